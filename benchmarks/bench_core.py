@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmarks for the hot paths of the viewer: startup, decoding, grid population,
+view synchronization, painting, pixel inspection, channel extraction and snapshots.
+
+A QApplication must exist before any benchmark is set up (see run.py).
+"""
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import List
+
+from PySide6.QtCore import QCoreApplication, QEvent, QPointF, QRectF, QThreadPool
+from PySide6.QtGui import QImage
+
+from igridvu import ImageGrid, ZoomableView
+from igridvu.create_examples import noise_image
+from igridvu.snapshot import save_image
+
+from harness import benchmark
+
+IMAGE_SIZES = [256, 1024, 4096]
+CELL_COUNTS = [4, 16, 30]
+GRID_IMAGE_SIZE = 512
+
+_workdir = tempfile.TemporaryDirectory(prefix="igridvu_bench_")
+# Widgets must stay alive while their benchmark runs.
+_keep_alive: List[object] = []
+
+
+def _noise_image(size: int) -> QImage:
+    """An opaque image with random content (so PNG encoding is realistic)."""
+    return noise_image(size, size)
+
+
+def _image_file(size: int, name: str) -> Path:
+    path = Path(_workdir.name) / f"{name}_{size}.png"
+    if not path.exists():
+        _noise_image(size).save(str(path))
+    return path
+
+
+def _dataset(cells: int, size: int = GRID_IMAGE_SIZE) -> List[str]:
+    """Writes `cells` images named bench_<i>.png and returns their suffixes."""
+    suffixes = [f"{i}.png" for i in range(cells)]
+    for suffix in suffixes:
+        path = Path(_workdir.name) / f"bench_{suffix}"
+        if not path.exists():
+            _noise_image(size).save(str(path))
+    return suffixes
+
+
+def _grid(cells: int) -> ImageGrid:
+    suffixes = _dataset(cells)
+    grid = ImageGrid(str(Path(_workdir.name) / "bench_"), suffixes, suffix_file_path="")
+    grid.resize(1600, 1200)
+    QCoreApplication.processEvents()
+    _keep_alive.append(grid)
+    return grid
+
+
+def _flush_deletes():
+    QCoreApplication.sendPostedEvents(None, QEvent.DeferredDelete)
+
+
+@benchmark("startup", repeat=3, cells=[0, 16])
+def bench_startup(cells: int):
+    """Launch of `igridvu` in a fresh interpreter until the window is ready."""
+    suffixes = _dataset(cells)
+    suffix_file = Path(_workdir.name) / f"startup_{cells}.txt"
+    suffix_file.write_text("\n".join(suffixes))
+    prefix = str(Path(_workdir.name) / "bench_") if cells else None
+    args = [sys.executable, "-m", "igridvu.cli", "--startup-time"]
+    if prefix:
+        args += [prefix, str(suffix_file)]
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+
+    def run():
+        subprocess.run(args, check=True, capture_output=True, env=env)
+    return run
+
+
+@benchmark("zoomable_view_decode", size=IMAGE_SIZES)
+def bench_zoomable_view_decode(size: int):
+    path = str(_image_file(size, "decode"))
+
+    def run():
+        view = ZoomableView(label_text="bench", img_path=path)
+        view.deleteLater()
+        _flush_deletes()
+    return run
+
+
+@benchmark("populate_grid", cells=CELL_COUNTS)
+def bench_populate_grid(cells: int):
+    grid = _grid(cells)
+    suffixes = list(grid.list_of_suffix)
+
+    def run():
+        grid._populate_grid(suffixes)
+        _flush_deletes()
+    return run
+
+
+@benchmark("sync_views", repeat=20, cells=CELL_COUNTS)
+def bench_sync_views(cells: int):
+    grid = _grid(cells)
+    rects = [QRectF(0, 0, GRID_IMAGE_SIZE / 2, GRID_IMAGE_SIZE / 2),
+             QRectF(GRID_IMAGE_SIZE / 4, GRID_IMAGE_SIZE / 4, GRID_IMAGE_SIZE / 3, GRID_IMAGE_SIZE / 3)]
+    state = {"i": 0}
+
+    def run():
+        # Alternate between two rects so every call changes the transform
+        state["i"] ^= 1
+        grid.sync_views(rects[state["i"]])
+    return run
+
+
+@benchmark("paint_zoomed_out", repeat=20, size=IMAGE_SIZES)
+def bench_paint_zoomed_out(size: int):
+    """Repainting a view that fits a large image into a small cell, as when panning a grid."""
+    view = ZoomableView(label_text="bench", image=_noise_image(size))
+    view.resize(320, 240)
+    view.show()
+    view.fitInView(view.sceneRect())
+    # The downsampled levels are built in the background
+    QThreadPool.globalInstance().waitForDone()
+    QCoreApplication.processEvents()
+    _keep_alive.append(view)
+
+    def run():
+        view.viewport().grab()
+    return run
+
+
+@benchmark("update_pixel_info", repeat=20, cells=CELL_COUNTS)
+def bench_update_pixel_info(cells: int):
+    grid = _grid(cells)
+    source = grid.views[0]
+    pos = QPointF(GRID_IMAGE_SIZE / 3, GRID_IMAGE_SIZE / 3)
+
+    def run():
+        source.mouseMovedAtScenePos.emit(pos)
+    return run
+
+
+@benchmark("get_channel_image", repeat=3, size=[64, 256, 1024])
+def bench_get_channel_image(size: int):
+    view = ZoomableView(label_text="bench", image=_noise_image(size))
+    _keep_alive.append(view)
+
+    def run():
+        view.get_channel_image("Red")
+    return run
+
+
+@benchmark("save_snapshot", cells=CELL_COUNTS)
+def bench_save_snapshot(cells: int):
+    """The work behind _save_snapshot: grabbing the window and encoding it."""
+    grid = _grid(cells)
+    out = str(Path(_workdir.name) / f"snapshot_{cells}.png")
+
+    def run():
+        save_image(grid.grab().toImage(), out)
+    return run
@@ -0,0 +1,111 @@
+# -*- coding: utf-8 -*-
+"""
+A minimal benchmark harness: registration, timing and JSON reporting.
+
+Benchmarks are plain functions registered with the @benchmark decorator.
+Each one receives its parameters as keyword arguments and returns the
+callable to be timed, so that expensive setup is excluded from the timing.
+"""
+import itertools
+import json
+import platform
+import statistics
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Callable, Dict, List, Optional
+
+
+@dataclass
+class Benchmark:
+    name: str
+    setup: Callable[..., Callable[[], Any]]
+    params: Dict[str, List[Any]] = field(default_factory=dict)
+    repeat: int = 5
+
+    def cases(self) -> List[Dict[str, Any]]:
+        """Returns every combination of the parameter values."""
+        keys = list(self.params)
+        return [dict(zip(keys, values)) for values in itertools.product(*self.params.values())]
+
+
+@dataclass
+class Result:
+    name: str
+    params: Dict[str, Any]
+    repeat: int
+    min_s: float
+    median_s: float
+    mean_s: float
+    stdev_s: float
+
+
+REGISTRY: List[Benchmark] = []
+
+
+def benchmark(name: str, repeat: int = 5, **params: List[Any]):
+    """Registers a benchmark. Keyword arguments are lists of parameter values."""
+    def decorator(setup: Callable[..., Callable[[], Any]]):
+        REGISTRY.append(Benchmark(name, setup, params, repeat))
+        return setup
+    return decorator
+
+
+def measure(fn: Callable[[], Any], repeat: int) -> List[float]:
+    """Calls fn once as a warm-up, then `repeat` times, returning the durations."""
+    fn()
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run(benchmarks: List[Benchmark], quick: bool = False,
+        log: Optional[Callable[[str], None]] = None) -> List[Result]:
+    """Runs all cases of the given benchmarks."""
+    results = []
+    for bench in benchmarks:
+        cases = bench.cases()
+        if quick:
+            # Only the smallest case of every benchmark
+            cases = cases[:1]
+        for params in cases:
+            fn = bench.setup(**params)
+            timings = measure(fn, 1 if quick else bench.repeat)
+            result = Result(
+                name=bench.name,
+                params=params,
+                repeat=len(timings),
+                min_s=min(timings),
+                median_s=statistics.median(timings),
+                mean_s=statistics.mean(timings),
+                stdev_s=statistics.stdev(timings) if len(timings) > 1 else 0.0,
+            )
+            results.append(result)
+            if log:
+                log(f"{bench.name:<28} {json.dumps(params):<40} median {result.median_s * 1000:9.3f} ms")
+    return results
+
+
+def environment() -> Dict[str, str]:
+    """Describes the machine and library versions the results were measured with."""
+    info = {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+    try:
+        import PySide6
+        from PySide6.QtCore import qVersion
+        info["pyside6"] = PySide6.__version__
+        info["qt"] = qVersion()
+    except ImportError:
+        pass
+    return info
+
+
+def to_json(results: List[Result]) -> str:
+    return json.dumps({"environment": environment(), "results": [asdict(r) for r in results]}, indent=2)
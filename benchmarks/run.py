@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+"""
+Runs the benchmark suite and writes the results as JSON.
+
+Usage (headless):
+    QT_QPA_PLATFORM=offscreen python benchmarks/run.py -o results.json
+"""
+import argparse
+import os
+import sys
+from pathlib import Path
+
+# Make the harness and the package importable without installation.
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "src"))
+
+# Benchmarks don't need a visible window.
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run the igridvu micro-benchmarks.")
+    parser.add_argument("-o", "--output", help="Write the JSON results to this file instead of stdout.")
+    parser.add_argument("-k", "--filter", default="",
+                        help="Only run benchmarks whose name contains this string.")
+    parser.add_argument("--quick", action="store_true",
+                        help="Run only the smallest case of each benchmark once (smoke test).")
+    args = parser.parse_args()
+
+    from PySide6.QtWidgets import QApplication
+    _app = QApplication.instance() or QApplication(sys.argv[:1])
+
+    import harness
+    import bench_core  # noqa: F401  (registers the benchmarks)
+
+    selected = [b for b in harness.REGISTRY if args.filter in b.name]
+    results = harness.run(selected, quick=args.quick, log=lambda line: print(line, file=sys.stderr))
+
+    output = harness.to_json(results)
+    if args.output:
+        Path(args.output).write_text(output + "\n", encoding="utf-8")
+    else:
+        print(output)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,21 @@
-from .main_window import ImageGrid
-from .zoomable_view import ZoomableView
-from . import cli
+import importlib
 
 # Defines the public API for the package
-__all__ = ["ImageGrid", "ZoomableView", "cli"]
+__all__ = ["ImageGrid", "ZoomableView", "show", "cli"]
+
+# The Qt modules are imported on first access, so that importing the package
+# (e.g. for `igridvu --help`) does not pay for loading Qt.
+_LAZY_ATTRIBUTES = {
+    "ImageGrid": ".main_window",
+    "ZoomableView": ".zoomable_view",
+    "show": ".arrays",
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(_LAZY_ATTRIBUTES[name], __name__)
+        return getattr(module, name)
+    if name == "cli":
+        return importlib.import_module(".cli", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -0,0 +1,296 @@
+# -*- coding: utf-8 -*-
+"""
+Images inside zip and tar archives.
+
+A path inside an archive is written as the archive path, `!` and the member
+path, e.g. `results.zip!/scene1_` is the prefix `scene1_` at the top level
+of results.zip, and `results.tar!/renders/scene1_diffuse.png` one member.
+
+Every archive is opened once: its member index (name -> offset and size) is
+built from the zip central directory, or from one pass over the tar headers,
+and cached until the archive's mtime or size changes. The archive is memory
+mapped, so reading a member is a slice of the mapping at a known offset:
+stored members are never copied through a file object, compressed zip
+members are inflated from the mapped bytes. Reading any member does not scan
+the archive, and reads from several threads do not share a file position.
+
+Only uncompressed tar archives support random access; compressed tar
+archives (.tar.gz etc.) are not supported.
+"""
+import mmap
+import os
+import posixpath
+import re
+import struct
+import threading
+import zlib
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+ARCHIVE_SEPARATOR = "!"
+_ARCHIVE_PATH = re.compile(r"^(.+?\.(?:zip|tar))!(?:/(.*))?$", re.IGNORECASE | re.DOTALL)
+
+# The fixed part of a zip local file header; the name and extra field lengths
+# are its last two fields.
+_LOCAL_HEADER = struct.Struct("<4s5H3L2H")
+_ZIP_STORED = 0
+_ZIP_DEFLATED = 8
+# The largest member read, like the file size cap of the views. Compressed
+# members are never inflated beyond it, whatever size their header declares.
+MAX_MEMBER_BYTES = 50 * 1024 * 1024
+
+
+class ArchiveError(OSError):
+    """An archive cannot be read, or a member is missing or unsupported."""
+
+
+class ArchiveMember(NamedTuple):
+    """One regular file in an archive."""
+    name: str
+    size: int
+    # Offset of the (zip: local header, tar: data) in the archive
+    offset: int
+    compressed_size: int
+    compress_type: int
+
+
+def split_archive_path(path: str) -> Optional[Tuple[str, str]]:
+    """
+    Splits `archive.zip!/member/path` into (archive path, member path).
+    The member path is normalized and empty for the archive root.
+    Returns None if the path is not inside a zip or tar archive.
+    """
+    match = _ARCHIVE_PATH.match(path)
+    if match is None:
+        return None
+    member = posixpath.normpath(match.group(2) or "").lstrip("/")
+    return match.group(1), "" if member == "." else member
+
+
+def is_archive_path(path: str) -> bool:
+    return _ARCHIVE_PATH.match(path) is not None
+
+
+def is_archive_directory(path: str) -> bool:
+    """Returns True if an archive path names the archive root or a directory in it."""
+    parts = split_archive_path(path)
+    if parts is None:
+        return False
+    try:
+        return parts[1] in open_archive(parts[0]).directories
+    except ArchiveError:
+        return False
+
+
+def _normalize_member_name(name: str) -> Optional[str]:
+    """Normalizes a stored member name. Names leaving the archive root are ignored."""
+    name = posixpath.normpath(name.replace("\\", "/")).lstrip("/")
+    if name in (".", "") or name == ".." or name.startswith("../"):
+        return None
+    return name
+
+
+class ArchiveIndex:
+    """The member index of one archive and a read-only memory map of it."""
+
+    def __init__(self, path: str):
+        """
+        Raises:
+            ArchiveError: If the archive cannot be opened or is not a supported archive.
+        """
+        self.path = path
+        try:
+            st = os.stat(path)
+            self.mtime_ns, self.size = st.st_mtime_ns, st.st_size
+            with open(path, "rb") as f:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:  # An empty file cannot be mapped
+            raise ArchiveError(f"Cannot open archive '{path}': {e}") from None
+
+        if path.lower().endswith(".zip"):
+            members = self._index_zip()
+        else:
+            members = self._index_tar()
+        self.members: Dict[str, ArchiveMember] = {m.name: m for m in members}
+
+        # Member names by directory, for the shared directory listing (see suffixes.py)
+        self.directories: Dict[str, List[str]] = {"": []}
+        for name in self.members:
+            directory, base = posixpath.split(name)
+            self.directories.setdefault(directory, []).append(base)
+            # Directories holding only subdirectories are directories too
+            while directory and (directory := posixpath.dirname(directory)) not in self.directories:
+                self.directories[directory] = []
+        self._data_offsets: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self._zip_file = None
+
+    def _index_zip(self) -> List[ArchiveMember]:
+        import zipfile
+        try:
+            with zipfile.ZipFile(self.path) as archive:
+                infos = archive.infolist()
+        except (OSError, zipfile.BadZipFile) as e:
+            raise ArchiveError(f"Cannot read zip archive '{self.path}': {e}") from None
+        members = []
+        for info in infos:
+            name = _normalize_member_name(info.filename)
+            if name is None or info.is_dir() or info.flag_bits & 0x1:  # Skip encrypted members
+                continue
+            members.append(ArchiveMember(name, info.file_size, info.header_offset,
+                                         info.compress_size, info.compress_type))
+        return members
+
+    def _index_tar(self) -> List[ArchiveMember]:
+        import tarfile
+        members = []
+        try:
+            # "r:" refuses compressed archives, which have no random access
+            with tarfile.open(self.path, "r:") as archive:
+                for info in archive:  # Reads the headers only, the data is skipped
+                    name = _normalize_member_name(info.name)
+                    if name is not None and info.isreg() and not info.issparse():
+                        members.append(ArchiveMember(name, info.size, info.offset_data,
+                                                     info.size, _ZIP_STORED))
+        except (OSError, tarfile.TarError) as e:
+            raise ArchiveError(f"Cannot read tar archive '{self.path}' "
+                               f"(compressed tar archives are not supported): {e}") from None
+        return members
+
+    def is_current(self) -> bool:
+        """Returns True if the archive file is unchanged since it was indexed."""
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return False
+        return st.st_mtime_ns == self.mtime_ns and st.st_size == self.size
+
+    def _data_offset(self, member: ArchiveMember) -> int:
+        if not self.path.lower().endswith(".zip"):
+            return member.offset
+        offset = self._data_offsets.get(member.name)
+        if offset is None:
+            header = _LOCAL_HEADER.unpack_from(self._map, member.offset)
+            if header[0] != b"PK\x03\x04":
+                raise ArchiveError(f"Bad local header for '{member.name}' in '{self.path}'")
+            offset = member.offset + _LOCAL_HEADER.size + header[-2] + header[-1]
+            self._data_offsets[member.name] = offset
+        return offset
+
+    def read(self, name: str, max_size: int = MAX_MEMBER_BYTES) -> bytes:
+        """
+        Returns the content of a member.
+
+        Args:
+            max_size: The largest content returned. Decompression stops there,
+                so a member whose declared size is a lie (a zip bomb) cannot
+                exhaust memory.
+
+        Raises:
+            ArchiveError: If the member does not exist, cannot be decompressed,
+                or its content is larger than its declared size or max_size.
+        """
+        member = self.members.get(name)
+        if member is None:
+            raise ArchiveError(f"'{name}' not found in '{self.path}'")
+        if member.size > max_size:
+            raise ArchiveError(f"'{name}' in '{self.path}' is larger than {max_size} bytes")
+        try:
+            if member.compress_type == _ZIP_STORED:
+                offset = self._data_offset(member)
+                return self._map[offset:offset + member.size]
+            if member.compress_type == _ZIP_DEFLATED:
+                offset = self._data_offset(member)
+                decompressor = zlib.decompressobj(-zlib.MAX_WBITS)
+                data = decompressor.decompress(self._map[offset:offset + member.compressed_size], member.size + 1)
+            else:
+                data = self._read_with_zipfile(member)
+        except (zlib.error, struct.error, ValueError) as e:
+            raise ArchiveError(f"Cannot read '{name}' from '{self.path}': {e}") from None
+        if len(data) > member.size:
+            raise ArchiveError(f"'{name}' in '{self.path}' is larger than its declared size")
+        return data
+
+    def _read_with_zipfile(self, member: ArchiveMember) -> bytes:
+        # Other methods (bzip2, lzma) go through zipfile, one read at a time,
+        # stopping one byte past the declared size
+        import zipfile
+        with self._lock:
+            if self._zip_file is None:
+                self._zip_file = zipfile.ZipFile(self.path)
+            for info in self._zip_file.infolist():
+                if _normalize_member_name(info.filename) == member.name:
+                    try:
+                        with self._zip_file.open(info) as f:
+                            return f.read(member.size + 1)
+                    except (NotImplementedError, RuntimeError, zipfile.BadZipFile) as e:
+                        raise ArchiveError(f"Cannot read '{member.name}' from '{self.path}': {e}") from None
+        raise ArchiveError(f"'{member.name}' not found in '{self.path}'")
+
+    def close(self):
+        with self._lock:
+            if self._zip_file is not None:
+                self._zip_file.close()
+                self._zip_file = None
+        # Slices already returned are copies, so the map can be closed
+        self._map.close()
+
+
+_cache: Dict[str, ArchiveIndex] = {}
+_cache_lock = threading.Lock()
+
+
+def open_archive(path: str) -> ArchiveIndex:
+    """
+    Returns the cached index of an archive, rebuilding it if the archive changed.
+
+    Raises:
+        ArchiveError: If the archive cannot be read.
+    """
+    key = os.path.abspath(path)
+    with _cache_lock:
+        index = _cache.get(key)
+    if index is not None and index.is_current():
+        return index
+    index = ArchiveIndex(key)
+    with _cache_lock:
+        old = _cache.get(key)
+        _cache[key] = index
+    if old is not None and old is not index:
+        old.close()
+    return index
+
+
+def clear_cache():
+    """Closes and forgets all open archives."""
+    with _cache_lock:
+        indexes = list(_cache.values())
+        _cache.clear()
+    for index in indexes:
+        index.close()
+
+
+def member_size(path: str) -> Optional[int]:
+    """
+    Returns the size of the member at an archive path, or None if it does not exist.
+
+    Raises:
+        ArchiveError: If the archive cannot be read.
+    """
+    archive, member = split_archive_path(path)
+    entry = open_archive(archive).members.get(member)
+    return None if entry is None else entry.size
+
+
+def read_member(path: str) -> bytes:
+    """
+    Reads the member at an archive path, e.g. `results.zip!/scene1_diffuse.png`.
+    Safe to call from worker threads.
+
+    Raises:
+        ArchiveError: If the path is not inside an archive, or the member cannot be read.
+    """
+    parts = split_archive_path(path)
+    if parts is None:
+        raise ArchiveError(f"'{path}' is not inside a zip or tar archive")
+    archive, member = parts
+    return open_archive(archive).read(member)
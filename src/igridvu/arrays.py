@@ -0,0 +1,198 @@
+# -*- coding: utf-8 -*-
+"""
+Showing NumPy arrays from a Python session, e.g. while debugging a training loop:
+
+    import igridvu
+    viewer = igridvu.show([prediction, target], ["prediction", "target"], columns=2)
+    ...
+    viewer.update(0, new_prediction)    # in place, keeping the zoom and pan
+
+Arrays are wrapped in QImages without copying when their layout matches a
+QImage format: C-contiguous uint8 (gray, RGB, RGBA), uint16 (gray, RGBA) and
+float32 RGBA arrays. Other arrays (e.g. uint16 RGB or float32 gray) are
+converted once. Float values are shown in the range 0..1. The wrapped arrays
+are kept alive by the viewer, and arrays changed in place are shown again
+with refresh().
+
+show() returns at once. In IPython or Jupyter with the Qt event loop enabled
+(`%gui qt`), the window stays responsive on its own; in a plain script it
+processes events whenever the viewer is updated, and wait() keeps it open
+until it is closed.
+"""
+from typing import Any, List, Optional, Sequence
+
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QApplication
+
+from .config import MAX_IMAGES
+
+# (dtype, channels) of arrays that are wrapped without copying
+_FORMATS = {
+    ("uint8", 1): QImage.Format_Grayscale8,
+    ("uint8", 3): QImage.Format_RGB888,
+    ("uint8", 4): QImage.Format_RGBA8888,
+    ("uint16", 1): QImage.Format_Grayscale16,
+    ("uint16", 4): QImage.Format_RGBA64,
+    ("float32", 4): QImage.Format_RGBA32FPx4,
+}
+_FILL_VALUES = {"uint16": 65535, "float32": 1.0}
+
+# The viewers of show(), kept until their window is closed, so a viewer
+# whose handle was dropped stays on screen
+_open_viewers: List["ArrayViewer"] = []
+
+
+def _channels(array) -> int:
+    if array.ndim == 2:
+        return 1
+    if array.ndim == 3 and array.shape[2] in (1, 3, 4):
+        return array.shape[2]
+    raise ValueError(f"Expected an array of shape (height, width) or (height, width, 1|3|4), got {array.shape}")
+
+
+def prepare_array(array):
+    """
+    Returns an array with the same pixels that array_to_qimage() can wrap
+    without copying: the array itself if its layout already fits, else a
+    converted copy. Gray float32 and RGB uint16/float32 arrays are padded to
+    RGBA, as QImage has no such formats.
+
+    Raises:
+        ValueError: For other shapes and dtypes.
+    """
+    import numpy as np
+    channels = _channels(array)
+    dtype = array.dtype.newbyteorder("=") if array.dtype.byteorder not in "=|" else array.dtype
+    if dtype.name not in ("uint8", "uint16", "float32"):
+        raise ValueError(f"Unsupported dtype {array.dtype}: expected uint8, uint16 or float32")
+    if array.ndim == 3 and channels == 1:
+        array = array[:, :, 0]
+    if (dtype.name, channels) not in _FORMATS:
+        # Gray or RGB padded to RGBA, with an opaque alpha channel
+        padded = np.empty(array.shape[:2] + (4,), dtype=dtype)
+        padded[:, :, :3] = array[:, :, None] if channels == 1 else array
+        padded[:, :, 3] = _FILL_VALUES[dtype.name]
+        return padded
+    if array.dtype != dtype or not array.flags.c_contiguous:
+        return np.ascontiguousarray(array, dtype=dtype)
+    return array
+
+
+def array_to_qimage(array) -> QImage:
+    """
+    Wraps an array prepared by prepare_array() in a QImage that shares its
+    memory. The QImage is only valid while the array is alive.
+    """
+    channels = _channels(array)
+    image_format = _FORMATS.get((array.dtype.name, channels))
+    if image_format is None or not array.flags.c_contiguous:
+        raise ValueError("The array must be prepared with prepare_array()")
+    height, width = array.shape[:2]
+    return QImage(array.data, width, height, array.strides[0], image_format)
+
+
+class ArrayViewer:
+    """The window of show(), and a handle to update its cells."""
+
+    def __init__(self, arrays: Sequence[Any], labels: Optional[Sequence[str]] = None, columns: int = 4,
+                 title: str = "igridvu"):
+        from .main_window import ImageGrid
+        self._app = QApplication.instance() or QApplication([])
+        self.window = ImageGrid("", [], suffix_file_path="", columns=columns, app_name=title)
+        self.window.setAttribute(Qt.WA_DeleteOnClose)
+        self.window.destroyed.connect(lambda _obj=None: self._on_closed())
+        self.window.setWindowTitle(title)
+        # The arrays shared with the QImages of the views, and those QImages
+        self._arrays: List[Any] = []
+        self._images: List[QImage] = []
+        self._closed = False
+        self.set_arrays(arrays, labels)
+
+    def _on_closed(self):
+        self._closed = True
+        if self in _open_viewers:
+            _open_viewers.remove(self)
+
+    def is_open(self) -> bool:
+        return not self._closed
+
+    def __len__(self) -> int:
+        return len(self._arrays)
+
+    def labels(self) -> List[str]:
+        return [view.label_text for view in self.window.views]
+
+    def set_arrays(self, arrays: Sequence[Any], labels: Optional[Sequence[str]] = None):
+        """Shows other arrays, possibly a different number of them, keeping the zoom and pan."""
+        if len(arrays) > MAX_IMAGES:
+            raise ValueError(f"At most {MAX_IMAGES} arrays can be shown, got {len(arrays)}")
+        labels = list(labels) if labels is not None else [str(i) for i in range(len(arrays))]
+        if len(labels) != len(arrays):
+            raise ValueError(f"Got {len(labels)} labels for {len(arrays)} arrays")
+        self._check_open()
+        prepared = [prepare_array(array) for array in arrays]
+        images = [array_to_qimage(array) for array in prepared]
+        self.window.show_images(images, labels)
+        self._arrays, self._images = prepared, images
+        self.process_events()
+
+    def update(self, index: int, array, label: Optional[str] = None):
+        """Shows another array in a cell, keeping its zoom, pan and channel."""
+        self._check_open()
+        prepared = prepare_array(array)
+        image = array_to_qimage(prepared)
+        self.window.update_image(index, image, label)
+        self._arrays[index], self._images[index] = prepared, image
+        self.process_events()
+
+    def refresh(self, index: Optional[int] = None):
+        """
+        Shows arrays again after they were changed in place, all of them or one.
+        Only arrays wrapped without copying (see prepare_array) show the changes.
+        """
+        self._check_open()
+        for i in range(len(self._images)) if index is None else [index]:
+            self.window.update_image(i, self._images[i])
+        self.process_events()
+
+    def process_events(self):
+        """Lets the window repaint and respond, e.g. from a loop in a script."""
+        self._app.processEvents()
+
+    def wait(self):
+        """Blocks until the window is closed, e.g. at the end of a script."""
+        while self.is_open():
+            self._app.processEvents()
+            if self.is_open():
+                self.window.thread().msleep(10)
+
+    def close(self):
+        if self.is_open():
+            self.window.close()
+            self.process_events()
+
+    def _check_open(self):
+        if self._closed:
+            raise RuntimeError("The viewer window was closed")
+
+
+def show(arrays: Sequence[Any], labels: Optional[Sequence[str]] = None, columns: int = 4,
+         title: str = "igridvu") -> ArrayViewer:
+    """
+    Shows NumPy arrays in a new grid window and returns at once.
+
+    Args:
+        arrays: uint8, uint16 or float32 arrays of shape (height, width) or
+            (height, width, 1|3|4). Float values are shown in the range 0..1.
+        labels: The label of every array. Defaults to the indexes.
+        columns: The number of columns of the grid.
+
+    Returns:
+        The viewer, to update the cells (see ArrayViewer.update and refresh).
+    """
+    viewer = ArrayViewer(arrays, labels, columns, title)
+    _open_viewers.append(viewer)
+    viewer.window.raise_()
+    viewer.process_events()
+    return viewer
@@ -1,25 +1,49 @@
 # -*- coding: utf-8 -*-
 """
 Command-line interface for the Image Grid Viewer.
+
+Qt is only imported after the arguments have been parsed and validated, so
+`igridvu --help` and argument errors return without loading Qt.
 """
 import sys
+import time
 import argparse
 from pathlib import Path
-from itertools import islice
-
-from PySide6.QtWidgets import QApplication
 
-from .main_window import ImageGrid
-from .config import MAX_IMAGES
+from .config import MAX_IMAGES, DEFAULT_SUFFIX_FILE, STARTUP_BUDGET_MS
+from .archives import split_archive_path
+from .suffixes import read_suffix_file
+from . import tracing
 
 APP_NAME = "Image Grid Viewer"
-DEFAULT_SUFFIX_FILE = "igridvu_suffix.txt"
 
-def main():
-    """Main function to run the application."""
-    # Initialize QApplication first, as it can also parse Qt-specific arguments
-    app = QApplication(sys.argv)
+# Options handled by QApplication itself, mapped to whether they take a value
+QT_OPTIONS = {
+    "-platform": True, "-platformpluginpath": True, "-platformtheme": True,
+    "-plugin": True, "-qwindowgeometry": True, "-qwindowicon": True,
+    "-qwindowtitle": True, "-style": True, "-stylesheet": True,
+    "-display": True, "-geometry": True, "-session": True,
+    "-reverse": False, "-widgetcount": False,
+}
+
 
+def _split_qt_args(argv):
+    """Separates the QApplication options from our own arguments."""
+    own, qt = [], []
+    i = 0
+    while i < len(argv):
+        name = argv[i].split("=", 1)[0]
+        if name in QT_OPTIONS:
+            takes_value = QT_OPTIONS[name] and "=" not in argv[i]
+            qt.extend(argv[i:i + 1 + takes_value])
+            i += 1 + takes_value
+        else:
+            own.append(argv[i])
+            i += 1
+    return own, qt
+
+
+def _build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
         description="Image Grid Viewer (igridvu). Displays a grid of images from a prefix and a list of suffixes.",
         formatter_class=argparse.RawTextHelpFormatter,  # Keep newlines in help text
@@ -29,7 +53,7 @@ def main():
         "image_prefix",
         nargs="?",
         default=None,
-        help="The common prefix for the image files (e.g., 'testimage').\nIf omitted, the application starts with a welcome screen."
+        help="The common prefix for the image files (e.g., 'testimage', or 'results.zip!/scene1_' inside an archive).\nIf omitted, the application starts with a welcome screen."
     )
     parser.add_argument(
         "suffix_file",
@@ -43,7 +67,90 @@ def main():
         default=4,
         help="The number of columns in the grid. Defaults to 4."
     )
-    args = parser.parse_args()
+    parser.add_argument(
+        "--trace",
+        metavar="FILE",
+        default=None,
+        help=f"Record performance spans and write them as Chrome trace JSON to FILE on exit.\n"
+             f"Can also be enabled with the {tracing.ENV_VAR} environment variable."
+    )
+    parser.add_argument(
+        "--latest",
+        metavar="ROOT",
+        default=None,
+        help="Open the most recent complete dataset under ROOT, looked up in the\n"
+             "dataset index (see igridvu-index). ROOT is indexed first if needed."
+    )
+    parser.add_argument(
+        "--last-session",
+        action="store_true",
+        help="Reopen the dataset, columns, zoom, channels and window geometry of\n"
+             "the last session, which is saved when the window is closed."
+    )
+    parser.add_argument(
+        "--single-instance",
+        action="store_true",
+        help="If a viewer started with this option is running, open the dataset\n"
+             "in it and exit at once. Otherwise start one that later calls reuse."
+    )
+    parser.add_argument(
+        "--remote",
+        action="store_true",
+        help="Accept commands of automation scripts (load, zoom, channels, pixel\n"
+             "queries, snapshots) on a local socket; see igridvu.remote.RemoteClient."
+    )
+    parser.add_argument(
+        "--startup-time",
+        action="store_true",
+        help=f"Print the time from launch until the window is ready, then exit.\n"
+             f"Warns if it exceeds the budget of {STARTUP_BUDGET_MS} ms."
+    )
+    return parser
+
+
+def _report_startup_time(start: float, app):
+    """Prints the time since `start` and quits the application."""
+    elapsed_ms = (time.perf_counter() - start) * 1000.0
+    print(f"Startup time: {elapsed_ms:.0f} ms (budget: {STARTUP_BUDGET_MS} ms)")
+    if elapsed_ms > STARTUP_BUDGET_MS:
+        print(f"Warning: Startup took longer than the budget of {STARTUP_BUDGET_MS} ms.", file=sys.stderr)
+    app.quit()
+
+
+def main():
+    """Main function to run the application."""
+    start = time.perf_counter()
+    # Qt-specific arguments (e.g. -platform) are left for QApplication
+    own_args, qt_args = _split_qt_args(sys.argv[1:])
+    parser = _build_parser()
+    args = parser.parse_args(own_args)
+    if args.last_session and (args.image_prefix or args.latest):
+        parser.error("--last-session cannot be combined with an image prefix or --latest")
+
+    if args.trace:
+        tracing.enable(args.trace)
+
+    if args.latest:
+        from .tree_index import TreeIndex
+        index = TreeIndex().load()
+        if not index.contains(args.latest):
+            index.refresh(args.latest)
+            index.save()
+        dataset = index.most_recent(args.latest)
+        if dataset is None:
+            print(f"Error: No complete dataset found under '{args.latest}'.", file=sys.stderr)
+            sys.exit(1)
+        args.image_prefix, args.suffix_file = dataset.pre_path, dataset.suffix_file
+
+    session = None
+    if args.last_session:
+        from .session import load_session
+        session = load_session()
+        if session is None:
+            print("Error: No saved session found.", file=sys.stderr)
+            sys.exit(1)
+        args.image_prefix, args.suffix_file = session.pre_path, session.suffix_file
+        args.columns = session.columns
 
     list_of_suffix = []
     pre_path_str = ""
@@ -57,16 +164,19 @@ def main():
         if args.suffix_file:
             suffix_file_path = Path(args.suffix_file)
         else:
-            # The default is 'igridvu_suffix.txt' in the same directory as the prefix.
-            suffix_file_path = prefix_path.parent / DEFAULT_SUFFIX_FILE
+            # The default is 'igridvu_suffix.txt' in the same directory as the prefix,
+            # or next to the archive for a prefix inside an archive.
+            archive = split_archive_path(pre_path_str)
+            prefix_dir = Path(archive[0]).parent if archive else prefix_path.parent
+            suffix_file_path = prefix_dir / DEFAULT_SUFFIX_FILE
 
         if suffix_file_path.is_file():
             try:
-                with open(suffix_file_path, 'r', encoding='utf-8') as f:
-                    list_of_suffix = [line.strip() for line in islice(f, MAX_IMAGES) if line.strip()]
-                    if f.readline():
-                        print(f"Warning: Suffix file has more than {MAX_IMAGES} lines.", file=sys.stderr)
-                        print(f"-> Displaying the first {MAX_IMAGES} images.")
+                # Glob and regex entries are expanded by the grid
+                list_of_suffix, truncated = read_suffix_file(str(suffix_file_path), MAX_IMAGES)
+                if truncated:
+                    print(f"Warning: Suffix file has more than {MAX_IMAGES} lines.", file=sys.stderr)
+                    print(f"-> Displaying the first {MAX_IMAGES} images.")
             except IOError as e:
                 print(f"Warning: Could not read suffix file '{suffix_file_path}': {e}", file=sys.stderr)
         suffix_file_path_str = str(suffix_file_path)
@@ -75,14 +185,45 @@ def main():
         # The suffix editor will need a path to create a new file.
         suffix_file_path_str = str(Path.cwd() / DEFAULT_SUFFIX_FILE)
 
-    # The ImageGrid instance must be stored in a variable for the application to work.
-    _ = ImageGrid(
-        pre_path=pre_path_str,
-        list_of_suffix=list_of_suffix,
-        suffix_file_path=suffix_file_path_str,
-        columns=args.columns,
-        app_name=APP_NAME
-    )
+    if args.single_instance and pre_path_str:
+        # Only QtCore and QtNetwork: forwarding returns without loading the GUI stack
+        from .single_instance import forward_open
+        if forward_open(pre_path_str, suffix_file_path_str):
+            print(f"Opened '{pre_path_str}' in the running instance.")
+            sys.exit(0)
+
+    # Imported here so that the argument handling above never loads Qt
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication
+    from .main_window import ImageGrid
+    from .session import default_session_path
+
+    with tracing.span("startup", "startup"):
+        app = QApplication(sys.argv[:1] + qt_args)
+        # The ImageGrid instance must be stored in a variable for the application to work.
+        window = ImageGrid(
+            pre_path=pre_path_str,
+            list_of_suffix=list_of_suffix,
+            suffix_file_path=suffix_file_path_str,
+            columns=args.columns,
+            app_name=APP_NAME,
+            defer_menus=True,
+            session=session
+        )
+        window.session_path = default_session_path()
+        if args.single_instance:
+            from .single_instance import InstanceServer
+            server = InstanceServer(parent=window)
+            server.openRequested.connect(window.open_dataset)
+            if not server.listen():
+                print(f"Warning: Could not listen for other instances: {server.name}", file=sys.stderr)
+        if args.remote:
+            remote = window.start_remote_control()
+            if not remote.is_listening():
+                print(f"Warning: Could not listen for remote control: {remote.name}", file=sys.stderr)
+    if args.startup_time:
+        # Queued behind the window's first paint and the deferred menu bar
+        QTimer.singleShot(0, lambda: _report_startup_time(start, app))
     sys.exit(app.exec())
 
 
@@ -0,0 +1,247 @@
+# -*- coding: utf-8 -*-
+"""
+A/B comparison of two images in one viewport.
+
+Side-by-side views make small shifts between two images hard to spot. The
+comparison view shows both images in the same place. In flicker mode only
+one of them is visible and Space swaps them; in swipe mode image B is shown
+right of a divider that is dragged with the mouse.
+
+Both images are painted from pixmaps already resident in their grid views
+(including their levels of detail, see zoomable_view.py), so switching never
+decodes or uploads anything: a flicker repaints the viewport from the other
+pixmap, and a divider move repaints only the strip it passed over. Views
+that only hold a proxy are restored by the grid and repainted once decoded.
+"""
+from typing import Optional
+
+from PySide6.QtCore import Qt, Signal as pyqtSignal, QLineF, QPointF, QRect, QRectF
+from PySide6.QtGui import QColor, QPainter, QPen, QPixmap
+from PySide6.QtWidgets import QFrame, QGraphicsPixmapItem, QGraphicsScene, QGraphicsView, QLabel
+from shiboken6 import isValid
+
+from .zoomable_view import ZoomableView
+
+
+class _SwipePixmapItem(QGraphicsPixmapItem):
+    """A pixmap item that is hidden left of a scene x coordinate."""
+
+    def __init__(self):
+        super().__init__()
+        self.clip_x: Optional[float] = None
+
+    def paint(self, painter: QPainter, option, widget=None):
+        if self.clip_x is not None:
+            # Item coordinates are pixels of the pixmap, scaled up to image pixels
+            left = self.clip_x / self.scale()
+            pixmap = self.pixmap()
+            painter.setClipRect(QRectF(left, 0, max(0.0, pixmap.width() - left), pixmap.height()),
+                                Qt.IntersectClip)
+        super().paint(painter, option, widget)
+
+
+class CompareView(QGraphicsView):
+    """Shows two views' images in one viewport, flickering between them or split by a divider."""
+    # Escape was pressed
+    closeRequested = pyqtSignal()
+
+    FLICKER = "flicker"
+    SWIPE = "swipe"
+    # Distance in screen pixels within which a press grabs the divider
+    DIVIDER_GRAB_MARGIN = 6
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._scene = QGraphicsScene(self)
+        self.setScene(self._scene)
+        self._item_a = QGraphicsPixmapItem()
+        self._item_b = _SwipePixmapItem()
+        self._scene.addItem(self._item_a)
+        self._scene.addItem(self._item_b)
+        self.view_a: Optional[ZoomableView] = None
+        self.view_b: Optional[ZoomableView] = None
+        self.mode = self.FLICKER
+        self.showing_b = False
+        # The divider position in scene (image) coordinates
+        self.divider_x = 0.0
+        self._dragging_divider = False
+
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
+        self.setResizeAnchor(QGraphicsView.AnchorViewCenter)
+        self.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.setFrameStyle(QFrame.StyledPanel)
+        self.setDragMode(QGraphicsView.ScrollHandDrag)
+        self.setRenderHint(QPainter.SmoothPixmapTransform, True)
+        self.setMouseTracking(True)
+        self.setFocusPolicy(Qt.StrongFocus)
+
+        self._title_label = QLabel(self)
+        self._title_label.setAlignment(Qt.AlignCenter)
+        self._title_label.setStyleSheet(
+            "background-color: rgba(0, 0, 0, 160);"
+            "color: white;"
+            "padding: 4px;"
+            "border-radius: 4px;"
+        )
+        self._title_label.setAttribute(Qt.WA_TransparentForMouseEvents)
+
+    def set_views(self, view_a: ZoomableView, view_b: ZoomableView, rect: Optional[QRectF] = None):
+        """Compares the images of two views, showing a scene rectangle (default: all of image A)."""
+        self._disconnect_views()
+        self.view_a, self.view_b = view_a, view_b
+        # A proxy being restored is repainted at full resolution once decoded
+        for view in {view_a, view_b}:
+            view.memoryChanged.connect(self._view_changed)
+        size = view_a.image_size().expandedTo(view_b.image_size())
+        self._scene.setSceneRect(QRectF(0, 0, size.width(), size.height()))
+        self.divider_x = size.width() / 2
+        if rect is None or rect.isNull():
+            rect = QRectF(0, 0, view_a.image_size().width(), view_a.image_size().height())
+        self.fitInView(rect, Qt.KeepAspectRatio)
+        self._update_pixmaps()
+        self._update_items()
+
+    def clear(self):
+        """Releases the pixmaps, e.g. when the grid views are deleted."""
+        self._disconnect_views()
+        self.view_a = self.view_b = None
+        self._item_a.setPixmap(QPixmap())
+        self._item_b.setPixmap(QPixmap())
+
+    def _disconnect_views(self):
+        for view in {self.view_a, self.view_b} - {None}:
+            if isValid(view):
+                view.memoryChanged.disconnect(self._view_changed)
+
+    def _view_changed(self):
+        self.viewport().update()
+
+    def set_mode(self, mode: str):
+        self.mode = mode
+        self._update_items()
+
+    def toggle(self):
+        """Flicker: shows the other image. In swipe mode, switches to flicker mode first."""
+        if self.mode != self.FLICKER:
+            self.mode = self.FLICKER
+        else:
+            self.showing_b = not self.showing_b
+        self._update_items()
+
+    def set_divider(self, x: float):
+        """Moves the swipe divider to a scene x coordinate, repainting only the strip it passed."""
+        x = max(0.0, min(x, self.sceneRect().width()))
+        if x == self.divider_x:
+            return
+        old_x = self.view_x(self.divider_x)
+        self.divider_x = x
+        self._item_b.clip_x = x
+        new_x = self.view_x(x)
+        margin = 2  # The divider line
+        left, right = min(old_x, new_x) - margin, max(old_x, new_x) + margin
+        self.viewport().update(QRect(left, 0, right - left + 1, self.viewport().height()))
+
+    def view_x(self, scene_x: float) -> int:
+        """The viewport x coordinate of a scene x coordinate."""
+        return self.mapFromScene(QPointF(scene_x, 0)).x()
+
+    def view_rect(self) -> QRectF:
+        """The visible scene rectangle."""
+        return self.mapToScene(self.viewport().rect()).boundingRect()
+
+    def _update_items(self):
+        if self.view_a is None or self.view_b is None:
+            return
+        swipe = self.mode == self.SWIPE
+        # Image B covers image A, which may show through its transparent pixels
+        self._item_a.setVisible(swipe or not self.showing_b)
+        self._item_b.setVisible(swipe or self.showing_b)
+        self._item_b.clip_x = self.divider_x if swipe else None
+        if swipe:
+            self._title_label.setText(f"A: {self.view_a.label_text}  |  B: {self.view_b.label_text}")
+        else:
+            view = self.view_b if self.showing_b else self.view_a
+            self._title_label.setText(f"{'B' if self.showing_b else 'A'}: {view.label_text}")
+        self._place_title()
+        self.viewport().update()
+
+    def _place_title(self):
+        margin = 5
+        self._title_label.setFixedWidth(self.width() - 2 * margin)
+        self._title_label.move(margin, margin)
+
+    def _update_pixmaps(self):
+        # The resident level of detail closest to the current zoom, as in the grid views
+        zoom = self.transform().m11()
+        mode = Qt.FastTransformation if zoom >= ZoomableView.NEAREST_NEIGHBOR_ZOOM else Qt.SmoothTransformation
+        for item, view in ((self._item_a, self.view_a), (self._item_b, self.view_b)):
+            if view is None:
+                continue
+            pixmap = view.pixmap_for_zoom(zoom)
+            if pixmap is None or pixmap.isNull():
+                continue
+            if pixmap.cacheKey() != item.pixmap().cacheKey():
+                item.setPixmap(pixmap)
+                item.setScale(view.image_size().width() / pixmap.width())
+            if item.transformationMode() != mode:
+                item.setTransformationMode(mode)
+
+    def drawBackground(self, painter: QPainter, rect: QRectF):
+        self._update_pixmaps()
+        super().drawBackground(painter, rect)
+
+    def drawForeground(self, painter: QPainter, rect: QRectF):
+        super().drawForeground(painter, rect)
+        if self.mode != self.SWIPE:
+            return
+        pen = QPen(QColor(255, 255, 255, 200))
+        pen.setCosmetic(True)
+        pen.setWidth(2)
+        painter.setPen(pen)
+        painter.drawLine(QLineF(self.divider_x, rect.top(), self.divider_x, rect.bottom()))
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._place_title()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Space:
+            self.toggle()
+        elif event.key() == Qt.Key_S:
+            self.set_mode(self.FLICKER if self.mode == self.SWIPE else self.SWIPE)
+        elif event.key() == Qt.Key_Escape:
+            self.closeRequested.emit()
+        else:
+            super().keyPressEvent(event)
+
+    def wheelEvent(self, event):
+        if not event.pixelDelta().isNull():
+            steps = event.pixelDelta().y() / ZoomableView.WHEEL_PIXELS_PER_STEP
+        else:
+            steps = event.angleDelta().y() / 120
+        factor = ZoomableView.ZOOM_STEP ** steps
+        self.scale(factor, factor)
+
+    def _near_divider(self, x: float) -> bool:
+        return self.mode == self.SWIPE and abs(x - self.view_x(self.divider_x)) <= self.DIVIDER_GRAB_MARGIN
+
+    def mousePressEvent(self, event):
+        if event.button() == Qt.LeftButton and self._near_divider(event.position().x()):
+            self._dragging_divider = True
+            return
+        super().mousePressEvent(event)
+
+    def mouseMoveEvent(self, event):
+        if self._dragging_divider:
+            self.set_divider(self.mapToScene(event.position().toPoint()).x())
+            return
+        self.viewport().setCursor(Qt.SplitHCursor if self._near_divider(event.position().x())
+                                  else Qt.OpenHandCursor)
+        super().mouseMoveEvent(event)
+
+    def mouseReleaseEvent(self, event):
+        if self._dragging_divider and event.button() == Qt.LeftButton:
+            self._dragging_divider = False
+            return
+        super().mouseReleaseEvent(event)
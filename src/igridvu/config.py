@@ -2,6 +2,55 @@
 """
 Shared configuration constants for the application.
 """
+import os
 
 # Limit the number of images to prevent excessive resource usage
-MAX_IMAGES = 30
\ No newline at end of file
+MAX_IMAGES = 30
+# The suffix file looked up next to the images
+DEFAULT_SUFFIX_FILE = "igridvu_suffix.txt"
+# The suffix editor loads at most this many entries. Only the first MAX_IMAGES
+# (after pattern expansion) are shown in the grid.
+MAX_SUFFIX_FILE_ENTRIES = 200000
+# Number of output rows composited at a time by the full-resolution export.
+# Bounds the export memory to roughly width * EXPORT_BAND_HEIGHT * 3 bytes.
+EXPORT_BAND_HEIGHT = 256
+
+# Default snapshot encoding settings. PNG compression is a zlib level (0-9),
+# quality applies to lossy formats such as JPEG and WebP (0-100).
+SNAPSHOT_PNG_COMPRESSION = 6
+SNAPSHOT_QUALITY = 90
+
+# Memory budget for all image views. Views beyond the budget are degraded to
+# low-resolution proxies. Override with the IGRIDVU_MEMORY_BUDGET_MB variable.
+MEMORY_BUDGET_BYTES = int(os.environ.get("IGRIDVU_MEMORY_BUDGET_MB", "2048")) * 1024 * 1024
+# The longest side of a low-resolution proxy image
+PROXY_MAX_DIMENSION = 512
+# Disk space for the persistent proxies shown first when a session is
+# restored. Override with the IGRIDVU_PROXY_CACHE_MB variable.
+PROXY_CACHE_BUDGET_BYTES = int(os.environ.get("IGRIDVU_PROXY_CACHE_MB", "256")) * 1024 * 1024
+
+# Memory budget for decoded frames of multi-page and animated images, shared
+# by all views. Override with the IGRIDVU_FRAME_BUDGET_MB variable.
+FRAME_CACHE_BUDGET_BYTES = int(os.environ.get("IGRIDVU_FRAME_BUDGET_MB", "512")) * 1024 * 1024
+# Frames decoded in the background ahead of and behind the current frame
+FRAME_PREFETCH_AHEAD = 4
+FRAME_PREFETCH_BEHIND = 2
+
+# Memory budget for images decoded ahead by the flip-book and for the grids of
+# neighbouring datasets in a sequence. Override with the
+# IGRIDVU_PREFETCH_BUDGET_MB variable.
+PREFETCH_BUDGET_BYTES = int(os.environ.get("IGRIDVU_PREFETCH_BUDGET_MB", "1024")) * 1024 * 1024
+# Images decoded in the background ahead of and behind the flip-book image
+FLIPBOOK_PREFETCH_AHEAD = 3
+FLIPBOOK_PREFETCH_BEHIND = 1
+# Datasets of a numbered sequence whose grids are decoded ahead in each
+# direction (within the prefetch budget)
+SEQUENCE_PREFETCH_DEPTH = 2
+
+# Playback of numbered sequences: the default frame rate and the number of
+# frames (whole grids) decoded ahead
+PLAYBACK_FPS = 24.0
+PLAYBACK_BUFFER_FRAMES = 8
+
+# Time budget in milliseconds from launch until the window is ready (see --startup-time)
+STARTUP_BUDGET_MS = 1500
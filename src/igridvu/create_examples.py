@@ -2,9 +2,21 @@
 """
 A simple module to generate the placeholder images for the example test scene.
 This helps make the project runnable out-of-the-box.
+
+It can also generate larger synthetic datasets (noise, gradients or
+photographic-like content at any resolution and bit depth) for load testing
+and benchmarking, either from the GUI or via the `igridvu-examples` command.
 """
 import os
+import sys
+import math
+import random
+import argparse
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from .tracing import span
 
 # Define the prefix and suffixes from the README
 SUBDIR = "testscene"
@@ -79,4 +91,268 @@ def create_example_dataset(base_dir: Path) -> tuple[bool, str, str]:
 
     except (IOError, OSError) as e:
         message = f"Error creating example dataset: {e}"
-        return False, message, ""
\ No newline at end of file
+        return False, message, ""
+
+
+# Settings for synthetic datasets
+SYNTHETIC_SUBDIR = "synthetic"
+SYNTHETIC_PREFIX = "synth_"
+CONTENT_TYPES = ("noise", "gradient", "photo")
+IMAGE_FORMATS = ("png", "jpg", "webp", "bmp", "tif")
+BIT_DEPTHS = (8, 16)
+
+
+def _random_bytes(rng: random.Random, size: int) -> bytearray:
+    """Returns `size` random bytes generated in a single call."""
+    return bytearray(rng.getrandbits(8 * size).to_bytes(size, "little")) if size else bytearray()
+
+
+def noise_image(width: int, height: int, bit_depth: int = 8, alpha: bool = False,
+                rng: Optional[random.Random] = None):
+    """
+    Creates an image filled with uniform random noise.
+
+    The pixel buffer is generated in one go and handed to QImage, instead of
+    setting the pixels one by one.
+
+    Args:
+        width, height: The image size in pixels.
+        bit_depth: 8 or 16 bits per channel.
+        alpha: If True the alpha channel is random too, otherwise opaque.
+        rng: Optional random generator for reproducible content.
+    """
+    from PySide6.QtGui import QImage
+
+    rng = rng or random.Random()
+    pixels = width * height
+    if bit_depth == 16:
+        bytes_per_pixel = 8
+        image_format = QImage.Format_RGBA64 if alpha else QImage.Format_RGBX64
+    else:
+        bytes_per_pixel = 4
+        image_format = QImage.Format_ARGB32 if alpha else QImage.Format_RGB32
+
+    data = _random_bytes(rng, pixels * bytes_per_pixel)
+    if not alpha:
+        # The alpha bytes must be fully opaque. In both formats alpha is the
+        # last channel of each pixel (little-endian ARGB32 is stored as BGRA).
+        for offset in range(bytes_per_pixel - (bytes_per_pixel // 4), bytes_per_pixel):
+            data[offset::bytes_per_pixel] = b"\xff" * pixels
+
+    image = QImage(bytes(data), width, height, width * bytes_per_pixel, image_format)
+    return image.copy()  # Detach from the temporary Python buffer
+
+
+def _gradient_image(width: int, height: int, image_format, rng: random.Random):
+    """A smooth diagonal gradient between two random colors."""
+    from PySide6.QtGui import QImage, QColor, QPainter, QLinearGradient
+
+    image = QImage(width, height, image_format)
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0.0, QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    gradient.setColorAt(1.0, QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256)))
+    painter = QPainter(image)
+    painter.fillRect(image.rect(), gradient)
+    painter.end()
+    return image
+
+
+def _photo_image(width: int, height: int, image_format, bit_depth: int, rng: random.Random):
+    """
+    A photographic-like image: a sky-to-ground background, soft out-of-focus
+    highlights, a few solid shapes and a layer of fine grain.
+    """
+    from PySide6.QtCore import Qt, QPointF
+    from PySide6.QtGui import QImage, QColor, QPainter, QLinearGradient, QRadialGradient
+
+    image = _gradient_image(width, height, image_format, rng)
+    painter = QPainter(image)
+    painter.setRenderHint(QPainter.Antialiasing, True)
+    painter.setPen(Qt.NoPen)
+
+    sky = QLinearGradient(0, 0, 0, height)
+    sky.setColorAt(0.0, QColor(90, 140, 200, 200))
+    sky.setColorAt(0.55, QColor(220, 200, 170, 120))
+    sky.setColorAt(1.0, QColor(60, 50, 40, 220))
+    painter.fillRect(image.rect(), sky)
+
+    size = min(width, height)
+    for _ in range(24):
+        center = QPointF(rng.uniform(0, width), rng.uniform(0, height))
+        radius = rng.uniform(0.02, 0.15) * size
+        blob = QRadialGradient(center, radius)
+        color = QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.randrange(60, 200))
+        blob.setColorAt(0.0, color)
+        color.setAlpha(0)
+        blob.setColorAt(1.0, color)
+        painter.setBrush(blob)
+        painter.drawEllipse(center, radius, radius)
+
+    for _ in range(6):
+        painter.setBrush(QColor(rng.randrange(256), rng.randrange(256), rng.randrange(256), rng.randrange(120, 256)))
+        painter.drawEllipse(QPointF(rng.uniform(0, width), rng.uniform(0, height)),
+                            rng.uniform(0.03, 0.2) * size, rng.uniform(0.03, 0.2) * size)
+
+    # Fine grain: a low-opacity noise layer
+    painter.setOpacity(0.08)
+    painter.drawImage(0, 0, noise_image(width, height, bit_depth, alpha=False, rng=rng))
+    painter.end()
+    return image
+
+
+def _apply_alpha_vignette(image):
+    """Fades the image towards transparency at its border."""
+    from PySide6.QtGui import QColor, QPainter, QRadialGradient
+
+    mask = QRadialGradient(image.width() / 2, image.height() / 2, math.hypot(image.width(), image.height()) / 2)
+    mask.setColorAt(0.0, QColor(0, 0, 0, 255))
+    mask.setColorAt(1.0, QColor(0, 0, 0, 40))
+    painter = QPainter(image)
+    painter.setCompositionMode(QPainter.CompositionMode_DestinationIn)
+    painter.fillRect(image.rect(), mask)
+    painter.end()
+
+
+def generate_image(width: int, height: int, bit_depth: int = 8, alpha: bool = False,
+                   content: str = "noise", seed: Optional[int] = None):
+    """
+    Generates a single synthetic image. Safe to call from worker threads.
+
+    Args:
+        width, height: The image size in pixels.
+        bit_depth: 8 or 16 bits per channel.
+        alpha: Whether the image has a (non-trivial) alpha channel.
+        content: One of CONTENT_TYPES.
+        seed: Optional seed for reproducible content.
+    """
+    from PySide6.QtGui import QImage
+
+    if content not in CONTENT_TYPES:
+        raise ValueError(f"Unknown content type '{content}'")
+    if bit_depth not in BIT_DEPTHS:
+        raise ValueError(f"Unsupported bit depth {bit_depth}")
+
+    rng = random.Random(seed)
+    if content == "noise":
+        return noise_image(width, height, bit_depth, alpha, rng)
+
+    if bit_depth == 16:
+        image_format = QImage.Format_RGBA64 if alpha else QImage.Format_RGBX64
+    else:
+        image_format = QImage.Format_ARGB32 if alpha else QImage.Format_RGB32
+
+    if content == "gradient":
+        image = _gradient_image(width, height, image_format, rng)
+    else:
+        image = _photo_image(width, height, image_format, bit_depth, rng)
+
+    if alpha:
+        _apply_alpha_vignette(image)
+    return image
+
+
+def create_synthetic_dataset(base_dir: Path, count: int = 16, width: int = 1024, height: int = 1024,
+                             bit_depth: int = 8, alpha: bool = False, image_format: str = "png",
+                             content: str = "noise", workers: Optional[int] = None,
+                             seed: Optional[int] = None) -> tuple[bool, str, str]:
+    """
+    Generates a synthetic dataset for load testing in a 'synthetic'
+    subdirectory of the given base directory. Images are generated and
+    written in parallel.
+
+    Args:
+        base_dir: The directory in which to create the 'synthetic' folder.
+        count: The number of images.
+        width, height: The image size in pixels.
+        bit_depth: 8 or 16 bits per channel.
+        alpha: Whether the images have an alpha channel.
+        image_format: One of IMAGE_FORMATS (the file extension).
+        content: One of CONTENT_TYPES.
+        workers: The number of worker threads (defaults to the CPU count).
+        seed: Optional seed for reproducible datasets.
+
+    Returns:
+        A tuple like the one of create_example_dataset:
+        (success, message, prefix path or an empty string).
+    """
+    scene_dir = base_dir / SYNTHETIC_SUBDIR
+    prefix_path = scene_dir / SYNTHETIC_PREFIX
+    suffix_filename = scene_dir / "igridvu_suffix.txt"
+
+    if image_format not in IMAGE_FORMATS:
+        return False, f"Error creating synthetic dataset: unsupported format '{image_format}'", ""
+    if count < 1 or width < 1 or height < 1:
+        return False, "Error creating synthetic dataset: count and size must be positive", ""
+
+    digits = len(str(count - 1))
+    suffixes = [f"{content}{i:0{digits}d}.{image_format}" for i in range(count)]
+
+    def write_image(index: int):
+        image_seed = None if seed is None else seed * 1_000_003 + index
+        filename = f"{prefix_path}{suffixes[index]}"
+        with span("generate_image", "worker", index=index):
+            image = generate_image(width, height, bit_depth, alpha, content, image_seed)
+        with span("encode", "io", path=filename):
+            if not image.save(filename):
+                raise IOError(f"Failed to save image '{filename}'")
+
+    try:
+        scene_dir.mkdir(parents=True, exist_ok=True)
+
+        with ThreadPoolExecutor(max_workers=workers or os.cpu_count()) as executor:
+            # list() re-raises the first exception of any worker
+            list(executor.map(write_image, range(count)))
+
+        with open(suffix_filename, "w", encoding="utf-8") as f:
+            f.write("\n".join(suffixes) + "\n")
+
+        message = f"Successfully created {count} synthetic images in:\n{scene_dir}"
+        return True, message, str(prefix_path)
+
+    except (IOError, OSError, ValueError) as e:
+        message = f"Error creating synthetic dataset: {e}"
+        return False, message, ""
+
+
+def main(argv=None):
+    """Command-line entry point (igridvu-examples)."""
+    parser = argparse.ArgumentParser(
+        description="Generate example or synthetic datasets for the Image Grid Viewer.",
+        epilog="Example: igridvu-examples /tmp/data --count 30 --size 4096 4096 --content photo"
+    )
+    parser.add_argument("directory", help="The directory in which to create the dataset.")
+    parser.add_argument("--count", type=int, default=None,
+                        help="Generate a synthetic dataset with this many images. "
+                             "If omitted, the small example test scene is created.")
+    parser.add_argument("--size", type=int, nargs=2, metavar=("WIDTH", "HEIGHT"), default=(1024, 1024),
+                        help="Image size in pixels. Defaults to 1024 1024.")
+    parser.add_argument("--bit-depth", type=int, choices=BIT_DEPTHS, default=8, help="Bits per channel.")
+    parser.add_argument("--alpha", action="store_true", help="Add an alpha channel.")
+    parser.add_argument("--format", choices=IMAGE_FORMATS, default="png", help="Image file format.")
+    parser.add_argument("--content", choices=CONTENT_TYPES, default="noise", help="Image content.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker threads.")
+    parser.add_argument("--seed", type=int, default=None, help="Seed for reproducible content.")
+    args = parser.parse_args(argv)
+
+    # QImage/QPainter need a GUI application for fonts and image plugins.
+    from PySide6.QtGui import QGuiApplication
+    _app = QGuiApplication.instance() or QGuiApplication(sys.argv[:1])
+
+    base_dir = Path(args.directory)
+    if args.count is None:
+        success, message, prefix = create_example_dataset(base_dir)
+    else:
+        success, message, prefix = create_synthetic_dataset(
+            base_dir, count=args.count, width=args.size[0], height=args.size[1],
+            bit_depth=args.bit_depth, alpha=args.alpha, image_format=args.format,
+            content=args.content, workers=args.workers, seed=args.seed
+        )
+
+    print(message, file=sys.stdout if success else sys.stderr)
+    if success:
+        print(f"Open it with: igridvu {prefix}")
+    return 0 if success else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
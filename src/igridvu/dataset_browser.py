@@ -0,0 +1,281 @@
+# -*- coding: utf-8 -*-
+"""
+Dialogs listing datasets: every prefix in one directory, or every dataset
+recorded in the index of a directory tree.
+"""
+import os
+import time
+from typing import List, Optional, Tuple
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLineEdit, QPushButton,
+                               QTreeWidget, QTreeWidgetItem, QLabel, QDialogButtonBox,
+                               QFileDialog, QAbstractItemView)
+from PySide6.QtCore import Qt, QDateTime
+
+from .config import DEFAULT_SUFFIX_FILE
+from .datasets import DatasetInfo, find_datasets
+from .memory import format_bytes
+from .tree_index import IndexedDataset, TreeIndex
+from .workers import start_task
+
+
+def _timed_find_datasets(directory: str) -> Tuple[Optional[List[DatasetInfo]], float]:
+    start = time.perf_counter()
+    datasets = find_datasets(directory)
+    return datasets, time.perf_counter() - start
+
+
+class DatasetBrowserDialog(QDialog):
+    """
+    Indexes a directory in the background and lists its datasets with the
+    number of images found, complete datasets first.
+    """
+
+    def __init__(self, directory: str = "", parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Browse Datasets")
+        self.setMinimumSize(560, 480)
+        self.directory = ""
+        self._datasets: List[DatasetInfo] = []
+
+        layout = QVBoxLayout(self)
+
+        dir_layout = QHBoxLayout()
+        self.dir_edit = QLineEdit()
+        self.dir_edit.setPlaceholderText("Directory")
+        self.dir_edit.returnPressed.connect(lambda: self.set_directory(self.dir_edit.text()))
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self._choose_directory)
+        dir_layout.addWidget(self.dir_edit)
+        dir_layout.addWidget(browse_button)
+        layout.addLayout(dir_layout)
+
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("Filter prefixes")
+        self.filter_edit.textChanged.connect(self._apply_filter)
+        layout.addWidget(self.filter_edit)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Prefix", "Images", "Status"])
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)  # Keeps layout fast with many rows
+        self.tree.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tree.itemDoubleClicked.connect(lambda *_: self.accept())
+        self.tree.itemSelectionChanged.connect(self._update_open_button)
+        layout.addWidget(self.tree)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Open | QDialogButtonBox.Cancel)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+        self._update_open_button()
+
+        if directory:
+            self.set_directory(directory)
+
+    def _choose_directory(self):
+        directory = QFileDialog.getExistingDirectory(self, "Choose a Directory", self.directory)
+        if directory:
+            self.set_directory(directory)
+
+    def set_directory(self, directory: str):
+        """Indexes a directory in the background and lists its datasets."""
+        self.directory = directory
+        self.dir_edit.setText(directory)
+        self.tree.clear()
+        self._datasets = []
+        self.status_label.setText(f"Indexing {directory}...")
+        start_task(
+            _timed_find_datasets, directory,
+            on_finished=lambda result, d=directory: self._show_datasets(d, *result),
+            on_failed=lambda error, d=directory: self._show_error(d, error),
+        )
+
+    def _show_error(self, directory: str, error: str):
+        if directory == self.directory:  # Ignore results for a directory no longer shown
+            self.status_label.setText(
+                f"Could not read '{DEFAULT_SUFFIX_FILE}' in {directory}:\n{error}")
+
+    def _show_datasets(self, directory: str, datasets: Optional[List[DatasetInfo]], elapsed: float):
+        if directory != self.directory:
+            return
+        if datasets is None:
+            self.status_label.setText(f"Could not read the directory {directory}")
+            return
+
+        self._datasets = datasets
+        items = []
+        for dataset in datasets:
+            item = QTreeWidgetItem([
+                dataset.name_prefix or "(directory)",
+                f"{dataset.matched} / {dataset.total}",
+                "Complete" if dataset.complete else "Partial",
+            ])
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            items.append(item)
+        self.tree.addTopLevelItems(items)  # One batch instead of one insert per row
+        self.tree.resizeColumnToContents(0)
+        if items:
+            self.tree.setCurrentItem(items[0])
+
+        complete = sum(1 for dataset in datasets if dataset.complete)
+        self.status_label.setText(
+            f"{len(datasets)} datasets ({complete} complete), indexed in {elapsed * 1000:.0f} ms")
+        self._apply_filter(self.filter_edit.text())
+
+    def _apply_filter(self, text: str):
+        text = text.lower()
+        for i in range(self.tree.topLevelItemCount()):
+            item = self.tree.topLevelItem(i)
+            item.setHidden(text not in item.text(0).lower())
+
+    def _update_open_button(self):
+        self.button_box.button(QDialogButtonBox.Open).setEnabled(self.selected_dataset() is not None)
+
+    def selected_dataset(self) -> Optional[DatasetInfo]:
+        item = self.tree.currentItem()
+        if item is None or not item.isSelected():
+            return None
+        return self._datasets[self.tree.indexOfTopLevelItem(item)]
+
+    def suffix_file_path(self) -> str:
+        return os.path.join(self.directory, DEFAULT_SUFFIX_FILE)
+
+
+def _refresh_index(index: TreeIndex, root: str, progress=None):
+    stats = index.refresh(root, progress=progress)
+    index.save()
+    return stats
+
+
+class DatasetIndexDialog(QDialog):
+    """
+    Lists the datasets recorded in the index for a directory tree, most
+    recent first. The recorded datasets are shown immediately; the tree is
+    then refreshed in the background, which only lists changed directories.
+    """
+
+    def __init__(self, root: str = "", index: Optional[TreeIndex] = None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Dataset Index")
+        self.setMinimumSize(720, 480)
+        self.index = index or TreeIndex().load()
+        self.root = ""
+        self._datasets: List[IndexedDataset] = []
+        # One refresh runs at a time; a refresh requested meanwhile runs after it
+        self._refreshing = False
+        self._refresh_queued = False
+
+        layout = QVBoxLayout(self)
+
+        root_layout = QHBoxLayout()
+        self.root_edit = QLineEdit()
+        self.root_edit.setPlaceholderText("Root directory")
+        self.root_edit.returnPressed.connect(lambda: self.set_root(self.root_edit.text()))
+        browse_button = QPushButton("Browse...")
+        browse_button.clicked.connect(self._choose_root)
+        self.refresh_button = QPushButton("Refresh")
+        self.refresh_button.clicked.connect(self.refresh)
+        root_layout.addWidget(self.root_edit)
+        root_layout.addWidget(browse_button)
+        root_layout.addWidget(self.refresh_button)
+        layout.addLayout(root_layout)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(["Prefix", "Images", "Size", "Modified"])
+        self.tree.setRootIsDecorated(False)
+        self.tree.setUniformRowHeights(True)
+        self.tree.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.tree.itemDoubleClicked.connect(lambda *_: self.accept())
+        layout.addWidget(self.tree)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.Open | QDialogButtonBox.Cancel)
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+        if root:
+            self.set_root(root)
+
+    def _choose_root(self):
+        root = QFileDialog.getExistingDirectory(self, "Choose a Root Directory", self.root)
+        if root:
+            self.set_root(root)
+
+    def set_root(self, root: str):
+        """Shows the indexed datasets under root and refreshes them in the background."""
+        self.root = root
+        self.root_edit.setText(root)
+        self._show_datasets()
+        self.refresh()
+
+    def refresh(self):
+        if not self.root:
+            return
+        if self._refreshing:
+            self._refresh_queued = True
+            return
+        root = self.root
+        self._refreshing = True
+        self.refresh_button.setEnabled(False)
+        self.status_label.setText(f"Refreshing the index of {root}...")
+        start_task(
+            _refresh_index, self.index, root,
+            on_progress=lambda done, _total: self.status_label.setText(
+                f"Refreshing the index of {root}... {done} directories"),
+            on_finished=lambda stats, r=root: self._refresh_finished(r, stats),
+            on_failed=lambda error: self._refresh_failed(error),
+        )
+
+    def _refresh_finished(self, root: str, stats):
+        if root == self.root:
+            self._show_datasets()
+            self.status_label.setText(
+                f"{stats.datasets} datasets under {root} "
+                f"({stats.scanned} directories listed, {stats.reused} unchanged)")
+        self._refresh_done()
+
+    def _refresh_failed(self, error: str):
+        self.status_label.setText(f"Error: Could not refresh the index: {error}")
+        self._refresh_done()
+
+    def _refresh_done(self):
+        self._refreshing = False
+        self.refresh_button.setEnabled(True)
+        if self._refresh_queued:
+            self._refresh_queued = False
+            self.refresh()
+
+    def _show_datasets(self):
+        selected = self.selected_dataset()
+        self.tree.clear()
+        self._datasets = self.index.datasets(self.root)
+        items = []
+        for dataset in self._datasets:
+            modified = QDateTime.fromSecsSinceEpoch(int(dataset.mtime)).toString("yyyy-MM-dd hh:mm")
+            item = QTreeWidgetItem([dataset.pre_path, f"{dataset.count} / {dataset.total}",
+                                    format_bytes(dataset.bytes), modified])
+            item.setTextAlignment(1, Qt.AlignRight | Qt.AlignVCenter)
+            item.setTextAlignment(2, Qt.AlignRight | Qt.AlignVCenter)
+            items.append(item)
+        self.tree.addTopLevelItems(items)
+        self.tree.resizeColumnToContents(0)
+
+        # Keep the selection across refreshes; by default select the most recent dataset
+        paths = [dataset.pre_path for dataset in self._datasets]
+        if selected is not None and selected.pre_path in paths:
+            self.tree.setCurrentItem(items[paths.index(selected.pre_path)])
+        elif items:
+            self.tree.setCurrentItem(items[0])
+
+    def selected_dataset(self) -> Optional[IndexedDataset]:
+        item = self.tree.currentItem()
+        if item is None:
+            return None
+        return self._datasets[self.tree.indexOfTopLevelItem(item)]
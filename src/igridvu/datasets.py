@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Discovery of the datasets (prefixes) in a directory.
+
+A dataset is a prefix P such that P + suffix names a file for some of the
+explicit entries of a suffix file. A directory holding renders of many scenes
+contains many datasets; this module finds all of them from one cached
+directory listing (see suffixes.list_directory).
+"""
+import os
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .config import MAX_IMAGES, DEFAULT_SUFFIX_FILE
+from .suffixes import is_pattern, list_directory, natural_key, read_suffix_file
+
+
+class DatasetInfo(NamedTuple):
+    """A prefix found in a directory and how many of the suffixes it has."""
+    directory: str
+    name_prefix: str
+    matched: int
+    total: int
+
+    @property
+    def complete(self) -> bool:
+        return self.matched == self.total
+
+    @property
+    def pre_path(self) -> str:
+        """The image prefix to load, as accepted by ImageGrid."""
+        if not self.name_prefix:
+            return os.path.join(self.directory, "")
+        return os.path.join(self.directory, self.name_prefix)
+
+
+def index_datasets(directory: str, names: Iterable[str], suffixes: List[str]) -> List[DatasetInfo]:
+    """
+    Groups file names into datasets.
+
+    The suffixes are indexed by length: for every distinct length, one pass
+    slices the tail of each name and looks it up in a set. This is a handful
+    of passes in total, instead of one test per name and suffix.
+
+    Args:
+        directory: The directory the names are in.
+        names: The file names.
+        suffixes: The suffix file entries. Glob and regex entries are ignored,
+            as a prefix cannot be deduced from them unambiguously.
+
+    Returns:
+        The datasets, by number of matched suffixes (complete ones first),
+        then by prefix in natural order.
+    """
+    by_length: Dict[int, set] = defaultdict(set)
+    for suffix in suffixes:
+        if suffix and not is_pattern(suffix):
+            by_length[len(suffix)].add(suffix)
+    total = sum(len(group) for group in by_length.values())
+
+    names = list(names)
+    counts: Counter = Counter()
+    for length, group in by_length.items():
+        counts.update(name[:-length] for name in names if name[-length:] in group)
+
+    datasets = [DatasetInfo(directory, prefix, matched, total) for prefix, matched in counts.items()]
+    datasets.sort(key=lambda d: natural_key(d.name_prefix))
+    datasets.sort(key=lambda d: d.matched, reverse=True)
+    return datasets
+
+
+def find_datasets(directory: str, suffixes: Optional[List[str]] = None) -> Optional[List[DatasetInfo]]:
+    """
+    Finds the datasets in a directory using its cached listing.
+
+    Args:
+        suffixes: The suffix file entries. Defaults to the entries of the
+            directory's DEFAULT_SUFFIX_FILE.
+
+    Returns:
+        The datasets (see index_datasets), or None if the directory cannot be read.
+
+    Raises:
+        OSError: If suffixes is None and the suffix file cannot be read.
+    """
+    if suffixes is None:
+        suffixes, _ = read_suffix_file(os.path.join(directory, DEFAULT_SUFFIX_FILE), MAX_IMAGES)
+    listing = list_directory(directory)
+    if listing is None:
+        return None
+    return index_datasets(directory, listing.files, suffixes)
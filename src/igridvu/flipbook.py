@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""
+Flip-book mode: one large view stepping through all images of a dataset.
+
+With many suffixes every grid cell is small. The flip-book shows one image
+at a time in a single view and steps through the suffixes; the zoom, pan
+and channel of the view are kept across steps. The images ahead of and
+behind the current one are decoded in the background (see prefetch.py).
+Stepping to an image that is still being decoded keeps the previous image
+on screen until the new one is ready, so the view is never blank.
+"""
+from typing import List, Optional
+
+from PySide6.QtCore import Qt, Signal as pyqtSignal, QRectF
+from PySide6.QtGui import QImage
+from PySide6.QtWidgets import QLabel, QVBoxLayout, QWidget
+
+from .prefetch import ImageCache
+from .validation import PathCheck
+from .zoomable_view import ZoomableView
+
+
+class FlipBook(QWidget):
+    """A single ZoomableView showing one image of a list at a time."""
+    # Escape was pressed
+    closeRequested = pyqtSignal()
+    # A status message: the position in the list and the image label
+    messageChanged = pyqtSignal(str)
+
+    def __init__(self, cache: ImageCache, ahead: int = 2, behind: int = 1, parent=None):
+        super().__init__(parent)
+        self.cache = cache
+        self.ahead = ahead
+        self.behind = behind
+        self.view: Optional[ZoomableView] = None
+        self.index = -1
+        # The index of the image on screen, which lags behind index while decoding
+        self.shown_index = -1
+        self._checks: List[PathCheck] = []
+        self._labels: List[str] = []
+        self._rect: Optional[QRectF] = None
+
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._placeholder = QLabel("Loading...")
+        self._placeholder.setAlignment(Qt.AlignCenter)
+        self._layout.addWidget(self._placeholder)
+
+        cache.imageReady.connect(self._on_image_decoded)
+        cache.imageFailed.connect(self._on_image_decoded)
+
+    def count(self) -> int:
+        return len(self._checks)
+
+    def set_images(self, checks: List[PathCheck], labels: List[str], index: int = 0,
+                   rect: Optional[QRectF] = None):
+        """
+        Shows a list of images, starting at an index.
+
+        Args:
+            checks: The validated image paths (see validation.validate_paths).
+            labels: The label of each image.
+            rect: The scene rectangle to show, e.g. that of the grid.
+        """
+        self._checks, self._labels = list(checks), list(labels)
+        self._rect = rect
+        self.index = self.shown_index = -1
+        self.set_index(index)
+        if self.view is not None and rect is not None:
+            self.view.setViewRect(rect)
+
+    def step(self, delta: int):
+        self.set_index(self.index + delta)
+
+    def set_index(self, index: int):
+        """Steps to an image. It is shown as soon as it is decoded."""
+        if not self._checks:
+            return
+        index = max(0, min(index, len(self._checks) - 1))
+        if index == self.index:
+            return
+        self.index = index
+        self.cache.set_wanted([self._checks[i].path for i in self._window()])
+        self._show_current()
+
+    def _window(self) -> List[int]:
+        """The valid images around the current one, nearest first, ahead before behind."""
+        first = max(0, self.index - self.behind)
+        last = min(len(self._checks) - 1, self.index + self.ahead)
+        indexes = sorted(range(first, last + 1), key=lambda i: (abs(i - self.index), i < self.index))
+        return [i for i in indexes if self._checks[i].error is None]
+
+    def _show_current(self):
+        check = self._checks[self.index]
+        label = self._labels[self.index]
+        position = f"Image {self.index + 1} / {len(self._checks)}: {label}"
+        error = check.error
+        if error is None and self.cache.has_failed(check.path):
+            error = "Unsupported format\n(Corrupted?)"
+        if error is not None:
+            # The previous image stays on screen
+            self.messageChanged.emit(f"{position} ({error.replace(chr(10), ' ')})")
+            return
+        image = self.cache.get(check.path)
+        if image is None:
+            self.messageChanged.emit(f"{position} (loading...)")
+            return
+        self._show_image(image, check.path, label)
+        self.shown_index = self.index
+        self.messageChanged.emit(position)
+
+    def _show_image(self, image: QImage, path: str, label: str):
+        if self.view is not None:
+            self.view.replace_image(image, label, path)
+            return
+        self.view = ZoomableView(label_text=label, img_path=path, image=image)
+        self._layout.replaceWidget(self._placeholder, self.view)
+        self._placeholder.hide()
+        # Lays the view out now, so the rectangle of the grid is fitted to its final size
+        self._layout.activate()
+        self.view.show()
+        if self._rect is not None:
+            self.view.setViewRect(self._rect)
+        self.view.setFocus()
+
+    def _on_image_decoded(self, path: str):
+        if 0 <= self.index < len(self._checks) and self._checks[self.index].path == path:
+            self._show_current()
+
+    def view_rect(self) -> Optional[QRectF]:
+        """The visible scene rectangle, or None before the first image is shown."""
+        if self.view is None:
+            return None
+        return self.view.mapToScene(self.view.viewport().rect()).boundingRect()
+
+    def keyPressEvent(self, event):
+        if event.key() == Qt.Key_Escape:
+            self.closeRequested.emit()
+        else:
+            super().keyPressEvent(event)
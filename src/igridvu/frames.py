@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Multi-frame images: multi-page TIFF, animated GIF and WebP.
+
+A view shows one frame of its image; the grid keeps the same frame index in
+every view. Decoded frames are kept in a FrameCache shared by all views.
+Around the frame index of every image, a window of frames ahead and behind
+is decoded in worker threads, so stepping through the frames does not wait
+for the decoder. The cache is bounded by a byte budget: frames outside
+their image's window are evicted first, then the least recently used ones.
+"""
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+from PySide6.QtCore import QObject, Signal as pyqtSignal
+from PySide6.QtGui import QImage
+
+from .image_io import open_reader
+from .workers import start_task
+
+
+def decode_frame(path: str, index: int) -> QImage:
+    """
+    Decodes one frame of an image file or archive member. Safe to call from
+    worker threads. Returns a null image if the frame does not exist.
+    """
+    try:
+        reader = open_reader(path)
+    except OSError:
+        return QImage()
+    count = reader.imageCount()
+    if index < 0 or 0 < count <= index:
+        return QImage()
+    if index > 0 and not reader.jumpToImage(index):
+        # Formats without random access (e.g. GIF) are decoded up to the frame
+        for _ in range(index):
+            if reader.read().isNull():
+                return QImage()
+    return reader.read()
+
+
+class FrameCache(QObject):
+    """Decoded frames keyed by (path, frame index), bounded by a byte budget."""
+
+    # (path, frame index) of a background decode that finished. The frame is
+    # cached unless the decode failed, or the frame left its image's window.
+    frameReady = pyqtSignal(str, int)
+
+    def __init__(self, budget_bytes: int, ahead: int = 4, behind: int = 2, parent=None):
+        super().__init__(parent)
+        self.budget_bytes = budget_bytes
+        self.ahead = ahead
+        self.behind = behind
+        self._frames: "OrderedDict[Tuple[str, int], QImage]" = OrderedDict()
+        self._bytes = 0
+        # The frame index around which each image's window is kept
+        self._current: Dict[str, int] = {}
+        self._pending: Set[Tuple[str, int]] = set()
+        # Incremented by clear(), so results of earlier decodes are dropped
+        self._generation = 0
+
+    def memory_usage(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._frames)
+
+    def __contains__(self, key: Tuple[str, int]) -> bool:
+        return key in self._frames
+
+    def get(self, path: str, index: int) -> Optional[QImage]:
+        image = self._frames.get((path, index))
+        if image is not None:
+            self._frames.move_to_end((path, index))
+        return image
+
+    def put(self, path: str, index: int, image: QImage):
+        key = (path, index)
+        old = self._frames.pop(key, None)
+        if old is not None:
+            self._bytes -= old.sizeInBytes()
+        self._frames[key] = image
+        self._bytes += image.sizeInBytes()
+        self._evict()
+
+    def _in_window(self, key: Tuple[str, int]) -> bool:
+        current = self._current.get(key[0])
+        return current is not None and current - self.behind <= key[1] <= current + self.ahead
+
+    def _evict(self):
+        while self._bytes > self.budget_bytes and len(self._frames) > 1:
+            # Oldest first: frames outside their window, then any frame
+            key = next((k for k in self._frames if not self._in_window(k)), None)
+            if key is None:
+                key = next(iter(self._frames))
+            self._bytes -= self._frames.pop(key).sizeInBytes()
+
+    def set_current(self, path: str, index: int, frame_count: int):
+        """
+        Moves the window of an image to a frame and decodes the frames of the
+        window that are not cached yet in the background.
+        """
+        self._current[path] = index
+        first = max(0, index - self.behind)
+        last = min(frame_count - 1, index + self.ahead)
+        # Nearest frames first, ahead before behind at equal distance
+        for i in sorted(range(first, last + 1), key=lambda i: (abs(i - index), i < index)):
+            key = (path, i)
+            if i == index or key in self._frames or key in self._pending:
+                continue
+            self._pending.add(key)
+            generation = self._generation
+            start_task(decode_frame, path, i,
+                       on_finished=lambda image, k=key, g=generation: self._prefetched(k, g, image),
+                       on_failed=lambda _error, k=key, g=generation: self._prefetched(k, g, QImage()))
+
+    def is_pending(self, path: str, index: int) -> bool:
+        """Returns True if the frame is being decoded in the background."""
+        return (path, index) in self._pending
+
+    def _prefetched(self, key: Tuple[str, int], generation: int, image: QImage):
+        if generation != self._generation:
+            return
+        self._pending.discard(key)
+        if not image.isNull() and self._in_window(key):
+            self.put(*key, image)
+        # Also after a failure, so a view waiting for the frame decodes it itself
+        self.frameReady.emit(*key)
+
+    def clear(self):
+        """Discards all frames, e.g. when another dataset is loaded."""
+        self._frames.clear()
+        self._bytes = 0
+        self._current.clear()
+        self._pending.clear()
+        self._generation += 1
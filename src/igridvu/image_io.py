@@ -0,0 +1,87 @@
+# -*- coding: utf-8 -*-
+"""
+Image decoding from files and from archive members (see archives.py).
+
+QImage and QImageReader may be used outside the GUI thread, so these
+functions can run in worker tasks (see workers.py).
+"""
+import os
+from typing import Optional, Tuple
+
+from PySide6.QtCore import QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QImage, QImageReader
+
+from .archives import is_archive_path, read_member
+
+MAX_IMAGE_DIMENSION = 10000  # Max 10k pixels for width or height
+
+
+def open_reader(path: str) -> QImageReader:
+    """
+    Returns an image reader for a file or an archive member.
+
+    Raises:
+        OSError: If an archive member cannot be read.
+    """
+    if not is_archive_path(path):
+        return QImageReader(path)
+    buffer = QBuffer()
+    buffer.setData(QByteArray(read_member(path)))
+    buffer.open(QIODevice.ReadOnly)
+    # The extension is a format hint, as for files
+    extension = os.path.splitext(path)[1][1:].lower().encode()
+    reader = QImageReader(buffer, QByteArray(extension))
+    reader.setDecideFormatFromContent(True)
+    reader._buffer = buffer  # A reader does not own its device
+    return reader
+
+
+def read_image(path: str) -> QImage:
+    """Decodes an image file or archive member. Returns a null image on failure."""
+    if not is_archive_path(path):
+        return QImage(path)
+    try:
+        return open_reader(path).read()
+    except OSError:
+        return QImage()
+
+
+def open_checked(path: str, max_dimension: int) -> Tuple[Optional[QImageReader], int, Optional[str]]:
+    """
+    Opens an image reader and checks the header: a known format, and at most
+    max_dimension pixels wide and high. Safe to call from worker threads.
+
+    Returns:
+        (reader, frame count, error) where error is the message shown
+        instead of the image, and reader is None if there is an error.
+    """
+    try:
+        reader = open_reader(path)
+    except OSError as e:
+        return None, 0, f"Cannot access\n{e.strerror or e}"
+    # Counted first: the header checks below move some handlers (TIFF) off the start
+    frame_count = reader.imageCount()
+    if not reader.canRead():
+        return None, 0, "Unrecognized\nformat"
+
+    img_dim = reader.size()
+    if img_dim.width() > max_dimension or img_dim.height() > max_dimension:
+        return None, 0, f"Dimensions too large\n({img_dim.width()}x{img_dim.height()})"
+    return reader, max(1, frame_count), None
+
+
+def decode_checked(path: str, max_dimension: int) -> Tuple[QImage, int, Optional[str]]:
+    """
+    Checks and decodes the first frame of an image, as a view does when it
+    is created. Safe to call from worker threads.
+
+    Returns:
+        (image, frame count, error), with a null image if there is an error.
+    """
+    reader, frame_count, error = open_checked(path, max_dimension)
+    if error:
+        return QImage(), 0, error
+    image = reader.read()
+    if image.isNull():
+        return image, 0, "Cannot load\n(Corrupted?)"
+    return image, frame_count, None
@@ -3,28 +3,51 @@
 The main window for the Image Grid Viewer application.
 """
 import os
-from typing import List, cast
+import sys
+from functools import partial
+from typing import List, Optional, cast
 from pathlib import Path
-from itertools import islice
 
 from PySide6.QtWidgets import \
     (QWidget, QGridLayout, QApplication,
      QMainWindow, QVBoxLayout, QFileDialog, QMessageBox,
-     QStackedWidget, QPushButton, QLabel)
-from PySide6.QtGui import QAction, QKeySequence, QFont
-from PySide6.QtCore import Qt, QRectF, QPointF, QStandardPaths, QSize
-
-from .zoomable_view import ZoomableView
-from .suffix_editor import SuffixEditorDialog
-from .config import MAX_IMAGES
-from .create_examples import create_example_dataset
+     QStackedWidget, QPushButton, QLabel, QInputDialog)
+from PySide6.QtGui import QAction, QKeySequence, QFont, QImage
+from PySide6.QtCore import Qt, QByteArray, QRectF, QPointF, QStandardPaths, QSize, QTimer
+
+from .zoomable_view import ZoomableView, load_full_resolution
+from .config import (MAX_IMAGES, EXPORT_BAND_HEIGHT, SNAPSHOT_PNG_COMPRESSION, SNAPSHOT_QUALITY,
+                     MEMORY_BUDGET_BYTES, PROXY_MAX_DIMENSION, MAX_SUFFIX_FILE_ENTRIES,
+                     FRAME_CACHE_BUDGET_BYTES, FRAME_PREFETCH_AHEAD, FRAME_PREFETCH_BEHIND,
+                     PREFETCH_BUDGET_BYTES, FLIPBOOK_PREFETCH_AHEAD, FLIPBOOK_PREFETCH_BEHIND,
+                     SEQUENCE_PREFETCH_DEPTH, PLAYBACK_FPS, PLAYBACK_BUFFER_FRAMES,
+                     PROXY_CACHE_BUDGET_BYTES)
+from .workers import start_task
+from .tracing import traced
+from .frames import FrameCache
+from .memory import MemoryGovernor, format_bytes
+from .prefetch import ImageCache
+from .proxy_cache import ProxyCache
+from .sequences import sequence_prefixes
+from .session import Session, save_session
+from .suffixes import read_suffix_file, expand_suffixes, deduce_prefix, split_prefix
+from .validation import validate_paths
 
 
 class ImageGrid(QMainWindow):
     """A widget that displays a grid of images."""
 
     def __init__(self, pre_path: str, list_of_suffix: List[str], suffix_file_path: str,
-                 columns: int = 4, app_name: str = "Image Grid Viewer"):
+                 columns: int = 4, app_name: str = "Image Grid Viewer",
+                 defer_menus: bool = False, session: Optional[Session] = None):
+        """
+        Args:
+            defer_menus: Build the menu bar after the window is first shown,
+                so the images appear as early as possible.
+            session: A saved session (see session.py) whose zoom rectangle,
+                channels and window geometry are restored. Its cells first
+                show their proxies from the persistent proxy cache.
+        """
         super().__init__()
         self.pre_path = pre_path
         self.list_of_suffix = list_of_suffix
@@ -32,6 +55,28 @@ class ImageGrid(QMainWindow):
         self.columns = columns
         self.app_name = app_name
         self.views: List[ZoomableView] = []
+        self.snapshot_png_compression = SNAPSHOT_PNG_COMPRESSION
+        self.snapshot_quality = SNAPSHOT_QUALITY
+        self.memory_governor = MemoryGovernor(MEMORY_BUDGET_BYTES, PROXY_MAX_DIMENSION, parent=self)
+        self.frame_cache = FrameCache(FRAME_CACHE_BUDGET_BYTES, FRAME_PREFETCH_AHEAD,
+                                      FRAME_PREFETCH_BEHIND, parent=self)
+        # The frame shown by every view of multi-frame images
+        self.frame_index = 0
+        # The A/B comparison page, created on first use
+        self.compare_view = None
+        # Images decoded ahead for the flip-book (whose page is created on first
+        # use) or for the neighbouring datasets of a numbered sequence
+        self.image_cache = ImageCache(PREFETCH_BUDGET_BYTES, ZoomableView.MAX_IMAGE_DIMENSION, parent=self)
+        self.flipbook = None
+        # Playback of a numbered sequence, created when it starts
+        self.player = None
+        self.playback_fps = PLAYBACK_FPS
+        # Proxies of the cells, written when the session is saved
+        self.proxy_cache = ProxyCache(max_dimension=PROXY_MAX_DIMENSION, budget_bytes=PROXY_CACHE_BUDGET_BYTES)
+        # The session is saved here when the window is closed, if set
+        self.session_path: Optional[str] = None
+        self.session = session
+        self.defer_menus = defer_menus
         self.initUI()
 
     def initUI(self):
@@ -60,17 +105,31 @@ class ImageGrid(QMainWindow):
         # Set up the status bar with a default message
         self.status_message = "Ready. Hover for path. Move over image for pixel values."
         self.statusBar().showMessage(self.status_message)
+        self.memory_label = QLabel()
+        self.statusBar().addPermanentWidget(self.memory_label)
+        self.memory_governor.usageChanged.connect(self._update_memory_label)
 
-        self._create_menu_bar()
+        if self.defer_menus:
+            # Runs once the event loop has shown the window
+            QTimer.singleShot(0, self._create_menu_bar)
+        else:
+            self._create_menu_bar()
         self.resize(800, 600)
-        self._center_on_screen()
+        session = self.session
+        if session is None or not self.restoreGeometry(QByteArray.fromBase64(session.geometry.encode("ascii"))):
+            self._center_on_screen()
 
         # Decide which page to show on startup
         if not self.list_of_suffix:
             self.stacked_widget.setCurrentWidget(self.welcome_widget)
             self.setWindowTitle(self.app_name)
         else:
-            self._populate_grid(self.list_of_suffix)
+            if session is not None:
+                rect = QRectF(*session.view_rect) if session.view_rect else None
+                self._populate_grid(self.list_of_suffix, view_rect=rect, channels=session.channels,
+                                    warm_start=True)
+            else:
+                self._populate_grid(self.list_of_suffix)
             self.stacked_widget.setCurrentWidget(self.grid_container)
             self.setWindowTitle(f"{self.app_name}: {self.pre_path}...")
 
@@ -102,6 +161,10 @@ class ImageGrid(QMainWindow):
         open_dataset_button.setFixedSize(QSize(220, 32))
         open_dataset_button.clicked.connect(self._prompt_open_dataset)
 
+        browse_datasets_button = QPushButton("Browse Datasets...")
+        browse_datasets_button.setFixedSize(QSize(220, 32))
+        browse_datasets_button.clicked.connect(self._open_dataset_browser)
+
         open_editor_button = QPushButton("Open Suffix Editor...")
         open_editor_button.setFixedSize(QSize(220, 32))
         open_editor_button.clicked.connect(self._open_suffix_editor)
@@ -113,6 +176,7 @@ class ImageGrid(QMainWindow):
         layout.addWidget(title_label)
         layout.addWidget(instructions_label)
         layout.addWidget(open_dataset_button, 0, Qt.AlignCenter)
+        layout.addWidget(browse_datasets_button, 0, Qt.AlignCenter)
         layout.addWidget(open_editor_button, 0, Qt.AlignCenter)
         layout.addWidget(create_example_button, 0, Qt.AlignCenter)
 
@@ -120,74 +184,102 @@ class ImageGrid(QMainWindow):
 
     def _clear_grid(self):
         """Removes all widgets from the grid layout and clears the views list."""
+        if self.compare_view is not None:
+            self.compare_view.clear()
+            if self.stacked_widget.currentWidget() is self.compare_view:
+                self.stacked_widget.setCurrentWidget(self.grid_container)
+        self.exit_flipbook()
+        self.stop_playback()
         for view in self.views:
+            self.memory_governor.unregister(view)
             view.deleteLater()
         self.views.clear()
+        self.frame_cache.clear()
+        self.frame_index = 0
 
         # Also clear the layout by deleting all its items
         while (item := self.grid_layout.takeAt(0)) is not None:
             if item.widget():
                 item.widget().deleteLater()
 
-    def _populate_grid(self, suffixes: List[str]):
-        """Populates the grid with views for the given suffixes."""
+    @traced("populate_grid", "layout")
+    def _populate_grid(self, suffixes: List[str], view_rect: Optional[QRectF] = None,
+                       channels: Optional[List[Optional[str]]] = None, warm_start: bool = False):
+        """
+        Populates the grid with views for the given suffixes. Glob and regex
+        entries are expanded against the prefix directory. Images decoded
+        ahead (see step_sequence) are taken from the image cache.
+
+        Args:
+            view_rect: The scene rectangle the views show first.
+            channels: The channel shown by each view, e.g. of the previous dataset.
+            warm_start: Views with a proxy in the persistent proxy cache show it
+                at once and decode their image in the background.
+        """
         self._clear_grid()
-        prefix_path = Path(self.pre_path)
-
-        # Security: Define the base directory to prevent path traversal.
-        # All resolved image paths must be within this directory.
-        try:
-            base_dir = prefix_path.resolve() if prefix_path.is_dir() else prefix_path.parent.resolve()
-        except (FileNotFoundError, OSError):
-            # If the base path doesn't exist, we can't load anything.
-            # This can happen if the prefix points to a deleted directory.
-            base_dir = None
-
-        for i, suffix in enumerate(suffixes):
-            row = i // self.columns
-            col = i % self.columns
-
-            clean_suffix = suffix.rstrip()
-            # This check-then-act logic is a Time-of-check-to-time-of-use (TOCTOU)
-            # race condition. For a local desktop app, the risk is negligible,
-            # but it's an anti-pattern in security-sensitive contexts.
-            if prefix_path.is_dir():
-                full_path_str = str(prefix_path / clean_suffix)
-            else:
-                full_path_str = self.pre_path + clean_suffix
-
-            label_text = Path(clean_suffix).stem
-            error_msg = None
-
-            if base_dir:
-                try:
-                    # Security: Resolve the path and check it's within the base directory.
-                    resolved_path = Path(full_path_str).resolve()
-                    # This check prevents path traversal attacks (e.g., suffix being "../...").
-                    # It raises ValueError if the path is not a sub-path.
-                    resolved_path.relative_to(base_dir)
-                except ValueError:
-                    error_msg = "Path traversal\nattempt"
-                except (FileNotFoundError, OSError):
-                    # This can happen if a suffix points to a non-existent path component.
-                    # This is a normal "not found" case that ZoomableView will handle,
-                    # so we don't need to set a pre-emptive error here.
-                    pass
-            else:
-                error_msg = "Base path\nnot found"
-
-            view = ZoomableView(label_text=label_text, img_path=full_path_str, error=error_msg)
-            self._connect_view_signals(view)
+        suffixes, truncated = expand_suffixes(suffixes, self.pre_path, MAX_IMAGES)
+        if truncated:
+            self.statusBar().showMessage(f"Showing the first {MAX_IMAGES} matching images.", 5000)
+
+        # Resolves and checks all paths in one batch (including path traversal
+        # protection), so the views skip their own file checks
+        checks = validate_paths(self.pre_path, [suffix.rstrip() for suffix in suffixes],
+                                ZoomableView.MAX_FILE_SIZE_BYTES)
+
+        for i, (suffix, check) in enumerate(zip(suffixes, checks)):
+            label_text = Path(suffix.rstrip()).stem
+            channel = channels[i] if channels and i < len(channels) else None
+            image = self.image_cache.get(check.path) if check.error is None else None
+            proxy = None
+            if warm_start and image is None and check.error is None:
+                proxy = self.proxy_cache.get(check.path, channel or "")
+            view = ZoomableView(label_text=label_text, img_path=check.path, image=image,
+                                error=check.error, validated=True, frame_cache=self.frame_cache,
+                                view_rect=view_rect, proxy=proxy,
+                                frame_count=self.image_cache.frame_count(check.path))
+            if channel:
+                view.view_channel(channel)
+            self._add_view(view)
+        # Once the grid is on screen, the neighbouring datasets are decoded
+        QTimer.singleShot(0, self, self._prefetch_sequence)
+
+    def _add_view(self, view: ZoomableView):
+        """Adds a view to the next cell of the grid."""
+        self._connect_view_signals(view)
+        row, col = divmod(len(self.views), self.columns)
+        # AlignTop creates a masonry-like layout for images of different aspect ratios
+        self.grid_layout.addWidget(view, row, col, Qt.AlignTop)
+        self.views.append(view)
+        self.memory_governor.register(view)
+
+    @traced("show_images", "layout")
+    def show_images(self, images: List[QImage], labels: List[str]):
+        """
+        Shows in-memory images in the grid instead of a dataset, e.g. the
+        arrays of igridvu.show(). The zoom and pan are kept if the grid
+        already showed images.
+        """
+        rect = self.current_view_rect()
+        self.pre_path = ""
+        self.list_of_suffix = []
+        self._clear_grid()
+        for image, label in zip(images, labels):
+            self._add_view(ZoomableView(label_text=label, image=image, view_rect=rect))
+        self.stacked_widget.setCurrentWidget(self.grid_container if self.views else self.welcome_widget)
 
-            # AlignTop creates a masonry-like layout for images of different aspect ratios
-            self.grid_layout.addWidget(view, row, col, Qt.AlignTop)
-            self.views.append(view)
+    def update_image(self, index: int, image: QImage, label: Optional[str] = None):
+        """Replaces the image of one cell in place, keeping the zoom, pan and channel."""
+        view = self.views[index]
+        view.replace_image(image, view.label_text if label is None else label, view.img_path)
 
     def _connect_view_signals(self, view: ZoomableView):
         """Connects all necessary signals for a ZoomableView instance."""
         view.hovered.connect(self.update_status_bar)
         view.mouseMovedAtScenePos.connect(self._update_pixel_info)
         view.viewRectChanged.connect(self.sync_views)
+        # Views the user interacts with are the last to be degraded to proxies
+        view.hovered.connect(lambda _text, v=view: self.memory_governor.touch(v))
+        view.viewRectChanged.connect(lambda _rect, v=view: self.memory_governor.touch(v))
 
     def _center_on_screen(self):
         """Centers the window on the primary screen."""
@@ -207,6 +299,17 @@ class ImageGrid(QMainWindow):
         open_action.triggered.connect(self._prompt_open_dataset)
         file_menu.addAction(open_action)
 
+        browse_action = QAction("&Browse Datasets...", self)
+        browse_action.setShortcut(QKeySequence("Ctrl+Shift+O"))
+        browse_action.setStatusTip("List every dataset in a directory and open one")
+        browse_action.triggered.connect(self._open_dataset_browser)
+        file_menu.addAction(browse_action)
+
+        index_action = QAction("Dataset &Index...", self)
+        index_action.setStatusTip("Index all datasets in a directory tree and open the most recent one")
+        index_action.triggered.connect(self._open_dataset_index)
+        file_menu.addAction(index_action)
+
         file_menu.addSeparator()
 
         save_action = QAction("&Save Snapshot...", self)
@@ -215,12 +318,86 @@ class ImageGrid(QMainWindow):
         save_action.triggered.connect(self._save_snapshot)
         file_menu.addAction(save_action)
 
+        export_action = QAction("&Export Full Resolution...", self)
+        export_action.setStatusTip("Export all images at native resolution as one stitched image")
+        export_action.triggered.connect(self._export_full_resolution)
+        file_menu.addAction(export_action)
+
+        snapshot_settings_action = QAction("Snapshot Se&ttings...", self)
+        snapshot_settings_action.setStatusTip("Choose the PNG compression level and JPEG/WebP quality")
+        snapshot_settings_action.triggered.connect(self._open_snapshot_settings)
+        file_menu.addAction(snapshot_settings_action)
+
         edit_menu = menu_bar.addMenu("&Edit")
         edit_suffixes_action = QAction("Edit &Suffixes...", self)
         edit_suffixes_action.setStatusTip("Open an editor for the suffix list file")
         edit_suffixes_action.triggered.connect(self._open_suffix_editor)
         edit_menu.addAction(edit_suffixes_action)
 
+        view_menu = menu_bar.addMenu("&View")
+        next_frame_action = QAction("&Next Frame", self)
+        next_frame_action.setShortcut(QKeySequence("]"))
+        next_frame_action.setStatusTip("Show the next frame of multi-page and animated images in all views")
+        next_frame_action.triggered.connect(lambda: self.set_frame(self.frame_index + 1))
+        view_menu.addAction(next_frame_action)
+
+        previous_frame_action = QAction("&Previous Frame", self)
+        previous_frame_action.setShortcut(QKeySequence("["))
+        previous_frame_action.setStatusTip("Show the previous frame of multi-page and animated images in all views")
+        previous_frame_action.triggered.connect(lambda: self.set_frame(self.frame_index - 1))
+        view_menu.addAction(previous_frame_action)
+
+        view_menu.addSeparator()
+        compare_action = QAction("&Compare Two Images...", self)
+        compare_action.setShortcut(QKeySequence("C"))
+        compare_action.setStatusTip("Flicker (Space) or swipe (S) between two images in one view; Escape returns")
+        compare_action.triggered.connect(self._prompt_compare)
+        view_menu.addAction(compare_action)
+
+        self.flipbook_action = QAction("&Flip-Book", self)
+        self.flipbook_action.setShortcut(QKeySequence("F"))
+        self.flipbook_action.setCheckable(True)
+        self.flipbook_action.setStatusTip("Step through all images in one large view; Escape returns")
+        self.flipbook_action.toggled.connect(lambda on: self.enter_flipbook() if on else self.exit_flipbook())
+        view_menu.addAction(self.flipbook_action)
+
+        self.next_image_action = QAction("Ne&xt Image", self)
+        self.next_image_action.setShortcut(QKeySequence(Qt.Key_Right))
+        self.next_image_action.setEnabled(False)
+        self.next_image_action.triggered.connect(lambda: self.flipbook.step(1))
+        view_menu.addAction(self.next_image_action)
+
+        self.previous_image_action = QAction("Pre&vious Image", self)
+        self.previous_image_action.setShortcut(QKeySequence(Qt.Key_Left))
+        self.previous_image_action.setEnabled(False)
+        self.previous_image_action.triggered.connect(lambda: self.flipbook.step(-1))
+        view_menu.addAction(self.previous_image_action)
+
+        view_menu.addSeparator()
+        next_dataset_action = QAction("Next &Dataset in Sequence", self)
+        next_dataset_action.setShortcut(QKeySequence(Qt.Key_PageDown))
+        next_dataset_action.setStatusTip("Load the next numbered prefix (e.g. frame0002_), keeping zoom, pan and channels")
+        next_dataset_action.triggered.connect(lambda: self.step_sequence(1))
+        view_menu.addAction(next_dataset_action)
+
+        previous_dataset_action = QAction("Previous Dat&aset in Sequence", self)
+        previous_dataset_action.setShortcut(QKeySequence(Qt.Key_PageUp))
+        previous_dataset_action.setStatusTip("Load the previous numbered prefix, keeping zoom, pan and channels")
+        previous_dataset_action.triggered.connect(lambda: self.step_sequence(-1))
+        view_menu.addAction(previous_dataset_action)
+
+        self.play_action = QAction("&Play Sequence", self)
+        self.play_action.setShortcut(QKeySequence("P"))
+        self.play_action.setCheckable(True)
+        self.play_action.setStatusTip("Play the numbered sequence of datasets as video, keeping zoom, pan and channels")
+        self.play_action.toggled.connect(lambda on: self.start_playback() if on else self.stop_playback())
+        view_menu.addAction(self.play_action)
+
+        playback_speed_action = QAction("Playback &Speed...", self)
+        playback_speed_action.setStatusTip("Set the target frames per second of the playback")
+        playback_speed_action.triggered.connect(self._prompt_playback_speed)
+        view_menu.addAction(playback_speed_action)
+
         help_menu = menu_bar.addMenu("&Help")
         create_examples_action = QAction("Create Example Dataset...", self)
         create_examples_action.setStatusTip(
@@ -229,9 +406,18 @@ class ImageGrid(QMainWindow):
         create_examples_action.triggered.connect(self._prompt_create_examples)
         help_menu.addAction(create_examples_action)
 
+        create_synthetic_action = QAction("Create Synthetic Dataset...", self)
+        create_synthetic_action.setStatusTip(
+            "Generate a large dataset of noise, gradient or photo-like images for load testing"
+        )
+        create_synthetic_action.triggered.connect(self._prompt_create_synthetic)
+        help_menu.addAction(create_synthetic_action)
+
     def _open_suffix_editor(self):
         """Opens the suffix editor dialog and reloads the grid if changes are saved."""
-        dialog = SuffixEditorDialog(self.suffix_file_path, MAX_IMAGES, self)
+        # Dialogs and the example generators are imported on first use to keep startup fast
+        from .suffix_editor import SuffixEditorDialog
+        dialog = SuffixEditorDialog(self.suffix_file_path, MAX_SUFFIX_FILE_ENTRIES, self, pre_path=self.pre_path)
         if dialog.exec():  # True if the dialog was accepted (saved)
             self._reload_grid()
 
@@ -241,8 +427,7 @@ class ImageGrid(QMainWindow):
             self.list_of_suffix = []
         else:
             try:
-                with open(self.suffix_file_path, 'r', encoding='utf-8') as f:
-                    self.list_of_suffix = [line.strip() for line in islice(f, MAX_IMAGES) if line.strip()]
+                self.list_of_suffix, _ = read_suffix_file(self.suffix_file_path, MAX_IMAGES)
                 self.statusBar().showMessage("Grid reloaded with new suffixes.", 5000)
             except (FileNotFoundError, IOError) as e:
                 self.list_of_suffix = []
@@ -290,16 +475,14 @@ class ImageGrid(QMainWindow):
 
         # Read suffixes from the file
         try:
-            with open(suffix_file_path, 'r', encoding='utf-8') as f:
-                # Security: Use islice to prevent reading a massive file into memory.
-                suffixes = [line.strip() for line in islice(f, MAX_IMAGES) if line.strip()]
-                if f.readline():
-                    QMessageBox.warning(
-                        self,
-                        "Suffix Limit Reached",
-                        f"The suffix file has more than {MAX_IMAGES} lines.\n"
-                        f"Only the first {MAX_IMAGES} will be considered for this dataset."
-                    )
+            suffixes, truncated = read_suffix_file(str(suffix_file_path), MAX_IMAGES)
+            if truncated:
+                QMessageBox.warning(
+                    self,
+                    "Suffix Limit Reached",
+                    f"The suffix file has more than {MAX_IMAGES} lines.\n"
+                    f"Only the first {MAX_IMAGES} will be considered for this dataset."
+                )
         except IOError as e:
             QMessageBox.critical(self, "Error Reading File", f"Could not read suffix file:\n{e}")
             return
@@ -308,31 +491,86 @@ class ImageGrid(QMainWindow):
             QMessageBox.warning(self, "Empty Suffix File", f"The suffix file is empty:\n{suffix_file_path}")
             return
 
-        # Deduce the prefix by finding the longest matching suffix
-        best_match_len = -1
-        new_prefix = None
-        for suffix in suffixes:
-            if selected_file.name.endswith(suffix):
-                if len(suffix) > best_match_len:
-                    best_match_len = len(suffix)
-                    prefix_len = len(selected_file.name) - len(suffix)
-                    new_prefix = str(selected_file.parent / selected_file.name[:prefix_len])
-
-        if new_prefix is None:
+        # Deduce the prefix by finding the longest matching suffix (or pattern)
+        name_prefix = deduce_prefix(selected_file.name, suffixes)
+        if name_prefix is None:
             QMessageBox.warning(self, "Could Not Deduce Prefix", f"The selected file '{selected_file.name}' does not match any suffix in '{suffix_file_path.name}'.")
             return
 
         # We have a new prefix and suffix file, update the main window state and reload
-        self.pre_path = new_prefix
+        self.pre_path = str(selected_file.parent / name_prefix)
         self.suffix_file_path = str(suffix_file_path)
         self._reload_grid()
 
+    def _open_dataset_browser(self):
+        """Lists the datasets of a directory and loads the chosen one."""
+        from .dataset_browser import DatasetBrowserDialog
+        # Start in the directory of the current prefix, whose listing is usually cached
+        start_dir = split_prefix(self.pre_path)[0] if self.pre_path else ""
+        dialog = DatasetBrowserDialog(start_dir, self)
+        if not dialog.exec():
+            return
+        dataset = dialog.selected_dataset()
+        if dataset is None:
+            return
+
+        self.pre_path = dataset.pre_path
+        self.suffix_file_path = dialog.suffix_file_path()
+        self._reload_grid()
+
+    def _open_dataset_index(self):
+        """Lists the indexed datasets of a directory tree and loads the chosen one."""
+        from .dataset_browser import DatasetIndexDialog
+        root = QFileDialog.getExistingDirectory(
+            self, "Choose the Root of the Directory Tree",
+            split_prefix(self.pre_path)[0] if self.pre_path else "")
+        if not root:
+            return
+        dialog = DatasetIndexDialog(root, parent=self)
+        if not dialog.exec():
+            return
+        dataset = dialog.selected_dataset()
+        if dataset is None:
+            return
+
+        self.pre_path = dataset.pre_path
+        self.suffix_file_path = dataset.suffix_file
+        self._reload_grid()
+
+    def open_dataset(self, pre_path: str, suffix_file: str):
+        """
+        Loads a dataset and brings the window to the front, e.g. one forwarded
+        by a later call in single-instance mode (see single_instance.py).
+        """
+        self.pre_path = pre_path
+        self.suffix_file_path = suffix_file
+        self._reload_grid()
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+    def start_remote_control(self, name: Optional[str] = None):
+        """
+        Listens for the commands of automation scripts on a local socket
+        (see remote.py). Returns the server; check is_listening().
+        """
+        from .remote import RemoteServer, register_grid_commands
+        server = RemoteServer(name, parent=self)
+        register_grid_commands(server, self)
+        server.listen()
+        return server
+
     def _save_snapshot(self):
-        """Saves a snapshot of the application window to a file."""
+        """
+        Saves a snapshot of the application window to a file.
+        Encoding runs in a background thread, so the grid stays responsive.
+        """
         # Grab the window content BEFORE opening the file dialog. This ensures
         # that the status bar text (e.g., pixel info) is captured correctly,
         # as opening the dialog can cause the window to lose focus and reset the text.
-        pixmap_to_save = self.grab()
+        # The QImage (unlike the QPixmap) can safely be handed to a worker thread.
+        image_to_save = self.grab().toImage()
 
         # Suggest a default path in the user's "Pictures" directory
         pictures_location = QStandardPaths.writableLocation(QStandardPaths.PicturesLocation)
@@ -343,15 +581,75 @@ class ImageGrid(QMainWindow):
             self,
             "Save Snapshot",
             default_path,
-            "Images (*.png *.jpg *.bmp)"
+            "Images (*.png *.jpg *.webp *.bmp)"
         )
 
         if file_path:
-            # Save the previously captured pixmap.
-            if pixmap_to_save.save(file_path):
-                self.statusBar().showMessage(f"Snapshot saved to {file_path}", 5000)  # Show for 5s
-            else:
-                self.statusBar().showMessage(f"Error: Failed to save snapshot to {file_path}", 5000)
+            from .snapshot import save_image
+            self.statusBar().showMessage(f"Saving snapshot to {file_path}...")
+            start_task(
+                save_image, image_to_save, file_path,
+                self.snapshot_png_compression, self.snapshot_quality,
+                on_finished=lambda path: self.statusBar().showMessage(
+                    f"Snapshot saved to {path}", 5000),  # Show for 5s
+                on_failed=lambda error: self.statusBar().showMessage(
+                    f"Error: Failed to save snapshot to {file_path}: {error}", 5000),
+            )
+
+    def _open_snapshot_settings(self):
+        """Lets the user choose the snapshot compression level and quality."""
+        from .snapshot import SnapshotSettingsDialog
+        dialog = SnapshotSettingsDialog(self.snapshot_png_compression, self.snapshot_quality, self)
+        if dialog.exec():
+            self.snapshot_png_compression = dialog.compression_spin.value()
+            self.snapshot_quality = dialog.quality_spin.value()
+
+    def _export_full_resolution(self):
+        """
+        Exports the grid as one stitched PNG at native (or user-chosen) resolution.
+        Compositing and encoding run in a background thread.
+        """
+        from .snapshot import write_stitched_png, DeferredImage
+        cells = []
+        for view in self.views:
+            image = view._image if view.has_image() else None
+            if view.is_proxy():
+                # Decoded again by the export, as the view only holds a proxy
+                image = DeferredImage(view.image_size(), partial(
+                    load_full_resolution, view.img_path, view.frame_shown(), view.current_channel()))
+            cells.append((view.label_text, image))
+        if not cells:
+            self.statusBar().showMessage("Nothing to export.", 5000)
+            return
+
+        scale, ok = QInputDialog.getDouble(
+            self,
+            "Export Full Resolution",
+            "Scale relative to the native image size:",
+            1.0, 0.01, 4.0, 2
+        )
+        if not ok:
+            return
+
+        pictures_location = QStandardPaths.writableLocation(QStandardPaths.PicturesLocation)
+        default_path = os.path.join(pictures_location, "image_grid_export.png")
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "Export Full Resolution",
+            default_path,
+            "PNG Images (*.png)"
+        )
+        if not file_path:
+            return
+
+        self.statusBar().showMessage(f"Exporting to {file_path}...")
+        start_task(
+            write_stitched_png, cells, file_path, self.columns, scale, EXPORT_BAND_HEIGHT,
+            on_progress=lambda done, total: self.statusBar().showMessage(
+                f"Exporting to {file_path}... {100 * done // total}%"),
+            on_finished=lambda path: self.statusBar().showMessage(f"Exported grid to {path}", 5000),
+            on_failed=lambda error: self.statusBar().showMessage(f"Error: Export failed: {error}", 5000),
+        )
 
     def _prompt_create_examples(self):
         """
@@ -386,27 +684,103 @@ class ImageGrid(QMainWindow):
         )
 
         if reply == QMessageBox.StandardButton.Ok:
+            from .create_examples import create_example_dataset
             # The create_example_dataset function uses Qt classes, so an application
             # instance must exist. This is guaranteed when called from the GUI.
             success, message, prefix_path_str = create_example_dataset(target_dir)
 
-            if success:
-                # Ask the user if they want to load the new dataset
-                load_reply = QMessageBox.question(
-                    self,
-                    "Success",
-                    f"{message}\n\nWould you like to load this example dataset now?",
-                    QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                    QMessageBox.StandardButton.Yes,
-                )
-                if load_reply == QMessageBox.StandardButton.Yes:
-                    prefix_path = Path(prefix_path_str)
-                    self.pre_path = prefix_path_str
-                    self.suffix_file_path = str(prefix_path.parent / "igridvu_suffix.txt")
-                    self._reload_grid()
-            else:
-                QMessageBox.critical(self, "Error", message)
+            self._offer_to_load_dataset(success, message, prefix_path_str)
 
+    def _offer_to_load_dataset(self, success: bool, message: str, prefix_path_str: str):
+        """Reports the outcome of a dataset creation and offers to load the new dataset."""
+        if success:
+            # Ask the user if they want to load the new dataset
+            load_reply = QMessageBox.question(
+                self,
+                "Success",
+                f"{message}\n\nWould you like to load this example dataset now?",
+                QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                QMessageBox.StandardButton.Yes,
+            )
+            if load_reply == QMessageBox.StandardButton.Yes:
+                prefix_path = Path(prefix_path_str)
+                self.pre_path = prefix_path_str
+                self.suffix_file_path = str(prefix_path.parent / "igridvu_suffix.txt")
+                self._reload_grid()
+        else:
+            QMessageBox.critical(self, "Error", message)
+
+    def _prompt_create_synthetic(self):
+        """
+        Lets the user configure a synthetic dataset and a target directory,
+        then generates it in the background.
+        """
+        from .create_examples import create_synthetic_dataset
+        from .synthetic_dialog import SyntheticDatasetDialog
+        dialog = SyntheticDatasetDialog(self)
+        if not dialog.exec():
+            return
+        options = dialog.options()
+
+        default_location = QStandardPaths.writableLocation(QStandardPaths.DocumentsLocation)
+        target_dir_str = QFileDialog.getExistingDirectory(
+            self,
+            "Choose a Location for the Synthetic Dataset",
+            default_location,
+            QFileDialog.Option.ShowDirsOnly | QFileDialog.Option.DontResolveSymlinks,
+        )
+        if not target_dir_str:
+            return  # User cancelled the dialog
+
+        self.statusBar().showMessage(f"Generating {options['count']} synthetic images...")
+        start_task(
+            create_synthetic_dataset, Path(target_dir_str), **options,
+            on_finished=lambda result: self._offer_to_load_dataset(*result),
+            on_failed=lambda error: QMessageBox.critical(self, "Error", error),
+        )
+
+    def current_view_rect(self) -> Optional[QRectF]:
+        """The scene rectangle on screen in the grid, flip-book or comparison, or None without images."""
+        if self.is_flipbook_active():
+            return self.flipbook.view_rect()
+        if self.compare_view is not None and self.stacked_widget.currentWidget() is self.compare_view:
+            return self.compare_view.view_rect()
+        shown = [view for view in self.views if view.has_image()]
+        return shown[0].mapToScene(shown[0].viewport().rect()).boundingRect() if shown else None
+
+    @traced("save_session", "io")
+    def save_session(self, path: Optional[str] = None):
+        """
+        Saves the dataset, columns, zoom rectangle, channels and window
+        geometry (see session.py), and writes a proxy of every cell not in
+        the persistent proxy cache yet, so a restore shows the cells at once.
+        """
+        rect = self.current_view_rect()
+        session = Session(pre_path=self.pre_path, suffix_file=self.suffix_file_path, columns=self.columns,
+                          view_rect=(rect.x(), rect.y(), rect.width(), rect.height()) if rect else None,
+                          channels=[view.current_channel() for view in self.views],
+                          geometry=bytes(self.saveGeometry().toBase64()).decode("ascii"))
+        save_session(session, path)
+        for view in self.views:
+            # Restored sessions show the first frame
+            variant = view.current_channel() or ""
+            if (not view.has_image() or view.frame_shown() != 0
+                    or self.proxy_cache.contains(view.img_path, variant)):
+                continue
+            image = view.proxy_image(self.proxy_cache.max_dimension)
+            if image is not None:
+                self.proxy_cache.put(view.img_path, image, view.image_size(), variant)
+        self.proxy_cache.prune()
+
+    def closeEvent(self, event):
+        if self.session_path and self.list_of_suffix:
+            try:
+                self.save_session(self.session_path)
+            except OSError as e:
+                print(f"Warning: Could not save the session: {e}", file=sys.stderr)
+        super().closeEvent(event)
+
+    @traced("sync_views", "layout")
     def sync_views(self, rect: QRectF):
         """Slot to synchronize all views to the given rectangle."""
         sender_view = self.sender()
@@ -414,6 +788,259 @@ class ImageGrid(QMainWindow):
             if view is not sender_view:
                 view.setViewRect(rect)
 
+    def _prompt_compare(self):
+        """Asks for two images of the grid and compares them."""
+        views = [view for view in self.views if view.has_image()]
+        if len(views) < 2:
+            self.statusBar().showMessage("Comparing needs at least two images.", 5000)
+            return
+        labels = [view.label_text for view in views]
+        label_a, ok = QInputDialog.getItem(self, "Compare Two Images", "Image A:", labels, 0, False)
+        if not ok:
+            return
+        index_a = labels.index(label_a)
+        label_b, ok = QInputDialog.getItem(self, "Compare Two Images", "Image B:", labels,
+                                           (index_a + 1) % len(labels), False)
+        if not ok:
+            return
+        self.compare_views(views[index_a], views[labels.index(label_b)])
+
+    def compare_views(self, view_a: ZoomableView, view_b: ZoomableView):
+        """Shows two views' images in one large view, at the zoom and pan of the grid."""
+        from .compare import CompareView
+        if self.compare_view is None:
+            self.compare_view = CompareView()
+            self.compare_view.closeRequested.connect(self.exit_compare)
+            self.stacked_widget.addWidget(self.compare_view)
+        # Compared images stay at full resolution; proxies are restored in the
+        # background and repainted by the comparison once decoded
+        self.memory_governor.touch(view_a)
+        self.memory_governor.touch(view_b)
+        self.memory_governor.pin([view_a, view_b])
+        view_a.restore_full_resolution()
+        view_b.restore_full_resolution()
+        rect = view_a.mapToScene(view_a.viewport().rect()).boundingRect()
+        self.stacked_widget.setCurrentWidget(self.compare_view)
+        self.compare_view.set_views(view_a, view_b, rect)
+        self.compare_view.setFocus()
+
+    def exit_compare(self):
+        """Returns to the grid, keeping the zoom and pan of the comparison."""
+        if self.compare_view is None or self.stacked_widget.currentWidget() is not self.compare_view:
+            return
+        rect = self.compare_view.view_rect()
+        self.compare_view.clear()
+        self.memory_governor.pin([])
+        self.stacked_widget.setCurrentWidget(self.grid_container)
+        for view in self.views:
+            view.setViewRect(rect)
+
+    def is_flipbook_active(self) -> bool:
+        return self.flipbook is not None and self.stacked_widget.currentWidget() is self.flipbook
+
+    @traced("enter_flipbook", "layout")
+    def enter_flipbook(self, index: int = 0):
+        """
+        Shows one large view stepping through all suffixes (not only those
+        shown in the grid), at the zoom and pan of the grid.
+        """
+        if self.is_flipbook_active() or not self.list_of_suffix:
+            self._set_flipbook_actions()
+            return
+        from .flipbook import FlipBook
+        self.stop_playback()
+        if self.flipbook is None:
+            self.flipbook = FlipBook(self.image_cache, FLIPBOOK_PREFETCH_AHEAD, FLIPBOOK_PREFETCH_BEHIND)
+            self.flipbook.closeRequested.connect(self.exit_flipbook)
+            self.flipbook.messageChanged.connect(self.statusBar().showMessage)
+            self.stacked_widget.addWidget(self.flipbook)
+
+        suffixes, _ = expand_suffixes(self.list_of_suffix, self.pre_path, MAX_SUFFIX_FILE_ENTRIES)
+        suffixes = [suffix.rstrip() for suffix in suffixes]
+        checks = validate_paths(self.pre_path, suffixes, ZoomableView.MAX_FILE_SIZE_BYTES)
+        # The images already decoded by the grid need no second decode
+        for view in self.views:
+            image = view.source_image()
+            if image is not None and view.frame_shown() == 0:
+                self.image_cache.put(view.img_path, image, view.frame_count())
+
+        rect = None
+        if self.views and self.views[0].has_image():
+            rect = self.views[0].mapToScene(self.views[0].viewport().rect()).boundingRect()
+        self.stacked_widget.setCurrentWidget(self.flipbook)
+        self.flipbook.set_images(checks, [Path(suffix).stem for suffix in suffixes], index, rect)
+        self._set_flipbook_actions()
+
+    def exit_flipbook(self):
+        """Returns to the grid, keeping the zoom and pan of the flip-book."""
+        if not self.is_flipbook_active():
+            self._set_flipbook_actions()
+            return
+        rect = self.flipbook.view_rect()
+        self.stacked_widget.setCurrentWidget(self.grid_container)
+        self.image_cache.clear()
+        if rect is not None:
+            for view in self.views:
+                view.setViewRect(rect)
+        self.statusBar().showMessage(self.status_message)
+        self._set_flipbook_actions()
+        self._prefetch_sequence()
+
+    @traced("step_sequence", "layout")
+    def step_sequence(self, step: int):
+        """
+        Loads the dataset `step` places after (or before, if negative) the
+        current one in its numbered sequence (frame0001_, frame0002_, ...),
+        with the same suffixes. The zoom, pan and channels are kept.
+        """
+        if not self.list_of_suffix or self.is_flipbook_active():
+            return
+        self.stop_playback()
+        prefixes = sequence_prefixes(self.pre_path)
+        if self.pre_path not in prefixes:
+            self.statusBar().showMessage("The prefix is not part of a numbered sequence.", 5000)
+            return
+        index = prefixes.index(self.pre_path) + step
+        if not 0 <= index < len(prefixes):
+            self.statusBar().showMessage("No further datasets in the sequence.", 3000)
+            return
+
+        rect = self.current_view_rect()
+        channels = [view.current_channel() for view in self.views]
+        self.pre_path = prefixes[index]
+        self._populate_grid(self.list_of_suffix, view_rect=rect, channels=channels)
+        self.setWindowTitle(f"{self.app_name}: {self.pre_path}...")
+        self.statusBar().showMessage(f"Dataset {index + 1} / {len(prefixes)}: {self.pre_path}", 3000)
+
+    def _sequence_neighbours(self) -> List[str]:
+        """The prefixes around the current one in its sequence, nearest first, next before previous."""
+        prefixes = sequence_prefixes(self.pre_path)
+        if self.pre_path not in prefixes:
+            return []
+        index = prefixes.index(self.pre_path)
+        neighbours = []
+        for distance in range(1, SEQUENCE_PREFETCH_DEPTH + 1):
+            neighbours += [prefixes[i] for i in (index + distance, index - distance) if 0 <= i < len(prefixes)]
+        return neighbours
+
+    def _grid_paths(self, prefix: str) -> List[Optional[str]]:
+        """The image path of every grid cell for another prefix, None where it cannot be loaded."""
+        suffixes, _ = expand_suffixes(self.list_of_suffix, prefix, MAX_IMAGES)
+        checks = validate_paths(prefix, [suffix.rstrip() for suffix in suffixes],
+                                ZoomableView.MAX_FILE_SIZE_BYTES)
+        return [check.path if check.error is None else None for check in checks]
+
+    def _prefetch_sequence(self):
+        """Decodes the grids of the neighbouring datasets in the background, within the prefetch budget."""
+        if not self.list_of_suffix or self.is_flipbook_active() or self.is_playing():
+            return
+        wanted = []
+        for prefix in self._sequence_neighbours():
+            wanted += [path for path in self._grid_paths(prefix) if path]
+        self.image_cache.set_wanted(wanted)
+
+    def is_playing(self) -> bool:
+        return self.player is not None and self.player.is_playing()
+
+    def start_playback(self):
+        """
+        Plays the numbered sequence of the current prefix in a loop, starting
+        after the current dataset. The views keep their zoom, pan and channels.
+        """
+        prefixes = sequence_prefixes(self.pre_path) if self.list_of_suffix else []
+        if self.is_flipbook_active() or len(prefixes) < 2 or self.pre_path not in prefixes:
+            self.statusBar().showMessage("Playback needs a numbered sequence of datasets.", 5000)
+            self._set_play_action(False)
+            return
+        from .playback import SequencePlayer
+        self.stop_playback()
+        self.image_cache.clear()  # The ring buffer of the player replaces the prefetch
+        self._playback_prefixes = prefixes
+        self.player = SequencePlayer(len(prefixes), lambda index: self._grid_paths(prefixes[index]),
+                                     self.playback_fps, PLAYBACK_BUFFER_FRAMES, parent=self)
+        self.player.frameShown.connect(self._show_playback_frame)
+        self.player.statsChanged.connect(self._show_playback_stats)
+        self.player.start(prefixes.index(self.pre_path))
+        self._set_play_action(True)
+
+    def stop_playback(self):
+        """Stops the playback on the dataset on screen."""
+        if self.player is None:
+            return
+        player, self.player = self.player, None
+        player.stop()
+        player.deleteLater()
+        self._set_play_action(False)
+        self.setWindowTitle(f"{self.app_name}: {self.pre_path}...")
+        self._prefetch_sequence()
+
+    def _set_play_action(self, playing: bool):
+        if hasattr(self, "play_action"):  # The menus may be built later (defer_menus)
+            self.play_action.blockSignals(True)
+            self.play_action.setChecked(playing)
+            self.play_action.blockSignals(False)
+
+    @traced("playback_frame", "render")
+    def _show_playback_frame(self, index: int, images: list):
+        """Shows one decoded dataset of the playback in the existing views."""
+        self.pre_path = self._playback_prefixes[index]
+        paths = self.player.paths(index) if self.player is not None else []
+        for view, image, path in zip(self.views, images, paths):
+            # Cells that cannot be loaded keep their previous image
+            if view.has_image() and not image.isNull():
+                view.replace_image(image, view.label_text, path, levels=False)
+
+    def _show_playback_stats(self, fps: float, dropped: int):
+        index = self.player.current_index() if self.player is not None else 0
+        self.statusBar().showMessage(
+            f"Playing {index + 1} / {len(self._playback_prefixes)}: {fps:.1f} fps "
+            f"(target {self.playback_fps:g}), {dropped} frames dropped")
+
+    def _prompt_playback_speed(self):
+        fps, ok = QInputDialog.getDouble(self, "Playback Speed", "Frames per second:",
+                                         self.playback_fps, 0.5, 240.0, 1)
+        if not ok:
+            return
+        self.playback_fps = fps
+        if self.player is not None:
+            self.player.set_fps(fps)
+
+    def _set_flipbook_actions(self):
+        active = self.is_flipbook_active()
+        if not hasattr(self, "flipbook_action"):
+            return  # The menus are built later (defer_menus)
+        self.flipbook_action.blockSignals(True)
+        self.flipbook_action.setChecked(active)
+        self.flipbook_action.blockSignals(False)
+        self.next_image_action.setEnabled(active)
+        self.previous_image_action.setEnabled(active)
+
+    def frame_count(self) -> int:
+        """The largest number of frames of the images in the grid."""
+        return max((view.frame_count() for view in self.views), default=1)
+
+    @traced("set_frame", "layout")
+    def set_frame(self, index: int):
+        """Shows the same frame index in every view of a multi-frame image."""
+        count = self.frame_count()
+        if count <= 1:
+            return
+        index = max(0, min(index, count - 1))
+        if index == self.frame_index:
+            return
+        self.frame_index = index
+        for view in self.views:
+            view.set_frame(index)
+        self.statusBar().showMessage(f"Frame {index + 1} / {count}", 3000)
+
+    def _update_memory_label(self, used: int, budget: int):
+        """Shows the memory held by the views in the status bar."""
+        proxies = sum(1 for view in self.views if view.is_proxy())
+        text = f"Memory: {format_bytes(used)} / {format_bytes(budget)}"
+        if proxies:
+            text += f" ({proxies} low-res)"
+        self.memory_label.setText(text)
+
     def update_status_bar(self, text: str):
         """Slot to update the status bar message. Restores default when text is empty."""
         # This is now primarily for when the mouse enters/leaves the view area
@@ -422,6 +1049,7 @@ class ImageGrid(QMainWindow):
         else:
             self.statusBar().showMessage(self.status_message)
 
+    @traced("pixel_inspection", "compute")
     def _update_pixel_info(self, scene_pos: QPointF):
         """Updates pixel info label on each view at a given scene coordinate."""
         sender_view = cast(ZoomableView, self.sender())
@@ -441,6 +1069,9 @@ class ImageGrid(QMainWindow):
                     value_str = f"({color.red()},{color.green()},{color.blue()})"
                 info_str = f"({display_x},{display_y}) {value_str}"
                 view.set_pixel_info(info_str)
+            elif view.is_proxy():
+                # The full image was released to save memory
+                view.set_pixel_info(f"({display_x},{display_y}) low-res")
             else:
                 # If get_color_at returns None, display -1
                 view.set_pixel_info(f"({display_x},{display_y}) -1")
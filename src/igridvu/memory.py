@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+"""
+Memory accounting and a budget governor for the image views.
+
+The governor sums the bytes held by every registered ZoomableView. When the
+total exceeds the budget, or the system is running low on memory, it
+degrades views to low-resolution proxies: off-screen views first, then the
+least recently used ones. When memory becomes available again, proxies are
+restored in the background, most recently used first, as long as the usage
+stays below a lower watermark; the gap keeps views from being restored and
+degraded again on every pass. Pinned views (e.g. the two compared ones) are
+never degraded.
+"""
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from PySide6.QtCore import QObject, QTimer, Signal as pyqtSignal
+from shiboken6 import isValid
+
+from .tracing import traced
+
+MEMINFO_PATH = "/proc/meminfo"
+
+
+def read_meminfo(path: str = MEMINFO_PATH) -> Optional[Dict[str, int]]:
+    """
+    Reads the system memory information (Linux only).
+
+    Returns:
+        A dict mapping the /proc/meminfo keys (e.g. 'MemTotal', 'MemAvailable')
+        to values in bytes, or None if the file is not available.
+    """
+    try:
+        text = Path(path).read_text(encoding="ascii")
+    except OSError:
+        return None
+
+    info = {}
+    for line in text.splitlines():
+        key, _, value = line.partition(":")
+        fields = value.split()
+        if fields and fields[0].isdigit():
+            factor = 1024 if len(fields) > 1 and fields[1] == "kB" else 1
+            info[key.strip()] = int(fields[0]) * factor
+    return info
+
+
+def format_bytes(num_bytes: float) -> str:
+    """Formats a byte count for display, e.g. '12.5 MB'."""
+    for unit in ("B", "KB", "MB", "GB"):
+        if abs(num_bytes) < 1024 or unit == "GB":
+            return f"{num_bytes:.0f} {unit}" if unit == "B" else f"{num_bytes:.1f} {unit}"
+        num_bytes /= 1024
+    return f"{num_bytes:.1f} GB"
+
+
+class MemoryGovernor(QObject):
+    """Keeps the memory held by the registered views within a budget."""
+
+    # (bytes in use, effective budget in bytes). Python ints, as byte counts
+    # may exceed the range of a C++ int.
+    usageChanged = pyqtSignal(object, object)
+
+    def __init__(self, budget_bytes: int, proxy_max_dimension: int = 512,
+                 pressure_threshold: float = 0.1, restore_fraction: float = 0.8,
+                 poll_interval_ms: int = 2000, meminfo_path: str = MEMINFO_PATH,
+                 parent: Optional[QObject] = None):
+        """
+        Args:
+            budget_bytes: The maximum number of bytes all views may hold.
+            proxy_max_dimension: The longest side of a degraded proxy image.
+            pressure_threshold: The system is considered under memory pressure
+                when less than this fraction of its memory is available.
+            restore_fraction: Proxies are only restored while the usage stays
+                below this fraction of the budget.
+            poll_interval_ms: How often to check the system memory.
+            meminfo_path: The file to read the system memory from.
+        """
+        super().__init__(parent)
+        self.budget_bytes = budget_bytes
+        self.proxy_max_dimension = proxy_max_dimension
+        self.pressure_threshold = pressure_threshold
+        self.restore_fraction = restore_fraction
+        self.meminfo_path = meminfo_path
+        self._views: List = []
+        self._pinned: List = []
+        self._last_used: Dict[int, int] = {}
+        self._clock = 0
+
+        # Coalesces many change notifications (e.g. while populating) into one pass
+        self._enforce_timer = QTimer(self)
+        self._enforce_timer.setSingleShot(True)
+        self._enforce_timer.setInterval(0)
+        self._enforce_timer.timeout.connect(self.enforce)
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(poll_interval_ms)
+        self._poll_timer.timeout.connect(self.enforce)
+        if poll_interval_ms > 0:
+            self._poll_timer.start()
+
+    def register(self, view):
+        """Starts accounting for a view."""
+        self._views.append(view)
+        self.touch(view)
+        view.memoryChanged.connect(self.schedule_enforce)
+        view.destroyed.connect(lambda _obj=None, v=view: self._on_view_destroyed(v))
+        self.schedule_enforce()
+
+    def _on_view_destroyed(self, view):
+        # The governor may already be gone when its window is torn down
+        if isValid(self):
+            self.unregister(view)
+
+    def unregister(self, view):
+        if view in self._views:
+            self._views.remove(view)
+            self._last_used.pop(id(view), None)
+            if view in self._pinned:
+                self._pinned.remove(view)
+            self.schedule_enforce()
+
+    def pin(self, views: List):
+        """
+        Keeps views at full resolution, e.g. while they are compared, releasing
+        the views pinned before. The caller restores pinned proxies itself.
+        """
+        self._pinned = [view for view in views if view in self._views]
+        self.schedule_enforce()
+
+    def touch(self, view):
+        """Marks a view as just used (hovered, zoomed, ...)."""
+        self._clock += 1
+        self._last_used[id(view)] = self._clock
+
+    def views(self) -> List:
+        return list(self._views)
+
+    def total_bytes(self) -> int:
+        """The bytes held by the views, counting those being restored at full size."""
+        return sum(view.full_size_bytes() if view.is_restoring() else view.memory_usage()
+                   for view in self._views)
+
+    def schedule_enforce(self):
+        self._enforce_timer.start()
+
+    def effective_budget(self, used: Optional[int] = None) -> int:
+        """
+        Returns the budget, reduced while the system is under memory pressure
+        so that enough memory is released to leave the pressure zone.
+        """
+        budget = self.budget_bytes
+        info = read_meminfo(self.meminfo_path)
+        if info and "MemTotal" in info and "MemAvailable" in info:
+            wanted_available = info["MemTotal"] * self.pressure_threshold
+            shortfall = wanted_available - info["MemAvailable"]
+            if shortfall > 0:
+                used = self.total_bytes() if used is None else used
+                budget = min(budget, max(0, int(used - shortfall)))
+        return budget
+
+    def _degrade_order(self) -> List:
+        """Off-screen views first, then the least recently used; pinned views last."""
+        def key(view):
+            on_screen = view.isVisible() and not view.visibleRegion().isEmpty()
+            return (view in self._pinned, on_screen, self._last_used.get(id(view), 0))
+        return sorted(self._views, key=key)
+
+    @traced("memory_enforce", "memory")
+    def enforce(self):
+        """Degrades or restores views so that the usage fits the budget."""
+        used = self.total_bytes()
+        budget = self.effective_budget(used)
+
+        if used > budget:
+            for view in self._degrade_order():
+                if used <= budget:
+                    break
+                if view in self._pinned:
+                    continue
+                before = view.memory_usage()
+                if view.degrade_to_proxy(self.proxy_max_dimension):
+                    used -= before - view.memory_usage()
+        else:
+            # Restore the most recently used proxies that fit below the lower watermark
+            restore_budget = int(budget * self.restore_fraction)
+            for view in reversed(self._degrade_order()):
+                if not view.is_proxy() or view.is_restoring():
+                    continue
+                extra = view.full_size_bytes() - view.memory_usage()
+                if used + extra > restore_budget:
+                    continue
+                if view.restore_full_resolution():
+                    used += extra
+
+        self._enforce_timer.stop()  # The changes above must not trigger another pass
+        self.usageChanged.emit(used, budget)
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Timed playback of a sequence of datasets (see sequences.py) as video.
+
+The SequencePlayer keeps a ring buffer of the frames ahead of the one on
+screen, where a frame is the decoded images of all grid cells of one
+dataset. Every missing frame of the buffer is decoded by its own worker
+task, so several frames are decoded in parallel.
+
+Frames are shown on a clock: at every tick the player shows the newest
+decoded frame that is due. When decoding cannot keep up, the frames in
+between are dropped instead of slowing the playback down, and the buffer is
+refilled from the frame that is due next, so no work is spent on frames
+that would be dropped anyway. The achieved frame rate and the number of
+dropped frames are reported once per second.
+"""
+from collections import deque
+from typing import Callable, Dict, List, Optional, Set
+
+from PySide6.QtCore import QElapsedTimer, QObject, Qt, QTimer, Signal as pyqtSignal
+from PySide6.QtGui import QImage
+
+from .image_io import read_image
+from .workers import start_task
+
+
+def decode_images(paths: List[Optional[str]]) -> List[QImage]:
+    """Decodes the images of one frame. Missing paths give null images. Safe to call from worker threads."""
+    return [read_image(path) if path else QImage() for path in paths]
+
+
+class SequencePlayer(QObject):
+    """Plays frames 0..frame_count-1 in a loop at a target frame rate."""
+
+    # The dataset index and the decoded images (one per cell, null if missing)
+    frameShown = pyqtSignal(int, list)
+    # The achieved frames per second and the number of frames dropped so far
+    statsChanged = pyqtSignal(float, int)
+
+    def __init__(self, frame_count: int, frame_paths: Callable[[int], List[Optional[str]]],
+                 fps: float = 24.0, buffer_frames: int = 8, parent=None):
+        """
+        Args:
+            frame_count: The number of datasets in the sequence.
+            frame_paths: Returns the image path of every cell for a dataset index.
+            buffer_frames: The number of frames decoded ahead.
+        """
+        super().__init__(parent)
+        self.frame_count = frame_count
+        self.frame_paths = frame_paths
+        self.fps = fps
+        self.buffer_frames = max(1, buffer_frames)
+        self.dropped = 0
+        # Frames are numbered without wrapping around; frame n shows dataset n % frame_count
+        self._shown = 0
+        self._start = 0
+        self._buffer: Dict[int, List[QImage]] = {}
+        self._pending: Set[int] = set()
+        self._paths: Dict[int, List[Optional[str]]] = {}
+        self._shown_times: deque = deque()
+        self._last_stats = 0
+        # Incremented by stop(), so decodes of an earlier run are dropped
+        self._generation = 0
+        self._clock = QElapsedTimer()
+        self._timer = QTimer(self)
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+
+    def is_playing(self) -> bool:
+        return self._timer.isActive()
+
+    def current_index(self) -> int:
+        """The dataset index on screen."""
+        return self._shown % self.frame_count
+
+    def start(self, index: int = 0):
+        """Starts playing after the dataset shown at index."""
+        self.stop()
+        self._shown = self._start = index
+        self.dropped = 0
+        self._shown_times.clear()
+        self._clock.start()
+        self._last_stats = 0
+        self._timer.start(max(1, int(1000 / self.fps)))
+        self._fill(self._shown + 1)
+
+    def stop(self):
+        self._timer.stop()
+        self._buffer.clear()
+        self._pending.clear()
+        self._generation += 1
+
+    def set_fps(self, fps: float):
+        """Changes the frame rate, continuing from the frame on screen."""
+        self.fps = fps
+        if self.is_playing():
+            self._start = self._shown
+            self._clock.restart()
+            self._timer.setInterval(max(1, int(1000 / fps)))
+
+    def paths(self, index: int) -> List[Optional[str]]:
+        """The image paths of a dataset, looked up once per playback."""
+        paths = self._paths.get(index)
+        if paths is None:
+            paths = self._paths[index] = self.frame_paths(index)
+        return paths
+
+    def buffered(self) -> int:
+        return len(self._buffer)
+
+    def _due(self) -> int:
+        """The frame that should be on screen now."""
+        return self._start + int(self._clock.elapsed() * self.fps / 1000)
+
+    def _fill(self, first: int):
+        """Decodes the frames from first on that are missing in the ring buffer."""
+        for n in list(self._buffer):
+            if n < first:
+                del self._buffer[n]
+        for n in range(first, first + self.buffer_frames):
+            if len(self._buffer) + len(self._pending) >= self.buffer_frames:
+                break  # Decodes still running for late frames count against the buffer
+            if n in self._buffer or n in self._pending:
+                continue
+            self._pending.add(n)
+            generation = self._generation
+            start_task(decode_images, self.paths(n % self.frame_count),
+                       on_finished=lambda images, n=n, g=generation: self._decoded(n, g, images),
+                       on_failed=lambda _error, n=n: self._pending.discard(n))
+
+    def _decoded(self, n: int, generation: int, images: List[QImage]):
+        if generation != self._generation:
+            return
+        self._pending.discard(n)
+        if n > self._shown:
+            self._buffer[n] = images
+        if self.is_playing():
+            self._fill(max(self._shown + 1, self._due()))
+
+    def _tick(self):
+        due = self._due()
+        # The newest decoded frame that is due; frames between it and the one shown are dropped
+        ready = [n for n in self._buffer if self._shown < n <= due]
+        if ready:
+            n = max(ready)
+            self.dropped += n - self._shown - 1
+            self._shown = n
+            self.frameShown.emit(n % self.frame_count, self._buffer.pop(n))
+            self._shown_times.append(self._clock.elapsed())
+        self._fill(max(self._shown + 1, due))
+        self._report()
+
+    def _report(self):
+        now = self._clock.elapsed()
+        while self._shown_times and self._shown_times[0] < now - 1000:
+            self._shown_times.popleft()
+        if now - self._last_stats >= 1000:
+            self._last_stats = now
+            self.statsChanged.emit(float(len(self._shown_times)), self.dropped)
@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+"""
+Background decoding of whole images ahead of the user.
+
+Modes that step through images (the flip-book, see flipbook.py) tell the
+ImageCache which images they will want next, in order of priority. Missing
+ones are decoded in worker threads, and the cache is bounded by a byte
+budget: images no longer wanted are evicted first (least recently used
+first), then wanted images of the lowest priority. The image wanted most is
+never evicted, so stepping to it never shows a blank view.
+"""
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+
+from PySide6.QtCore import QObject, Signal as pyqtSignal
+from PySide6.QtGui import QImage
+
+from .image_io import MAX_IMAGE_DIMENSION, decode_checked
+from .workers import start_task
+
+
+class ImageCache(QObject):
+    """Decoded images keyed by path, bounded by a byte budget."""
+
+    # Path of an image decoded in the background
+    imageReady = pyqtSignal(str)
+    # Path of an image that could not be decoded
+    imageFailed = pyqtSignal(str)
+
+    def __init__(self, budget_bytes: int, max_dimension: int = MAX_IMAGE_DIMENSION, parent=None):
+        """
+        Args:
+            budget_bytes: The maximum number of bytes of the cached images.
+            max_dimension: Images wider or higher fail, as they do in a view.
+        """
+        super().__init__(parent)
+        self.budget_bytes = budget_bytes
+        self.max_dimension = max_dimension
+        self._images: "OrderedDict[str, QImage]" = OrderedDict()
+        # The frame count of multi-frame images, so their views can step through the frames
+        self._frame_counts: Dict[str, int] = {}
+        self._bytes = 0
+        # The paths wanted next, most wanted first, and their priority
+        self._wanted: Dict[str, int] = {}
+        self._pending: Set[str] = set()
+        self._failed: Set[str] = set()
+        # Incremented by clear(), so results of earlier decodes are dropped
+        self._generation = 0
+
+    def memory_usage(self) -> int:
+        return self._bytes
+
+    def __len__(self) -> int:
+        return len(self._images)
+
+    def __contains__(self, path: str) -> bool:
+        return path in self._images
+
+    def get(self, path: str) -> Optional[QImage]:
+        image = self._images.get(path)
+        if image is not None:
+            self._images.move_to_end(path)
+        return image
+
+    def frame_count(self, path: str) -> int:
+        """The number of frames of a cached image, 1 for single images."""
+        return self._frame_counts.get(path, 1)
+
+    def is_pending(self, path: str) -> bool:
+        return path in self._pending
+
+    def has_failed(self, path: str) -> bool:
+        return path in self._failed
+
+    def put(self, path: str, image: QImage, frame_count: int = 1):
+        """Caches the first frame of an image, and its number of frames."""
+        old = self._images.pop(path, None)
+        if old is not None:
+            self._bytes -= old.sizeInBytes()
+        self._images[path] = image
+        self._bytes += image.sizeInBytes()
+        if frame_count > 1:
+            self._frame_counts[path] = frame_count
+        else:
+            self._frame_counts.pop(path, None)
+        self._evict()
+
+    def _evict(self):
+        while self._bytes > self.budget_bytes and len(self._images) > 1:
+            # Oldest unwanted image first, then the least wanted one
+            path = next((p for p in self._images if p not in self._wanted), None)
+            if path is None:
+                path = max(self._images, key=lambda p: self._wanted[p])
+                if self._wanted[path] == 0:
+                    return  # Only the most wanted image is left
+            self._bytes -= self._images.pop(path).sizeInBytes()
+            self._frame_counts.pop(path, None)
+
+    def set_wanted(self, paths: Sequence[str]):
+        """
+        Sets the images wanted next, most wanted first, and decodes the ones
+        not cached yet in the background in that order. Images that would not
+        fit in the budget next to the more wanted ones are not decoded.
+        """
+        self._wanted = {}
+        for path in paths:
+            self._wanted.setdefault(path, len(self._wanted))
+        self._evict()
+        # Estimates the size of missing images from the cached ones
+        sizes = [image.sizeInBytes() for image in self._images.values()]
+        estimate = max(sizes) if sizes else 0
+        planned = 0
+        for path in self._wanted:
+            image = self._images.get(path)
+            planned += image.sizeInBytes() if image is not None else estimate
+            if planned > self.budget_bytes and self._wanted[path] > 0:
+                break
+            if image is not None or path in self._pending or path in self._failed:
+                continue
+            self._pending.add(path)
+            generation = self._generation
+            start_task(decode_checked, path, self.max_dimension,
+                       on_finished=lambda result, p=path, g=generation: self._decoded(p, g, result),
+                       on_failed=lambda _error, p=path: self._pending.discard(p))
+
+    def wanted(self) -> List[str]:
+        return list(self._wanted)
+
+    def _decoded(self, path: str, generation: int, result: Tuple[QImage, int, Optional[str]]):
+        if generation != self._generation:
+            return
+        self._pending.discard(path)
+        image, frame_count, error = result
+        if error:
+            self._failed.add(path)
+            self.imageFailed.emit(path)
+            return
+        if path not in self._wanted:
+            return
+        self.put(path, image, frame_count)
+        if path in self._images:
+            self.imageReady.emit(path)
+
+    def clear(self):
+        """Discards all images, e.g. when another dataset is loaded."""
+        self._images.clear()
+        self._frame_counts.clear()
+        self._bytes = 0
+        self._wanted = {}
+        self._pending.clear()
+        self._failed.clear()
+        self._generation += 1
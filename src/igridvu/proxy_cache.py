@@ -0,0 +1,145 @@
+# -*- coding: utf-8 -*-
+"""
+A persistent cache of low-resolution proxies of the images in the grid.
+
+When a session is saved (see session.py), every cell writes a small PNG copy
+of the image it shows to the user's cache directory. Restoring the session
+shows these proxies at once, scaled up to the full image size, while the
+images are decoded in the background. A proxy is keyed by the image path,
+its modification time and size, and the channel shown, so an image written
+again never shows a stale proxy. The cache is kept within a byte budget by
+deleting the least recently used proxies.
+"""
+import hashlib
+import os
+import tempfile
+from typing import NamedTuple, Optional
+
+from PySide6.QtCore import QSize, Qt
+from PySide6.QtGui import QImage
+
+from .archives import split_archive_path
+
+PROXY_DIR_NAME = "proxies"
+# The PNG text key holding the size of the full image
+FULL_SIZE_KEY = "FullSize"
+# Proxies are small and written often: light compression is faster
+PROXY_PNG_QUALITY = 80
+
+
+def default_proxy_dir() -> str:
+    """Returns the proxy cache location in the user's cache directory."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "igridvu", PROXY_DIR_NAME)
+
+
+class CachedProxy(NamedTuple):
+    """A proxy image and the size of the image it stands for."""
+    image: QImage
+    full_size: QSize
+
+
+class ProxyCache:
+    """Proxy images stored as PNG files in a directory."""
+
+    def __init__(self, directory: Optional[str] = None, max_dimension: int = 512,
+                 budget_bytes: int = 256 * 1024 * 1024):
+        """
+        Args:
+            directory: Defaults to default_proxy_dir().
+            max_dimension: The longest side of a stored proxy.
+            budget_bytes: The size of the directory kept by prune().
+        """
+        self.directory = directory or default_proxy_dir()
+        self.max_dimension = max_dimension
+        self.budget_bytes = budget_bytes
+
+    def file_for(self, path: str, variant: str = "") -> Optional[str]:
+        """
+        The proxy file of an image, e.g. with variant the channel shown, or
+        None if the image cannot be accessed.
+        """
+        archive = split_archive_path(path)
+        try:
+            stat = os.stat(archive[0] if archive else path)
+        except OSError:
+            return None
+        key = f"{os.path.abspath(path)}\0{stat.st_mtime_ns}\0{stat.st_size}\0{variant}"
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".png")
+
+    def contains(self, path: str, variant: str = "") -> bool:
+        file_path = self.file_for(path, variant)
+        return file_path is not None and os.path.isfile(file_path)
+
+    def get(self, path: str, variant: str = "") -> Optional[CachedProxy]:
+        """Loads the proxy of an image, or returns None if there is none for its current version."""
+        file_path = self.file_for(path, variant)
+        if file_path is None or not os.path.isfile(file_path):
+            return None
+        image = QImage(file_path)
+        width, _, height = image.text(FULL_SIZE_KEY).partition("x")
+        if image.isNull() or not width.isdigit() or not height.isdigit():
+            return None
+        try:
+            os.utime(file_path)  # Recently used proxies are pruned last
+        except OSError:
+            pass
+        return CachedProxy(image, QSize(int(width), int(height)))
+
+    def put(self, path: str, image: QImage, full_size: QSize, variant: str = "") -> bool:
+        """
+        Stores a proxy of an image, downscaled to max_dimension. The file is
+        written atomically, so readers never see a truncated proxy.
+
+        Returns:
+            True if the proxy was written.
+        """
+        file_path = self.file_for(path, variant)
+        if file_path is None or image.isNull():
+            return False
+        if max(image.width(), image.height()) > self.max_dimension:
+            image = image.scaled(self.max_dimension, self.max_dimension, Qt.KeepAspectRatio,
+                                 Qt.SmoothTransformation)
+        else:
+            image = image.copy()  # setText() must not touch the caller's image
+        image.setText(FULL_SIZE_KEY, f"{full_size.width()}x{full_size.height()}")
+
+        os.makedirs(self.directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, prefix=".proxy-", suffix=".png")
+        os.close(fd)
+        if not image.save(tmp_path, "PNG", PROXY_PNG_QUALITY):
+            os.unlink(tmp_path)
+            return False
+        os.replace(tmp_path, file_path)
+        return True
+
+    def prune(self) -> int:
+        """
+        Deletes the least recently used proxies until the cache fits its budget.
+
+        Returns:
+            The number of proxies deleted.
+        """
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    # Files still being written start with a dot
+                    if entry.name.endswith(".png") and not entry.name.startswith(".") and entry.is_file():
+                        stat = entry.stat()
+                        entries.append((stat.st_mtime, stat.st_size, entry.path))
+        except OSError:
+            return 0
+
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for _, size, file_path in sorted(entries):
+            if total <= self.budget_bytes:
+                break
+            try:
+                os.unlink(file_path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
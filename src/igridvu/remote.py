@@ -0,0 +1,396 @@
+# -*- coding: utf-8 -*-
+"""
+Remote control of the viewer by automation scripts over a local socket.
+
+`igridvu --remote` (or ImageGrid.start_remote_control) listens on a local
+socket. Every request is one line of JSON, either a command object
+
+    {"id": 1, "command": "pixel", "x": 10, "y": 20}
+
+or a list of them (a batch). Every line gets one response line, in the
+order of the requests: {"id": 1, "result": ...} or {"id": 1, "error": "..."},
+or for a batch the list of responses. Batches and pipelined requests are
+handled in one pass per read, so a script can issue hundreds of queries per
+second. Pixel queries are read from the decoded images in memory; they do
+not repaint or update any widget.
+
+The commands are:
+
+    load            pre_path, suffix_file   Loads a dataset.
+    cells                                   The label, path, size and channel of every cell.
+    view_rect                               The visible scene rectangle [x, y, w, h].
+    set_view_rect   rect                    Shows a scene rectangle in all views.
+    set_channel     cell, channel           Shows a channel ("Red", ...; null for all) of a
+                                            cell, given by index or label.
+    pixel           x, y                    The pixel values of every cell (null where the
+                                            pixel is outside the image or not in memory).
+    snapshot        path                    Saves a snapshot of the window; answers once written.
+
+RemoteClient is a small blocking client for scripts running in another
+process. Like the server, it only needs QtCore and QtNetwork, and no event
+loop.
+"""
+import getpass
+import json
+import os
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from PySide6.QtCore import QObject, QRectF
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+from shiboken6 import isValid
+
+from .single_instance import listen_local
+
+# Overrides the name of the local socket
+ENV_VAR = "IGRIDVU_REMOTE_NAME"
+# Requests are single lines; longer ones are dropped
+MAX_REQUEST_BYTES = 16 << 20
+CHANNELS = ("Red", "Green", "Blue", "Alpha")
+# Pixel coordinates are passed to Qt as 32-bit ints
+MIN_COORDINATE, MAX_COORDINATE = -(1 << 31), (1 << 31) - 1
+
+
+def remote_name() -> str:
+    """The name of the local socket, one per user."""
+    name = os.environ.get(ENV_VAR)
+    if name:
+        return name
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = "user"
+    return f"igridvu-remote-{user}"
+
+
+class RemoteError(Exception):
+    """A request that cannot be carried out. The message is sent back as the error."""
+
+
+class PendingResult:
+    """The result of a command that completes later, e.g. a snapshot being written."""
+
+    def __init__(self):
+        self.response: Optional[Dict[str, Any]] = None
+        self.id = None
+        self._on_done: Optional[Callable[[], None]] = None
+
+    def is_done(self) -> bool:
+        return self.response is not None
+
+    def resolve(self, result: Any):
+        self._finish({"id": self.id, "result": result})
+
+    def fail(self, message: str):
+        self._finish({"id": self.id, "error": message})
+
+    def _finish(self, response: Dict[str, Any]):
+        if self.response is None:
+            self.response = response
+            if self._on_done is not None:
+                self._on_done()
+
+
+class _Reply:
+    """The response line to one request line, sent once all its commands are done."""
+
+    def __init__(self, items: List[Any], batch: bool):
+        self.items = items
+        self.batch = batch
+
+    def is_done(self) -> bool:
+        return all(not isinstance(item, PendingResult) or item.is_done() for item in self.items)
+
+    def encode(self) -> bytes:
+        responses = [item.response if isinstance(item, PendingResult) else item for item in self.items]
+        return json.dumps(responses if self.batch else responses[0]).encode("utf-8") + b"\n"
+
+
+def _arg(request: Dict[str, Any], key: str, kind, optional: bool = False):
+    """A typed argument of a request."""
+    if key not in request or request[key] is None:
+        if optional:
+            return None
+        raise RemoteError(f"Missing argument '{key}'")
+    value = request[key]
+    if kind is float and isinstance(value, int) and not isinstance(value, bool):
+        value = float(value)
+    if not isinstance(value, kind) or isinstance(value, bool) and kind is not bool:
+        raise RemoteError(f"Invalid argument '{key}'")
+    return value
+
+
+class RemoteServer(QObject):
+    """Answers JSON commands on a local socket. Commands are added with register()."""
+
+    def __init__(self, name: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.name = name or remote_name()
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+
+    def register(self, command: str, handler: Callable[[Dict[str, Any]], Any]):
+        """
+        Adds a command. The handler is called with the request object and
+        returns a JSON-serializable result, or a PendingResult, and raises
+        RemoteError for invalid requests.
+        """
+        self._handlers[command] = handler
+
+    def commands(self) -> List[str]:
+        return sorted(self._handlers)
+
+    def listen(self) -> bool:
+        """Starts listening, unless another viewer already does (see single_instance.listen_local)."""
+        return listen_local(self._server, self.name)
+
+    def is_listening(self) -> bool:
+        return self._server.isListening()
+
+    def close(self):
+        self._server.close()
+
+    def _on_new_connection(self):
+        while (socket := self._server.nextPendingConnection()) is not None:
+            replies: deque = deque()
+            socket.readyRead.connect(lambda s=socket, r=replies: self._read_requests(s, r))
+            socket.disconnected.connect(socket.deleteLater)
+            self._read_requests(socket, replies)
+
+    def _read_requests(self, socket: QLocalSocket, replies: deque):
+        while socket.canReadLine():
+            line = bytes(socket.readLine(MAX_REQUEST_BYTES)).strip()
+            if line:
+                replies.append(self.execute_line(line, lambda s=socket, r=replies: self._flush(s, r)))
+        if socket.bytesAvailable() >= MAX_REQUEST_BYTES:
+            socket.abort()
+            return
+        self._flush(socket, replies)
+
+    def _flush(self, socket: QLocalSocket, replies: deque):
+        """Writes the responses that are complete, in the order of the requests."""
+        if not isValid(socket):
+            return
+        out = []
+        while replies and replies[0].is_done():
+            out.append(replies.popleft().encode())
+        if out:
+            socket.write(b"".join(out))
+
+    def execute_line(self, line: bytes, on_done: Optional[Callable[[], None]] = None) -> _Reply:
+        """Runs the command (or batch of commands) of one request line."""
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return _Reply([{"id": None, "error": "Invalid JSON"}], False)
+        batch = isinstance(request, list)
+        items = [self.execute(item) for item in (request if batch else [request])]
+        for item in items:
+            if isinstance(item, PendingResult):
+                item._on_done = on_done
+        return _Reply(items, batch)
+
+    def execute(self, request: Any):
+        """Runs one command. Returns its response, or a PendingResult."""
+        if not isinstance(request, dict):
+            return {"id": None, "error": "A request must be a JSON object"}
+        request_id = request.get("id")
+        handler = self._handlers.get(request.get("command"))
+        if handler is None:
+            return {"id": request_id, "error": f"Unknown command: {request.get('command')}"}
+        try:
+            result = handler(request)
+        except RemoteError as e:
+            return {"id": request_id, "error": str(e)}
+        except Exception as e:
+            # Every request gets its response, or the client waits for it and
+            # the responses that follow no longer match their requests
+            return {"id": request_id, "error": f"{type(e).__name__}: {e}"}
+        if isinstance(result, PendingResult):
+            result.id = request_id
+            return result
+        return {"id": request_id, "result": result}
+
+
+def register_grid_commands(server: RemoteServer, grid):
+    """Adds the commands controlling an ImageGrid (see the module docstring)."""
+
+    def cell(request):
+        index = request.get("cell")
+        if isinstance(index, str):
+            labels = [view.label_text for view in grid.views]
+            if index not in labels:
+                raise RemoteError(f"No cell labelled '{index}'")
+            return grid.views[labels.index(index)]
+        if not isinstance(index, int) or isinstance(index, bool) or not 0 <= index < len(grid.views):
+            raise RemoteError("Invalid argument 'cell'")
+        return grid.views[index]
+
+    def load(request):
+        grid.open_dataset(_arg(request, "pre_path", str), _arg(request, "suffix_file", str))
+        return cells(request)
+
+    def cells(_request):
+        result = []
+        for view in grid.views:
+            size = view.image_size()
+            result.append({"label": view.label_text, "path": view.img_path, "loaded": view.has_image(),
+                           "width": size.width(), "height": size.height(),
+                           "channel": view.current_channel()})
+        return result
+
+    def view_rect(_request):
+        rect = grid.current_view_rect()
+        return [rect.x(), rect.y(), rect.width(), rect.height()] if rect is not None else None
+
+    def set_view_rect(request):
+        values = _arg(request, "rect", list)
+        if len(values) != 4 or not all(isinstance(v, (int, float)) and not isinstance(v, bool) for v in values):
+            raise RemoteError("Invalid argument 'rect': expected [x, y, width, height]")
+        rect = QRectF(*values)
+        if rect.width() <= 0 or rect.height() <= 0:
+            raise RemoteError("Invalid argument 'rect': empty rectangle")
+        views = list(grid.views)
+        if grid.is_flipbook_active() and grid.flipbook.view is not None:
+            views.append(grid.flipbook.view)
+        for view in views:
+            view.setViewRect(rect)
+        return view_rect(request)
+
+    def set_channel(request):
+        view = cell(request)
+        channel = _arg(request, "channel", str, optional=True)
+        if channel is None:
+            view.restore_original()
+        elif channel not in CHANNELS:
+            raise RemoteError(f"Invalid channel '{channel}': expected one of {', '.join(CHANNELS)}")
+        else:
+            view.view_channel(channel)
+        return view.current_channel()
+
+    def pixel(request):
+        x, y = _arg(request, "x", int), _arg(request, "y", int)
+        if not (MIN_COORDINATE <= x <= MAX_COORDINATE and MIN_COORDINATE <= y <= MAX_COORDINATE):
+            raise RemoteError("Invalid argument 'x' or 'y': out of range")
+        return [view.pixel_values(x, y) for view in grid.views]
+
+    def snapshot(request):
+        from .snapshot import save_image
+        from .workers import start_task
+        path = _arg(request, "path", str)
+        pending = PendingResult()
+        # Grabbed now, encoded in the background
+        image = grid.grab().toImage()
+        start_task(save_image, image, path, grid.snapshot_png_compression, grid.snapshot_quality,
+                   on_finished=pending.resolve, on_failed=pending.fail)
+        return pending
+
+    for name, handler in (("load", load), ("cells", cells), ("view_rect", view_rect),
+                          ("set_view_rect", set_view_rect), ("set_channel", set_channel),
+                          ("pixel", pixel), ("snapshot", snapshot)):
+        server.register(name, handler)
+
+
+class RemoteClient:
+    """
+    A blocking client for the remote control, e.g. for evaluation scripts:
+
+        with RemoteClient() as viewer:
+            viewer.load("/renders/frame0001_", "/renders/igridvu_suffix.txt")
+            viewer.set_view_rect(100, 100, 64, 64)
+            values = viewer.pixels([(x, 120) for x in range(100, 164)])
+    """
+
+    def __init__(self, name: Optional[str] = None, timeout_ms: int = 30000):
+        """
+        Raises:
+            ConnectionError: If no viewer listens on the socket.
+        """
+        self.timeout_ms = timeout_ms
+        self._socket = QLocalSocket()
+        self._socket.connectToServer(name or remote_name())
+        if not self._socket.waitForConnected(min(timeout_ms, 2000)):
+            raise ConnectionError(f"No viewer is listening: {self._socket.errorString()}")
+        self._next_id = 0
+        self._buffer = b""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        self._socket.disconnectFromServer()
+
+    def call(self, command: str, **args) -> Any:
+        """
+        Runs one command and returns its result.
+
+        Raises:
+            RemoteError: If the viewer could not carry out the command.
+        """
+        return self.batch([(command, args)])[0]
+
+    def batch(self, commands: Sequence[Tuple[str, Dict[str, Any]]]) -> List[Any]:
+        """
+        Runs many commands with one round trip, returning their results in order.
+
+        Raises:
+            RemoteError: For the first command the viewer could not carry out.
+        """
+        requests = []
+        for command, args in commands:
+            self._next_id += 1
+            requests.append({"id": self._next_id, "command": command, **args})
+        self._send(requests)
+        responses = self._receive()
+        for response in responses:
+            if "error" in response:
+                raise RemoteError(response["error"])
+        return [response.get("result") for response in responses]
+
+    def _send(self, request: Any):
+        self._socket.write(json.dumps(request).encode("utf-8") + b"\n")
+        if not self._socket.waitForBytesWritten(self.timeout_ms):
+            raise ConnectionError(f"Cannot send the request: {self._socket.errorString()}")
+
+    def _receive(self) -> Any:
+        while b"\n" not in self._buffer:
+            if not self._socket.waitForReadyRead(self.timeout_ms):
+                raise ConnectionError(f"No response from the viewer: {self._socket.errorString()}")
+            self._buffer += bytes(self._socket.readAll())
+        line, _, self._buffer = self._buffer.partition(b"\n")
+        return json.loads(line)
+
+    def load(self, pre_path: str, suffix_file: str) -> List[Dict[str, Any]]:
+        """Loads a dataset; paths are made absolute. Returns the cells (see cells())."""
+        from .single_instance import absolute_prefix
+        return self.call("load", pre_path=absolute_prefix(pre_path), suffix_file=os.path.abspath(suffix_file))
+
+    def cells(self) -> List[Dict[str, Any]]:
+        return self.call("cells")
+
+    def view_rect(self) -> Optional[List[float]]:
+        return self.call("view_rect")
+
+    def set_view_rect(self, x: float, y: float, width: float, height: float) -> List[float]:
+        """Shows a scene rectangle in all views. Returns the visible rectangle, fitted to the views."""
+        return self.call("set_view_rect", rect=[x, y, width, height])
+
+    def set_channel(self, cell, channel: Optional[str]) -> Optional[str]:
+        """Shows a channel of a cell (index or label), or the original image for None."""
+        return self.call("set_channel", cell=cell, channel=channel)
+
+    def pixel(self, x: int, y: int) -> List[Optional[List[int]]]:
+        """The [r, g, b] or [r, g, b, a] values of every cell at an image pixel."""
+        return self.call("pixel", x=x, y=y)
+
+    def pixels(self, points: Sequence[Tuple[int, int]]) -> List[List[Optional[List[int]]]]:
+        """The values of every cell at many pixels, queried in one batch."""
+        return self.batch([("pixel", {"x": x, "y": y}) for x, y in points])
+
+    def snapshot(self, path: str) -> str:
+        """Saves a snapshot of the window, returning once the file is written."""
+        return self.call("snapshot", path=os.path.abspath(path))
@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+"""
+Sequences of numbered datasets, e.g. one dataset per rendered frame.
+
+A prefix such as `/renders/frame0001_` or `/renders/frame0001/` is part of a
+sequence if its last run of digits can be replaced to name other datasets
+with the same suffixes: `frame0002_`, `frame0003_`, ... The sequence is
+found by matching the directory listing (see suffixes.list_directory)
+against the prefix with its number replaced by a digit pattern, so numbers
+may have gaps and any zero padding.
+"""
+import os
+import re
+from typing import List
+
+from .suffixes import list_directory, split_prefix
+
+_LAST_DIGITS = re.compile(r"(\d+)(\D*)$")
+
+
+def _numbered(names, head: str, tail: str, whole: bool = False) -> List[str]:
+    """
+    The names that start with (or with whole, are) head + digits + tail, as
+    head + digits + tail in numerical order.
+    """
+    pattern = re.compile(re.escape(head) + r"(\d+)" + re.escape(tail))
+    match_name = pattern.fullmatch if whole else pattern.match
+    numbers = {match.group(1) for name in names if (match := match_name(name))}
+    return [head + digits + tail for digits in sorted(numbers, key=lambda d: (int(d), d))]
+
+
+def sequence_prefixes(pre_path: str) -> List[str]:
+    """
+    Returns the prefixes of the sequence a prefix belongs to, in numerical
+    order, or an empty list if the prefix has no number. The number is
+    looked for in the file name prefix, or for a directory prefix in the
+    name of the directory.
+    """
+    directory, name_prefix = split_prefix(pre_path)
+    if name_prefix:
+        match = _LAST_DIGITS.search(name_prefix)
+        if match is None:
+            return []
+        listing = list_directory(directory)
+        if listing is None:
+            return []
+        head, tail = name_prefix[:match.start(1)], name_prefix[match.end(1):]
+        base = pre_path[:len(pre_path) - len(name_prefix)]
+        return [base + name for name in _numbered(listing.with_prefix(head), head, tail)]
+
+    # A directory per dataset: the number is in the directory name
+    stripped = pre_path.rstrip("/" + os.sep)
+    trailing = pre_path[len(stripped):]
+    parent, name = os.path.split(stripped)
+    match = _LAST_DIGITS.search(name)
+    if match is None:
+        return []
+    head, tail = name[:match.start(1)], name[match.end(1):]
+    try:
+        with os.scandir(parent or ".") as it:
+            names = [entry.name for entry in it if entry.name.startswith(head) and entry.is_dir()]
+    except OSError:
+        return []
+    base = stripped[:len(stripped) - len(name)]
+    return [base + name + trailing for name in _numbered(names, head, tail, whole=True)]
+
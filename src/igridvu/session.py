@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+"""
+Saving and restoring the state of the viewer between launches.
+
+A session records the dataset (prefix and suffix file), the number of
+columns, the zoom rectangle, the channel shown by every cell and the window
+geometry. It is written to the user's cache directory when the window is
+closed, and `igridvu --last-session` reopens it. The cells of a restored
+session first show their proxies from the persistent proxy cache (see
+proxy_cache.py), so the previous state reappears before any image is decoded.
+"""
+import json
+import os
+import tempfile
+from typing import List, NamedTuple, Optional, Tuple
+
+SESSION_VERSION = 1
+SESSION_FILE_NAME = "session.json"
+
+
+def default_session_path() -> str:
+    """Returns the session location in the user's cache directory."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "igridvu", SESSION_FILE_NAME)
+
+
+class Session(NamedTuple):
+    """The state of the viewer saved between launches."""
+    pre_path: str
+    suffix_file: str
+    columns: int
+    # The visible scene rectangle (x, y, width, height), or None for the whole images
+    view_rect: Optional[Tuple[float, float, float, float]]
+    # The channel shown by each cell, None for the original image
+    channels: List[Optional[str]]
+    # QWidget.saveGeometry() encoded as base64
+    geometry: str
+
+
+def save_session(session: Session, path: Optional[str] = None):
+    """Writes a session atomically, so a crash never leaves a truncated file."""
+    path = path or default_session_path()
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".session-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"version": SESSION_VERSION, **session._asdict()}, f)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def load_session(path: Optional[str] = None) -> Optional[Session]:
+    """Reads a saved session. Returns None if there is none, or it cannot be read."""
+    path = path or default_session_path()
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(data, dict) or data.get("version") != SESSION_VERSION:
+        return None
+    try:
+        rect = data["view_rect"]
+        return Session(pre_path=str(data["pre_path"]), suffix_file=str(data["suffix_file"]),
+                       columns=max(1, int(data["columns"])),
+                       view_rect=tuple(float(value) for value in rect) if rect and len(rect) == 4 else None,
+                       channels=[str(channel) if channel else None for channel in data["channels"]],
+                       geometry=str(data["geometry"]))
+    except (KeyError, TypeError, ValueError):
+        return None
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+Single-instance mode: hands datasets to a viewer that is already running.
+
+Scripts that call `igridvu --single-instance <prefix>` repeatedly would pay
+for the Qt start-up and lose the decoded images and directory listings with
+every call. Instead, the first call starts the viewer, which listens on a
+local socket (a Unix domain socket, or a named pipe on Windows). Later calls
+connect to it, send the prefix and suffix file as one line of JSON, and exit
+without loading the GUI stack: only QtCore and QtNetwork are imported here.
+The running viewer loads the dataset and raises its window.
+"""
+import getpass
+import json
+import os
+from typing import Optional
+
+from PySide6.QtCore import QObject, Signal as pyqtSignal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+# Overrides the name of the local socket, e.g. to run separate instances
+ENV_VAR = "IGRIDVU_INSTANCE_NAME"
+# How long a forwarding call waits for the running instance
+FORWARD_TIMEOUT_MS = 500
+# Requests are single lines; longer ones are dropped
+MAX_REQUEST_BYTES = 1 << 20
+
+
+def server_name() -> str:
+    """The name of the local socket, one per user."""
+    name = os.environ.get(ENV_VAR)
+    if name:
+        return name
+    try:
+        user = getpass.getuser()
+    except (KeyError, OSError):
+        user = "user"
+    return f"igridvu-{user}"
+
+
+def absolute_prefix(pre_path: str) -> str:
+    """Makes a prefix absolute for another process, keeping a trailing separator (a directory prefix)."""
+    trailing = os.sep if pre_path.endswith(("/", os.sep)) else ""
+    return os.path.abspath(pre_path) + trailing
+
+
+def listen_local(server: QLocalServer, name: str, probe_timeout_ms: int = FORWARD_TIMEOUT_MS) -> bool:
+    """
+    Starts a local server that only the current user can connect to. A
+    socket left behind by a process that crashed is replaced, but one that
+    still accepts connections is not: its owner may only be busy, e.g.
+    loading a grid, and would never receive another request.
+    """
+    # Probed first: with access options, listen() moves its socket over an existing one
+    probe = QLocalSocket()
+    probe.connectToServer(name)
+    if probe.waitForConnected(probe_timeout_ms):
+        probe.abort()
+        return False
+    QLocalServer.removeServer(name)
+    server.setSocketOptions(QLocalServer.UserAccessOption)
+    return server.listen(name)
+
+
+def forward_open(pre_path: str, suffix_file: str, name: Optional[str] = None,
+                 timeout_ms: int = FORWARD_TIMEOUT_MS) -> bool:
+    """
+    Asks a running instance to open a dataset. Paths are made absolute, as
+    the instance may run in another directory.
+
+    Returns:
+        True if an instance took the request, False if none is running.
+    """
+    request = {"command": "open", "pre_path": absolute_prefix(pre_path),
+               "suffix_file": os.path.abspath(suffix_file) if suffix_file else ""}
+    socket = QLocalSocket()
+    socket.connectToServer(name or server_name())
+    if not socket.waitForConnected(timeout_ms):
+        return False
+    socket.write(json.dumps(request).encode("utf-8") + b"\n")
+    # The request stays readable by the instance after we disconnect
+    written = socket.waitForBytesWritten(timeout_ms)
+    socket.disconnectFromServer()
+    return written
+
+
+class InstanceServer(QObject):
+    """Listens for datasets forwarded by later calls (see forward_open)."""
+
+    # The absolute prefix and suffix file of a dataset to open
+    openRequested = pyqtSignal(str, str)
+
+    def __init__(self, name: Optional[str] = None, parent=None):
+        super().__init__(parent)
+        self.name = name or server_name()
+        self._server = QLocalServer(self)
+        self._server.newConnection.connect(self._on_new_connection)
+
+    def listen(self) -> bool:
+        """Starts listening, unless another instance already does (see listen_local)."""
+        return listen_local(self._server, self.name)
+
+    def is_listening(self) -> bool:
+        return self._server.isListening()
+
+    def close(self):
+        self._server.close()
+
+    def _on_new_connection(self):
+        while (socket := self._server.nextPendingConnection()) is not None:
+            socket.readyRead.connect(lambda s=socket: self._read_requests(s))
+            socket.disconnected.connect(socket.deleteLater)
+            # The request may have arrived with the connection
+            self._read_requests(socket)
+
+    def _read_requests(self, socket: QLocalSocket):
+        while socket.canReadLine():
+            line = bytes(socket.readLine(MAX_REQUEST_BYTES)).strip()
+            if line:
+                self._handle(line)
+        if socket.bytesAvailable() >= MAX_REQUEST_BYTES:
+            socket.abort()
+
+    def _handle(self, line: bytes):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return
+        if not isinstance(request, dict) or request.get("command") != "open":
+            return
+        pre_path, suffix_file = request.get("pre_path"), request.get("suffix_file")
+        if isinstance(pre_path, str) and pre_path and isinstance(suffix_file, str):
+            self.openRequested.emit(pre_path, suffix_file)
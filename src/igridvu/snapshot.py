@@ -0,0 +1,262 @@
+# -*- coding: utf-8 -*-
+"""
+Snapshot encoding and export of the image grid.
+
+Snapshots of the window are encoded from a QImage, which (unlike QPixmap) may
+be used outside the GUI thread, so encoding can run in a background worker.
+
+The full-resolution export composites the grid in horizontal bands that are
+compressed and appended to the output file one by one, so the complete canvas
+never has to be held in memory. This is what makes exporting very large grids
+possible. Cells whose view only holds a proxy are decoded at full resolution
+by the export itself, one grid row at a time.
+"""
+import math
+import os
+import struct
+import zlib
+from typing import Callable, Dict, NamedTuple, Optional, Sequence, Tuple, Union
+
+from PySide6.QtCore import Qt, QRectF, QSize
+from PySide6.QtGui import QImage, QImageWriter, QPainter, QColor, QFont
+from PySide6.QtWidgets import QDialog, QDialogButtonBox, QFormLayout, QSpinBox
+
+
+class DeferredImage(NamedTuple):
+    """An image that is decoded only when the export reaches its grid row."""
+    size: QSize
+    load: Callable[[], QImage]
+
+
+# (label, image) for every cell. The image is None for cells that failed to load.
+Cell = Tuple[str, Union[QImage, DeferredImage, None]]
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+BACKGROUND_COLOR = QColor(40, 40, 40)
+LABEL_FONT_SIZE = 14
+
+
+def _png_chunk(tag: bytes, data: bytes) -> bytes:
+    """Encodes a single PNG chunk (length, tag, data, CRC)."""
+    crc = zlib.crc32(tag + data) & 0xFFFFFFFF
+    return struct.pack(">I", len(data)) + tag + data + struct.pack(">I", crc)
+
+
+def grid_geometry(cells: Sequence[Cell], columns: int, scale: float = 1.0) -> Tuple[int, int, int, int]:
+    """
+    Computes the layout of the stitched image.
+
+    Every cell is as large as the largest (scaled) image, so cells line up in
+    a regular grid.
+
+    Returns:
+        (cell_width, cell_height, total_width, total_height)
+    """
+    sizes = [image.size() if isinstance(image, QImage) else image.size
+             for _, image in cells if image is not None]
+    sizes = [size for size in sizes if not size.isEmpty()]
+    widths = [size.width() for size in sizes]
+    heights = [size.height() for size in sizes]
+    cell_width = max(1, math.ceil(max(widths, default=1) * scale))
+    cell_height = max(1, math.ceil(max(heights, default=1) * scale))
+
+    columns = max(1, min(columns, len(cells))) if cells else 1
+    rows = max(1, math.ceil(len(cells) / columns))
+    return cell_width, cell_height, cell_width * columns, cell_height * rows
+
+
+def _load_rows(cells: Sequence[Cell], loaded: Dict[int, QImage], columns: int, first_row: int, last_row: int):
+    """
+    Decodes the deferred images of the grid rows [first_row, last_row] into
+    loaded (by cell index), and releases those of the rows above, which are
+    already written.
+    """
+    for i, (_, image) in enumerate(cells):
+        if isinstance(image, DeferredImage):
+            row = i // columns
+            if row < first_row:
+                loaded.pop(i, None)
+            elif row <= last_row and i not in loaded:
+                loaded[i] = image.load()
+
+
+def _draw_label(painter: QPainter, rect: QRectF, text: str):
+    """Draws a label box similar to the overlay labels of ZoomableView."""
+    metrics = painter.fontMetrics()
+    margin = 5
+    box_height = metrics.height() + 8
+    box = QRectF(rect.x() + margin, rect.y() + margin, rect.width() - 2 * margin, box_height)
+    painter.fillRect(box, QColor(0, 0, 0, 160))
+    painter.setPen(QColor(Qt.white))
+    painter.drawText(box, Qt.AlignCenter, text)
+
+
+def render_band(cells: Sequence[Cell], columns: int, scale: float,
+                top: int, band_height: int, loaded: Optional[Dict[int, QImage]] = None) -> QImage:
+    """
+    Renders the rows [top, top + band_height) of the stitched grid.
+
+    Only the part of each image that intersects the band is drawn, so the
+    cost of a band is proportional to its own size. Deferred images are taken
+    from loaded, by cell index, and drawn as missing if they are not there.
+    """
+    cell_width, cell_height, total_width, _ = grid_geometry(cells, columns, scale)
+    columns = max(1, min(columns, len(cells)))
+    band = QImage(total_width, band_height, QImage.Format_RGB888)
+    band.fill(BACKGROUND_COLOR)
+
+    painter = QPainter(band)
+    painter.setRenderHint(QPainter.SmoothPixmapTransform, scale != 1.0)
+    font = QFont()
+    font.setPixelSize(LABEL_FONT_SIZE)
+    painter.setFont(font)
+    painter.translate(0, -top)
+
+    band_rect = QRectF(0, top, total_width, band_height)
+    for i, (label, image) in enumerate(cells):
+        cell_rect = QRectF((i % columns) * cell_width, (i // columns) * cell_height,
+                           cell_width, cell_height)
+        if not cell_rect.intersects(band_rect):
+            continue
+
+        if isinstance(image, DeferredImage):
+            image = loaded.get(i) if loaded else None
+        if image is not None and not image.isNull():
+            # Center the image horizontally, align it to the top (like the grid).
+            target = QRectF(cell_rect.x() + (cell_width - image.width() * scale) / 2,
+                            cell_rect.y(), image.width() * scale, image.height() * scale)
+            visible = target.intersected(band_rect)
+            if not visible.isEmpty():
+                source = QRectF((visible.x() - target.x()) / scale,
+                                (visible.y() - target.y()) / scale,
+                                visible.width() / scale, visible.height() / scale)
+                painter.drawImage(visible, image, source)
+        else:
+            painter.setPen(QColor(Qt.red))
+            painter.drawText(cell_rect, Qt.AlignCenter, "No image")
+
+        label_area = QRectF(cell_rect.x(), cell_rect.y(), cell_width, LABEL_FONT_SIZE * 3)
+        if label and label_area.intersects(band_rect):
+            _draw_label(painter, cell_rect, label)
+
+    painter.end()
+    return band
+
+
+def write_stitched_png(cells: Sequence[Cell], file_path: str, columns: int,
+                       scale: float = 1.0, band_height: int = 256, compression: int = 6,
+                       progress: Optional[Callable[[int, int], None]] = None) -> str:
+    """
+    Writes the grid of cells to a PNG file, streaming it band by band.
+
+    Args:
+        cells: The (label, image) pairs in grid order. Deferred images are
+            decoded when the bands reach their row.
+        file_path: The output PNG file.
+        columns: The number of grid columns.
+        scale: Resolution relative to the native image size.
+        band_height: Number of output rows composited at a time.
+        compression: zlib compression level (0-9).
+        progress: Optional callback receiving (rows_written, total_rows).
+
+    Returns:
+        The path of the written file.
+    """
+    if not cells:
+        raise ValueError("Nothing to export")
+    if scale <= 0:
+        raise ValueError(f"Invalid scale: {scale}")
+
+    _, cell_height, total_width, total_height = grid_geometry(cells, columns, scale)
+    grid_columns = max(1, min(columns, len(cells)))
+    row_bytes = total_width * 3
+    loaded: Dict[int, QImage] = {}
+    compressor = zlib.compressobj(compression)
+
+    with open(file_path, "wb") as f:
+        f.write(PNG_SIGNATURE)
+        # 8-bit RGB, default compression/filter, no interlacing
+        f.write(_png_chunk(b"IHDR", struct.pack(">IIBBBBB", total_width, total_height, 8, 2, 0, 0, 0)))
+
+        for top in range(0, total_height, band_height):
+            rows = min(band_height, total_height - top)
+            _load_rows(cells, loaded, grid_columns, top // cell_height, (top + rows - 1) // cell_height)
+            band = render_band(cells, columns, scale, top, rows, loaded)
+            bits = memoryview(band.constBits())
+            stride = band.bytesPerLine()
+
+            raw = bytearray()
+            for y in range(rows):
+                raw.append(0)  # Filter type "None"
+                raw += bits[y * stride:y * stride + row_bytes]
+            data = compressor.compress(bytes(raw))
+            if data:
+                f.write(_png_chunk(b"IDAT", data))
+            if progress:
+                progress(top + rows, total_height)
+
+        f.write(_png_chunk(b"IDAT", compressor.flush()))
+        f.write(_png_chunk(b"IEND", b""))
+
+    return file_path
+
+
+def png_compression_to_quality(level: int) -> int:
+    """
+    Maps a zlib compression level (0-9) to the quality value Qt's PNG writer expects.
+
+    Qt derives the compression level from the quality as (100 - quality) * 9 / 91.
+    """
+    level = max(0, min(9, level))
+    return 100 - math.ceil(level * 91 / 9)
+
+
+def save_image(image: QImage, file_path: str, png_compression: int = 6, quality: int = 90) -> str:
+    """
+    Encodes an image to a file. Safe to call from a worker thread.
+
+    The format is derived from the file extension. For PNG files the
+    png_compression level (0-9) is used, for lossy formats (JPEG, WebP)
+    the quality (0-100).
+
+    Returns:
+        The path of the written file.
+
+    Raises:
+        IOError: If the image could not be written.
+    """
+    writer = QImageWriter(file_path)
+    # A writer built from a path leaves format() empty until it writes
+    if os.path.splitext(file_path)[1].lower() == ".png":
+        writer.setQuality(png_compression_to_quality(png_compression))
+    else:
+        writer.setQuality(quality)
+
+    if not writer.write(image):
+        raise IOError(writer.errorString())
+    return file_path
+
+
+class SnapshotSettingsDialog(QDialog):
+    """A dialog for choosing the snapshot compression and quality."""
+
+    def __init__(self, png_compression: int, quality: int, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Snapshot Settings")
+
+        layout = QFormLayout(self)
+        self.compression_spin = QSpinBox()
+        self.compression_spin.setRange(0, 9)
+        self.compression_spin.setValue(png_compression)
+        self.compression_spin.setToolTip("0 = fastest, largest file; 9 = slowest, smallest file")
+        layout.addRow("PNG compression level:", self.compression_spin)
+
+        self.quality_spin = QSpinBox()
+        self.quality_spin.setRange(0, 100)
+        self.quality_spin.setValue(quality)
+        layout.addRow("JPEG/WebP quality:", self.quality_spin)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addRow(button_box)
@@ -1,20 +1,223 @@
 # -*- coding: utf-8 -*-
 """
 A dialog for editing the list of image suffixes.
+
+The list is backed by a QAbstractListModel, so the editor stays responsive
+with suffix files of 100,000 lines: the view fetches rows in batches as it
+scrolls, and bulk operations (removing a selection, pasting, sorting,
+removing duplicates) change the model in one step instead of item by item.
 """
+import re
 from itertools import islice
-from PySide6.QtWidgets import (QDialog, QVBoxLayout, QListWidget, QListWidgetItem,
+from typing import Iterable, List, Optional
+
+from PySide6.QtWidgets import (QDialog, QVBoxLayout, QListView, QApplication,
                              QPushButton, QHBoxLayout, QDialogButtonBox,
-                             QAbstractItemView, QMessageBox)
-from PySide6.QtCore import Qt
+                             QAbstractItemView, QMessageBox, QLabel)
+from PySide6.QtGui import QAction, QKeySequence
+from PySide6.QtCore import (Qt, QAbstractListModel, QModelIndex, QPersistentModelIndex, QTimer,
+                            Signal as pyqtSignal)
+
+from .suffixes import (is_pattern, match_pattern, split_prefix, list_directory,
+                       natural_key, write_suffix_file)
+
+
+class SuffixListModel(QAbstractListModel):
+    """A list of suffix entries. Rows are exposed to views in batches (lazy loading)."""
+
+    FETCH_BATCH = 1000
+
+    # Emitted whenever the number of entries changes
+    countChanged = pyqtSignal(int)
+
+    def __init__(self, entries: Optional[List[str]] = None, parent=None):
+        super().__init__(parent)
+        self._entries: List[str] = list(entries or [])
+        self._fetched = min(len(self._entries), self.FETCH_BATCH)
+
+    # --- Qt model interface ---
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._fetched
+
+    def canFetchMore(self, parent=QModelIndex()) -> bool:
+        return not parent.isValid() and self._fetched < len(self._entries)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH, len(self._entries) - self._fetched)
+        if count > 0:
+            self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+            self._fetched += count
+            self.endInsertRows()
+
+    def data(self, index: QModelIndex, role=Qt.DisplayRole):
+        if index.isValid() and role in (Qt.DisplayRole, Qt.EditRole):
+            return self._entries[index.row()]
+        return None
+
+    def setData(self, index: QModelIndex, value, role=Qt.EditRole) -> bool:
+        # A drop sets the moved entries with setItemData(), DisplayRole included
+        if not index.isValid() or role not in (Qt.EditRole, Qt.DisplayRole):
+            return False
+        text = str(value).strip()
+        if not text:
+            # An emptied entry is removed, after the editor has finished committing.
+            # A persistent index follows the entry if rows move in the meantime.
+            entry = QPersistentModelIndex(index)
+            QTimer.singleShot(0, self, lambda: entry.isValid() and self.remove_rows([entry.row()]))
+            return False
+        self._entries[index.row()] = text
+        self.dataChanged.emit(index, index, [Qt.DisplayRole, Qt.EditRole])
+        return True
+
+    def flags(self, index: QModelIndex):
+        if not index.isValid():
+            return Qt.ItemIsDropEnabled  # Allows dropping between rows
+        return (Qt.ItemIsSelectable | Qt.ItemIsEnabled | Qt.ItemIsEditable
+                | Qt.ItemIsDragEnabled)
+
+    def supportedDropActions(self):
+        return Qt.MoveAction
+
+    def insertRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
+        # Used by drag and drop, which then sets the moved entries via setItemData
+        if parent.isValid() or row < 0 or row > self._fetched:
+            return False
+        self.beginInsertRows(QModelIndex(), row, row + count - 1)
+        self._entries[row:row] = [""] * count
+        self._fetched += count
+        self.endInsertRows()
+        self.countChanged.emit(len(self._entries))
+        return True
+
+    def removeRows(self, row: int, count: int, parent=QModelIndex()) -> bool:
+        if parent.isValid() or row < 0 or row + count > self._fetched:
+            return False
+        self.beginRemoveRows(QModelIndex(), row, row + count - 1)
+        del self._entries[row:row + count]
+        self._fetched -= count
+        self.endRemoveRows()
+        self.countChanged.emit(len(self._entries))
+        return True
+
+    def moveRows(self, source_parent: QModelIndex, source_row: int, count: int,
+                 destination_parent: QModelIndex, destination_child: int) -> bool:
+        # Used by drag and drop (InternalMove): the entries move as they are
+        if (source_parent.isValid() or destination_parent.isValid() or count <= 0 or source_row < 0
+                or source_row + count > self._fetched or not 0 <= destination_child <= self._fetched
+                or source_row <= destination_child <= source_row + count):
+            return False
+        self.beginMoveRows(QModelIndex(), source_row, source_row + count - 1, QModelIndex(), destination_child)
+        moved = self._entries[source_row:source_row + count]
+        del self._entries[source_row:source_row + count]
+        insert_at = destination_child - count if destination_child > source_row else destination_child
+        self._entries[insert_at:insert_at] = moved
+        self.endMoveRows()
+        return True
+
+    # --- Bulk operations ---
+
+    def fetch_all(self):
+        """Exposes all rows to views, e.g. before selecting all of them."""
+        if self.canFetchMore():
+            self.beginInsertRows(QModelIndex(), self._fetched, len(self._entries) - 1)
+            self._fetched = len(self._entries)
+            self.endInsertRows()
+
+    def entries(self) -> List[str]:
+        """Returns all entries, including those not yet fetched by a view."""
+        return list(self._entries)
+
+    def entry_count(self) -> int:
+        return len(self._entries)
+
+    def set_entries(self, entries: Iterable[str]):
+        self.beginResetModel()
+        self._entries = list(entries)
+        self._fetched = min(len(self._entries), max(self._fetched, self.FETCH_BATCH))
+        self.endResetModel()
+        self.countChanged.emit(len(self._entries))
+
+    def append_entries(self, entries: List[str]) -> int:
+        """Appends entries in one step and returns the row of the first one."""
+        first = len(self._entries)
+        if not entries:
+            return first
+        if self._fetched == first:
+            # Everything is fetched, so the new rows are visible right away
+            self.beginInsertRows(QModelIndex(), first, first + len(entries) - 1)
+            self._entries.extend(entries)
+            self._fetched = len(self._entries)
+            self.endInsertRows()
+        else:
+            self._entries.extend(entries)  # Fetched later, like the rest of the tail
+        self.countChanged.emit(len(self._entries))
+        return first
+
+    def remove_rows(self, rows: Iterable[int]):
+        """Removes the given rows, as few contiguous ranges as possible."""
+        rows = sorted(set(r for r in rows if 0 <= r < self._fetched))
+        if not rows:
+            return
+        ranges = []
+        start = prev = rows[0]
+        for row in rows[1:]:
+            if row != prev + 1:
+                ranges.append((start, prev))
+                start = row
+            prev = row
+        ranges.append((start, prev))
+
+        if len(ranges) > 100:
+            # Many scattered rows: one reset is cheaper than many notifications
+            removed = set(rows)
+            self._fetched -= len(rows)
+            self.set_entries(e for i, e in enumerate(self._entries) if i not in removed)
+            return
+        for first, last in reversed(ranges):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self._entries[first:last + 1]
+            self._fetched -= last - first + 1
+            self.endRemoveRows()
+        self.countChanged.emit(len(self._entries))
+
+    def sort_entries(self):
+        """Sorts the entries in natural order (`v2` before `v10`)."""
+        self.set_entries(sorted(self._entries, key=natural_key))
+
+    def remove_duplicates(self) -> int:
+        """Keeps the first occurrence of every entry. Returns the number removed."""
+        unique = list(dict.fromkeys(self._entries))
+        removed = len(self._entries) - len(unique)
+        if removed:
+            self.set_entries(unique)
+        return removed
+
+
+class SuffixListView(QListView):
+    """A list view whose Select All also selects the rows not fetched yet."""
+
+    def selectAll(self):
+        model = self.model()
+        if isinstance(model, SuffixListModel):
+            model.fetch_all()
+        super().selectAll()
 
 
 class SuffixEditorDialog(QDialog):
     """A dialog for editing a list of suffixes from a file."""
 
-    def __init__(self, suffix_file_path: str, max_suffixes: int, parent=None):
+    def __init__(self, suffix_file_path: str, max_suffixes: int, parent=None, pre_path: str = ""):
+        """
+        Args:
+            pre_path: The image prefix. If given, the number of files matched
+                by the selected glob or regex entry is shown.
+        """
         super().__init__(parent)
         self.suffix_file_path = suffix_file_path
+        self.pre_path = pre_path
         self.max_suffixes = max_suffixes
         self.setWindowTitle("Edit Suffixes")
         self.setMinimumSize(400, 500)
@@ -22,23 +225,41 @@ class SuffixEditorDialog(QDialog):
         # Main layout
         layout = QVBoxLayout(self)
 
-        # List widget for suffixes
-        self.list_widget = QListWidget()
-        self.list_widget.setDragDropMode(QAbstractItemView.InternalMove)
-        self.list_widget.itemChanged.connect(self._on_item_changed)
-        self.list_widget.model().rowsMoved.connect(self._update_button_states)
-        self.list_widget.model().rowsRemoved.connect(self._update_button_states)
-        layout.addWidget(self.list_widget)
+        # List view for suffixes
+        self.model = SuffixListModel(parent=self)
+        self.list_view = SuffixListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setDragDropMode(QAbstractItemView.InternalMove)
+        self.list_view.setDefaultDropAction(Qt.MoveAction)
+        # All rows have the same height, so the view never measures every row
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.selectionModel().currentChanged.connect(lambda *_: self._update_match_label())
+        self.model.dataChanged.connect(lambda *_: self._update_match_label())
+        self.model.countChanged.connect(self._update_button_states)
+        self.model.modelReset.connect(self._update_button_states)
+        layout.addWidget(self.list_view)
+
+        # Shows what a pattern entry expands to
+        self.match_label = QLabel()
+        layout.addWidget(self.match_label)
 
         # Button layout
         button_layout = QHBoxLayout()
         self.add_button = QPushButton("Add Suffix")
         self.remove_button = QPushButton("Remove Selected")
-        button_layout.addWidget(self.add_button)
-        button_layout.addWidget(self.remove_button)
+        self.paste_button = QPushButton("Paste")
+        self.sort_button = QPushButton("Sort")
+        self.dedupe_button = QPushButton("Remove Duplicates")
+        for button in (self.add_button, self.remove_button, self.paste_button,
+                       self.sort_button, self.dedupe_button):
+            button_layout.addWidget(button)
         button_layout.addStretch()
         layout.addLayout(button_layout)
 
+        self.count_label = QLabel()
+        layout.addWidget(self.count_label)
+
         # Dialog buttons (Save/Cancel)
         self.button_box = QDialogButtonBox(QDialogButtonBox.Save | QDialogButtonBox.Cancel)
         layout.addWidget(self.button_box)
@@ -46,14 +267,25 @@ class SuffixEditorDialog(QDialog):
         # Connections
         self.add_button.clicked.connect(self._add_suffix)
         self.remove_button.clicked.connect(self._remove_suffix)
+        self.paste_button.clicked.connect(self._paste_suffixes)
+        self.sort_button.clicked.connect(self.model.sort_entries)
+        self.dedupe_button.clicked.connect(self._remove_duplicates)
         self.button_box.accepted.connect(self._save_and_accept)
         self.button_box.rejected.connect(self.reject)
 
+        for shortcut, slot in ((QKeySequence.Paste, self._paste_suffixes),
+                               (QKeySequence.Delete, self._remove_suffix)):
+            action = QAction(self.list_view)
+            action.setShortcut(shortcut)
+            action.setShortcutContext(Qt.WidgetShortcut)
+            action.triggered.connect(slot)
+            self.list_view.addAction(action)
+
         self._load_suffixes()
         self._update_button_states()
 
     def _load_suffixes(self):
-        """Loads suffixes from the file into the list widget."""
+        """Loads suffixes from the file into the model."""
         try:
             with open(self.suffix_file_path, 'r', encoding='utf-8') as f:
                 # Security: Use islice to prevent reading a massive file into memory.
@@ -66,10 +298,7 @@ class SuffixEditorDialog(QDialog):
                         f"The suffix file contains more than {self.max_suffixes} entries.\n"
                         f"Only the first {self.max_suffixes} have been loaded into the editor."
                     )
-
-                for suffix in suffixes:
-                    item = QListWidgetItem(suffix, self.list_widget)
-                    item.setFlags(item.flags() | Qt.ItemIsEditable)
+            self.model.set_entries(suffixes)
         except FileNotFoundError:
             pass  # It's okay if the file doesn't exist yet.
         except Exception as e:
@@ -77,46 +306,69 @@ class SuffixEditorDialog(QDialog):
                                  f"Could not load from {self.suffix_file_path}:\n{e}")
 
     def _add_suffix(self):
-        """Adds a new, empty suffix to the list for editing."""
-        if self.list_widget.count() >= self.max_suffixes:
+        """Adds a new suffix to the end of the list for editing."""
+        if self.model.entry_count() >= self.max_suffixes:
             QMessageBox.warning(self, "Limit Reached",
                                 f"The maximum number of suffixes ({self.max_suffixes}) has been reached.")
             return
 
-        new_item = QListWidgetItem("new_suffix", self.list_widget)
-        new_item.setFlags(new_item.flags() | Qt.ItemIsEditable)
-        self.list_widget.setCurrentItem(new_item)
-        self.list_widget.editItem(new_item)
-        self._update_button_states()
+        row = self.model.append_entries(["new_suffix"])
+        while self.model.rowCount() <= row:
+            self.model.fetchMore()
+        index = self.model.index(row)
+        self.list_view.setCurrentIndex(index)
+        self.list_view.scrollTo(index)
+        self.list_view.edit(index)
 
     def _remove_suffix(self):
-        """Removes the currently selected suffix from the list."""
-        for item in self.list_widget.selectedItems():
-            self.list_widget.takeItem(self.list_widget.row(item))
-
-    def _on_item_changed(self, item: QListWidgetItem):
-        """Ensure item text is stripped of whitespace and not empty."""
-        stripped_text = item.text().strip()
-        if not stripped_text:
-            self.list_widget.takeItem(self.list_widget.row(item))
-        elif stripped_text != item.text():
-            item.setText(stripped_text)
-        self._update_button_states()
+        """Removes all selected suffixes."""
+        rows = [index.row() for index in self.list_view.selectionModel().selectedRows()]
+        self.model.remove_rows(rows)
+
+    def _paste_suffixes(self):
+        """Appends the lines of the clipboard as suffixes."""
+        lines = [line.strip() for line in QApplication.clipboard().text().splitlines()]
+        lines = [line for line in lines if line]
+        room = self.max_suffixes - self.model.entry_count()
+        if len(lines) > room:
+            QMessageBox.warning(self, "Limit Reached",
+                                f"The maximum number of suffixes ({self.max_suffixes}) has been reached.\n"
+                                f"Only {max(room, 0)} of the {len(lines)} pasted lines were added.")
+            lines = lines[:max(room, 0)]
+        self.model.append_entries(lines)
 
-    def _update_button_states(self):
+    def _remove_duplicates(self):
+        removed = self.model.remove_duplicates()
+        self.count_label.setText(f"{self.model.entry_count()} entries ({removed} duplicates removed)")
+
+    def _update_match_label(self):
+        """Shows how many files in the prefix directory the selected pattern matches."""
+        index = self.list_view.currentIndex()
+        text = index.data() if index.isValid() else None
+        if not text or not self.pre_path or not is_pattern(text):
+            self.match_label.clear()
+            return
+        directory, name_prefix = split_prefix(self.pre_path)
+        listing = list_directory(directory)  # Shared with the grid, usually cached
+        candidates = listing.with_prefix(name_prefix) if listing else []
+        try:
+            count = len(match_pattern(text, candidates, name_prefix))
+        except re.error as e:
+            self.match_label.setText(f"Invalid regular expression: {e}")
+            return
+        self.match_label.setText(f"Pattern matches {count} file(s)")
+
+    def _update_button_states(self, *_):
         """Enables/disables buttons based on list state."""
-        self.add_button.setEnabled(self.list_widget.count() < self.max_suffixes)
+        count = self.model.entry_count()
+        self.add_button.setEnabled(count < self.max_suffixes)
+        self.count_label.setText(f"{count} entries")
 
     def _save_and_accept(self):
-        """Saves the suffixes and, if successful, accepts the dialog."""
-        suffixes = [self.list_widget.item(i).text() for i in range(self.list_widget.count())]
-
+        """Saves the suffixes atomically and, if successful, accepts the dialog."""
         try:
-            with open(self.suffix_file_path, 'w', encoding='utf-8') as f:
-                f.write('\n'.join(suffixes))
-                if suffixes:
-                    f.write('\n')  # Add trailing newline for POSIX compatibility
+            write_suffix_file(self.suffix_file_path, self.model.entries())
             self.accept()
         except Exception as e:
             QMessageBox.critical(self, "Error Saving Suffixes",
-                                 f"Could not save to {self.suffix_file_path}:\n{e}")
\ No newline at end of file
+                                 f"Could not save to {self.suffix_file_path}:\n{e}")
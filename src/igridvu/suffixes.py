@@ -0,0 +1,316 @@
+# -*- coding: utf-8 -*-
+"""
+Suffix file entries: explicit suffixes, glob patterns and regular expressions.
+
+An entry in a suffix file is either
+  - an explicit suffix, e.g. `_render.png`,
+  - a glob pattern, i.e. an entry containing `*`, `?` or `[`, e.g. `_v*.png`,
+  - a regular expression, written as `re:<expression>`, e.g. `re:_v\\d{3}\\.png`.
+Patterns are matched against the whole suffix of every file in the prefix
+directory whose name starts with the prefix, and expand to the matching
+suffixes in natural order (`v2` before `v10`). A glob pattern that matches
+nothing but names an existing file, e.g. `_img[1].png`, is taken literally.
+
+The directory is listed with a single os.scandir() pass. The listing is cached
+and revalidated by the directory's mtime, so the grid, the open dialog and the
+suffix editor share one listing per directory. A directory inside a zip or tar
+archive (e.g. `results.zip!/renders`) is listed from the archive's member
+index (see archives.py).
+"""
+import bisect
+import fnmatch
+import os
+import re
+import stat
+import threading
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
+
+from .archives import (ARCHIVE_SEPARATOR, ArchiveError, is_archive_directory, is_archive_path,
+                       open_archive, split_archive_path)
+
+REGEX_PREFIX = "re:"
+GLOB_CHARACTERS = frozenset("*?[")
+# Above this many matches, sorting uses the listing's precomputed natural order
+NATURAL_RANK_THRESHOLD = 2000
+
+
+class DirectoryListing:
+    """The sorted names of the regular files in one directory."""
+
+    def __init__(self, directory: str, mtime_ns: int, files: List[str]):
+        self.directory = directory
+        self.mtime_ns = mtime_ns
+        self.files = sorted(files)
+        self._file_set = frozenset(self.files)
+        self._natural_rank: Optional[Dict[str, int]] = None
+
+    def __len__(self) -> int:
+        return len(self.files)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._file_set
+
+    def with_prefix(self, prefix: str) -> List[str]:
+        """Returns the file names starting with prefix, using binary search."""
+        if not prefix:
+            return self.files
+        start = bisect.bisect_left(self.files, prefix)
+        # Every name starting with prefix sorts before prefix + the highest code point
+        end = bisect.bisect_left(self.files, prefix + "\U0010ffff", start)
+        return self.files[start:end]
+
+    def natural_rank(self) -> Dict[str, int]:
+        """
+        Maps every file name to its position in natural order. Computed once
+        per listing, so sorting expanded patterns is a cheap integer sort.
+        """
+        if self._natural_rank is None:
+            ordered = sorted(self.files, key=natural_key)
+            self._natural_rank = {name: i for i, name in enumerate(ordered)}
+        return self._natural_rank
+
+
+_cache: Dict[str, DirectoryListing] = {}
+_cache_lock = threading.Lock()
+
+
+def list_directory(directory: str) -> Optional[DirectoryListing]:
+    """
+    Returns the cached listing of a directory, rescanning it if its mtime
+    changed. Returns None if the directory cannot be read.
+    """
+    if is_archive_path(directory):
+        return _list_archive_directory(directory)
+
+    key = os.path.abspath(directory)
+    try:
+        mtime_ns = os.stat(key).st_mtime_ns
+    except OSError:
+        return None
+
+    with _cache_lock:
+        listing = _cache.get(key)
+    if listing is not None and listing.mtime_ns == mtime_ns:
+        return listing
+
+    try:
+        with os.scandir(key) as it:
+            files = [entry.name for entry in it if entry.is_file()]
+    except OSError:
+        return None
+    listing = DirectoryListing(key, mtime_ns, files)
+    with _cache_lock:
+        _cache[key] = listing
+    return listing
+
+
+def _list_archive_directory(directory: str) -> Optional[DirectoryListing]:
+    archive, member = split_archive_path(directory)
+    try:
+        index = open_archive(archive)
+    except ArchiveError:
+        return None
+    key = os.path.abspath(archive) + ARCHIVE_SEPARATOR + "/" + member
+    with _cache_lock:
+        listing = _cache.get(key)
+    # The archive index is cached by the archive's mtime; reuse its listing with it
+    if listing is not None and listing.mtime_ns == index.mtime_ns:
+        return listing
+    listing = DirectoryListing(key, index.mtime_ns, index.directories.get(member, []))
+    with _cache_lock:
+        _cache[key] = listing
+    return listing
+
+
+def clear_cache():
+    """Discards all cached directory listings."""
+    with _cache_lock:
+        _cache.clear()
+
+
+def split_prefix(pre_path: str) -> Tuple[str, str]:
+    """
+    Splits an image prefix into (directory, file name prefix).
+    A prefix naming an existing directory has an empty file name prefix.
+    """
+    if not pre_path:
+        return ".", ""
+    if os.path.isdir(pre_path) or is_archive_directory(pre_path):
+        return pre_path, ""
+    directory, name_prefix = os.path.split(pre_path)
+    return directory or ".", name_prefix
+
+
+def is_pattern(entry: str) -> bool:
+    """Returns True if a suffix file entry is a glob pattern or a regular expression."""
+    return entry.startswith(REGEX_PREFIX) or not GLOB_CHARACTERS.isdisjoint(entry)
+
+
+def compile_pattern(entry: str) -> Pattern:
+    """
+    Compiles a pattern entry into a regular expression for re.fullmatch().
+
+    Raises:
+        re.error: If a `re:` entry is not a valid regular expression.
+    """
+    if entry.startswith(REGEX_PREFIX):
+        return re.compile(entry[len(REGEX_PREFIX):])
+    return re.compile(fnmatch.translate(entry))
+
+
+_DIGITS = re.compile(r"(\d+)")
+
+
+def natural_key(text: str):
+    """A sort key that orders embedded numbers by value, e.g. 'v2' before 'v10'."""
+    parts = _DIGITS.split(text)
+    parts[1::2] = map(int, parts[1::2])
+    return parts
+
+
+def read_suffix_file(path: str, max_entries: int) -> Tuple[List[str], bool]:
+    """
+    Reads up to max_entries non-empty entries from a suffix file.
+
+    Returns:
+        (entries, truncated) where truncated is True if the file has more lines.
+
+    Raises:
+        OSError: If the file cannot be read.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        # Security: Use islice to prevent reading a massive file into memory.
+        entries = [line.strip() for line in islice(f, max_entries) if line.strip()]
+        truncated = bool(f.readline())
+    return entries, truncated
+
+
+def write_suffix_file(path: str, entries: List[str]):
+    """
+    Writes the entries, one per line, atomically: the text goes to a
+    temporary file in the same directory, which then replaces the file.
+    Readers never see a partially written file, and a failed write leaves
+    the old file intact. The permissions of an existing file are kept.
+
+    Raises:
+        OSError: If the file cannot be written.
+    """
+    directory, name = os.path.split(os.path.abspath(path))
+    try:
+        mode = stat.S_IMODE(os.stat(path).st_mode)
+    except OSError:
+        mode = None  # A new file gets the default permissions (0o666 minus umask)
+
+    tmp_path = os.path.join(directory, f".{name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o666)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write("\n".join(entries))
+            if entries:
+                f.write("\n")  # Add trailing newline for POSIX compatibility
+            f.flush()
+            os.fsync(f.fileno())
+        if mode is not None:
+            os.chmod(tmp_path, mode)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+
+def match_pattern(entry: str, candidates: Iterable[str], name_prefix: str = "") -> List[str]:
+    """Returns the suffixes of the candidate file names that match a pattern entry."""
+    pattern = compile_pattern(entry)
+    start = len(name_prefix)
+    fullmatch = pattern.fullmatch
+    return [name[start:] for name in candidates if fullmatch(name, start)]
+
+
+def expand_suffixes(entries: List[str], pre_path: str,
+                    max_results: Optional[int] = None) -> Tuple[List[str], bool]:
+    """
+    Replaces the pattern entries by the suffixes of the matching files.
+
+    Explicit entries are kept as they are, in place, whether or not the file
+    exists. A glob pattern that matches nothing is kept as an explicit entry
+    if a file has that literal name. Duplicates produced by overlapping
+    patterns are dropped. Invalid regular expressions match nothing.
+
+    Returns:
+        (suffixes, truncated) where truncated is True if there were more than
+        max_results suffixes.
+    """
+    if not any(is_pattern(entry) for entry in entries):
+        if max_results is not None and len(entries) > max_results:
+            return entries[:max_results], True
+        return list(entries), False
+
+    directory, name_prefix = split_prefix(pre_path)
+    listing = list_directory(directory)
+    candidates = listing.with_prefix(name_prefix) if listing else []
+
+    result: List[str] = []
+    seen = set()
+    for entry in entries:
+        if max_results is not None and len(result) >= max_results:
+            return result, True
+        if not is_pattern(entry):
+            result.append(entry)
+            continue
+
+        try:
+            matches = match_pattern(entry, candidates, name_prefix)
+        except re.error:
+            matches = []
+        if not matches and not entry.startswith(REGEX_PREFIX) and listing and name_prefix + entry in listing:
+            # A file name such as `img[1].png` that is not meant as a pattern
+            matches = [entry]
+        if len(matches) > NATURAL_RANK_THRESHOLD:
+            rank = listing.natural_rank()
+            matches.sort(key=lambda suffix: rank[name_prefix + suffix])
+        else:
+            matches.sort(key=lambda suffix: natural_key(name_prefix + suffix))
+        for suffix in matches:
+            if suffix not in seen:
+                seen.add(suffix)
+                result.append(suffix)
+                if max_results is not None and len(result) > max_results:
+                    return result[:max_results], True
+
+    return result, False
+
+
+def deduce_prefix(file_name: str, entries: List[str]) -> Optional[str]:
+    """
+    Deduces the file name prefix of a dataset from one of its files.
+
+    The entry matching the longest suffix of file_name wins. A pattern entry
+    matches if some suffix of file_name matches it.
+
+    Returns:
+        The file name prefix, or None if no entry matches.
+    """
+    best_len = -1
+    for entry in entries:
+        if is_pattern(entry):
+            try:
+                pattern = compile_pattern(entry)
+            except re.error:
+                continue
+            # The longest matching suffix starts at the lowest index
+            for start in range(len(file_name)):
+                if pattern.fullmatch(file_name, start):
+                    if len(file_name) - start > best_len:
+                        best_len = len(file_name) - start
+                    break
+            else:
+                # Glob characters in a literal file name (see expand_suffixes)
+                if (not entry.startswith(REGEX_PREFIX) and file_name.endswith(entry)
+                        and len(entry) > best_len):
+                    best_len = len(entry)
+        elif file_name.endswith(entry) and len(entry) > best_len:
+            best_len = len(entry)
+    if best_len < 0:
+        return None
+    return file_name[:len(file_name) - best_len]
@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+A dialog for choosing the parameters of a synthetic dataset.
+"""
+from PySide6.QtWidgets import (QDialog, QFormLayout, QSpinBox, QComboBox,
+                               QCheckBox, QDialogButtonBox, QHBoxLayout)
+
+from .create_examples import CONTENT_TYPES, IMAGE_FORMATS, BIT_DEPTHS
+
+
+class SyntheticDatasetDialog(QDialog):
+    """Lets the user choose count, resolution, bit depth, alpha, format and content."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Create Synthetic Dataset")
+
+        layout = QFormLayout(self)
+
+        self.count_spin = QSpinBox()
+        self.count_spin.setRange(1, 10000)
+        self.count_spin.setValue(16)
+        layout.addRow("Number of images:", self.count_spin)
+
+        size_layout = QHBoxLayout()
+        self.width_spin = QSpinBox()
+        self.height_spin = QSpinBox()
+        for spin in (self.width_spin, self.height_spin):
+            spin.setRange(1, 16384)
+            spin.setValue(1024)
+            size_layout.addWidget(spin)
+        layout.addRow("Width x height:", size_layout)
+
+        self.bit_depth_combo = QComboBox()
+        self.bit_depth_combo.addItems([str(depth) for depth in BIT_DEPTHS])
+        layout.addRow("Bits per channel:", self.bit_depth_combo)
+
+        self.alpha_check = QCheckBox("Add an alpha channel")
+        layout.addRow("", self.alpha_check)
+
+        self.format_combo = QComboBox()
+        self.format_combo.addItems(IMAGE_FORMATS)
+        layout.addRow("Format:", self.format_combo)
+
+        self.content_combo = QComboBox()
+        self.content_combo.addItems(CONTENT_TYPES)
+        layout.addRow("Content:", self.content_combo)
+
+        button_box = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        button_box.accepted.connect(self.accept)
+        button_box.rejected.connect(self.reject)
+        layout.addRow(button_box)
+
+    def options(self) -> dict:
+        """Returns the chosen settings as keyword arguments for create_synthetic_dataset."""
+        return {
+            "count": self.count_spin.value(),
+            "width": self.width_spin.value(),
+            "height": self.height_spin.value(),
+            "bit_depth": int(self.bit_depth_combo.currentText()),
+            "alpha": self.alpha_check.isChecked(),
+            "image_format": self.format_combo.currentText(),
+            "content": self.content_combo.currentText(),
+        }
@@ -0,0 +1,167 @@
+# -*- coding: utf-8 -*-
+"""
+Lightweight tracing with Chrome trace-event export.
+
+Tracing is off by default. It is enabled by setting the IGRIDVU_TRACE
+environment variable to an output file, by the `--trace FILE` command-line
+option, or by calling enable(). When it is off, span() returns a shared no-op
+context manager and @traced functions add only a flag check.
+
+The exported JSON can be opened in chrome://tracing or https://ui.perfetto.dev.
+Every thread appears on its own track.
+"""
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+ENV_VAR = "IGRIDVU_TRACE"
+
+
+class _State:
+    enabled = False
+    output_path: Optional[str] = None
+    atexit_registered = False
+
+
+_state = _State()
+_events: List[Dict[str, Any]] = []
+_named_threads = set()
+_lock = threading.Lock()
+
+
+def _now_us() -> float:
+    # perf_counter is monotonic, so spans never go backwards with the wall clock
+    return time.perf_counter_ns() / 1000.0
+
+
+def _append(event: Dict[str, Any]):
+    pid, tid = event["pid"], event["tid"]
+    with _lock:
+        if (pid, tid) not in _named_threads:
+            _named_threads.add((pid, tid))
+            _events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+                            "args": {"name": threading.current_thread().name}})
+        _events.append(event)
+
+
+class _NullSpan:
+    """The span used while tracing is disabled. Does nothing."""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class _Span:
+    """Records a complete ("X") trace event covering the `with` block."""
+    __slots__ = ("name", "category", "args", "start")
+
+    def __init__(self, name: str, category: str, args: Optional[Dict[str, Any]]):
+        self.name = name
+        self.category = category
+        self.args = args
+        self.start = 0.0
+
+    def __enter__(self):
+        self.start = _now_us()
+        return self
+
+    def __exit__(self, *exc):
+        end = _now_us()
+        event = {"name": self.name, "cat": self.category, "ph": "X",
+                 "ts": self.start, "dur": end - self.start,
+                 "pid": os.getpid(), "tid": threading.get_ident()}
+        if self.args:
+            event["args"] = self.args
+        _append(event)
+        return False
+
+
+def span(name: str, category: str = "app", **args):
+    """
+    Returns a context manager that records the duration of its block.
+
+    Keyword arguments are stored as event arguments (shown in the trace viewer).
+    """
+    if not _state.enabled:
+        return _NULL_SPAN
+    return _Span(name, category, args)
+
+
+def traced(name: Optional[str] = None, category: str = "app"):
+    """Decorator that records every call of the function as a span."""
+    def decorator(fn: Callable):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return fn(*args, **kwargs)
+            with _Span(label, category, None):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def is_enabled() -> bool:
+    return _state.enabled
+
+
+def enable(output_path: Optional[str] = None):
+    """
+    Starts recording spans. If output_path is given, the trace is written
+    there when the interpreter exits.
+    """
+    _state.enabled = True
+    if output_path:
+        _state.output_path = output_path
+        if not _state.atexit_registered:
+            atexit.register(_export_at_exit)
+            _state.atexit_registered = True
+    with _lock:
+        _events.append({"name": "process_name", "ph": "M", "pid": os.getpid(), "tid": 0,
+                        "args": {"name": f"igridvu ({os.getpid()})"}})
+
+
+def disable():
+    _state.enabled = False
+
+
+def clear():
+    """Discards all recorded events."""
+    with _lock:
+        _events.clear()
+        _named_threads.clear()
+
+
+def events() -> List[Dict[str, Any]]:
+    """Returns a copy of the recorded events."""
+    with _lock:
+        return list(_events)
+
+
+def export(path: str):
+    """Writes the recorded events as Chrome trace-event JSON."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events(), "displayTimeUnit": "ms"}, f)
+
+
+def _export_at_exit():
+    if _state.output_path:
+        try:
+            export(_state.output_path)
+        except OSError:
+            pass  # Nothing sensible can be done while the interpreter shuts down
+
+
+if os.environ.get(ENV_VAR):
+    enable(os.environ[ENV_VAR])
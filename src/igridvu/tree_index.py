@@ -0,0 +1,267 @@
+# -*- coding: utf-8 -*-
+"""
+A persistent index of the datasets in a directory tree.
+
+Every directory containing a suffix file (igridvu_suffix.txt) holds one or
+more datasets (see datasets.py). The indexer walks a tree with a thread pool,
+records every dataset with its image count, total size and newest mtime, and
+stores the result in a JSON file. A refresh only lists directories whose
+mtime (or suffix file mtime) changed; unchanged directories cost one stat.
+Images rewritten in place do not change their directory's mtime, so their
+size and mtime are updated when something else in the directory changes.
+
+Finding "the most recent dataset under /renders" is then a lookup:
+
+    igridvu-index /renders --most-recent
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from .config import DEFAULT_SUFFIX_FILE, MAX_IMAGES
+from .datasets import index_datasets
+from .suffixes import read_suffix_file
+
+INDEX_VERSION = 1
+INDEX_FILE_NAME = "dataset_index.json"
+
+
+def default_index_path() -> str:
+    """Returns the index location in the user's cache directory."""
+    cache_home = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(cache_home, "igridvu", INDEX_FILE_NAME)
+
+
+class IndexedDataset(NamedTuple):
+    """A dataset recorded in the index."""
+    pre_path: str
+    suffix_file: str
+    count: int
+    total: int
+    bytes: int
+    mtime: float
+
+
+class RefreshStats(NamedTuple):
+    """What a refresh did: directories listed, reused from the index, and datasets found."""
+    scanned: int
+    reused: int
+    datasets: int
+
+
+def _mtime_ns(path: str) -> Optional[int]:
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
+def scan_directory(directory: str, previous: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], bool]:
+    """
+    Lists one directory and indexes its datasets.
+
+    If the directory and its suffix file are unchanged since `previous` was
+    recorded, the previous record is returned without listing the directory.
+
+    Returns:
+        (record, scanned) where scanned is False if `previous` was reused.
+    """
+    mtime_ns = _mtime_ns(directory)
+    suffix_path = os.path.join(directory, DEFAULT_SUFFIX_FILE)
+    suffix_mtime_ns = _mtime_ns(suffix_path)
+    if (previous is not None and previous["mtime_ns"] == mtime_ns
+            and previous["suffix_mtime_ns"] == suffix_mtime_ns):
+        return previous, False
+
+    files: Dict[str, os.DirEntry] = {}
+    subdirs: List[str] = []
+    try:
+        with os.scandir(directory) as it:
+            for entry in it:
+                # Symbolic links to directories are not followed, to avoid cycles
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                elif entry.is_file():
+                    files[entry.name] = entry
+    except OSError:
+        pass
+
+    datasets = []
+    if suffix_mtime_ns is not None:
+        try:
+            suffixes, _ = read_suffix_file(suffix_path, MAX_IMAGES)
+        except OSError:
+            suffixes = []
+        for dataset in index_datasets(directory, files, suffixes):
+            size, newest = 0, 0.0
+            for suffix in suffixes:
+                entry = files.get(dataset.name_prefix + suffix)
+                if entry is None:
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                size += stat.st_size
+                newest = max(newest, stat.st_mtime)
+            datasets.append({"name_prefix": dataset.name_prefix, "count": dataset.matched,
+                             "total": dataset.total, "bytes": size, "mtime": newest})
+
+    record = {"mtime_ns": mtime_ns, "suffix_mtime_ns": suffix_mtime_ns,
+              "subdirs": sorted(subdirs), "datasets": datasets}
+    return record, True
+
+
+class TreeIndex:
+    """The persisted dataset index. Directories are keyed by their absolute path."""
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or default_index_path()
+        self.directories: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> "TreeIndex":
+        """Loads the index file. A missing or unreadable file gives an empty index."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return self
+        if data.get("version") == INDEX_VERSION:
+            self.directories = data.get("directories", {})
+        return self
+
+    def save(self):
+        """Writes the index atomically, so a crash never leaves a truncated file."""
+        # Records are replaced, never changed in place, so a shallow copy is a snapshot
+        with self._lock:
+            directories = dict(self.directories)
+        directory = os.path.dirname(self.path) or "."
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".index-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump({"version": INDEX_VERSION, "directories": directories}, f)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    def refresh(self, root: str, workers: Optional[int] = None,
+                progress: Optional[Callable[[int, int], None]] = None) -> RefreshStats:
+        """
+        Walks the tree under root in parallel and updates the index.
+        Directories that no longer exist are dropped.
+
+        Args:
+            workers: The number of threads listing directories. Listing is
+                I/O bound, so more threads than CPUs help on network filesystems.
+            progress: Called with (directories visited, 0) as the walk proceeds;
+                the total is not known in advance.
+        """
+        root = os.path.abspath(root)
+        with self._lock:
+            old = {d: r for d, r in self.directories.items() if _is_under(d, root)}
+        new: Dict[str, Dict[str, Any]] = {}
+        scanned = reused = 0
+
+        with ThreadPoolExecutor(max_workers=workers or min(32, (os.cpu_count() or 1) * 4)) as executor:
+            pending = {executor.submit(scan_directory, root, old.get(root)): root}
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    directory = pending.pop(future)
+                    record, was_scanned = future.result()
+                    if record["mtime_ns"] is None:
+                        continue  # Vanished while walking
+                    new[directory] = record
+                    scanned += was_scanned
+                    reused += not was_scanned
+                    for name in record["subdirs"]:
+                        subdir = os.path.join(directory, name)
+                        pending[executor.submit(scan_directory, subdir, old.get(subdir))] = subdir
+                if progress is not None:
+                    progress(scanned + reused, 0)
+
+        with self._lock:
+            for directory in old:
+                self.directories.pop(directory, None)
+            self.directories.update(new)
+        count = sum(len(record["datasets"]) for record in new.values())
+        return RefreshStats(scanned, reused, count)
+
+    def datasets(self, root: Optional[str] = None) -> List[IndexedDataset]:
+        """Returns the indexed datasets (under root, if given), most recent first."""
+        root = os.path.abspath(root) if root else None
+        result = []
+        with self._lock:
+            for directory, record in self.directories.items():
+                if root is not None and not _is_under(directory, root):
+                    continue
+                suffix_file = os.path.join(directory, DEFAULT_SUFFIX_FILE)
+                for d in record["datasets"]:
+                    pre_path = os.path.join(directory, d["name_prefix"])
+                    result.append(IndexedDataset(pre_path, suffix_file, d["count"], d["total"],
+                                                 d["bytes"], d["mtime"]))
+        result.sort(key=lambda dataset: dataset.mtime, reverse=True)
+        return result
+
+    def most_recent(self, root: Optional[str] = None, complete_only: bool = True) -> Optional[IndexedDataset]:
+        """Returns the most recently modified (complete) dataset under root."""
+        for dataset in self.datasets(root):
+            if not complete_only or dataset.count == dataset.total:
+                return dataset
+        return None
+
+    def contains(self, root: str) -> bool:
+        return os.path.abspath(root) in self.directories
+
+
+def _is_under(path: str, root: str) -> bool:
+    return path == root or path.startswith(root.rstrip(os.sep) + os.sep)
+
+
+def main(argv=None):
+    """Command-line entry point (igridvu-index)."""
+    parser = argparse.ArgumentParser(
+        description="Index the Image Grid Viewer datasets in a directory tree.",
+        epilog="Example: igridvu-index /renders --most-recent"
+    )
+    parser.add_argument("root", help="The root of the directory tree.")
+    parser.add_argument("--index", default=None,
+                        help=f"The index file. Defaults to {default_index_path()}.")
+    parser.add_argument("--workers", type=int, default=None, help="Number of threads listing directories.")
+    parser.add_argument("--no-refresh", action="store_true",
+                        help="Only query the existing index, do not walk the tree.")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--list", action="store_true", help="List the datasets, most recent first.")
+    query.add_argument("--most-recent", action="store_true",
+                       help="Print the prefix of the most recent complete dataset.")
+    args = parser.parse_args(argv)
+
+    index = TreeIndex(args.index).load()
+    if not args.no_refresh:
+        stats = index.refresh(args.root, workers=args.workers)
+        index.save()
+        print(f"Indexed {stats.datasets} datasets ({stats.scanned} directories listed, "
+              f"{stats.reused} unchanged).", file=sys.stderr)
+
+    if args.most_recent:
+        dataset = index.most_recent(args.root)
+        if dataset is None:
+            print(f"No complete dataset found under {args.root}", file=sys.stderr)
+            return 1
+        print(dataset.pre_path)
+    elif args.list:
+        for dataset in index.datasets(args.root):
+            print(f"{dataset.count}/{dataset.total}\t{dataset.bytes}\t{dataset.pre_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+Batched validation of the image paths of a grid.
+
+Checking every cell on its own (is the prefix a directory, resolve the path,
+is it inside the base directory, is it a file, is it readable, how large is
+it) costs a dozen system calls per cell, each a round trip on NFS. Here the
+base directory is resolved once, and the per-file checks (realpath for the
+path traversal check, stat and access) run in parallel on a thread pool,
+which hides the latency of remote filesystems. Every path is resolved: a
+cached directory listing cannot tell whether a file was replaced by a
+symbolic link since it was taken.
+
+The views are then created with the results and skip their own checks.
+Paths inside an archive are checked against its member index instead.
+"""
+import os
+import stat
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional
+
+from .archives import ArchiveError, open_archive, split_archive_path
+from .suffixes import split_prefix
+from .tracing import traced
+
+
+class PathCheck(NamedTuple):
+    """The result of validating one image path. error is None if the file can be loaded."""
+    path: str
+    error: Optional[str]
+    size: int = 0
+
+
+def _is_inside(path: str, base_dir: str) -> bool:
+    return path == base_dir or path.startswith(base_dir.rstrip(os.sep) + os.sep)
+
+
+def _is_inside_member(member: str, base_member: str) -> bool:
+    # Member paths are normalized, so ".." can only remain as a leading component
+    if member == ".." or member.startswith("../"):
+        return False
+    return not base_member or member == base_member or member.startswith(base_member + "/")
+
+
+def _check_archive_paths(archive_dir: str, paths: List[str], max_file_size: int) -> List[PathCheck]:
+    archive, base_member = split_archive_path(archive_dir)
+    try:
+        index = open_archive(archive)
+    except ArchiveError:
+        return [PathCheck(path, "Base path\nnot found") for path in paths]
+    results = []
+    for path in paths:
+        parts = split_archive_path(path)
+        if parts is None or parts[0] != archive or not _is_inside_member(parts[1], base_member):
+            results.append(PathCheck(path, "Path traversal\nattempt"))
+            continue
+        member = index.members.get(parts[1])
+        if member is None:
+            results.append(PathCheck(path, "Not found"))
+        elif member.size > max_file_size:
+            results.append(PathCheck(path, f"File too large\n({member.size / (1024 * 1024):.1f} MB)", member.size))
+        else:
+            results.append(PathCheck(path, None, member.size))
+    return results
+
+
+def _check_path(path: str, base_dir: str, max_file_size: int) -> PathCheck:
+    """Checks that a path resolves inside base_dir, then checks the file."""
+    try:
+        # Prevents path traversal (e.g. a suffix "/../../secret.png" or a symbolic link)
+        inside = _is_inside(os.path.realpath(path), base_dir)
+    except OSError:
+        inside = True  # A missing path component is reported as "Not found"
+    if not inside:
+        return PathCheck(path, "Path traversal\nattempt")
+    return check_file(path, max_file_size)
+
+
+def check_file(path: str, max_file_size: int) -> PathCheck:
+    """Checks that a path is a readable regular file of at most max_file_size bytes."""
+    try:
+        st = os.stat(path)
+    except (FileNotFoundError, NotADirectoryError):
+        return PathCheck(path, "Not found")
+    except OSError as e:
+        return PathCheck(path, f"Cannot access\n{e.strerror}")
+    if not stat.S_ISREG(st.st_mode):
+        return PathCheck(path, "Not found")
+    if not os.access(path, os.R_OK):
+        return PathCheck(path, "Permission\ndenied")
+    if st.st_size > max_file_size:
+        size_mb = st.st_size / (1024 * 1024)
+        return PathCheck(path, f"File too large\n({size_mb:.1f} MB)", st.st_size)
+    return PathCheck(path, None, st.st_size)
+
+
+@traced("validate_paths", "io")
+def validate_paths(pre_path: str, suffixes: List[str], max_file_size: int,
+                   workers: Optional[int] = None) -> List[PathCheck]:
+    """
+    Builds and validates the image path of every suffix.
+
+    A path that resolves outside the base directory (the prefix directory,
+    or the directory containing the prefix), e.g. through `..` or a symbolic
+    link, is rejected with a path traversal error.
+
+    Args:
+        pre_path: The image prefix.
+        suffixes: The (expanded) suffixes.
+        max_file_size: Larger files are rejected.
+        workers: The number of threads checking files. Defaults to one per
+            path, up to 16.
+
+    Returns:
+        One PathCheck per suffix, in order.
+    """
+    directory, name_prefix = split_prefix(pre_path)
+    prefix_is_dir = not name_prefix
+    paths = [os.path.join(pre_path, suffix) if prefix_is_dir else pre_path + suffix
+             for suffix in suffixes]
+
+    if split_archive_path(directory) is not None:
+        return _check_archive_paths(directory, paths, max_file_size)
+
+    # Security: all resolved image paths must be within this directory
+    try:
+        base_dir = os.path.realpath(directory)
+    except OSError:
+        # Can happen if the prefix points to a deleted directory
+        return [PathCheck(path, "Base path\nnot found") for path in paths]
+
+    workers = workers or min(16, len(paths))
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(lambda path: _check_path(path, base_dir, max_file_size), paths))
+    return [_check_path(path, base_dir, max_file_size) for path in paths]
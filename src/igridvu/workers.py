@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+"""
+Helpers for running blocking work (encoding, decoding) off the GUI thread.
+"""
+from typing import Any, Callable, Optional, Set
+
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal as pyqtSignal
+
+from .tracing import span
+
+
+class TaskSignals(QObject):
+    """Signals emitted by a Task. They are delivered in the GUI thread."""
+    # (done, total) units of work, e.g. rows written
+    progress = pyqtSignal(int, int)
+    # The return value of the task function
+    finished = pyqtSignal(object)
+    # A human readable error message
+    failed = pyqtSignal(str)
+
+
+# Signal objects of running tasks. They must outlive the worker thread until
+# their queued signals have been delivered, so we hold a reference here.
+_active_signals: Set[TaskSignals] = set()
+
+
+class Task(QRunnable):
+    """A QRunnable that calls a function and reports the outcome via signals."""
+
+    def __init__(self, fn: Callable[..., Any], *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+
+    def run(self):
+        try:
+            with span(getattr(self.fn, "__qualname__", "task"), "worker"):
+                result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:  # Report every failure instead of losing it in the pool
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+def _release(signals: TaskSignals):
+    # Deferred so the signals object is not destroyed while a slot is running.
+    QTimer.singleShot(0, lambda: _active_signals.discard(signals))
+
+
+def start_task(fn: Callable[..., Any], *args,
+               on_finished: Optional[Callable[[Any], None]] = None,
+               on_failed: Optional[Callable[[str], None]] = None,
+               on_progress: Optional[Callable[[int, int], None]] = None,
+               pool: Optional[QThreadPool] = None, **kwargs) -> Task:
+    """
+    Runs fn(*args, **kwargs) in a thread pool.
+
+    If on_progress is given, fn is called with an additional `progress`
+    keyword argument: a callable taking (done, total) that is safe to call
+    from the worker thread.
+    """
+    task = Task(fn, *args, **kwargs)
+    signals = task.signals
+    if on_progress is not None:
+        task.kwargs["progress"] = signals.progress.emit
+        signals.progress.connect(on_progress)
+    if on_finished is not None:
+        signals.finished.connect(on_finished)
+    if on_failed is not None:
+        signals.failed.connect(on_failed)
+    signals.finished.connect(lambda _result: _release(signals))
+    signals.failed.connect(lambda _msg: _release(signals))
+
+    _active_signals.add(signals)
+    (pool or QThreadPool.globalInstance()).start(task)
+    return task
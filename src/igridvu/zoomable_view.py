@@ -2,8 +2,9 @@
 """
 A QGraphicsView that can zoom and pan, and sync with other views.
 """
+import math
 import os
-from typing import Optional, cast
+from typing import List, Optional, Tuple, cast
 from pathlib import Path
 import ctypes
 
@@ -12,9 +13,103 @@ from PySide6.QtWidgets import (
     QLabel, QSizePolicy, QGraphicsPixmapItem, QMenu
 )
 from PySide6.QtGui import (
-    QPixmap, QPainter, QImageReader, QColor, QResizeEvent, QImage, QAction, qRgb
+    QPixmap, QPainter, QImageReader, QColor, QResizeEvent, QImage, QAction, qRgb, QPen
 )
-from PySide6.QtCore import Qt, Signal as pyqtSignal, QRectF, QPointF, QSize, QPoint
+from PySide6.QtCore import Qt, Signal as pyqtSignal, QRectF, QPointF, QSize, QPoint, QLineF, QTimer
+from shiboken6 import isValid
+
+from .archives import is_archive_path, member_size
+from .frames import FrameCache, decode_frame
+from .image_io import MAX_IMAGE_DIMENSION, decode_checked, open_checked, read_image
+from .proxy_cache import CachedProxy
+from .tracing import span, traced, is_enabled as tracing_enabled
+from .workers import start_task
+
+
+def build_levels(image: QImage, min_dimension: int) -> List[QImage]:
+    """
+    Downsamples an image by 2, 4, 8, ... until its longest side is at most
+    min_dimension. Each level is computed from the previous one by averaging
+    2x2 pixel blocks (smooth scaling to half size), so the cost is about a
+    third of one full-resolution pass. Safe to call from worker threads.
+    """
+    levels = []
+    level = image
+    while max(level.width(), level.height()) > min_dimension:
+        level = level.scaled(max(1, level.width() // 2), max(1, level.height() // 2),
+                             Qt.IgnoreAspectRatio, Qt.SmoothTransformation)
+        levels.append(level)
+    return levels
+
+
+def extract_channel(image: QImage, channel_name: str) -> Optional[QImage]:
+    """
+    Returns one channel ("Red", "Green", "Blue" or "Alpha") of an image as an
+    8-bit gray image, a copy of grayscale images, or None if the image has no
+    such channel. Safe to call from worker threads.
+    """
+    if image.isGrayscale():
+        return image.copy()
+
+    channel_map = {"Red": 2, "Green": 1, "Blue": 0, "Alpha": 3}
+    channel_index = channel_map.get(channel_name)
+
+    if channel_index is None or (channel_index == 3 and not image.hasAlphaChannel()):
+        return None
+
+    width, height = image.width(), image.height()
+    
+    # Create an 8-bit indexed image for the channel
+    channel_img = QImage(width, height, QImage.Format_Indexed8)
+    color_table = [qRgb(i, i, i) for i in range(256)]
+    channel_img.setColorTable(color_table)
+
+    # Fast pixel manipulation using memory views
+    source_format = image.format()
+    
+    # Ensure source image is in a format we can process
+    if source_format not in (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied):
+         image = image.convertToFormat(QImage.Format_ARGB32)
+
+    bytes_per_pixel = image.depth() // 8
+    
+    # Get read-only access to the source image buffer
+    source_bits = image.constBits()
+    
+    # Get write access to the destination image buffer
+    dest_bits = channel_img.bits()
+    
+    # Create numpy-like array views from the memory buffers
+    source_array = (ctypes.c_uint8 * len(source_bits)).from_buffer_copy(source_bits)
+    dest_array = (ctypes.c_uint8 * len(dest_bits)).from_buffer(dest_bits)
+
+    # Iterate over each row and process pixels
+    for y in range(height):
+        source_line_start = y * image.bytesPerLine()
+        dest_line_start = y * channel_img.bytesPerLine()
+        
+        for x in range(width):
+            source_idx = source_line_start + x * bytes_per_pixel + channel_index
+            dest_idx = dest_line_start + x
+            dest_array[dest_idx] = source_array[source_idx]
+
+    return channel_img
+
+
+def load_full_resolution(path: str, frame_index: int = 0, channel: Optional[str] = None) -> QImage:
+    """
+    Decodes a frame of an image at full resolution, as shown by a view with
+    the given channel. Used to restore or export views that only hold a
+    proxy. Safe to call from worker threads.
+
+    Returns:
+        The image, null if it cannot be decoded.
+    """
+    with span("decode", "io", path=path):
+        image = decode_frame(path, frame_index) if frame_index else read_image(path)
+    if channel and not image.isNull():
+        return extract_channel(image, channel) or image
+    return image
 
 
 class ZoomableView(QGraphicsView):
@@ -25,12 +120,43 @@ class ZoomableView(QGraphicsView):
     hovered = pyqtSignal(str)
     # Signal for mouse movement over the scene
     mouseMovedAtScenePos = pyqtSignal(QPointF)
+    # Signal emitted when the memory held by the view changes
+    memoryChanged = pyqtSignal()
 
     MAX_FILE_SIZE_BYTES = 50 * 1024 * 1024  # 50 MB
-    MAX_IMAGE_DIMENSION = 10000  # Max 10k pixels for width or height
+    MAX_IMAGE_DIMENSION = MAX_IMAGE_DIMENSION
+    # Screen pixels per image pixel above which pixels are drawn as sharp
+    # squares, outlined by a grid, and labelled with their values
+    NEAREST_NEIGHBOR_ZOOM = 2.0
+    PIXEL_GRID_ZOOM = 8.0
+    PIXEL_VALUE_ZOOM = 48.0
+    # Downsampled levels of detail are built until the longest side is at most this
+    LOD_MIN_DIMENSION = 256
+    # Zoom per wheel notch (120 eighths of a degree), and the trackpad scroll
+    # distance in pixels that zooms as much as one notch
+    ZOOM_STEP = 1.15
+    WHEEL_PIXELS_PER_STEP = 60
+    # Wheel events are accumulated and applied at most once per frame
+    ZOOM_FRAME_MS = 16
 
     def __init__(self, label_text: str, img_path: Optional[str] = None,
-                 image: Optional[QImage] = None, error: Optional[str] = None):
+                 image: Optional[QImage] = None, error: Optional[str] = None,
+                 validated: bool = False, frame_cache: Optional[FrameCache] = None,
+                 view_rect: Optional[QRectF] = None, proxy: Optional[CachedProxy] = None,
+                 frame_count: int = 1):
+        """
+        Args:
+            error: Shown instead of loading the image.
+            validated: The file checks (exists, readable, size) were already
+                done, e.g. by validation.validate_paths, and are skipped.
+            frame_cache: Caches and prefetches the frames of multi-frame
+                images. Without it, every frame is decoded when shown.
+            view_rect: The scene rectangle shown first, instead of the whole image.
+            proxy: A low-resolution copy of the image (see proxy_cache.py),
+                shown at once while the image is decoded in the background.
+            frame_count: The number of frames of the image given as image,
+                e.g. decoded ahead by an ImageCache.
+        """
         super().__init__()
         self.img_path = img_path or "in-memory"
         self.label_text = label_text
@@ -40,13 +166,48 @@ class ZoomableView(QGraphicsView):
         self._image: Optional[QImage] = image
         self._original_image: Optional[QImage] = None
         self._current_channel: Optional[str] = None
+        # While showing a low-resolution proxy, the full image is released
+        self._is_proxy = False
+        self._full_size_bytes = 0
         self._is_handling_wheel = False
+        # Zoom accumulated from wheel events since the last frame, and the
+        # viewport position it is anchored at
+        self._pending_zoom = 1.0
+        self._zoom_anchor = QPointF()
+        self._zoom_timer = QTimer(self)
+        self._zoom_timer.setSingleShot(True)
+        self._zoom_timer.setInterval(self.ZOOM_FRAME_MS)
+        self._zoom_timer.timeout.connect(self._apply_pending_zoom)
+        self._reader: Optional[QImageReader] = None
+        self._proxy_max_dimension = 0
+        # Levels of detail: the full-resolution pixmap, and copies downsampled
+        # by 2, 4, 8, ... which are painted when zoomed out
+        self._full_pixmap: Optional[QPixmap] = None
+        self._levels: List[QPixmap] = []
+        self._level = 0
+        self._levels_generation = 0
+        # Multi-frame images (multi-page TIFF, animated GIF/WebP)
+        self._frame_cache = frame_cache
+        self._frame_count = max(1, frame_count) if image else 1
+        self._frame_index = 0
+        # A frame requested while it was being decoded in the background
+        self._pending_frame: Optional[int] = None
+        if frame_cache is not None:
+            frame_cache.frameReady.connect(self._on_frame_ready)
         self._image_aspect_ratio = 0.0
+        self._validated = validated
+        self._initial_view_rect = view_rect
+        # Showing a proxy while the image is decoded in the background
+        self._loading = False
+        # Showing a proxy while restore_full_resolution() decodes the image
+        self._restoring = False
 
         self._setup_ui()
 
         if error:
             self._show_error_message(error)
+        elif proxy is not None and not image and self.img_path != "in-memory":
+            self._load_in_background(proxy)
         else:
             self._load_safe_pixmap()
 
@@ -102,25 +263,104 @@ class ZoomableView(QGraphicsView):
 
     def _load_safe_pixmap(self):
         if self._image:  # Image was provided directly
-            pixmap = QPixmap.fromImage(self._image)
-            self._pixmap_item = self._scene.addPixmap(pixmap)
+            self._pixmap_item = self._scene.addPixmap(QPixmap())
+            self._set_full_pixmap(self._image)
+            self._register_frames()
             return
 
         error_msg = self._get_loading_error()
+        reader, self._reader = self._reader, None
         if error_msg:
             self._show_error_message(error_msg)
         elif self.img_path:
-            self._image = QImage(self.img_path)
+            # The reader that checked the header decodes the image, so the
+            # file (or archive member) is opened once
+            with span("decode", "io", path=self.img_path):
+                self._image = reader.read()
             if self._image.isNull():
                 self._show_error_message("Cannot load\n(Corrupted?)")
             else:
-                pixmap = QPixmap.fromImage(self._image)
-                self._pixmap_item = self._scene.addPixmap(pixmap)
+                self._pixmap_item = self._scene.addPixmap(QPixmap())
+                self._set_full_pixmap(self._image)
+                self._register_frames()
+
+    def _register_frames(self):
+        """Shows the frame number of a multi-frame image, and prefetches the frames after the first."""
+        if self._frame_count <= 1:
+            return
+        self._update_title()
+        if self._frame_cache is not None:
+            self._frame_cache.put(self.img_path, 0, self._image)
+            self._frame_cache.set_current(self.img_path, 0, self._frame_count)
+
+    def _load_in_background(self, proxy: CachedProxy):
+        """Shows a proxy in place of the image and decodes the image in a worker thread."""
+        error = None
+        if not self._validated:
+            error = self._get_member_error() if is_archive_path(self.img_path) else self._get_file_error()
+        if error:
+            self._show_error_message(error)
+            return
+        full_width, full_height = proxy.full_size.width(), proxy.full_size.height()
+        self._pixmap_item = self._scene.addPixmap(QPixmap.fromImage(proxy.image))
+        self._pixmap_item.setScale(full_width / max(1, proxy.image.width()))
+        self._scene.setSceneRect(QRectF(0, 0, full_width, full_height))
+        self._is_proxy = True
+        self._proxy_max_dimension = max(proxy.image.width(), proxy.image.height())
+        self._full_size_bytes = full_width * full_height * 4
+        self._loading = True
+        start_task(decode_checked, self.img_path, self.MAX_IMAGE_DIMENSION,
+                   on_finished=self._loaded_in_background)
+
+    def _loaded_in_background(self, result: Tuple[QImage, int, Optional[str]]):
+        # The view may be gone, or show another image (replace_image) by now
+        if not isValid(self) or not self._loading:
+            return
+        self._loading = False
+        image, frame_count, error = result
+        if error:
+            self._scene.removeItem(self._pixmap_item)
+            self._pixmap_item = None
+            self._is_proxy = False
+            self._show_error_message(error)
+            self.memoryChanged.emit()
+            return
+
+        self._frame_count = frame_count
+        self._set_image(image)
+        self._scene.setSceneRect(self._pixmap_item.sceneBoundingRect())
+        if self._frame_count > 1 and self._frame_cache is not None:
+            self._frame_cache.put(self.img_path, 0, image)
+            self._frame_cache.set_current(self.img_path, 0, self._frame_count)
+        self._update_title()
+        self.memoryChanged.emit()
+
+    def is_loading(self) -> bool:
+        """True while a proxy is shown and the image is decoded in the background."""
+        return self._loading
 
+    @traced("validate", "io")
     def _get_loading_error(self) -> Optional[str]:
+        self._reader = None
         if not self.img_path or self.img_path == "in-memory":
             return "Invalid path"
 
+        if not self._validated:
+            if is_archive_path(self.img_path):
+                error = self._get_member_error()
+            else:
+                error = self._get_file_error()
+            if error:
+                return error
+
+        reader, frame_count, error = open_checked(self.img_path, self.MAX_IMAGE_DIMENSION)
+        if error:
+            return error
+        self._reader = reader
+        self._frame_count = frame_count
+        return None
+
+    def _get_file_error(self) -> Optional[str]:
         img_path = Path(self.img_path)
         if not img_path.is_file():
             return "Not found"
@@ -134,15 +374,17 @@ class ZoomableView(QGraphicsView):
                 return f"File too large\n({size_mb:.1f} MB)"
         except OSError as e:
             return f"Cannot access\n{e.strerror}"
+        return None
 
-        reader = QImageReader(str(img_path))
-        if not reader.canRead():
-            return "Unrecognized\nformat"
-
-        img_dim = reader.size()
-        if img_dim.width() > self.MAX_IMAGE_DIMENSION or img_dim.height() > self.MAX_IMAGE_DIMENSION:
-            return f"Dimensions too large\n({img_dim.width()}x{img_dim.height()})"
-
+    def _get_member_error(self) -> Optional[str]:
+        try:
+            size = member_size(self.img_path)
+        except OSError as e:
+            return f"Cannot access\n{e.strerror or e}"
+        if size is None:
+            return "Not found"
+        if size > self.MAX_FILE_SIZE_BYTES:
+            return f"File too large\n({size / (1024 * 1024):.1f} MB)"
         return None
 
     def contextMenuEvent(self, event):
@@ -182,6 +424,10 @@ class ZoomableView(QGraphicsView):
 
     def view_channel(self, channel_name: str):
         if not self._image:
+            if self._loading:
+                # Applied once the image is decoded
+                self._current_channel = channel_name
+                self._update_title()
             return
 
         if not self._original_image:
@@ -190,74 +436,409 @@ class ZoomableView(QGraphicsView):
         channel_image = self.get_channel_image(channel_name)
         if channel_image:
             self._image = channel_image
-            self._pixmap_item.setPixmap(QPixmap.fromImage(self._image))
-            self._title_label.setText(f"{self.label_text} ({channel_name})")
+            self._set_full_pixmap(self._image)
             self._current_channel = channel_name
+            self._update_title()
+            self.memoryChanged.emit()
 
     def restore_original(self):
         if not self._original_image:
             return
 
         self._image = self._original_image
-        self._pixmap_item.setPixmap(QPixmap.fromImage(self._image))
-        self._title_label.setText(self.label_text)
+        self._set_full_pixmap(self._image)
         self._original_image = None
         self._current_channel = None
+        self._update_title()
+        self.memoryChanged.emit()
 
-    def get_channel_image(self, channel_name: str) -> Optional[QImage]:
-        if not self._image:
-            return None
-
-        if self._image.isGrayscale():
-            return self._image.copy()
+    def current_channel(self) -> Optional[str]:
+        """The channel shown ("Red", "Green", "Blue" or "Alpha"), or None for the original image."""
+        return self._current_channel
 
-        channel_map = {"Red": 2, "Green": 1, "Blue": 0, "Alpha": 3}
-        channel_index = channel_map.get(channel_name)
+    def _update_title(self):
+        text = self.label_text
+        if self._current_channel:
+            text += f" ({self._current_channel})"
+        if self._frame_count > 1:
+            text += f" [{self._frame_index + 1}/{self._frame_count}]"
+        self._title_label.setText(text)
+
+    def frame_count(self) -> int:
+        """The number of frames of a multi-page or animated image, 1 for others."""
+        return self._frame_count
+
+    def current_frame(self) -> int:
+        """The frame shown, or the one that will be once its background decode finishes."""
+        return self._frame_index if self._pending_frame is None else self._pending_frame
+
+    def frame_shown(self) -> int:
+        """The frame on screen, which lags current_frame() while a frame is being prefetched."""
+        return self._frame_index
+
+    def set_frame(self, index: int) -> bool:
+        """
+        Shows a frame of a multi-frame image. Indexes past the last frame show
+        the last frame, so views with fewer frames stay in step with the grid.
+        The channel shown and the view rectangle are kept. A frame that is
+        being prefetched is shown when its decode finishes, instead of being
+        decoded a second time.
+
+        Returns:
+            True if the frame changed (or will, once prefetched).
+        """
+        if not self.has_image() or self._frame_count <= 1:
+            return False
+        index = max(0, min(index, self._frame_count - 1))
+        if index == self.current_frame():
+            return False
+        if index == self._frame_index:
+            self._pending_frame = None
+            return True
+
+        cache = self._frame_cache
+        image = cache.get(self.img_path, index) if cache is not None else None
+        if image is None and cache is not None and cache.is_pending(self.img_path, index):
+            self._pending_frame = index
+            cache.set_current(self.img_path, index, self._frame_count)
+            return True
+        self._pending_frame = None
+        return self._show_frame(index, image)
+
+    def _on_frame_ready(self, path: str, index: int):
+        """Shows a requested frame whose background decode finished."""
+        if index != self._pending_frame or path != self.img_path:
+            return
+        self._pending_frame = None
+        self._show_frame(index, self._frame_cache.get(path, index))
+
+    def _show_frame(self, index: int, image: Optional[QImage]) -> bool:
+        """Shows a frame, decoding it now if it is not cached (image is None)."""
+        cache = self._frame_cache
+        if image is None:
+            with span("decode_frame", "io", path=self.img_path, frame=index):
+                image = decode_frame(self.img_path, index)
+            if image.isNull():
+                return False
+            if cache is not None:
+                cache.put(self.img_path, index, image)
+        if cache is not None:
+            cache.set_current(self.img_path, index, self._frame_count)
+
+        self._frame_index = index
+        was_proxy = self._is_proxy
+        self._set_image(image)
+        if was_proxy:
+            self.degrade_to_proxy(self._proxy_max_dimension)
+        self._update_title()
+        self.memoryChanged.emit()
+        return True
+
+    def replace_image(self, image: QImage, label_text: str, img_path: str, levels: bool = True):
+        """
+        Shows another image in place, e.g. the next image of the flip-book.
+        The view rectangle and the channel shown are kept.
+
+        Args:
+            levels: Build the levels of detail. Playback, which replaces the
+                image many times per second, skips them.
+        """
+        if not self.has_image():
+            return
+        self._loading = False
+        self.label_text = label_text
+        self.img_path = img_path
+        self._frame_count, self._frame_index, self._pending_frame = 1, 0, None
+        self._set_image(image, levels)
+        self._scene.setSceneRect(self._pixmap_item.sceneBoundingRect())
+        if image.height() > 0:
+            self._image_aspect_ratio = image.width() / image.height()
+        self._update_title()
+        self.memoryChanged.emit()
+
+    def source_image(self) -> Optional[QImage]:
+        """The decoded image without a channel applied, or None while showing a proxy."""
+        if self._is_proxy:
+            return None
+        return self._original_image or self._image
 
-        if channel_index is None or (channel_index == 3 and not self._image.hasAlphaChannel()):
+    def _set_image(self, image: QImage, levels: bool = True):
+        """Shows a new full-resolution image, re-applying the channel that was shown."""
+        self._image = image
+        self._original_image = None
+        self._is_proxy = False
+        self._set_full_pixmap(image, levels)
+        self._full_size_bytes = 0
+
+        channel = self._current_channel
+        if channel:
+            self._current_channel = None
+            self.view_channel(channel)
+
+    def memory_usage(self) -> int:
+        """Returns the number of bytes held by the view's images and pixmaps."""
+        total = 0
+        for image in (self._image, self._original_image):
+            if image is not None:
+                total += image.sizeInBytes()
+        if self._pixmap_item:
+            pixmaps = [self._full_pixmap or self._pixmap_item.pixmap()] + self._levels
+            total += sum(pixmap.width() * pixmap.height() * pixmap.depth() // 8 for pixmap in pixmaps)
+        return total
+
+    def _set_full_pixmap(self, image: QImage, levels: bool = True):
+        """Shows an image at full resolution and rebuilds its levels of detail."""
+        with span("upload", "render"):
+            self._full_pixmap = QPixmap.fromImage(image)
+        self._pixmap_item.setPixmap(self._full_pixmap)
+        self._pixmap_item.setScale(1.0)
+        self._drop_levels()
+        if levels and max(image.width(), image.height()) > 2 * self.LOD_MIN_DIMENSION:
+            generation = self._levels_generation
+            start_task(build_levels, image, self.LOD_MIN_DIMENSION,
+                       on_finished=lambda levels, g=generation: self._levels_ready(g, levels))
+
+    def _drop_levels(self):
+        self._levels = []
+        self._level = 0
+        # Levels still being built for the previous image are discarded
+        self._levels_generation += 1
+
+    def _levels_ready(self, generation: int, levels: List[QImage]):
+        if not isValid(self) or generation != self._levels_generation or self._is_proxy:
+            return
+        with span("upload_levels", "render", label=self.label_text):
+            self._levels = [QPixmap.fromImage(level) for level in levels]
+        self.memoryChanged.emit()
+        self.viewport().update()  # Picks the level for the current zoom
+
+    def _level_for_zoom(self, zoom: float) -> int:
+        """The smallest level that still has at least one pixel per screen pixel."""
+        level = 0
+        while level < len(self._levels) and zoom * 2 ** (level + 1) <= 1.0:
+            level += 1
+        return level
+
+    def _update_level(self):
+        if self._is_proxy or self._full_pixmap is None:
+            return
+        level = self._level_for_zoom(self.pixel_zoom())
+        if level == self._level:
+            return
+        self._level = level
+        pixmap = self._levels[level - 1] if level else self._full_pixmap
+        # Scaled up in the scene, so scene coordinates stay full-resolution pixels
+        self._pixmap_item.setPixmap(pixmap)
+        self._pixmap_item.setScale(self._full_pixmap.width() / pixmap.width())
+
+    def pixmap_for_zoom(self, zoom: float) -> Optional[QPixmap]:
+        """
+        The resident pixmap that paints the image best at a zoom (screen pixels
+        per image pixel): a level of detail, the full-resolution pixmap, or the
+        proxy. Scale it by image_size().width() / pixmap.width() to show it in
+        image coordinates.
+        """
+        if not self._pixmap_item:
             return None
+        if self._is_proxy or self._full_pixmap is None:
+            return self._pixmap_item.pixmap()
+        level = self._level_for_zoom(zoom)
+        return self._levels[level - 1] if level else self._full_pixmap
+
+    def image_size(self) -> QSize:
+        """The size of the image in full-resolution pixels (scene coordinates)."""
+        if not self._pixmap_item:
+            return QSize()
+        # The scene keeps the full size while a rounded-down proxy is scaled up
+        return self._scene.sceneRect().size().toSize()
+
+    def is_proxy(self) -> bool:
+        return self._is_proxy
+
+    def is_restoring(self) -> bool:
+        """True while restore_full_resolution() decodes the image in the background."""
+        return self._restoring
+
+    def proxy_image(self, max_dimension: int) -> Optional[QImage]:
+        """
+        A copy of the image on screen (with its channel) whose longest side is
+        at most max_dimension, e.g. for the persistent proxy cache. It is
+        scaled from the smallest resident level of detail that is large enough.
+        """
+        if not self._pixmap_item:
+            return None
+        if self._is_proxy or self._full_pixmap is None:
+            pixmaps = [self._pixmap_item.pixmap()]
+        else:
+            pixmaps = [self._full_pixmap] + self._levels
+        source = next((pixmap for pixmap in reversed(pixmaps)
+                       if max(pixmap.width(), pixmap.height()) >= max_dimension), pixmaps[0])
+        image = source.toImage()
+        if max(image.width(), image.height()) > max_dimension:
+            image = image.scaled(max_dimension, max_dimension, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return image
+
+    def full_size_bytes(self) -> int:
+        """Returns the memory the view needs at full resolution."""
+        return self._full_size_bytes if self._is_proxy else self.memory_usage()
+
+    def degrade_to_proxy(self, max_dimension: int) -> bool:
+        """
+        Replaces the full-resolution image with a downscaled proxy to save memory.
+        The proxy is scaled up in the scene, so scene coordinates and the
+        synchronized view rectangle are unchanged. Only images loaded from a file
+        can be degraded, because restoring reloads them.
+
+        Returns:
+            True if the view now shows a proxy.
+        """
+        if self._is_proxy or not self._image or self.img_path == "in-memory":
+            return False
+        source = self._image
+        if max(source.width(), source.height()) <= max_dimension:
+            return False
+
+        with span("degrade_to_proxy", "memory", label=self.label_text):
+            self._proxy_max_dimension = max_dimension
+            self._full_size_bytes = self.memory_usage()
+            proxy = source.scaled(max_dimension, max_dimension, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            self._drop_levels()
+            self._full_pixmap = None
+            self._pixmap_item.setPixmap(QPixmap.fromImage(proxy))
+            self._pixmap_item.setScale(source.width() / proxy.width())
+            # Pixel values are not available from a proxy
+            self._image = None
+            self._original_image = None
+            self._is_proxy = True
+        self.memoryChanged.emit()
+        return True
+
+    def restore_full_resolution(self) -> bool:
+        """
+        Reloads the full-resolution image after degrade_to_proxy() in a worker
+        thread. The proxy stays on screen until the image is decoded, then the
+        channel that was shown is re-applied.
+
+        Returns:
+            True if the restore was started.
+        """
+        if not self._is_proxy or self._loading or self._restoring:
+            return False
+        self._restoring = True
+        path, frame_index = self.img_path, self._frame_index
+        start_task(load_full_resolution, path, frame_index,
+                   on_finished=lambda image: self._restored(path, frame_index, image),
+                   on_failed=lambda _error: self._restored(path, frame_index, QImage()))
+        return True
+
+    def _restored(self, path: str, frame_index: int, image: QImage):
+        if not isValid(self) or not self._restoring:
+            return
+        self._restoring = False
+        if not self._is_proxy or image.isNull():
+            return
+        if (path, frame_index) != (self.img_path, self._frame_index):
+            # Another frame was shown meanwhile; the governor restores that one
+            self.memoryChanged.emit()
+            return
+        self._set_image(image)
+        self.memoryChanged.emit()
 
-        width, height = self._image.width(), self._image.height()
-        
-        # Create an 8-bit indexed image for the channel
-        channel_img = QImage(width, height, QImage.Format_Indexed8)
-        color_table = [qRgb(i, i, i) for i in range(256)]
-        channel_img.setColorTable(color_table)
+    @traced("get_channel_image", "compute")
+    def get_channel_image(self, channel_name: str) -> Optional[QImage]:
+        if not self._image:
+            return None
+        return extract_channel(self._image, channel_name)
 
-        # Fast pixel manipulation using memory views
-        source_format = self._image.format()
-        
-        # Ensure source image is in a format we can process
-        if source_format not in (QImage.Format_RGB32, QImage.Format_ARGB32, QImage.Format_ARGB32_Premultiplied):
-             self._image = self._image.convertToFormat(QImage.Format_ARGB32)
+    def pixel_zoom(self) -> float:
+        """The number of screen pixels per image (scene) pixel."""
+        return self.transform().m11()
 
-        bytes_per_pixel = self._image.depth() // 8
-        
-        # Get read-only access to the source image buffer
-        source_bits = self._image.constBits()
-        
-        # Get write access to the destination image buffer
-        dest_bits = channel_img.bits()
-        
-        # Create numpy-like array views from the memory buffers
-        source_array = (ctypes.c_uint8 * len(source_bits)).from_buffer_copy(source_bits)
-        dest_array = (ctypes.c_uint8 * len(dest_bits)).from_buffer(dest_bits)
-
-        # Iterate over each row and process pixels
-        for y in range(height):
-            source_line_start = y * self._image.bytesPerLine()
-            dest_line_start = y * channel_img.bytesPerLine()
-            
-            for x in range(width):
-                source_idx = source_line_start + x * bytes_per_pixel + channel_index
-                dest_idx = dest_line_start + x
-                dest_array[dest_idx] = source_array[source_idx]
-
-        return channel_img
+    def _update_transformation_mode(self):
+        if not self._pixmap_item:
+            return
+        # Smooth filtering when zoomed out, exact pixel boundaries when zoomed in
+        if self.pixel_zoom() >= self.NEAREST_NEIGHBOR_ZOOM:
+            mode = Qt.FastTransformation
+        else:
+            mode = Qt.SmoothTransformation
+        if self._pixmap_item.transformationMode() != mode:
+            self._pixmap_item.setTransformationMode(mode)
+
+    def drawBackground(self, painter: QPainter, rect: QRectF):
+        # Every change of the view transform ends in a repaint, so the
+        # rendering mode and level follow zoom changes from any source (wheel, sync, fit)
+        self._update_transformation_mode()
+        self._update_level()
+        super().drawBackground(painter, rect)
+
+    def drawForeground(self, painter: QPainter, rect: QRectF):
+        super().drawForeground(painter, rect)
+        zoom = self.pixel_zoom()
+        if not self._pixmap_item or zoom < self.PIXEL_GRID_ZOOM:
+            return
+        # Only the exposed pixels are visited, so the cost does not depend on the image size
+        visible = rect.intersected(self._pixmap_item.sceneBoundingRect())
+        if visible.isEmpty():
+            return
+        x0, y0 = int(visible.left()), int(visible.top())
+        x1, y1 = math.ceil(visible.right()), math.ceil(visible.bottom())
+
+        with span("pixel_grid", "render", label=self.label_text):
+            painter.save()
+            pen = QPen(QColor(128, 128, 128, 160))
+            pen.setCosmetic(True)  # One screen pixel wide at any zoom
+            painter.setPen(pen)
+            lines = [QLineF(x, y0, x, y1) for x in range(x0, x1 + 1)]
+            lines += [QLineF(x0, y, x1, y) for y in range(y0, y1 + 1)]
+            painter.drawLines(lines)
+            painter.restore()
+
+            if zoom >= self.PIXEL_VALUE_ZOOM and self._image is not None:
+                self._draw_pixel_values(painter, x0, y0, x1, y1, zoom)
+
+    def _draw_pixel_values(self, painter: QPainter, x0: int, y0: int, x1: int, y1: int, zoom: float):
+        """Draws the value of every visible pixel inside it, in screen space so the text does not scale."""
+        image = self._image
+        x1, y1 = min(x1, image.width()), min(y1, image.height())
+        grayscale = image.isGrayscale()
+        alpha = image.hasAlphaChannel()
+        lines = 1 if grayscale else (4 if alpha else 3)
+
+        painter.save()
+        world = painter.worldTransform()
+        painter.resetTransform()
+        font = painter.font()
+        font.setPixelSize(max(6, min(14, int(zoom / (lines + 1.5)))))
+        painter.setFont(font)
+        for y in range(max(0, y0), y1):
+            for x in range(max(0, x0), x1):
+                color = image.pixelColor(x, y)
+                if grayscale:
+                    text = str(color.red())
+                else:
+                    values = [color.red(), color.green(), color.blue()] + ([color.alpha()] if alpha else [])
+                    text = "\n".join(str(value) for value in values)
+                # Dark text on light pixels and vice versa
+                painter.setPen(Qt.black if color.lightness() > 127 else Qt.white)
+                painter.drawText(world.mapRect(QRectF(x, y, 1, 1)), Qt.AlignCenter, text)
+        painter.restore()
+
+    def paintEvent(self, event):
+        if not tracing_enabled():
+            super().paintEvent(event)
+            return
+        with span("paint", "render", label=self.label_text):
+            super().paintEvent(event)
 
     def showEvent(self, event):
         super().showEvent(event)
-        if self.has_image():
+        if not self.has_image():
+            return
+        if self._initial_view_rect is not None:
+            self.setViewRect(self._initial_view_rect)
+            self._initial_view_rect = None
+        else:
             self.fitInView(self._pixmap_item, Qt.KeepAspectRatio)
 
     def resizeEvent(self, event: QResizeEvent):
@@ -274,10 +855,37 @@ class ZoomableView(QGraphicsView):
         if not self.has_image() or self._is_handling_wheel:
             return
 
+        # Trackpads report high-resolution pixel deltas, wheels angle deltas;
+        # either zooms in proportion to the distance scrolled
+        if not event.pixelDelta().isNull():
+            steps = event.pixelDelta().y() / self.WHEEL_PIXELS_PER_STEP
+        else:
+            steps = event.angleDelta().y() / 120
+        if steps == 0:
+            return
+        self._pending_zoom *= self.ZOOM_STEP ** steps
+        self._zoom_anchor = event.position()
+        if not self._zoom_timer.isActive():
+            self._zoom_timer.start()
+
+    @traced("apply_zoom", "render")
+    def _apply_pending_zoom(self):
+        """Applies the zoom of all wheel events since the last frame as one transform."""
+        zoom_factor, self._pending_zoom = self._pending_zoom, 1.0
+        if zoom_factor == 1.0 or not self.has_image():
+            return
+
         self._is_handling_wheel = True
-        zoom_factor = 1.15 if event.angleDelta().y() > 0 else 1 / 1.15
+        # Keeps the scene point under the cursor fixed
+        anchor = self._zoom_anchor.toPoint()
+        scene_anchor = self.mapToScene(anchor)
+        self.setTransformationAnchor(QGraphicsView.NoAnchor)
         self.scale(zoom_factor, zoom_factor)
+        center = self.mapToScene(self.viewport().rect().center())
+        self.centerOn(center + scene_anchor - self.mapToScene(anchor))
+        self.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
         self._is_handling_wheel = False
+        # One signal per frame, so the synced views are refitted once per frame
         self._emit_view_rect_changed()
 
     def _emit_view_rect_changed(self):
@@ -311,7 +919,8 @@ class ZoomableView(QGraphicsView):
         if not self._image or not self.has_image() or not self._pixmap_item:
             return None
 
-        item_pos = self._pixmap_item.mapFromScene(scene_pos)
+        # Item coordinates are in pixels of the level shown; scale them to the image
+        item_pos = self._pixmap_item.mapFromScene(scene_pos) * self._pixmap_item.scale()
         
         # Explicitly floor the coordinates to get the integer pixel position
         pixel_x = int(item_pos.x())
@@ -325,6 +934,22 @@ class ZoomableView(QGraphicsView):
 
         return self._image.pixelColor(image_pixel_pos)
 
+    def pixel_values(self, x: int, y: int) -> Optional[List[int]]:
+        """
+        The [r, g, b] (or [r, g, b, a]) values of the image pixel at (x, y),
+        read from the decoded image without the channel shown. None outside
+        the image, or while the view holds only a proxy.
+        """
+        image = self.source_image()
+        # Compared in Python, as image.valid() overflows on coordinates beyond 32 bits
+        if image is None or not (0 <= x < image.width() and 0 <= y < image.height()):
+            return None
+        rgb = image.pixel(x, y)
+        values = [(rgb >> 16) & 0xFF, (rgb >> 8) & 0xFF, rgb & 0xFF]
+        if image.hasAlphaChannel():
+            values.append((rgb >> 24) & 0xFF)
+        return values
+
     def mouseMoveEvent(self, event):
         super().mouseMoveEvent(event)
         self.mouseMovedAtScenePos.emit(self.mapToScene(event.position().toPoint()))
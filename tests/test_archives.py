@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for reading images from zip and tar archives (src/igridvu/archives.py).
+"""
+import io
+import os
+import tarfile
+import zipfile
+from pathlib import Path
+
+import pytest
+
+from igridvu import archives, suffixes
+from igridvu.archives import (ArchiveError, is_archive_directory, member_size, open_archive,
+                              read_member, split_archive_path)
+from igridvu.image_io import read_image
+from igridvu.suffixes import expand_suffixes, list_directory, split_prefix
+from igridvu.validation import validate_paths
+from igridvu.zoomable_view import ZoomableView
+
+
+@pytest.fixture(autouse=True)
+def fresh_caches():
+    archives.clear_cache()
+    suffixes.clear_cache()
+    yield
+    archives.clear_cache()
+    suffixes.clear_cache()
+
+
+@pytest.fixture
+def png_bytes(tmp_path: Path, create_dummy_image) -> bytes:
+    return create_dummy_image(tmp_path, 4, 3, "source.png").read_bytes()
+
+
+@pytest.fixture
+def zip_path(tmp_path: Path, png_bytes: bytes) -> Path:
+    path = tmp_path / "results.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("scene1_a.png", png_bytes, compress_type=zipfile.ZIP_STORED)
+        archive.writestr("scene1_b.png", png_bytes, compress_type=zipfile.ZIP_DEFLATED)
+        archive.writestr("renders/scene2_a.png", png_bytes)
+        archive.writestr("notes.txt", b"hello")
+    return path
+
+
+@pytest.fixture
+def tar_path(tmp_path: Path, png_bytes: bytes) -> Path:
+    path = tmp_path / "results.tar"
+    with tarfile.open(path, "w") as archive:
+        for name in ("./scene1_a.png", "deep/dir/scene1_b.png"):
+            info = tarfile.TarInfo(name)
+            info.size = len(png_bytes)
+            archive.addfile(info, io.BytesIO(png_bytes))
+    return path
+
+
+def test_split_archive_path():
+    assert split_archive_path("results.zip!/scene1_") == ("results.zip", "scene1_")
+    assert split_archive_path("a/results.TAR!/x/../y.png") == ("a/results.TAR", "y.png")
+    assert split_archive_path("results.zip!") == ("results.zip", "")
+    assert split_archive_path("results.zip") is None
+    assert split_archive_path("scene!/x.png") is None
+
+
+def test_read_stored_and_deflated_zip_members(zip_path: Path, png_bytes: bytes):
+    assert read_member(f"{zip_path}!/scene1_a.png") == png_bytes
+    assert read_member(f"{zip_path}!/scene1_b.png") == png_bytes
+    assert read_member(f"{zip_path}!/renders/scene2_a.png") == png_bytes
+    assert member_size(f"{zip_path}!/notes.txt") == 5
+    assert member_size(f"{zip_path}!/missing.png") is None
+    with pytest.raises(ArchiveError):
+        read_member(f"{zip_path}!/missing.png")
+
+
+def test_deflated_member_is_not_inflated_beyond_its_declared_size(tmp_path: Path):
+    """Tests that a zip bomb, whose header declares a small size, fails without inflating it all."""
+    path = tmp_path / "bomb.zip"
+    with zipfile.ZipFile(path, "w") as archive:
+        archive.writestr("bomb.png", bytes(20 * 1024 * 1024), compress_type=zipfile.ZIP_DEFLATED)
+    data = bytearray(path.read_bytes())
+    # Declare 100 bytes in the central directory, which the index is built from
+    central = data.index(b"PK\x01\x02")
+    data[central + 24:central + 28] = (100).to_bytes(4, "little")
+    path.write_bytes(bytes(data))
+
+    with pytest.raises(ArchiveError, match="declared size"):
+        read_member(f"{path}!/bomb.png")
+
+
+def test_members_larger_than_max_size_are_not_read(zip_path: Path, png_bytes: bytes):
+    archive = open_archive(str(zip_path))
+    with pytest.raises(ArchiveError, match="larger than"):
+        archive.read("scene1_b.png", max_size=len(png_bytes) - 1)
+    assert archive.read("scene1_b.png", max_size=len(png_bytes)) == png_bytes
+
+
+def test_read_tar_members(tar_path: Path, png_bytes: bytes):
+    assert read_member(f"{tar_path}!/scene1_a.png") == png_bytes
+    assert read_member(f"{tar_path}!/deep/dir/scene1_b.png") == png_bytes
+    assert is_archive_directory(f"{tar_path}!/deep")
+
+
+def test_compressed_tar_is_rejected(tmp_path: Path):
+    path = tmp_path / "results.tar"
+    with tarfile.open(path, "w:gz") as archive:
+        archive.addfile(tarfile.TarInfo("empty.png"), io.BytesIO(b""))
+    with pytest.raises(ArchiveError):
+        open_archive(str(path))
+
+
+def test_index_is_cached_until_the_archive_changes(zip_path: Path):
+    first = open_archive(str(zip_path))
+    assert open_archive(str(zip_path)) is first
+
+    with zipfile.ZipFile(zip_path, "a") as archive:
+        archive.writestr("scene1_c.png", b"c")
+    second = open_archive(str(zip_path))
+
+    assert second is not first
+    assert "scene1_c.png" in second.members
+
+
+def test_patterns_expand_against_archive_members(zip_path: Path):
+    pre_path = f"{zip_path}!/scene1_"
+    assert split_prefix(pre_path) == (f"{zip_path}!", "scene1_")
+    assert "notes.txt" in list_directory(f"{zip_path}!")
+
+    result, _ = expand_suffixes(["*.png"], pre_path)
+
+    assert result == ["a.png", "b.png"]
+
+
+def test_validate_archive_paths(zip_path: Path):
+    checks = validate_paths(f"{zip_path}!/renders/", ["scene2_a.png", "missing.png", "../scene1_a.png"], 1 << 20)
+    assert [check.error for check in checks] == [None, "Not found", "Path traversal\nattempt"]
+
+    too_large = validate_paths(f"{zip_path}!/scene1_", ["a.png"], 10)
+    assert too_large[0].error.startswith("File too large")
+
+
+def test_decode_image_from_archive(zip_path: Path, qtbot):
+    image = read_image(f"{zip_path}!/scene1_b.png")
+    assert (image.width(), image.height()) == (4, 3)
+
+    view = ZoomableView(label_text="a", img_path=f"{zip_path}!/scene1_a.png")
+    qtbot.addWidget(view)
+    assert view.has_image()
+
+    missing = ZoomableView(label_text="m", img_path=f"{zip_path}!/scene1_z.png")
+    qtbot.addWidget(missing)
+    assert not missing.has_image()
+
+
+def test_reads_from_several_threads(zip_path: Path, png_bytes: bytes):
+    from concurrent.futures import ThreadPoolExecutor
+    paths = [f"{zip_path}!/scene1_{c}.png" for c in "ab"] * 50
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        assert all(data == png_bytes for data in executor.map(read_member, paths))
@@ -0,0 +1,143 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for showing NumPy arrays from src/igridvu/arrays.py.
+"""
+import pytest
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QImage
+
+np = pytest.importorskip("numpy")
+
+import igridvu
+from igridvu import arrays
+from igridvu.arrays import array_to_qimage, prepare_array
+
+
+@pytest.fixture
+def viewer(qtbot):
+    """A viewer of show(), closed after the test."""
+    created = []
+
+    def _show(*args, **kwargs):
+        created.append(igridvu.show(*args, **kwargs))
+        return created[-1]
+
+    yield _show
+    for v in created:
+        v.close()
+
+
+@pytest.mark.parametrize("dtype, shape, image_format", [
+    (np.uint8, (4, 5), QImage.Format_Grayscale8),
+    (np.uint8, (4, 5, 3), QImage.Format_RGB888),
+    (np.uint8, (4, 5, 4), QImage.Format_RGBA8888),
+    (np.uint16, (4, 5), QImage.Format_Grayscale16),
+    (np.uint16, (4, 5, 4), QImage.Format_RGBA64),
+    (np.float32, (4, 5, 4), QImage.Format_RGBA32FPx4),
+])
+def test_matching_layouts_are_wrapped_without_copying(dtype, shape, image_format):
+    array = np.zeros(shape, dtype=dtype)
+    assert prepare_array(array) is array
+
+    image = array_to_qimage(array)
+    assert image.format() == image_format
+    assert (image.width(), image.height()) == (5, 4)
+    # The image shares the memory of the array
+    array[1, 2] = np.iinfo(dtype).max if np.issubdtype(dtype, np.integer) else 1.0
+    assert image.pixelColor(2, 1).red() == 255
+    assert image.pixelColor(0, 0).red() == 0
+
+
+def test_image_keeps_the_array_alive():
+    image = array_to_qimage(np.full((3, 3), 200, dtype=np.uint8))
+    assert image.pixelColor(1, 1).red() == 200
+
+
+@pytest.mark.parametrize("dtype, shape, alpha", [
+    (np.uint16, (4, 5, 3), 65535),
+    (np.float32, (4, 5), 1.0),
+    (np.float32, (4, 5, 3), 1.0),
+])
+def test_layouts_without_qimage_format_are_padded_to_rgba(dtype, shape, alpha):
+    array = np.ones(shape, dtype=dtype)
+    prepared = prepare_array(array)
+    assert prepared.shape == (4, 5, 4)
+    assert np.all(prepared[:, :, 3] == alpha)
+    assert np.all(prepared[:, :, :3] == 1)
+
+
+def test_strided_and_byte_swapped_arrays_are_copied():
+    array = np.arange(40, dtype=np.uint8).reshape(4, 10)[:, ::2]
+    prepared = prepare_array(array)
+    assert prepared is not array and prepared.flags.c_contiguous
+    assert np.array_equal(prepared, array)
+
+    swapped = np.arange(6, dtype=">u2").reshape(2, 3)
+    prepared = prepare_array(swapped)
+    assert prepared.dtype == np.dtype("=u2")
+    assert np.array_equal(prepared, swapped)
+
+
+def test_single_channel_arrays_are_squeezed():
+    array = np.zeros((4, 5, 1), dtype=np.uint8)
+    assert array_to_qimage(prepare_array(array)).format() == QImage.Format_Grayscale8
+
+
+@pytest.mark.parametrize("array", [np.zeros((4, 5), dtype=np.int32), np.zeros((4, 5, 2), dtype=np.uint8),
+                                   np.zeros(5, dtype=np.uint8)])
+def test_unsupported_arrays_raise(array):
+    with pytest.raises(ValueError):
+        prepare_array(array)
+
+
+def test_show_returns_a_viewer_with_labelled_cells(viewer):
+    v = viewer([np.zeros((8, 8), dtype=np.uint8), np.zeros((8, 8, 3), dtype=np.uint8)],
+               ["pred", "target"], columns=2)
+    assert v.is_open() and len(v) == 2
+    assert v.labels() == ["pred", "target"]
+    assert v.window.isVisible()
+    assert v.window.grid_layout.getItemPosition(v.window.grid_layout.indexOf(v.window.views[1]))[:2] == (0, 1)
+    assert v in arrays._open_viewers
+
+
+def test_update_replaces_one_cell_keeping_the_view_rect(viewer):
+    v = viewer([np.zeros((100, 100), dtype=np.uint8)] * 2)
+    view = v.window.views[0]
+    view.setViewRect(QRectF(20, 20, 40, 40))
+    rect = view.mapToScene(view.viewport().rect()).boundingRect()
+
+    v.update(0, np.full((100, 100), 255, dtype=np.uint8), label="new")
+    assert v.window.views[0] is view
+    assert view.label_text == "new"
+    assert view.source_image().pixelColor(5, 5).red() == 255
+    assert view.mapToScene(view.viewport().rect()).boundingRect() == rect
+
+
+def test_refresh_shows_arrays_changed_in_place(viewer):
+    array = np.zeros((10, 10), dtype=np.uint8)
+    v = viewer([array])
+    array[:] = 128
+    v.refresh()
+    pixmap_image = v.window.views[0]._pixmap_item.pixmap().toImage()
+    assert pixmap_image.pixelColor(3, 3).red() == 128
+
+
+def test_set_arrays_changes_the_number_of_cells(viewer):
+    v = viewer([np.zeros((10, 10), dtype=np.uint8)])
+    v.set_arrays([np.zeros((10, 10), dtype=np.uint8)] * 3, ["a", "b", "c"])
+    assert len(v.window.views) == 3
+    assert v.labels() == ["a", "b", "c"]
+
+
+def test_mismatched_labels_raise(viewer):
+    with pytest.raises(ValueError):
+        viewer([np.zeros((10, 10), dtype=np.uint8)], ["a", "b"])
+
+
+def test_closed_viewer_is_released_and_rejects_updates(viewer, qtbot):
+    v = viewer([np.zeros((10, 10), dtype=np.uint8)])
+    v.close()
+    qtbot.waitUntil(lambda: not v.is_open())
+    assert v not in arrays._open_viewers
+    with pytest.raises(RuntimeError):
+        v.update(0, np.zeros((10, 10), dtype=np.uint8))
@@ -8,7 +8,11 @@ These tests verify:
 - Graceful error handling for missing or empty suffix files.
 - Enforcement of the MAX_IMAGES limit.
 - Correct initialization of the main application window with parsed arguments.
+- Fast startup: Qt is not loaded for --help, and the window is ready within the budget.
 """
+import os
+import re
+import subprocess
 import sys
 from pathlib import Path
 from unittest.mock import patch, MagicMock
@@ -18,8 +22,8 @@ import pytest
 from igridvu import cli
 
 
-@patch('igridvu.cli.QApplication')
-@patch('igridvu.cli.ImageGrid')
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
 @patch('igridvu.cli.sys.exit')
 def test_cli_successful_run(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch):
     """Tests a standard successful run with explicit arguments."""
@@ -45,14 +49,16 @@ def test_cli_successful_run(mock_exit, mock_image_grid, mock_qapp, tmp_path, mon
         list_of_suffix=expected_suffixes,
         suffix_file_path=str(suffix_file),
         columns=4,  # Default value
-        app_name=cli.APP_NAME
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
     )
     mock_app_instance.exec.assert_called_once()
     mock_exit.assert_called_once_with(0)
 
 
-@patch('igridvu.cli.QApplication')
-@patch('igridvu.cli.ImageGrid')
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
 @patch('igridvu.cli.sys.exit')
 def test_cli_default_suffix_file(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch):
     """Tests that the CLI correctly finds the default suffix file."""
@@ -79,12 +85,14 @@ def test_cli_default_suffix_file(mock_exit, mock_image_grid, mock_qapp, tmp_path
         list_of_suffix=expected_suffixes,
         suffix_file_path=str(default_suffix_file),
         columns=4,
-        app_name=cli.APP_NAME
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
     )
 
 
-@patch('igridvu.cli.QApplication')
-@patch('igridvu.cli.ImageGrid')
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
 @patch('igridvu.cli.sys.exit')
 def test_cli_suffix_file_not_found(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch):
     """Tests that the CLI starts with an empty grid if the suffix file is not found."""
@@ -105,13 +113,15 @@ def test_cli_suffix_file_not_found(mock_exit, mock_image_grid, mock_qapp, tmp_pa
         list_of_suffix=[],
         suffix_file_path=str(suffix_file_path),
         columns=4,
-        app_name=cli.APP_NAME
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
     )
     mock_exit.assert_called_once()
 
 
-@patch('igridvu.cli.QApplication')
-@patch('igridvu.cli.ImageGrid')
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
 @patch('igridvu.cli.sys.exit')
 def test_cli_empty_suffix_file(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch):
     """Tests that the CLI starts with an empty grid if the suffix file is empty."""
@@ -132,13 +142,15 @@ def test_cli_empty_suffix_file(mock_exit, mock_image_grid, mock_qapp, tmp_path,
         list_of_suffix=[],
         suffix_file_path=str(empty_file),
         columns=4,
-        app_name=cli.APP_NAME
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
     )
     mock_exit.assert_called_once()
 
 
-@patch('igridvu.cli.QApplication')
-@patch('igridvu.cli.ImageGrid')
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
 @patch('igridvu.cli.sys.exit')
 def test_cli_max_images_limit(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch, capsys):
     """Tests that the number of images is limited and a warning is printed."""
@@ -166,12 +178,14 @@ def test_cli_max_images_limit(mock_exit, mock_image_grid, mock_qapp, tmp_path, m
         list_of_suffix=expected_suffixes,
         suffix_file_path=str(long_suffix_file),
         columns=4,
-        app_name=cli.APP_NAME
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
     )
 
 
-@patch('igridvu.cli.QApplication')
-@patch('igridvu.cli.ImageGrid')
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
 @patch('igridvu.cli.sys.exit')
 def test_cli_custom_columns(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch):
     """Tests that the --columns argument is correctly passed to ImageGrid."""
@@ -191,7 +205,9 @@ def test_cli_custom_columns(mock_exit, mock_image_grid, mock_qapp, tmp_path, mon
         list_of_suffix=['a.png'],
         suffix_file_path=str(suffix_file),
         columns=2,
-        app_name=cli.APP_NAME
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
     )
 
     # Reset mock for the next assertion
@@ -205,12 +221,14 @@ def test_cli_custom_columns(mock_exit, mock_image_grid, mock_qapp, tmp_path, mon
         list_of_suffix=['a.png'],
         suffix_file_path=str(suffix_file),
         columns=8,
-        app_name=cli.APP_NAME
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
     )
 
 
-@patch('igridvu.cli.QApplication')
-@patch('igridvu.cli.ImageGrid')
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
 @patch('igridvu.cli.sys.exit')
 def test_cli_no_arguments(mock_exit, mock_image_grid, mock_qapp, monkeypatch):
     """Tests that the CLI starts in welcome mode with no arguments."""
@@ -228,5 +246,135 @@ def test_cli_no_arguments(mock_exit, mock_image_grid, mock_qapp, monkeypatch):
         list_of_suffix=[],
         suffix_file_path=str(Path.cwd() / cli.DEFAULT_SUFFIX_FILE),
         columns=4,
-        app_name=cli.APP_NAME
-    )
\ No newline at end of file
+        app_name=cli.APP_NAME,
+        defer_menus=True,
+        session=None
+    )
+
+
+def run_cli(*args):
+    """Runs the CLI in a fresh interpreter, so nothing is imported yet."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen",
+               PYTHONPATH=str(Path(cli.__file__).resolve().parents[1]))
+    return subprocess.run([sys.executable, "-c", "import sys, igridvu.cli as c; c.main()", *args],
+                          capture_output=True, text=True, env=env, timeout=60)
+
+
+def test_cli_help_does_not_load_qt():
+    """Tests that --help and argument errors are handled before Qt is imported."""
+    env = dict(os.environ, PYTHONPATH=str(Path(cli.__file__).resolve().parents[1]))
+    code = ("import sys\n"
+            "sys.argv = ['igridvu', '--help']\n"
+            "import igridvu.cli\n"
+            "try:\n"
+            "    igridvu.cli.main()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('qt loaded' if 'PySide6' in sys.modules else 'qt not loaded')\n")
+    result = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, env=env, timeout=60)
+    assert "usage:" in result.stdout
+    assert result.stdout.strip().endswith("qt not loaded")
+
+
+def test_split_qt_args():
+    """Tests that QApplication options are separated from our own arguments."""
+    own, qt = cli._split_qt_args(["-platform", "offscreen", "prefix_", "-c", "2", "-reverse", "-style=fusion"])
+    assert own == ["prefix_", "-c", "2"]
+    assert qt == ["-platform", "offscreen", "-reverse", "-style=fusion"]
+
+
+def test_cli_startup_time_within_budget(tmp_path):
+    """Tests that the window with a dataset is ready within STARTUP_BUDGET_MS."""
+    for i in range(4):
+        (tmp_path / f"img_{i}.png").write_bytes(b"")  # Shown as error cells
+    (tmp_path / cli.DEFAULT_SUFFIX_FILE).write_text("\n".join(f"{i}.png" for i in range(4)))
+
+    result = run_cli(str(tmp_path / "img_"), "--startup-time")
+
+    match = re.search(r"Startup time: (\d+) ms", result.stdout)
+    assert match, result.stdout + result.stderr
+    assert int(match.group(1)) < cli.STARTUP_BUDGET_MS
+
+
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
+@patch('igridvu.cli.sys.exit')
+def test_cli_latest_opens_most_recent_dataset(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch):
+    """Tests that --latest indexes the tree and opens its most recent dataset."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    run = tmp_path / "renders" / "run1"
+    run.mkdir(parents=True)
+    (run / cli.DEFAULT_SUFFIX_FILE).write_text("_a.png\n")
+    (run / "scene_a.png").write_bytes(b"")
+    monkeypatch.setattr(sys, 'argv', ['igridvu', '--latest', str(tmp_path / "renders")])
+
+    cli.main()
+
+    kwargs = mock_image_grid.call_args.kwargs
+    assert kwargs["pre_path"] == str(run / "scene")
+    assert kwargs["list_of_suffix"] == ["_a.png"]
+    assert (tmp_path / "cache" / "igridvu" / "dataset_index.json").is_file()
+
+
+@patch('PySide6.QtWidgets.QApplication')
+@patch('igridvu.main_window.ImageGrid')
+@patch('igridvu.cli.sys.exit')
+def test_cli_last_session_reopens_saved_session(mock_exit, mock_image_grid, mock_qapp, tmp_path, monkeypatch):
+    """Tests that --last-session loads the dataset and columns of the saved session."""
+    from igridvu.session import Session, save_session
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    suffix_file = tmp_path / "suffixes.txt"
+    suffix_file.write_text("a.png\n")
+    session = Session(pre_path=str(tmp_path / "scene_"), suffix_file=str(suffix_file), columns=2,
+                      view_rect=None, channels=[], geometry="")
+    save_session(session)
+    monkeypatch.setattr(sys, 'argv', ['igridvu', '--last-session'])
+
+    cli.main()
+
+    kwargs = mock_image_grid.call_args.kwargs
+    assert kwargs["pre_path"] == session.pre_path
+    assert kwargs["list_of_suffix"] == ["a.png"]
+    assert kwargs["columns"] == 2
+    assert kwargs["session"] == session
+    assert mock_image_grid.return_value.session_path == str(tmp_path / "cache" / "igridvu" / "session.json")
+
+
+def test_cli_last_session_without_saved_session(tmp_path, monkeypatch, capsys):
+    """Tests that --last-session fails cleanly when no session was saved."""
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.setattr(sys, 'argv', ['igridvu', '--last-session'])
+
+    with pytest.raises(SystemExit) as excinfo:
+        cli.main()
+
+    assert excinfo.value.code == 1
+    assert "No saved session" in capsys.readouterr().err
+
+
+def test_cli_single_instance_forwards_without_loading_gui(qtbot, tmp_path: Path):
+    """Tests that `igridvu --single-instance` hands the dataset to the running instance without importing QtGui."""
+    from igridvu.single_instance import ENV_VAR, InstanceServer
+    server = InstanceServer(f"igridvu-test-{os.getpid()}")
+    assert server.listen()
+    received = []
+    server.openRequested.connect(lambda pre_path, suffix_file: received.append((pre_path, suffix_file)))
+    (tmp_path / "igridvu_suffix.txt").write_text("a.png\n")
+    script = (
+        "import sys\n"
+        "from igridvu import cli\n"
+        f"sys.argv = ['igridvu', '--single-instance', {str(tmp_path / 'scene_')!r}]\n"
+        "try:\n"
+        "    cli.main()\n"
+        "except SystemExit as e:\n"
+        "    print('exit', e.code)\n"
+        "print('gui', any(m in sys.modules for m in ('PySide6.QtGui', 'PySide6.QtWidgets')))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(cli.__file__).resolve().parents[1]), **{ENV_VAR: server.name})
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, env=env, timeout=30)
+
+    assert "exit 0" in result.stdout
+    assert "gui False" in result.stdout
+    qtbot.waitUntil(lambda: len(received) == 1)
+    assert received == [(str(tmp_path / "scene_"), str(tmp_path / "igridvu_suffix.txt"))]
+    server.close()
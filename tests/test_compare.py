@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the A/B comparison view.
+"""
+from PySide6.QtCore import QPointF, QRectF
+from PySide6.QtGui import QColor, QImage
+
+from igridvu import ZoomableView
+from igridvu.compare import CompareView
+
+
+def _view(qtbot, label: str, color: QColor, size: int = 100) -> ZoomableView:
+    image = QImage(size, size, QImage.Format_RGB32)
+    image.fill(color)
+    view = ZoomableView(label_text=label, image=image)
+    qtbot.addWidget(view)
+    return view
+
+
+def _compare(qtbot, size: int = 100) -> CompareView:
+    compare = CompareView()
+    qtbot.addWidget(compare)
+    compare.resize(300, 300)
+    compare.show()
+    qtbot.waitExposed(compare)
+    compare.set_views(_view(qtbot, "red", QColor(255, 0, 0), size),
+                      _view(qtbot, "blue", QColor(0, 0, 255), size))
+    return compare
+
+
+def _color_at(compare: CompareView, scene_x: float, scene_y: float) -> QColor:
+    drawn = compare.viewport().grab().toImage()
+    pos = compare.mapFromScene(QPointF(scene_x, scene_y))
+    return drawn.pixelColor(pos)
+
+
+def test_flicker_swaps_images(qtbot):
+    """Tests that toggling shows the other image in the same place."""
+    compare = _compare(qtbot)
+    assert compare.mode == CompareView.FLICKER
+    assert _color_at(compare, 50, 50) == QColor(255, 0, 0)
+    assert "red" in compare._title_label.text()
+
+    compare.toggle()
+    assert compare.showing_b
+    assert _color_at(compare, 50, 50) == QColor(0, 0, 255)
+    assert "blue" in compare._title_label.text()
+
+    compare.toggle()
+    assert _color_at(compare, 50, 50) == QColor(255, 0, 0)
+
+
+def test_swipe_divider_splits_images(qtbot):
+    """Tests that image A is shown left of the divider and image B right of it."""
+    compare = _compare(qtbot)
+    compare.set_mode(CompareView.SWIPE)
+    assert compare.divider_x == 50
+    assert _color_at(compare, 25, 50) == QColor(255, 0, 0)
+    assert _color_at(compare, 75, 50) == QColor(0, 0, 255)
+
+    compare.set_divider(90)
+    assert _color_at(compare, 75, 50) == QColor(255, 0, 0)
+    assert _color_at(compare, 95, 50) == QColor(0, 0, 255)
+    # Clamped to the image
+    compare.set_divider(-10)
+    assert compare.divider_x == 0
+
+
+def test_compare_uses_resident_levels(qtbot):
+    """Tests that a zoomed-out comparison paints the views' downsampled levels without new pixmaps."""
+    compare = _compare(qtbot, size=1200)
+    view_a = compare.view_a
+    qtbot.waitUntil(lambda: len(view_a._levels) == 3 and len(compare.view_b._levels) == 3)
+    compare.fitInView(QRectF(0, 0, 1200, 1200))
+    compare.viewport().grab()
+
+    pixmap = compare._item_a.pixmap()
+    assert any(pixmap.cacheKey() == level.cacheKey() for level in view_a._levels)
+    assert compare._item_a.scale() == 1200 / pixmap.width()
@@ -13,7 +13,13 @@ from igridvu.create_examples import (
     HEIGHT,
     SUBDIR,
     SUFFIXES,
+    SYNTHETIC_SUBDIR,
+    SYNTHETIC_PREFIX,
     create_example_dataset,
+    create_synthetic_dataset,
+    generate_image,
+    noise_image,
+    main,
 )
 
 
@@ -86,4 +92,75 @@ def test_create_example_dataset_permission_error_on_folder(tmp_path: Path, qtbot
     # 3. Assertions
     assert success is False
     assert "Error creating example dataset: Permission denied" in message
-    assert prefix_path == ""
\ No newline at end of file
+    assert prefix_path == ""
+
+
+def test_noise_image_is_opaque_without_alpha(qtbot):
+    """Tests that noise images without alpha are fully opaque, in 8 and 16 bits."""
+    for bit_depth in (8, 16):
+        image = noise_image(16, 8, bit_depth=bit_depth)
+        assert (image.width(), image.height()) == (16, 8)
+        assert not image.hasAlphaChannel()
+        assert all(image.pixelColor(x, y).alpha() == 255 for x in range(16) for y in range(8))
+
+
+def test_noise_image_is_reproducible_with_seed(qtbot):
+    import random
+    first = noise_image(8, 8, rng=random.Random(42))
+    second = noise_image(8, 8, rng=random.Random(42))
+    assert first == second
+
+
+@pytest.mark.parametrize("content", ["noise", "gradient", "photo"])
+@pytest.mark.parametrize("bit_depth, alpha", [(8, False), (8, True), (16, False), (16, True)])
+def test_generate_image_variants(qtbot, content, bit_depth, alpha):
+    """Tests every combination of content type, bit depth and alpha."""
+    image = generate_image(32, 24, bit_depth=bit_depth, alpha=alpha, content=content, seed=1)
+    assert (image.width(), image.height()) == (32, 24)
+    assert image.hasAlphaChannel() == alpha
+    assert image.depth() == (64 if bit_depth == 16 else 32)
+
+
+def test_generate_image_rejects_unknown_content(qtbot):
+    with pytest.raises(ValueError):
+        generate_image(4, 4, content="fractal")
+
+
+def test_create_synthetic_dataset_success(tmp_path: Path, qtbot):
+    """Tests that the synthetic generator writes all images and the suffix file."""
+    success, message, prefix_path_str = create_synthetic_dataset(
+        tmp_path, count=12, width=40, height=30, image_format="jpg", content="gradient", workers=4, seed=7
+    )
+
+    assert success is True, message
+    assert prefix_path_str == str(tmp_path / SYNTHETIC_SUBDIR / SYNTHETIC_PREFIX)
+
+    suffixes = (tmp_path / SYNTHETIC_SUBDIR / "igridvu_suffix.txt").read_text(encoding="utf-8").split()
+    assert len(suffixes) == 12
+    assert suffixes[0] == "gradient00.jpg"
+    for suffix in suffixes:
+        image = QImage(prefix_path_str + suffix)
+        assert (image.width(), image.height()) == (40, 30)
+
+
+def test_create_synthetic_dataset_reports_save_errors(tmp_path: Path, qtbot, monkeypatch):
+    monkeypatch.setattr(QImage, "save", lambda *args, **kwargs: False)
+    success, message, prefix_path = create_synthetic_dataset(tmp_path, count=3, width=4, height=4)
+    assert success is False
+    assert "Failed to save image" in message
+    assert prefix_path == ""
+
+
+def test_create_synthetic_dataset_rejects_unknown_format(tmp_path: Path, qtbot):
+    success, message, _ = create_synthetic_dataset(tmp_path, count=1, image_format="gif")
+    assert success is False
+    assert "unsupported format" in message
+
+
+def test_examples_cli_creates_synthetic_dataset(tmp_path: Path, qtbot, capsys):
+    """Tests the igridvu-examples command-line entry point."""
+    exit_code = main([str(tmp_path), "--count", "2", "--size", "8", "6", "--content", "photo"])
+
+    assert exit_code == 0
+    assert "igridvu" in capsys.readouterr().out
+    assert len(list((tmp_path / SYNTHETIC_SUBDIR).glob("*.png"))) == 2
@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the DatasetBrowserDialog.
+"""
+import os
+from pathlib import Path
+
+from igridvu.dataset_browser import DatasetBrowserDialog, DatasetIndexDialog
+
+
+def make_renders(directory: Path):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "igridvu_suffix.txt").write_text("_a.png\n_b.png\n")
+    for name in ("one_a.png", "one_b.png", "two_a.png"):
+        (directory / name).write_bytes(b"")
+
+
+def test_browser_lists_datasets(qtbot, tmp_path: Path):
+    make_renders(tmp_path)
+    dialog = DatasetBrowserDialog(str(tmp_path))
+    qtbot.addWidget(dialog)
+
+    qtbot.waitUntil(lambda: dialog.tree.topLevelItemCount() == 2)
+    first = dialog.tree.topLevelItem(0)
+    assert [first.text(0), first.text(1), first.text(2)] == ["one", "2 / 2", "Complete"]
+    assert dialog.selected_dataset().name_prefix == "one"
+    assert dialog.suffix_file_path() == str(tmp_path / "igridvu_suffix.txt")
+    assert "2 datasets (1 complete)" in dialog.status_label.text()
+
+
+def test_browser_filter(qtbot, tmp_path: Path):
+    make_renders(tmp_path)
+    dialog = DatasetBrowserDialog(str(tmp_path))
+    qtbot.addWidget(dialog)
+    qtbot.waitUntil(lambda: dialog.tree.topLevelItemCount() == 2)
+
+    dialog.filter_edit.setText("tw")
+
+    assert dialog.tree.topLevelItem(0).isHidden()
+    assert not dialog.tree.topLevelItem(1).isHidden()
+
+
+def test_browser_reports_missing_suffix_file(qtbot, tmp_path: Path):
+    dialog = DatasetBrowserDialog(str(tmp_path))
+    qtbot.addWidget(dialog)
+
+    qtbot.waitUntil(lambda: "Could not read" in dialog.status_label.text())
+    assert dialog.selected_dataset() is None
+
+
+def test_index_dialog_lists_most_recent_first(qtbot, tmp_path: Path):
+    from igridvu.tree_index import TreeIndex
+    make_renders(tmp_path / "tree" / "older")
+    make_renders(tmp_path / "tree" / "newer")
+    os.utime(tmp_path / "tree" / "older" / "one_a.png", (1, 1))
+    os.utime(tmp_path / "tree" / "older" / "one_b.png", (1, 1))
+    index = TreeIndex(str(tmp_path / "index.json"))
+
+    dialog = DatasetIndexDialog(str(tmp_path / "tree"), index=index)
+    qtbot.addWidget(dialog)
+
+    qtbot.waitUntil(lambda: dialog.tree.topLevelItemCount() == 4)
+    assert Path(dialog.selected_dataset().pre_path).parent.name == "newer"
+    assert (tmp_path / "index.json").is_file()
+
+
+def test_index_dialog_runs_one_refresh_at_a_time(qtbot, tmp_path: Path, monkeypatch):
+    from igridvu import dataset_browser
+    from igridvu.tree_index import TreeIndex
+    make_renders(tmp_path / "first")
+    make_renders(tmp_path / "second")
+    roots = []
+    original = dataset_browser._refresh_index
+
+    def _refresh_index(index, root, progress=None):
+        roots.append(root)
+        return original(index, root, progress)
+
+    monkeypatch.setattr(dataset_browser, "_refresh_index", _refresh_index)
+    dialog = DatasetIndexDialog(str(tmp_path / "first"), index=TreeIndex(str(tmp_path / "index.json")))
+    qtbot.addWidget(dialog)
+    # Requested while the first refresh runs: queued, and run for the current root
+    dialog.set_root(str(tmp_path / "second"))
+    dialog.refresh()
+
+    qtbot.waitUntil(lambda: dialog.refresh_button.isEnabled() and dialog.tree.topLevelItemCount() == 2)
+    assert roots == [str(tmp_path / "first"), str(tmp_path / "second")]
+    assert Path(dialog.selected_dataset().pre_path).parent.name == "second"
@@ -0,0 +1,72 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the dataset discovery in src/igridvu/datasets.py.
+"""
+import time
+from pathlib import Path
+
+import pytest
+
+from igridvu import suffixes
+from igridvu.datasets import DatasetInfo, find_datasets, index_datasets
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    suffixes.clear_cache()
+    yield
+    suffixes.clear_cache()
+
+
+def test_index_datasets_counts_matches_per_prefix():
+    names = ["a_diffuse.png", "a_specular.png", "b_diffuse.png", "notes.txt", "diffuse.png"]
+
+    datasets = index_datasets("/renders", names, ["_diffuse.png", "_specular.png", "_v*.png"])
+
+    assert [(d.name_prefix, d.matched, d.total) for d in datasets] == [("a", 2, 2), ("b", 1, 2)]
+    assert datasets[0].complete
+    assert not datasets[1].complete
+
+
+def test_index_datasets_natural_order_and_overlapping_suffixes():
+    names = ["s10_x.png", "s2_x.png", "s2_y.png"]
+
+    datasets = index_datasets("/renders", names, ["_x.png", "x.png", "_y.png"])
+
+    # "s2_x.png" also ends with "x.png", which makes "s2_" a partial dataset
+    assert [(d.name_prefix, d.matched) for d in datasets] == [
+        ("s2", 2), ("s2_", 1), ("s10", 1), ("s10_", 1)]
+
+
+def test_dataset_pre_path():
+    assert DatasetInfo("/renders", "scene1_", 1, 1).pre_path == "/renders/scene1_"
+    assert DatasetInfo("/renders", "", 1, 1).pre_path == "/renders/"
+
+
+def test_find_datasets_reads_the_suffix_file(tmp_path: Path):
+    (tmp_path / "igridvu_suffix.txt").write_text("_a.png\n_b.png\n")
+    for name in ("one_a.png", "one_b.png", "two_a.png"):
+        (tmp_path / name).write_bytes(b"")
+
+    datasets = find_datasets(str(tmp_path))
+
+    assert [(d.name_prefix, d.matched, d.total) for d in datasets] == [("one", 2, 2), ("two", 1, 2)]
+
+
+def test_find_datasets_missing_suffix_file(tmp_path: Path):
+    with pytest.raises(OSError):
+        find_datasets(str(tmp_path))
+    assert find_datasets(str(tmp_path / "missing"), ["_a.png"]) is None
+
+
+def test_index_300k_names_is_fast():
+    suffix_list = [f"_pass{i}.exr" for i in range(20)] + ["_beauty.png", "_depth.png"]
+    names = [f"scene{s}{suffix}" for s in range(14_000) for suffix in suffix_list][:300_000]
+
+    start = time.perf_counter()
+    datasets = index_datasets("/renders", names, suffix_list)
+    elapsed = time.perf_counter() - start
+
+    assert len(datasets) == 13_637
+    assert datasets[0].name_prefix == "scene0" and datasets[0].complete
+    assert elapsed < 1.0
@@ -0,0 +1,81 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the flip-book in src/igridvu/flipbook.py.
+"""
+from pathlib import Path
+
+from PySide6.QtCore import QRectF
+from PySide6.QtGui import QColor, QImage
+
+from igridvu.flipbook import FlipBook
+from igridvu.prefetch import ImageCache
+from igridvu.validation import PathCheck
+
+
+def _checks(tmp_path: Path, count: int):
+    checks = []
+    for i in range(count):
+        image = QImage(40, 40, QImage.Format_RGB32)
+        image.fill(QColor(i * 10, 0, 0))
+        path = tmp_path / f"img{i}.png"
+        image.save(str(path))
+        checks.append(PathCheck(str(path), None))
+    return checks
+
+
+def _flipbook(qtbot, tmp_path: Path, count: int = 5) -> FlipBook:
+    flipbook = FlipBook(ImageCache(1 << 20), ahead=2, behind=1)
+    qtbot.addWidget(flipbook)
+    flipbook.resize(300, 300)
+    flipbook.show()
+    checks = _checks(tmp_path, count)
+    flipbook.set_images(checks, [f"img{i}" for i in range(count)], rect=QRectF(0, 0, 20, 20))
+    qtbot.waitUntil(lambda: flipbook.view is not None)
+    return flipbook
+
+
+def shown_red(flipbook: FlipBook) -> int:
+    return flipbook.view.source_image().pixelColor(0, 0).red()
+
+
+def test_steps_keep_zoom_and_pan(qtbot, tmp_path: Path):
+    flipbook = _flipbook(qtbot, tmp_path)
+    view = flipbook.view
+    zoom = view.pixel_zoom()
+    assert zoom > 5  # The 20 px rectangle of the grid fills the view
+
+    qtbot.waitUntil(lambda: len(flipbook.cache) == 3)  # The current image and two ahead
+    flipbook.step(1)
+    assert flipbook.view is view
+    assert shown_red(flipbook) == 10
+    assert view.label_text == "img1"
+    assert view.pixel_zoom() == zoom
+
+
+def test_previous_image_stays_while_decoding(qtbot, tmp_path: Path):
+    flipbook = _flipbook(qtbot, tmp_path)
+    messages = []
+    flipbook.messageChanged.connect(messages.append)
+
+    flipbook.set_index(4)  # Not prefetched yet
+    if flipbook.shown_index != 4:
+        assert shown_red(flipbook) == 0
+        assert messages[-1].endswith("(loading...)")
+    qtbot.waitUntil(lambda: flipbook.shown_index == 4)
+    assert shown_red(flipbook) == 40
+    assert messages[-1] == "Image 5 / 5: img4"
+
+
+def test_invalid_images_are_skipped_in_place(qtbot, tmp_path: Path):
+    flipbook = FlipBook(ImageCache(1 << 20))
+    qtbot.addWidget(flipbook)
+    flipbook.show()
+    checks = _checks(tmp_path, 1) + [PathCheck(str(tmp_path / "missing.png"), "Not found")]
+    flipbook.set_images(checks, ["img0", "missing"])
+    qtbot.waitUntil(lambda: flipbook.shown_index == 0)
+
+    messages = []
+    flipbook.messageChanged.connect(messages.append)
+    flipbook.step(1)
+    assert messages == ["Image 2 / 2: missing (Not found)"]
+    assert flipbook.shown_index == 0
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for multi-frame images and the frame cache in src/igridvu/frames.py.
+"""
+import struct
+from pathlib import Path
+
+import pytest
+from PySide6.QtGui import QImage
+
+from igridvu.frames import FrameCache, decode_frame
+from igridvu.main_window import ImageGrid
+from igridvu.zoomable_view import ZoomableView
+
+
+def write_multipage_tiff(path: Path, values, width: int = 8, height: int = 6):
+    """Writes an uncompressed 8-bit grayscale TIFF with one page per value."""
+    entry = struct.Struct("<HHII")
+    data = bytearray(b"II*\x00\x00\x00\x00\x00")
+    ifd_offsets = []
+    for value in values:
+        pixel_offset = len(data)
+        data += bytes([value]) * (width * height)
+        ifd_offsets.append(len(data))
+        tags = [(256, 3, 1, width), (257, 3, 1, height), (258, 3, 1, 8), (259, 3, 1, 1),
+                (262, 3, 1, 1), (273, 4, 1, pixel_offset), (277, 3, 1, 1),
+                (278, 3, 1, height), (279, 4, 1, width * height)]
+        data += struct.pack("<H", len(tags))
+        for tag in tags:
+            data += entry.pack(*tag)
+        data += b"\x00\x00\x00\x00"  # Next IFD, patched below
+    struct.pack_into("<I", data, 4, ifd_offsets[0])
+    for this, following in zip(ifd_offsets, ifd_offsets[1:]):
+        count = struct.unpack_from("<H", data, this)[0]
+        struct.pack_into("<I", data, this + 2 + count * entry.size, following)
+    path.write_bytes(bytes(data))
+    return path
+
+
+def gray(image: QImage) -> int:
+    return image.pixelColor(0, 0).red()
+
+
+@pytest.fixture
+def stack(tmp_path: Path) -> Path:
+    return write_multipage_tiff(tmp_path / "stack.tif", [10, 20, 30, 40, 50])
+
+
+def test_decode_frame(stack: Path):
+    assert gray(decode_frame(str(stack), 0)) == 10
+    assert gray(decode_frame(str(stack), 3)) == 40
+    assert decode_frame(str(stack), 9).isNull()
+
+
+def test_view_steps_through_frames(qtbot, stack: Path):
+    cache = FrameCache(1 << 20, ahead=2, behind=1)
+    view = ZoomableView(label_text="stack", img_path=str(stack), frame_cache=cache)
+    qtbot.addWidget(view)
+
+    assert view.frame_count() == 5
+    assert view._title_label.text() == "stack [1/5]"
+    # Frames ahead are decoded in the background
+    qtbot.waitUntil(lambda: (str(stack), 2) in cache)
+
+    assert view.set_frame(2)
+    assert gray(view._image) == 30
+    assert view._title_label.text() == "stack [3/5]"
+    assert view.set_frame(99)  # Clamped to the last frame
+    assert view.current_frame() == 4
+    assert not view.set_frame(4)
+
+
+def test_frame_being_prefetched_is_shown_when_decoded(qtbot, stack: Path, monkeypatch):
+    """Tests that stepping to a frame still being prefetched waits for it instead of decoding it again."""
+    cache = FrameCache(1 << 20, ahead=2, behind=1)
+    view = ZoomableView(label_text="stack", img_path=str(stack), frame_cache=cache)
+    qtbot.addWidget(view)
+    assert cache.is_pending(str(stack), 1)
+    monkeypatch.setattr("igridvu.zoomable_view.decode_frame", lambda *args: pytest.fail("decoded twice"))
+
+    assert view.set_frame(1)
+    assert view.current_frame() == 1
+    assert gray(view._image) == 10  # Still the first frame, until the prefetch finishes
+
+    qtbot.waitUntil(lambda: gray(view._image) == 20)
+    assert view._title_label.text() == "stack [2/5]"
+
+
+def test_stepping_back_cancels_the_pending_frame(qtbot, stack: Path):
+    cache = FrameCache(1 << 20, ahead=2, behind=1)
+    view = ZoomableView(label_text="stack", img_path=str(stack), frame_cache=cache)
+    qtbot.addWidget(view)
+
+    assert view.set_frame(1)
+    assert view.set_frame(0)
+    qtbot.waitUntil(lambda: not cache.is_pending(str(stack), 1))
+    assert view.current_frame() == 0
+    assert gray(view._image) == 10
+
+
+def test_channel_is_kept_across_frames(qtbot, tmp_path: Path):
+    path = write_multipage_tiff(tmp_path / "stack.tif", [10, 20])
+    view = ZoomableView(label_text="stack", img_path=str(path))
+    qtbot.addWidget(view)
+    view._current_channel = "Red"
+    view._update_title()
+
+    view.set_frame(1)
+
+    assert view._current_channel == "Red"
+    assert view._title_label.text() == "stack (Red) [2/2]"
+
+
+def test_cache_stays_within_budget_and_evicts_outside_window():
+    frame = QImage(100, 100, QImage.Format_RGB32)
+    cache = FrameCache(budget_bytes=3 * frame.sizeInBytes(), ahead=1, behind=0)
+    cache._current["a"] = 5
+    for index in (0, 5, 6, 1):
+        cache.put("a", index, frame)
+
+    assert cache.memory_usage() <= cache.budget_bytes
+    assert ("a", 0) not in cache  # Outside the window, evicted first
+    assert ("a", 5) in cache and ("a", 6) in cache
+
+
+def test_grid_keeps_frames_in_step(qtbot, tmp_path: Path, create_dummy_image):
+    write_multipage_tiff(tmp_path / "s_long.tif", [1, 2, 3, 4])
+    write_multipage_tiff(tmp_path / "s_short.tif", [5, 6])
+    create_dummy_image(tmp_path, filename="s_still.png")
+    grid = ImageGrid(str(tmp_path / "s"), ["_long.tif", "_short.tif", "_still.png"], "dummy.txt")
+    qtbot.addWidget(grid)
+
+    assert grid.frame_count() == 4
+    grid.set_frame(3)
+
+    assert [view.current_frame() for view in grid.views] == [3, 1, 0]
+    qtbot.waitUntil(lambda: gray(grid.views[0]._image) == 4)
+    grid.set_frame(-5)
+    assert grid.frame_index == 0
+
+
+def test_prefetched_sequence_cells_keep_their_frames(qtbot, tmp_path: Path):
+    """Tests that cells built from images decoded ahead still step through their frames."""
+    write_multipage_tiff(tmp_path / "frame01_a.tif", [1, 2, 3])
+    write_multipage_tiff(tmp_path / "frame02_a.tif", [4, 5, 6])
+    grid = ImageGrid(str(tmp_path / "frame01_"), ["a.tif"], "dummy.txt")
+    qtbot.addWidget(grid)
+    next_path = str(tmp_path / "frame02_a.tif")
+    qtbot.waitUntil(lambda: next_path in grid.image_cache)
+    assert grid.image_cache.frame_count(next_path) == 3
+
+    grid.step_sequence(1)
+
+    view = grid.views[0]
+    assert view.source_image().constBits() == grid.image_cache.get(next_path).constBits()
+    assert view.frame_count() == 3
+    grid.set_frame(2)
+    qtbot.waitUntil(lambda: gray(view._image) == 6)
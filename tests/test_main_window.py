@@ -12,10 +12,11 @@ from pathlib import Path
 from unittest.mock import Mock, MagicMock, patch
 
 import pytest
-from PySide6.QtCore import QPoint, QPointF, QStandardPaths, Qt
+from PySide6.QtCore import QPoint, QPointF, QRectF, QStandardPaths, Qt
 from PySide6.QtGui import QAction, QColor, QWheelEvent, QImage
+from PySide6.QtTest import QTest
 from PySide6.QtWidgets import \
-    QApplication, QFileDialog, QGridLayout, QMessageBox, QPushButton, QGraphicsTextItem
+    QApplication, QFileDialog, QGridLayout, QMessageBox, QPushButton, QGraphicsTextItem, QInputDialog
 
 from igridvu import ImageGrid, ZoomableView
 
@@ -319,13 +320,14 @@ def test_save_snapshot(qtbot, tmp_path, monkeypatch, dialog_filename, save_retur
     monkeypatch.setattr(
         QFileDialog,
         'getSaveFileName',
-        lambda *args, **kwargs: (str(save_path), "Images (*.png *.jpg *.bmp)")
+        lambda *args, **kwargs: (str(save_path), "Images (*.png *.jpg *.webp *.bmp)")
     )
 
-    # Mock the `grab` method to return a mock pixmap whose `save` method can be tracked
-    mock_pixmap = MagicMock()
-    mock_pixmap.save.return_value = save_return
-    monkeypatch.setattr(grid, 'grab', lambda: mock_pixmap)
+    # Mock the encoder, which runs in a background thread, so its calls can be tracked
+    mock_save_image = Mock(return_value=str(save_path))
+    if not save_return:
+        mock_save_image.side_effect = IOError("disk full")
+    monkeypatch.setattr('igridvu.snapshot.save_image', mock_save_image)
 
     # Mock QStandardPaths to avoid dependency on the user's "Pictures" folder
     monkeypatch.setattr(QStandardPaths, 'writableLocation', lambda location: str(tmp_path))
@@ -335,9 +337,15 @@ def test_save_snapshot(qtbot, tmp_path, monkeypatch, dialog_filename, save_retur
 
     # 4. Assertions
     if save_called:
-        mock_pixmap.save.assert_called_once_with(str(save_path))
+        qtbot.waitUntil(lambda: expected_status_contains in grid.statusBar().currentMessage(), timeout=5000)
+        mock_save_image.assert_called_once()
+        image, path, compression, quality = mock_save_image.call_args.args
+        assert isinstance(image, QImage)
+        assert path == str(save_path)
+        assert compression == grid.snapshot_png_compression
+        assert quality == grid.snapshot_quality
     else:
-        mock_pixmap.save.assert_not_called()
+        mock_save_image.assert_not_called()
 
     assert expected_status_contains in grid.statusBar().currentMessage()
 
@@ -460,7 +468,7 @@ def test_open_dataset_handles_ambiguous_suffixes(qtbot, monkeypatch, tmp_path: P
 
 
 @pytest.mark.parametrize("load_answer", [QMessageBox.StandardButton.Yes, QMessageBox.StandardButton.No])
-@patch('igridvu.main_window.create_example_dataset')
+@patch('igridvu.create_examples.create_example_dataset')
 def test_create_example_dataset_action_and_load(mock_create_dataset, qtbot, monkeypatch, tmp_path: Path, load_answer):
     """Tests the full flow of creating and optionally loading the example dataset."""
     # 1. Setup
@@ -609,13 +617,14 @@ def test_save_snapshot(qtbot, tmp_path, monkeypatch, dialog_filename, save_retur
     monkeypatch.setattr(
         QFileDialog,
         'getSaveFileName',
-        lambda *args, **kwargs: (str(save_path), "Images (*.png *.jpg *.bmp)")
+        lambda *args, **kwargs: (str(save_path), "Images (*.png *.jpg *.webp *.bmp)")
     )
 
-    # Mock the `grab` method to return a mock pixmap whose `save` method can be tracked
-    mock_pixmap = MagicMock()
-    mock_pixmap.save.return_value = save_return
-    monkeypatch.setattr(grid, 'grab', lambda: mock_pixmap)
+    # Mock the encoder, which runs in a background thread, so its calls can be tracked
+    mock_save_image = Mock(return_value=str(save_path))
+    if not save_return:
+        mock_save_image.side_effect = IOError("disk full")
+    monkeypatch.setattr('igridvu.snapshot.save_image', mock_save_image)
 
     # Mock QStandardPaths to avoid dependency on the user's "Pictures" folder
     monkeypatch.setattr(QStandardPaths, 'writableLocation', lambda location: str(tmp_path))
@@ -625,9 +634,15 @@ def test_save_snapshot(qtbot, tmp_path, monkeypatch, dialog_filename, save_retur
 
     # 4. Assertions
     if save_called:
-        mock_pixmap.save.assert_called_once_with(str(save_path))
+        qtbot.waitUntil(lambda: expected_status_contains in grid.statusBar().currentMessage(), timeout=5000)
+        mock_save_image.assert_called_once()
+        image, path, compression, quality = mock_save_image.call_args.args
+        assert isinstance(image, QImage)
+        assert path == str(save_path)
+        assert compression == grid.snapshot_png_compression
+        assert quality == grid.snapshot_quality
     else:
-        mock_pixmap.save.assert_not_called()
+        mock_save_image.assert_not_called()
 
     assert expected_status_contains in grid.statusBar().currentMessage()
 
@@ -752,7 +767,7 @@ def test_open_dataset_handles_ambiguous_suffixes(qtbot, monkeypatch, tmp_path: P
 
 
 @pytest.mark.parametrize("load_answer", [QMessageBox.StandardButton.Yes, QMessageBox.StandardButton.No])
-@patch('igridvu.main_window.create_example_dataset')
+@patch('igridvu.create_examples.create_example_dataset')
 def test_create_example_dataset_action_and_load(mock_create_dataset, qtbot, monkeypatch, tmp_path: Path, load_answer):
     """Tests the full flow of creating and optionally loading the example dataset."""
     # 1. Setup
@@ -835,3 +850,300 @@ def test_image_grid_pixel_info_out_of_bounds(tmp_path: Path, qtbot, create_dummy
 
     # Check status bar (should show path of the sender view)
     assert grid.statusBar().currentMessage() == f"Path: {view1.img_path}"
+
+
+def test_export_full_resolution(tmp_path: Path, qtbot, monkeypatch, create_dummy_image):
+    """Tests that the full-resolution export writes a stitched image in the background."""
+    create_dummy_image(tmp_path, filename="1.png", width=30, height=20)
+    create_dummy_image(tmp_path, filename="2.png", width=30, height=20)
+    grid = ImageGrid(str(tmp_path), ["1.png", "2.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+
+    out = tmp_path / "export.png"
+    monkeypatch.setattr(QInputDialog, 'getDouble', lambda *args, **kwargs: (1.0, True))
+    monkeypatch.setattr(QFileDialog, 'getSaveFileName', lambda *args, **kwargs: (str(out), ""))
+
+    grid._export_full_resolution()
+
+    qtbot.waitUntil(lambda: "Exported grid to" in grid.statusBar().currentMessage(), timeout=5000)
+    image = QImage(str(out))
+    assert (image.width(), image.height()) == (60, 20)
+
+
+def test_export_decodes_proxies_at_full_resolution(tmp_path: Path, qtbot, monkeypatch, create_dummy_image):
+    """Tests that views reduced to a proxy are exported from their file, with the channel shown."""
+    create_dummy_image(tmp_path, filename="1.png", width=300, height=200)
+    create_dummy_image(tmp_path, filename="2.png", width=300, height=200)
+    grid = ImageGrid(str(tmp_path) + "/", ["1.png", "2.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+    grid.views[1].view_channel("Red")
+    assert grid.views[0].degrade_to_proxy(50) and grid.views[1].degrade_to_proxy(50)
+
+    out = tmp_path / "export.png"
+    monkeypatch.setattr(QInputDialog, 'getDouble', lambda *args, **kwargs: (1.0, True))
+    monkeypatch.setattr(QFileDialog, 'getSaveFileName', lambda *args, **kwargs: (str(out), ""))
+    grid._export_full_resolution()
+
+    qtbot.waitUntil(lambda: "Exported grid to" in grid.statusBar().currentMessage(), timeout=5000)
+    image = QImage(str(out))
+    assert (image.width(), image.height()) == (600, 200)
+    first, second = QImage(str(tmp_path / "1.png")), QImage(str(tmp_path / "2.png"))
+    for x, y in ((17, 150), (250, 199)):
+        assert image.pixelColor(x, y).rgb() == first.pixelColor(x, y).rgb()
+        assert image.pixelColor(300 + x, y).red() == second.pixelColor(x, y).red()
+        assert image.pixelColor(300 + x, y).green() == second.pixelColor(x, y).red()
+
+
+def test_create_synthetic_dataset_action(qtbot, monkeypatch, tmp_path: Path):
+    """Tests that the synthetic dataset is generated in the background and offered for loading."""
+    grid = ImageGrid("", [], "dummy.txt")
+    qtbot.addWidget(grid)
+
+    options = {"count": 3, "width": 8, "height": 8, "bit_depth": 8, "alpha": False,
+               "image_format": "png", "content": "noise"}
+    monkeypatch.setattr('igridvu.synthetic_dialog.SyntheticDatasetDialog.exec', lambda self: True)
+    monkeypatch.setattr('igridvu.synthetic_dialog.SyntheticDatasetDialog.options', lambda self: options)
+    monkeypatch.setattr(QFileDialog, 'getExistingDirectory', lambda *args, **kwargs: str(tmp_path))
+    mock_question = Mock(return_value=QMessageBox.StandardButton.Yes)
+    monkeypatch.setattr(QMessageBox, 'question', mock_question)
+
+    action = next(a for a in grid.findChildren(QAction) if a.text() == "Create Synthetic Dataset...")
+    action.trigger()
+
+    qtbot.waitUntil(lambda: mock_question.called, timeout=5000)
+    assert grid.pre_path == str(tmp_path / "synthetic" / "synth_")
+    assert len(grid.views) == 3
+
+
+def test_memory_budget_degrades_views(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that views beyond the memory budget show proxies and the usage is displayed."""
+    for name in ("1.png", "2.png"):
+        create_dummy_image(tmp_path, filename=name, width=600, height=600)
+    grid = ImageGrid(str(tmp_path) + "/", ["1.png", "2.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+    grid.memory_governor.budget_bytes = grid.views[0].memory_usage()
+
+    grid.memory_governor.enforce()
+
+    assert any(view.is_proxy() for view in grid.views)
+    assert grid.memory_label.text().startswith("Memory: ")
+    assert "low-res" in grid.memory_label.text()
+
+
+def test_deferred_menus_are_built_after_show(qtbot):
+    """Tests that with defer_menus the menu bar is built once the event loop runs."""
+    grid = ImageGrid("", [], "dummy.txt", defer_menus=True)
+    qtbot.addWidget(grid)
+    assert grid.isVisible()
+    assert not grid.menuBar().actions()
+
+    qtbot.waitUntil(lambda: len(grid.menuBar().actions()) == 4)
+
+
+def test_glob_suffixes_are_expanded(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that glob entries in the suffix list expand to the matching files."""
+    for name in ("scene_v1.png", "scene_v2.png", "scene_v10.png", "scene_other.png"):
+        create_dummy_image(tmp_path, filename=name)
+    grid = ImageGrid(str(tmp_path / "scene"), ["_v*.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+
+    assert [view.label_text for view in grid.views] == ["_v1", "_v2", "_v10"]
+
+
+def test_browse_datasets_loads_selection(tmp_path: Path, qtbot, monkeypatch, create_dummy_image):
+    """Tests that the dataset chosen in the browser is loaded."""
+    (tmp_path / "igridvu_suffix.txt").write_text("_a.png\n_b.png\n")
+    for name in ("one_a.png", "one_b.png"):
+        create_dummy_image(tmp_path, filename=name)
+    from igridvu.dataset_browser import DatasetBrowserDialog
+    from igridvu.datasets import DatasetInfo
+    monkeypatch.setattr(DatasetBrowserDialog, 'exec', lambda self: True)
+    monkeypatch.setattr(DatasetBrowserDialog, 'selected_dataset',
+                        lambda self: DatasetInfo(str(tmp_path), "one", 2, 2))
+    # The browser starts in the directory of the current prefix
+    grid = ImageGrid(str(tmp_path / "none_"), [], "dummy.txt")
+    qtbot.addWidget(grid)
+
+    grid._open_dataset_browser()
+
+    assert grid.pre_path == str(tmp_path / "one")
+    assert [view.label_text for view in grid.views] == ["_a", "_b"]
+
+
+def test_grid_loads_images_from_zip_archive(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that a prefix inside a zip archive loads the archive members."""
+    import zipfile
+    with zipfile.ZipFile(tmp_path / "results.zip", "w") as archive:
+        for name in ("scene1_a.png", "scene1_b.png"):
+            archive.write(create_dummy_image(tmp_path, filename=name), name)
+    grid = ImageGrid(f"{tmp_path / 'results.zip'}!/scene1_", ["a.png", "b.png", "c.png"],
+                     suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+
+    assert [view.has_image() for view in grid.views] == [True, True, False]
+
+
+def test_compare_two_views_and_return_to_grid(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that comparing shows one large view and returning applies its zoom to the grid."""
+    for name in ("1.png", "2.png"):
+        create_dummy_image(tmp_path, filename=name, width=100, height=100)
+    grid = ImageGrid(str(tmp_path) + "/", ["1.png", "2.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+
+    grid.compare_views(*grid.views)
+    assert grid.stacked_widget.currentWidget() is grid.compare_view
+    assert grid.compare_view.view_b is grid.views[1]
+
+    grid.compare_view.fitInView(QRectF(10, 10, 20, 20), Qt.KeepAspectRatio)
+    rect = grid.compare_view.view_rect()
+    QTest.keyClick(grid.compare_view, Qt.Key_Escape)
+    assert grid.stacked_widget.currentWidget() is grid.grid_container
+    assert grid.compare_view.view_a is None
+    visible = grid.views[0].mapToScene(grid.views[0].viewport().rect()).boundingRect()
+    assert visible.intersects(rect) and visible.width() < 100
+
+
+def test_compared_views_are_restored_and_kept_at_full_resolution(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that comparing restores proxies, and the governor keeps the compared views until the end."""
+    for name in ("1.png", "2.png", "3.png"):
+        create_dummy_image(tmp_path, filename=name, width=600, height=600)
+    grid = ImageGrid(str(tmp_path) + "/", ["1.png", "2.png", "3.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+    governor = grid.memory_governor
+    governor.budget_bytes = 1
+    governor.enforce()
+    assert all(view.is_proxy() for view in grid.views)
+
+    grid.compare_views(grid.views[0], grid.views[1])
+    qtbot.waitUntil(lambda: not grid.views[0].is_proxy() and not grid.views[1].is_proxy())
+    governor.enforce()
+    assert [view.is_proxy() for view in grid.views] == [False, False, True]
+
+    grid.exit_compare()
+    governor.enforce()
+    assert all(view.is_proxy() for view in grid.views)
+
+
+def test_flipbook_steps_through_suffixes(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that the flip-book shows one image at a time and returns to the grid."""
+    for name in ("1.png", "2.png", "3.png"):
+        create_dummy_image(tmp_path, filename=name, width=50, height=50)
+    grid = ImageGrid(str(tmp_path) + "/", ["1.png", "2.png", "3.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+
+    grid.flipbook_action.trigger()
+    assert grid.is_flipbook_active()
+    assert grid.next_image_action.isEnabled()
+    # The first image was taken from the grid, without decoding it again
+    assert grid.flipbook.shown_index == 0
+
+    grid.next_image_action.trigger()
+    qtbot.waitUntil(lambda: grid.flipbook.shown_index == 1)
+    assert grid.flipbook.view.label_text == "2"
+
+    QTest.keyClick(grid.flipbook.view, Qt.Key_Escape)
+    assert not grid.is_flipbook_active()
+    assert not grid.flipbook_action.isChecked()
+    assert len(grid.image_cache) == 0
+
+
+def test_step_sequence_keeps_view_state_and_uses_prefetched_images(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that the next numbered dataset is shown with the zoom, pan and channels of the current one."""
+    for frame in ("frame01_", "frame02_"):
+        for suffix in ("a.png", "b.png"):
+            create_dummy_image(tmp_path, filename=frame + suffix, width=100, height=100)
+    grid = ImageGrid(str(tmp_path / "frame01_"), ["a.png", "b.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+    qtbot.waitExposed(grid)
+    # The grid of frame02_ is decoded in the background
+    qtbot.waitUntil(lambda: str(tmp_path / "frame02_b.png") in grid.image_cache)
+
+    grid.views[0].setViewRect(QRectF(10, 10, 20, 20))
+    rect = grid.views[0].mapToScene(grid.views[0].viewport().rect()).boundingRect()
+    grid.views[1].view_channel("Green")
+    cached = grid.image_cache.get(str(tmp_path / "frame02_a.png"))
+
+    grid.step_sequence(1)
+
+    assert grid.pre_path == str(tmp_path / "frame02_")
+    assert grid.views[0].source_image().constBits() == cached.constBits()
+    assert grid.views[1].current_channel() == "Green"
+    qtbot.waitUntil(lambda: grid.views[0].isVisible())
+    visible = grid.views[0].mapToScene(grid.views[0].viewport().rect()).boundingRect()
+    assert visible.center().x() == pytest.approx(rect.center().x(), abs=2)
+    assert visible.width() < 50
+
+    grid.step_sequence(1)  # The last dataset
+    assert grid.pre_path == str(tmp_path / "frame02_")
+
+
+def test_playback_shows_sequence_in_existing_views(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that playing a numbered sequence replaces the images in place, keeping the zoom."""
+    for frame in ("shot1_", "shot2_", "shot3_"):
+        create_dummy_image(tmp_path, filename=frame + "a.png", width=60, height=60)
+    grid = ImageGrid(str(tmp_path / "shot1_"), ["a.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+    qtbot.waitExposed(grid)
+    view = grid.views[0]
+    view.setViewRect(QRectF(0, 0, 10, 10))
+    zoom = view.pixel_zoom()
+
+    grid.play_action.trigger()
+    assert grid.is_playing()
+    qtbot.waitUntil(lambda: view.img_path != str(tmp_path / "shot1_a.png"), timeout=3000)
+    assert view.pixel_zoom() == pytest.approx(zoom)
+
+    grid.play_action.trigger()
+    assert not grid.is_playing()
+    assert grid.pre_path + "a.png" == view.img_path
+
+
+def test_session_is_saved_on_close_and_restored_from_proxies(tmp_path: Path, qtbot, monkeypatch, create_dummy_image):
+    """Tests that closing saves the session, and a restored grid first shows the cached proxies."""
+    from igridvu.session import load_session
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path / "cache"))
+    for suffix in ("a.png", "b.png"):
+        create_dummy_image(tmp_path, filename="scene_" + suffix, width=1200, height=600)
+    session_path = str(tmp_path / "session.json")
+    grid = ImageGrid(str(tmp_path / "scene_"), ["a.png", "b.png"], suffix_file_path="suffixes.txt", columns=1)
+    qtbot.addWidget(grid)
+    qtbot.waitExposed(grid)
+    grid.session_path = session_path
+    grid.views[0].setViewRect(QRectF(100, 100, 200, 100))
+    grid.views[1].view_channel("Blue")
+    grid.close()
+
+    session = load_session(session_path)
+    assert session.pre_path == str(tmp_path / "scene_")
+    assert session.columns == 1
+    assert session.channels == [None, "Blue"]
+    x, y, width, height = session.view_rect
+    assert (x + width / 2, y + height / 2) == (pytest.approx(200, abs=2), pytest.approx(150, abs=2))
+    assert grid.proxy_cache.contains(str(tmp_path / "scene_b.png"), "Blue")
+
+    restored = ImageGrid(session.pre_path, ["a.png", "b.png"], suffix_file_path=session.suffix_file,
+                         columns=session.columns, session=session)
+    qtbot.addWidget(restored)
+    views = restored.views
+    assert all(view.is_loading() for view in views)
+    assert views[0].image_size().width() == 1200
+    assert views[1].current_channel() == "Blue"
+    qtbot.waitUntil(lambda: not any(view.is_loading() for view in views))
+    assert views[1].current_channel() == "Blue"
+    qtbot.waitExposed(restored)
+    visible = views[0].mapToScene(views[0].viewport().rect()).boundingRect()
+    assert visible.width() < 600
+
+
+def test_open_dataset_loads_forwarded_prefix(tmp_path: Path, qtbot, create_dummy_image):
+    """Tests that a dataset forwarded by another call is loaded in place."""
+    create_dummy_image(tmp_path, filename="other_a.png")
+    suffix_file = tmp_path / "igridvu_suffix.txt"
+    suffix_file.write_text("a.png\n")
+    grid = ImageGrid("", [], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+
+    grid.open_dataset(str(tmp_path / "other_"), str(suffix_file))
+
+    assert grid.stacked_widget.currentWidget() is grid.grid_container
+    assert [view.img_path for view in grid.views] == [str(tmp_path / "other_a.png")]
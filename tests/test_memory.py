@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the memory governor in src/igridvu/memory.py.
+"""
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QPointF
+from PySide6.QtGui import QImage
+
+from igridvu import ZoomableView
+from igridvu.memory import MemoryGovernor, read_meminfo, format_bytes
+
+IMAGE_SIZE = 256
+PROXY_SIZE = 32
+
+
+@pytest.fixture
+def make_views(tmp_path: Path, qtbot, create_dummy_image):
+    """Returns a factory creating `count` views of IMAGE_SIZE square images."""
+    def _make_views(count: int):
+        views = []
+        for i in range(count):
+            img_path = create_dummy_image(tmp_path, IMAGE_SIZE, IMAGE_SIZE, filename=f"img{i}.png")
+            view = ZoomableView(label_text=f"view{i}", img_path=str(img_path))
+            qtbot.addWidget(view)
+            views.append(view)
+        return views
+    return _make_views
+
+
+def write_meminfo(path: Path, total_kb: int, available_kb: int) -> str:
+    path.write_text(f"MemTotal:       {total_kb} kB\n"
+                    f"MemFree:        {available_kb // 2} kB\n"
+                    f"MemAvailable:   {available_kb} kB\n"
+                    f"HugePages_Total:       0\n")
+    return str(path)
+
+
+def governor_for(views, budget, meminfo_path="/nonexistent/meminfo"):
+    governor = MemoryGovernor(budget, proxy_max_dimension=PROXY_SIZE,
+                              poll_interval_ms=0, meminfo_path=meminfo_path)
+    for view in views:
+        governor.register(view)
+    return governor
+
+
+def test_read_meminfo(tmp_path: Path):
+    info = read_meminfo(write_meminfo(tmp_path / "meminfo", 1000, 400))
+    assert info["MemTotal"] == 1000 * 1024
+    assert info["MemAvailable"] == 400 * 1024
+    assert info["HugePages_Total"] == 0
+    assert read_meminfo(str(tmp_path / "missing")) is None
+
+
+def test_format_bytes():
+    assert format_bytes(512) == "512 B"
+    assert format_bytes(1536) == "1.5 KB"
+    assert format_bytes(3 * 1024 ** 3) == "3.0 GB"
+
+
+def test_memory_usage_counts_channel_copies(make_views):
+    (view,) = make_views(1)
+    base = view.memory_usage()
+    assert base > IMAGE_SIZE * IMAGE_SIZE * 4
+
+    view.view_channel("Red")
+    assert view.memory_usage() > base  # The original is kept for restoring
+    view.restore_original()
+    assert view.memory_usage() == base
+
+
+def test_degrade_keeps_scene_coordinates(make_views, qtbot):
+    (view,) = make_views(1)
+    full = view.memory_usage()
+
+    assert view.degrade_to_proxy(PROXY_SIZE)
+    assert view.is_proxy()
+    assert view.memory_usage() < full
+    assert view.full_size_bytes() == full
+    assert view._pixmap_item.sceneBoundingRect().width() == pytest.approx(IMAGE_SIZE)
+    assert view.get_color_at(QPointF(1, 1)) is None
+
+    assert view.restore_full_resolution()
+    # Decoded in the background, showing the proxy meanwhile
+    assert view.is_proxy() and view.is_restoring()
+    assert not view.restore_full_resolution()
+    qtbot.waitUntil(lambda: not view.is_proxy())
+    assert not view.is_restoring()
+    assert view.memory_usage() == full
+
+
+def test_governor_degrades_least_recently_used(make_views):
+    views = make_views(3)
+    per_view = views[0].memory_usage()
+    governor = governor_for(views, budget=int(per_view * 2.5))
+    governor.touch(views[2])
+    governor.touch(views[0])
+
+    governor.enforce()
+
+    assert [view.is_proxy() for view in views] == [False, True, False]
+    assert governor.total_bytes() <= governor.budget_bytes
+
+
+def test_governor_restores_when_budget_grows(make_views, qtbot):
+    views = make_views(2)
+    governor = governor_for(views, budget=1)
+    governor.enforce()
+    assert all(view.is_proxy() for view in views)
+
+    governor.budget_bytes = 10 * views[0].full_size_bytes()
+    with qtbot.waitSignal(governor.usageChanged) as blocker:
+        governor.enforce()
+    # Views being restored are counted at full size
+    assert all(view.is_restoring() for view in views)
+    used, budget = blocker.args
+    assert used == governor.total_bytes()
+    assert budget == governor.budget_bytes
+    qtbot.waitUntil(lambda: not any(view.is_proxy() for view in views))
+
+
+def test_governor_restores_only_below_the_lower_watermark(make_views, qtbot):
+    views = make_views(2)
+    full = views[0].memory_usage()
+    governor = governor_for(views, budget=1)
+    governor.enforce()
+    proxies = governor.total_bytes()
+
+    # Both views fit into the budget, but not below 80 % of it
+    governor.budget_bytes = int((proxies + 2 * (full - views[0].memory_usage())) / 0.9)
+    governor.enforce()
+    assert sum(view.is_restoring() for view in views) == 1
+
+    qtbot.waitUntil(lambda: not any(view.is_restoring() for view in views))
+    governor.enforce()
+    assert [view.is_proxy() for view in views].count(True) == 1
+
+
+def test_governor_reacts_to_memory_pressure(make_views, tmp_path: Path):
+    views = make_views(2)
+    per_view = views[0].memory_usage()
+    # 10 % of 100 MB should be available, but only 9.9 MB are
+    meminfo = write_meminfo(tmp_path / "meminfo", 100 * 1024, 100 * 1024 // 10 - 100)
+    governor = governor_for(views, budget=10 * per_view, meminfo_path=meminfo)
+
+    assert governor.effective_budget() < 2 * per_view
+    governor.enforce()
+    assert any(view.is_proxy() for view in views)
+
+
+def test_in_memory_images_are_not_degraded(qtbot, create_dummy_image, tmp_path: Path):
+    image = QImage(str(create_dummy_image(tmp_path, IMAGE_SIZE, IMAGE_SIZE)))
+    view = ZoomableView(label_text="in-memory", image=image)
+    qtbot.addWidget(view)
+
+    assert not view.degrade_to_proxy(PROXY_SIZE)
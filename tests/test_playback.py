@@ -0,0 +1,64 @@
+# -*- coding: utf-8 -*-
+"""
+Tests for the sequence playback in src/igridvu/playback.py.
+"""
+from pathlib import Path
+
+from PySide6.QtGui import QColor, QImage
+
+from igridvu.playback import SequencePlayer, decode_images
+
+
+def _frames(tmp_path: Path, count: int):
+    paths = []
+    for i in range(count):
+        image = QImage(8, 8, QImage.Format_RGB32)
+        image.fill(QColor(i * 10, 0, 0))
+        path = tmp_path / f"frame{i}_a.png"
+        image.save(str(path))
+        paths.append([str(path), None])
+    return paths
+
+
+def test_decode_images_keeps_cell_positions(tmp_path: Path):
+    paths = _frames(tmp_path, 1)[0]
+    images = decode_images(paths)
+    assert images[0].pixelColor(0, 0).red() == 0
+    assert images[1].isNull()
+
+
+def test_plays_frames_in_order_and_loops(qtbot, tmp_path: Path):
+    frames = _frames(tmp_path, 3)
+    player = SequencePlayer(3, lambda i: frames[i], fps=100, buffer_frames=4)
+    shown = []
+    player.frameShown.connect(lambda index, images: shown.append((index, images[0].pixelColor(0, 0).red())))
+
+    player.start(0)
+    qtbot.waitUntil(lambda: len(shown) >= 4, timeout=3000)
+    player.stop()
+
+    # Every frame shows the images of its dataset
+    assert all(red == index * 10 for index, red in shown)
+    assert not player.is_playing() and player.buffered() == 0
+
+
+def test_late_frames_are_dropped(qtbot, tmp_path: Path, monkeypatch):
+    frames = _frames(tmp_path, 10)
+    player = SequencePlayer(10, lambda i: frames[i], fps=24, buffer_frames=3)
+    player.start(0)
+    player._timer.stop()  # Ticks are driven by the test
+    qtbot.waitUntil(lambda: player.buffered() == 3)
+    shown = []
+    player.frameShown.connect(lambda index, _images: shown.append(index))
+
+    # Frame 3 is due, but only frames 1-3 are decoded: 1 and 2 are dropped
+    monkeypatch.setattr(player, "_due", lambda: 3)
+    player._tick()
+    assert shown == [3] and player.dropped == 2
+    # Nothing new is due: the frame stays on screen
+    player._tick()
+    assert shown == [3]
+    # The buffer is refilled after the frame on screen
+    qtbot.waitUntil(lambda: player.buffered() == 3)
+    assert sorted(player._buffer) == [4, 5, 6]
+    player.stop()
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the background image cache in src/igridvu/prefetch.py.
+"""
+from pathlib import Path
+
+from PySide6.QtGui import QColor, QImage
+
+from igridvu.prefetch import ImageCache
+
+
+def _images(tmp_path: Path, count: int, size: int = 16):
+    paths = []
+    for i in range(count):
+        image = QImage(size, size, QImage.Format_RGB32)
+        image.fill(QColor(i * 10, 0, 0))
+        path = tmp_path / f"img{i}.png"
+        image.save(str(path))
+        paths.append(str(path))
+    return paths
+
+
+def test_wanted_images_are_decoded_in_background(qtbot, tmp_path: Path):
+    paths = _images(tmp_path, 3)
+    cache = ImageCache(1 << 20)
+
+    with qtbot.waitSignals([cache.imageReady] * 3, timeout=2000):
+        cache.set_wanted(paths)
+
+    assert len(cache) == 3
+    assert cache.get(paths[2]).pixelColor(0, 0).red() == 20
+
+
+def test_unwanted_then_least_wanted_images_are_evicted(tmp_path: Path):
+    image = QImage(16, 16, QImage.Format_RGB32)
+    cache = ImageCache(2 * image.sizeInBytes())
+    cache.put("old", image)
+    cache.set_wanted([])
+    cache._wanted = {"a": 0, "b": 1}
+
+    cache.put("a", image)
+    cache.put("b", image)
+    assert "old" not in cache and len(cache) == 2
+
+    cache.budget_bytes = image.sizeInBytes()
+    cache._evict()
+    # The most wanted image is kept
+    assert "a" in cache and "b" not in cache
+
+
+def test_failed_decodes_are_reported_once(qtbot, tmp_path: Path):
+    broken = tmp_path / "broken.png"
+    broken.write_bytes(b"not an image")
+    cache = ImageCache(1 << 20)
+
+    with qtbot.waitSignal(cache.imageFailed, timeout=2000):
+        cache.set_wanted([str(broken)])
+    assert cache.has_failed(str(broken))
+
+    cache.set_wanted([str(broken)])
+    assert not cache.is_pending(str(broken))
+
+
+def test_images_larger_than_a_view_accepts_fail(qtbot, tmp_path: Path):
+    paths = _images(tmp_path, 1, size=16)
+    cache = ImageCache(1 << 20, max_dimension=8)
+
+    with qtbot.waitSignal(cache.imageFailed, timeout=2000):
+        cache.set_wanted(paths)
+    assert cache.has_failed(paths[0]) and paths[0] not in cache
+
+
+def test_clear_drops_pending_results(qtbot, tmp_path: Path):
+    paths = _images(tmp_path, 2)
+    cache = ImageCache(1 << 20)
+    cache.set_wanted(paths)
+    cache.clear()
+
+    qtbot.wait(200)
+    assert len(cache) == 0
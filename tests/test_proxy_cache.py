@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the persistent proxy cache in src/igridvu/proxy_cache.py.
+"""
+import os
+from pathlib import Path
+
+from PySide6.QtCore import QSize
+from PySide6.QtGui import QColor, QImage
+
+from igridvu.proxy_cache import ProxyCache, default_proxy_dir
+
+
+def _image(width: int, height: int, color=QColor(200, 10, 10)) -> QImage:
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(color)
+    return image
+
+
+def test_default_proxy_dir_uses_xdg_cache_home(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_proxy_dir() == str(tmp_path / "igridvu" / "proxies")
+
+
+def test_put_downscales_and_get_returns_full_size(tmp_path: Path):
+    source = tmp_path / "a.png"
+    _image(8, 4).save(str(source))
+    cache = ProxyCache(str(tmp_path / "proxies"), max_dimension=64)
+
+    assert cache.get(str(source)) is None
+    assert cache.put(str(source), _image(400, 200), QSize(4000, 2000))
+
+    proxy = cache.get(str(source))
+    assert proxy.image.size() == QSize(64, 32)
+    assert proxy.full_size == QSize(4000, 2000)
+    assert proxy.image.pixelColor(10, 10).red() == 200
+
+
+def test_variants_and_rewritten_images_have_separate_proxies(tmp_path: Path):
+    source = tmp_path / "a.png"
+    _image(8, 4).save(str(source))
+    cache = ProxyCache(str(tmp_path / "proxies"))
+    cache.put(str(source), _image(8, 4), QSize(8, 4), "Red")
+
+    assert cache.contains(str(source), "Red")
+    assert not cache.contains(str(source))
+
+    # The image is written again: its proxy is stale
+    stat = os.stat(source)
+    os.utime(source, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10 ** 9))
+    assert cache.get(str(source), "Red") is None
+    assert cache.get(str(tmp_path / "missing.png")) is None
+
+
+def test_prune_deletes_least_recently_used_proxies(tmp_path: Path):
+    cache = ProxyCache(str(tmp_path / "proxies"))
+    sources = []
+    for i in range(3):
+        source = tmp_path / f"{i}.png"
+        _image(8, 8).save(str(source))
+        cache.put(str(source), _image(64, 64, QColor(i * 50, 0, 0)), QSize(64, 64))
+        sources.append(str(source))
+        # Oldest first
+        proxy_file = cache.file_for(str(source))
+        os.utime(proxy_file, (1000 + i, 1000 + i))
+    cache.get(sources[0])  # Used again: now the most recent
+
+    sizes = [os.path.getsize(cache.file_for(source)) for source in sources]
+    cache.budget_bytes = sizes[0] + sizes[2]
+    assert cache.prune() == 1
+
+    assert cache.contains(sources[0])
+    assert not cache.contains(sources[1])
+    assert cache.contains(sources[2])
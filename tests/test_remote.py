@@ -0,0 +1,174 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the remote control in src/igridvu/remote.py.
+"""
+import json
+import os
+import subprocess
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+from PySide6.QtGui import QColor, QImage
+
+from igridvu import ImageGrid, remote
+from igridvu.remote import RemoteClient, RemoteError, RemoteServer
+
+
+def _grid(qtbot, tmp_path: Path) -> ImageGrid:
+    for suffix, color in (("a.png", QColor(10, 20, 30)), ("b.png", QColor(200, 100, 50))):
+        image = QImage(64, 32, QImage.Format_RGB32)
+        image.fill(color)
+        image.save(str(tmp_path / ("scene_" + suffix)))
+    grid = ImageGrid(str(tmp_path / "scene_"), ["a.png", "b.png"], suffix_file_path="dummy.txt")
+    qtbot.addWidget(grid)
+    qtbot.waitExposed(grid)
+    return grid
+
+
+def _run(server: RemoteServer, request):
+    reply = server.execute_line(json.dumps(request).encode())
+    assert reply.is_done()
+    return json.loads(reply.encode())
+
+
+def test_queries_and_errors(qtbot, tmp_path: Path):
+    grid = _grid(qtbot, tmp_path)
+    server = grid.start_remote_control(f"igridvu-test-{uuid.uuid4().hex[:12]}")
+    assert server.is_listening()
+
+    cells = _run(server, {"id": 1, "command": "cells"})["result"]
+    assert [(c["label"], c["width"], c["height"]) for c in cells] == [("a", 64, 32), ("b", 64, 32)]
+    assert _run(server, {"id": 2, "command": "pixel", "x": 3, "y": 4}) == \
+        {"id": 2, "result": [[10, 20, 30], [200, 100, 50]]}
+    assert _run(server, {"id": 3, "command": "pixel", "x": 64, "y": 0})["result"] == [None, None]
+
+    assert _run(server, {"id": 4, "command": "set_channel", "cell": "b", "channel": "Red"})["result"] == "Red"
+    assert grid.views[1].current_channel() == "Red"
+    # Pixel values are those of the decoded image, not of the channel shown
+    assert _run(server, {"id": 5, "command": "pixel", "x": 0, "y": 0})["result"][1] == [200, 100, 50]
+    assert _run(server, {"id": 6, "command": "set_channel", "cell": 1, "channel": None})["result"] is None
+
+    assert "error" in _run(server, {"id": 7, "command": "set_channel", "cell": 5, "channel": "Red"})
+    assert "error" in _run(server, {"id": 8, "command": "set_channel", "cell": 0, "channel": "Cyan"})
+    assert "error" in _run(server, {"id": 9, "command": "pixel", "x": "a", "y": 0})
+    assert _run(server, {"id": 10, "command": "fly"})["error"].startswith("Unknown command")
+    assert _run(server, "not an object")["error"]
+    server.close()
+
+
+def test_batch_and_view_rect(qtbot, tmp_path: Path):
+    grid = _grid(qtbot, tmp_path)
+    server = grid.start_remote_control(f"igridvu-test-{uuid.uuid4().hex[:12]}")
+
+    responses = _run(server, [{"id": 1, "command": "set_view_rect", "rect": [8, 8, 16, 16]},
+                              {"id": 2, "command": "pixel", "x": 1, "y": 1},
+                              {"id": 3, "command": "set_view_rect", "rect": [0, 0, 0, 5]}])
+
+    assert [response["id"] for response in responses] == [1, 2, 3]
+    x, y, width, height = responses[0]["result"]
+    assert (x + width / 2, y + height / 2) == (pytest.approx(16, abs=1), pytest.approx(16, abs=1))
+    assert "error" in responses[2]
+    server.close()
+
+
+def test_failing_handler_answers_with_an_error(qtbot, tmp_path: Path):
+    grid = _grid(qtbot, tmp_path)
+    server = grid.start_remote_control(f"igridvu-test-{uuid.uuid4().hex[:12]}")
+
+    def fail(_request):
+        raise ValueError("broken")
+    server.register("fail", fail)
+
+    responses = _run(server, [{"id": 1, "command": "fail"},
+                              {"id": 2, "command": "pixel", "x": 1 << 40, "y": 0},
+                              {"id": 3, "command": "pixel", "x": 0, "y": 0}])
+    assert responses[0] == {"id": 1, "error": "ValueError: broken"}
+    assert "out of range" in responses[1]["error"]
+    assert responses[2] == {"id": 3, "result": [[10, 20, 30], [200, 100, 50]]}
+    assert grid.views[0].pixel_values(1 << 40, 0) is None
+    server.close()
+
+
+def test_bad_request_pipelined_ahead_of_a_good_one(qtbot, tmp_path: Path):
+    """Tests that every pipelined request is answered, in order, even after a failing one."""
+    grid = _grid(qtbot, tmp_path)
+    server = grid.start_remote_control(f"igridvu-test-{uuid.uuid4().hex[:12]}")
+    server.register("fail", lambda _request: 1 // 0)
+    requests = [{"id": 1, "command": "fail"}, {"id": 2, "command": "pixel", "x": 2, "y": 2}]
+    # Both requests are written at once, so they arrive in the same read
+    script = (
+        "import sys\n"
+        "from PySide6.QtNetwork import QLocalSocket\n"
+        "socket = QLocalSocket()\n"
+        f"socket.connectToServer({server.name!r})\n"
+        "assert socket.waitForConnected(5000)\n"
+        f"socket.write({''.join(json.dumps(r) + chr(10) for r in requests).encode()!r})\n"
+        "socket.waitForBytesWritten(5000)\n"
+        "lines = 0\n"
+        "while lines < 2 and socket.waitForReadyRead(5000):\n"
+        "    while socket.canReadLine():\n"
+        "        sys.stdout.write(bytes(socket.readLine()).decode())\n"
+        "        lines += 1\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(remote.__file__).resolve().parents[1]))
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True, env=env)
+    qtbot.waitUntil(lambda: process.poll() is not None, timeout=20000)
+
+    responses = [json.loads(line) for line in process.stdout.read().splitlines()]
+    assert responses[0]["id"] == 1 and "ZeroDivisionError" in responses[0]["error"]
+    assert responses[1] == {"id": 2, "result": [[10, 20, 30], [200, 100, 50]]}
+    server.close()
+
+
+def test_snapshot_answers_once_written(qtbot, tmp_path: Path):
+    grid = _grid(qtbot, tmp_path)
+    server = grid.start_remote_control(f"igridvu-test-{uuid.uuid4().hex[:12]}")
+    path = tmp_path / "snapshot.png"
+    done = []
+
+    reply = server.execute_line(json.dumps({"id": 1, "command": "snapshot", "path": str(path)}).encode(),
+                                on_done=lambda: done.append(True))
+    assert not reply.is_done()
+    qtbot.waitUntil(lambda: bool(done))
+
+    assert json.loads(reply.encode()) == {"id": 1, "result": str(path)}
+    assert not QImage(str(path)).isNull()
+    server.close()
+
+
+def test_client_over_local_socket(qtbot, tmp_path: Path):
+    """Tests the blocking client against a running grid from another process, as a script would."""
+    grid = _grid(qtbot, tmp_path)
+    server = grid.start_remote_control(f"igridvu-test-{uuid.uuid4().hex[:12]}")
+    script = (
+        "import json\n"
+        "from igridvu.remote import RemoteClient, RemoteError\n"
+        f"with RemoteClient({server.name!r}, timeout_ms=5000) as client:\n"
+        "    results = {'pixels': client.pixels([(x, 0) for x in range(100)])}\n"
+        "    results['channel'] = client.set_channel(0, 'Green')\n"
+        "    try:\n"
+        "        client.set_channel(0, 'Cyan')\n"
+        "    except RemoteError as e:\n"
+        "        results['error'] = str(e)\n"
+        "print(json.dumps(results))\n"
+    )
+    env = dict(os.environ, PYTHONPATH=str(Path(remote.__file__).resolve().parents[1]))
+    process = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True, env=env)
+    # The viewer answers from its event loop while the script waits
+    qtbot.waitUntil(lambda: process.poll() is not None, timeout=20000)
+
+    results = json.loads(process.stdout.read())
+    assert len(results["pixels"]) == 100
+    assert results["pixels"][0] == [[10, 20, 30], [200, 100, 50]]
+    assert results["pixels"][99] == [None, None]
+    assert results["channel"] == "Green"
+    assert grid.views[0].current_channel() == "Green"
+    assert "Cyan" in results["error"]
+    server.close()
+
+
+def test_client_without_viewer():
+    with pytest.raises(ConnectionError):
+        RemoteClient(f"igridvu-test-{uuid.uuid4().hex[:12]}", timeout_ms=200)
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for numbered dataset sequences in src/igridvu/sequences.py.
+"""
+import os
+from pathlib import Path
+
+from igridvu.sequences import sequence_prefixes
+
+
+def _touch(directory: Path, *names: str):
+    for name in names:
+        (directory / name).write_bytes(b"")
+
+
+def test_sequence_of_file_name_prefixes(tmp_path: Path):
+    _touch(tmp_path, "frame0001_a.png", "frame0001_b.png", "frame0002_a.png",
+           "frame0010_a.png", "frameX_a.png", "other0003_a.png")
+    prefix = str(tmp_path / "frame0002_")
+
+    assert sequence_prefixes(prefix) == [str(tmp_path / f"frame{n}_") for n in ("0001", "0002", "0010")]
+
+
+def test_prefix_without_number_is_not_a_sequence(tmp_path: Path):
+    _touch(tmp_path, "scene_a.png")
+    assert sequence_prefixes(str(tmp_path / "scene_")) == []
+
+
+def test_number_with_trailing_text(tmp_path: Path):
+    # The number is the last digit run, followed by the rest of the prefix
+    _touch(tmp_path, "shot2_take7_a.png", "shot2_take8_a.png", "shot3_take7_a.png")
+    assert sequence_prefixes(str(tmp_path / "shot2_take7_")) == [
+        str(tmp_path / "shot2_take7_"), str(tmp_path / "shot2_take8_")]
+
+
+def test_sequence_of_directories(tmp_path: Path):
+    for name in ("frame9", "frame10", "frame10_old", "frame11"):
+        os.mkdir(tmp_path / name)
+    _touch(tmp_path, "frame12")  # A file, not a dataset directory
+    prefix = str(tmp_path / "frame10") + os.sep
+
+    assert sequence_prefixes(prefix) == [str(tmp_path / f"frame{n}") + os.sep for n in (9, 10, 11)]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for saving and loading sessions in src/igridvu/session.py.
+"""
+import json
+from pathlib import Path
+
+from igridvu.session import Session, default_session_path, load_session, save_session
+
+
+def _session(**changes) -> Session:
+    session = Session(pre_path="/data/scene_", suffix_file="/data/igridvu_suffix.txt", columns=3,
+                      view_rect=(10.0, 20.0, 300.0, 200.0), channels=[None, "Red"], geometry="AdnQyw==")
+    return session._replace(**changes)
+
+
+def test_default_session_path_uses_xdg_cache_home(tmp_path: Path, monkeypatch):
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert default_session_path() == str(tmp_path / "igridvu" / "session.json")
+
+
+def test_save_and_load_round_trip(tmp_path: Path):
+    path = tmp_path / "nested" / "session.json"
+    save_session(_session(), str(path))
+
+    assert load_session(str(path)) == _session()
+    # No temporary files are left behind
+    assert [p.name for p in path.parent.iterdir()] == ["session.json"]
+
+
+def test_session_without_view_rect(tmp_path: Path):
+    path = tmp_path / "session.json"
+    save_session(_session(view_rect=None, channels=[]), str(path))
+
+    assert load_session(str(path)).view_rect is None
+
+
+def test_missing_or_invalid_sessions_load_as_none(tmp_path: Path):
+    path = tmp_path / "session.json"
+    assert load_session(str(path)) is None
+
+    path.write_text("{not json")
+    assert load_session(str(path)) is None
+
+    path.write_text(json.dumps({"version": 999, "pre_path": "x"}))
+    assert load_session(str(path)) is None
+
+    path.write_text(json.dumps({"version": 1, "pre_path": "x"}))
+    assert load_session(str(path)) is None
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the single-instance mode in src/igridvu/single_instance.py.
+"""
+import os
+import socket
+import sys
+import uuid
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import QDir
+from PySide6.QtNetwork import QLocalServer
+
+from igridvu.single_instance import ENV_VAR, InstanceServer, absolute_prefix, forward_open, server_name
+
+
+def _unique_name() -> str:
+    return f"igridvu-test-{uuid.uuid4().hex[:12]}"
+
+
+def test_server_name_can_be_overridden(monkeypatch):
+    monkeypatch.setenv(ENV_VAR, "custom")
+    assert server_name() == "custom"
+    monkeypatch.delenv(ENV_VAR)
+    assert server_name().startswith("igridvu-")
+
+
+def test_absolute_prefix_keeps_directory_separator(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    assert absolute_prefix("renders/scene_") == str(tmp_path / "renders" / "scene_")
+    assert absolute_prefix("renders/") == str(tmp_path / "renders") + os.sep
+
+
+def test_forward_without_running_instance_fails_fast():
+    assert not forward_open("scene_", "suffixes.txt", name=_unique_name(), timeout_ms=200)
+
+
+def test_forwarded_dataset_is_received(qtbot, tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    server = InstanceServer(_unique_name())
+    assert server.listen()
+    received = []
+    server.openRequested.connect(lambda pre_path, suffix_file: received.append((pre_path, suffix_file)))
+
+    assert forward_open("scene_", "suffixes.txt", name=server.name)
+
+    qtbot.waitUntil(lambda: len(received) == 1)
+    assert received == [(str(tmp_path / "scene_"), str(tmp_path / "suffixes.txt"))]
+    server.close()
+
+
+def test_running_instance_keeps_its_socket(qtbot, tmp_path: Path, monkeypatch):
+    """Tests that a second server does not take over the socket of a live (maybe busy) one."""
+    monkeypatch.chdir(tmp_path)
+    first = InstanceServer(_unique_name())
+    assert first.listen()
+    second = InstanceServer(first.name)
+    assert not second.listen()
+
+    received = []
+    first.openRequested.connect(lambda pre_path, suffix_file: received.append(pre_path))
+    assert forward_open("scene_", "", name=first.name)
+    qtbot.waitUntil(lambda: len(received) == 1)
+    first.close()
+
+
+@pytest.mark.skipif(sys.platform == "win32", reason="Named pipes leave no stale files")
+def test_stale_socket_is_replaced(qtbot):
+    """Tests that the socket file of a crashed instance, which refuses connections, is replaced."""
+    name = _unique_name()
+    stale = socket.socket(socket.AF_UNIX)
+    stale.bind(os.path.join(QDir.tempPath(), name))
+    stale.close()  # The file stays, as after a crash
+
+    server = InstanceServer(name)
+    assert server.listen()
+    assert forward_open("scene_", "", name=name)
+    server.close()
+
+
+def test_socket_is_private_to_the_user(qtbot):
+    server = InstanceServer(_unique_name())
+    assert server.listen()
+    assert server._server.socketOptions() == QLocalServer.UserAccessOption
+    server.close()
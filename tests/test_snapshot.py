@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for snapshot encoding and the full-resolution grid export in src/igridvu/snapshot.py.
+"""
+from pathlib import Path
+
+import pytest
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QImage, QColor, QPainter
+
+from igridvu.snapshot import (
+    grid_geometry,
+    render_band,
+    write_stitched_png,
+    png_compression_to_quality,
+    save_image,
+)
+
+
+def make_image(width: int, height: int, color) -> QImage:
+    image = QImage(width, height, QImage.Format_RGB32)
+    image.fill(QColor(color))
+    return image
+
+
+def test_grid_geometry_uses_largest_image():
+    """Tests that every cell is as large as the largest scaled image."""
+    cells = [("a", make_image(10, 20, "red")), ("b", make_image(30, 5, "blue")), ("c", None)]
+    cell_w, cell_h, total_w, total_h = grid_geometry(cells, columns=2, scale=2.0)
+    assert (cell_w, cell_h) == (60, 40)
+    assert (total_w, total_h) == (120, 80)
+
+
+def test_render_band_draws_only_requested_rows(qtbot):
+    """Tests that a band shows the part of the grid it covers."""
+    cells = [("", make_image(8, 8, "red")), ("", make_image(8, 8, "blue")),
+             ("", make_image(8, 8, "green"))]
+    band = render_band(cells, columns=2, scale=1.0, top=8, band_height=8)
+
+    assert band.width() == 16
+    assert band.height() == 8
+    # The second row holds the third (green) image in its first column.
+    assert band.pixelColor(2, 4) == QColor("green")
+
+
+def test_write_stitched_png_streams_bands(tmp_path: Path, qtbot):
+    """Tests that the stitched PNG decodes to the full grid and reports progress."""
+    cells = [("", make_image(20, 10, "red")), ("", make_image(20, 10, "blue")),
+             ("", make_image(20, 10, "green"))]
+    out = tmp_path / "export.png"
+    progress = []
+
+    write_stitched_png(cells, str(out), columns=3, band_height=3,
+                       progress=lambda done, total: progress.append((done, total)))
+
+    image = QImage(str(out))
+    assert not image.isNull()
+    assert (image.width(), image.height()) == (60, 10)
+    assert image.pixelColor(5, 9) == QColor("red")
+    assert image.pixelColor(25, 9) == QColor("blue")
+    assert image.pixelColor(45, 9) == QColor("green")
+    # 10 rows in bands of 3 rows
+    assert progress == [(3, 10), (6, 10), (9, 10), (10, 10)]
+
+
+def test_write_stitched_png_scales_cells(tmp_path: Path, qtbot):
+    """Tests exporting at a user-chosen resolution."""
+    cells = [("label", make_image(40, 40, "red"))]
+    out = tmp_path / "half.png"
+
+    write_stitched_png(cells, str(out), columns=4, scale=0.5)
+
+    image = QImage(str(out))
+    assert (image.width(), image.height()) == (20, 20)
+
+
+def test_write_stitched_png_rejects_empty_grid(tmp_path: Path):
+    with pytest.raises(ValueError):
+        write_stitched_png([], str(tmp_path / "empty.png"), columns=4)
+
+
+@pytest.mark.parametrize("level", range(10))
+def test_png_compression_to_quality_round_trips(level):
+    """Tests that the quality maps back to the requested level in Qt's formula."""
+    quality = png_compression_to_quality(level)
+    assert (100 - quality) * 9 // 91 == level
+
+
+@pytest.mark.parametrize("filename", ["snap.png", "snap.jpg", "snap.webp", "snap.bmp"])
+def test_save_image_formats(tmp_path: Path, qtbot, filename):
+    """Tests that save_image writes every supported snapshot format."""
+    out = tmp_path / filename
+    assert save_image(make_image(16, 8, "red"), str(out), png_compression=1, quality=50) == str(out)
+    assert QImage(str(out)).size() == make_image(16, 8, "red").size()
+
+
+def test_save_image_applies_png_compression(tmp_path: Path, qtbot):
+    """Tests that a higher compression level writes a smaller PNG."""
+    image = make_image(256, 256, "white")
+    painter = QPainter(image)
+    for i in range(0, 256, 8):
+        painter.setPen(QColor(i, 255 - i, 128))
+        painter.drawLine(0, i, 255, 255 - i)
+    painter.end()
+
+    fast, small = tmp_path / "fast.png", tmp_path / "small.png"
+    save_image(image, str(fast), png_compression=0)
+    save_image(image, str(small), png_compression=9)
+    assert small.stat().st_size < fast.stat().st_size / 2
+    assert QImage(str(small)) == QImage(str(fast))
+
+
+def test_save_image_raises_on_failure(tmp_path: Path, qtbot):
+    with pytest.raises(IOError):
+        save_image(make_image(4, 4, "red"), str(tmp_path / "missing_dir" / "snap.png"))
@@ -2,13 +2,20 @@
 """
 Unit tests for the SuffixEditorDialog.
 """
+import os
+import stat
+import time
 from pathlib import Path
 
 from unittest.mock import Mock
 import pytest
-from PySide6.QtWidgets import QMessageBox, QListWidgetItem
+from PySide6.QtCore import QModelIndex, Qt
+from PySide6.QtGui import QKeySequence
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QMessageBox, QApplication
 
-from igridvu.suffix_editor import SuffixEditorDialog
+from igridvu.suffix_editor import SuffixEditorDialog, SuffixListModel
+from igridvu.suffixes import write_suffix_file
 
 
 def test_suffix_editor_loads_suffixes(qtbot, tmp_path: Path):
@@ -19,9 +26,7 @@ def test_suffix_editor_loads_suffixes(qtbot, tmp_path: Path):
     dialog = SuffixEditorDialog(str(suffix_file), max_suffixes=10, parent=None)
     qtbot.addWidget(dialog)
 
-    assert dialog.list_widget.count() == 2
-    assert dialog.list_widget.item(0).text() == "a.png"
-    assert dialog.list_widget.item(1).text() == "b.png"
+    assert dialog.model.entries() == ["a.png", "b.png"]
 
 
 def test_suffix_editor_handles_file_not_found(qtbot, tmp_path: Path):
@@ -29,7 +34,7 @@ def test_suffix_editor_handles_file_not_found(qtbot, tmp_path: Path):
     non_existent_file = tmp_path / "non_existent.txt"
     dialog = SuffixEditorDialog(str(non_existent_file), max_suffixes=10, parent=None)
     qtbot.addWidget(dialog)
-    assert dialog.list_widget.count() == 0
+    assert dialog.model.entry_count() == 0
 
 
 def test_suffix_editor_saves_suffixes(qtbot, tmp_path: Path):
@@ -39,8 +44,7 @@ def test_suffix_editor_saves_suffixes(qtbot, tmp_path: Path):
     qtbot.addWidget(dialog)
 
     # Add items
-    dialog.list_widget.addItem(QListWidgetItem("first.png"))
-    dialog.list_widget.addItem(QListWidgetItem("second.png"))
+    dialog.model.append_entries(["first.png", "second.png"])
 
     # Simulate clicking "Save"
     dialog._save_and_accept()
@@ -62,7 +66,7 @@ def test_suffix_editor_limit_enforced_on_load(qtbot, tmp_path: Path, monkeypatch
     qtbot.addWidget(dialog)
 
     # Assert that only max_suffixes were loaded
-    assert dialog.list_widget.count() == 10
+    assert dialog.model.entry_count() == 10
     # Assert that a warning was shown
     mock_msgbox.assert_called_once()
     # Check the content of the warning
@@ -84,15 +88,175 @@ def test_suffix_editor_limit_enforced_on_add(qtbot, tmp_path: Path, monkeypatch)
     dialog = SuffixEditorDialog(str(suffix_file), max_suffixes=10, parent=None)
     qtbot.addWidget(dialog)
 
-    assert dialog.list_widget.count() == 10
+    assert dialog.model.entry_count() == 10
     assert not dialog.add_button.isEnabled()
 
     # Try to add another one, which should fail and show a warning
     dialog._add_suffix()
 
-    assert dialog.list_widget.count() == 10
+    assert dialog.model.entry_count() == 10
     mock_msgbox.assert_called_once()
     args, _ = mock_msgbox.call_args
     # The QMessageBox.warning signature is (parent, title, text).
     assert args[1] == "Limit Reached"  # Check the title
-    assert "maximum number of suffixes (10)" in args[2]  # Check the detailed text
\ No newline at end of file
+    assert "maximum number of suffixes (10)" in args[2]  # Check the detailed text
+
+
+def test_suffix_editor_shows_pattern_matches(qtbot, tmp_path: Path):
+    """Tests that the editor shows how many files the selected pattern matches."""
+    for name in ("scene_v1.png", "scene_v2.png", "scene_x.png"):
+        (tmp_path / name).write_bytes(b"")
+    suffix_file = tmp_path / "suffixes.txt"
+    suffix_file.write_text("_v*.png\n_x.png\n")
+
+    dialog = SuffixEditorDialog(str(suffix_file), max_suffixes=10, pre_path=str(tmp_path / "scene"))
+    qtbot.addWidget(dialog)
+
+    dialog.list_view.setCurrentIndex(dialog.model.index(0))
+    assert dialog.match_label.text() == "Pattern matches 2 file(s)"
+    dialog.list_view.setCurrentIndex(dialog.model.index(1))
+    assert dialog.match_label.text() == ""
+
+
+def test_model_fetches_rows_lazily():
+    """Tests that the model exposes rows in batches but keeps all entries."""
+    model = SuffixListModel([f"{i}.png" for i in range(2500)])
+
+    assert model.rowCount() == SuffixListModel.FETCH_BATCH
+    assert model.canFetchMore()
+    while model.canFetchMore():
+        model.fetchMore()
+    assert model.rowCount() == 2500
+    assert model.entry_count() == 2500
+
+
+def test_model_bulk_remove_sort_and_dedupe():
+    """Tests the bulk operations of the model."""
+    model = SuffixListModel(["v10", "v2", "v1", "v2", "x", "v1"])
+
+    assert model.remove_duplicates() == 2
+    assert model.entries() == ["v10", "v2", "v1", "x"]
+
+    model.sort_entries()
+    assert model.entries() == ["v1", "v2", "v10", "x"]
+
+    model.remove_rows([0, 2, 3])
+    assert model.entries() == ["v2"]
+
+
+def test_model_removes_many_scattered_rows():
+    """Tests that removing many non-contiguous rows keeps the right entries."""
+    model = SuffixListModel([str(i) for i in range(1000)])
+    model.remove_rows(range(0, 1000, 2))
+    assert model.entries() == [str(i) for i in range(1, 1000, 2)]
+    assert model.rowCount() == 500
+
+
+def test_emptied_entry_is_removed(qtbot):
+    """Tests that editing an entry to an empty string removes it."""
+    model = SuffixListModel(["a.png", "b.png"])
+    assert model.setData(model.index(0), "  c.png ")
+    assert model.entries() == ["c.png", "b.png"]
+
+    model.setData(model.index(1), "   ")
+    qtbot.waitUntil(lambda: model.entries() == ["c.png"])
+
+
+def test_dragged_entry_keeps_its_text(qtbot, tmp_path: Path):
+    """Tests that dragging an entry to the end moves it, as the list view's drop does."""
+    model = SuffixListModel(["a", "b", "c"])
+
+    assert model.moveRows(QModelIndex(), 0, 1, QModelIndex(), 3)
+    assert model.entries() == ["b", "c", "a"]
+    assert model.moveRows(QModelIndex(), 2, 1, QModelIndex(), 0)
+    assert model.entries() == ["a", "b", "c"]
+
+    # Without moveRows, a view inserts a row, sets the dropped data and removes the source row
+    mime = model.mimeData([model.index(0)])
+    assert model.dropMimeData(mime, Qt.MoveAction, 3, 0, QModelIndex())
+    model.removeRows(0, 1)
+    assert model.entries() == ["b", "c", "a"]
+
+
+def test_emptied_entry_is_removed_after_rows_move(qtbot):
+    """Tests that the emptied entry is removed, not the one that took its row."""
+    model = SuffixListModel(["a.png", "b.png", "c.png"])
+    model.setData(model.index(2), "")
+    model.remove_rows([0])  # Before the removal of the emptied entry runs
+    qtbot.waitUntil(lambda: model.entries() == ["b.png"])
+
+
+def test_suffix_editor_pastes_lines(qtbot, tmp_path: Path):
+    """Tests that pasting appends the non-empty clipboard lines."""
+    dialog = SuffixEditorDialog(str(tmp_path / "suffixes.txt"), max_suffixes=10)
+    qtbot.addWidget(dialog)
+    QApplication.clipboard().setText("a.png\n\n  b.png\r\nc.png")
+
+    dialog._paste_suffixes()
+
+    assert dialog.model.entries() == ["a.png", "b.png", "c.png"]
+    assert dialog.count_label.text() == "3 entries"
+
+
+def test_suffix_editor_removes_selection(qtbot, tmp_path: Path):
+    """Tests that all selected rows are removed at once."""
+    suffix_file = tmp_path / "suffixes.txt"
+    suffix_file.write_text("a\nb\nc\nd\n")
+    dialog = SuffixEditorDialog(str(suffix_file), max_suffixes=10)
+    qtbot.addWidget(dialog)
+
+    selection = dialog.list_view.selectionModel()
+    for row in (0, 2, 3):
+        selection.select(dialog.model.index(row), selection.SelectionFlag.Select)
+    dialog._remove_suffix()
+
+    assert dialog.model.entries() == ["b"]
+
+
+def test_suffix_editor_select_all_removes_unfetched_rows(qtbot, tmp_path: Path):
+    """Tests that Select All then Remove Selected empties a list larger than one fetch batch."""
+    suffix_file = tmp_path / "suffixes.txt"
+    suffix_file.write_text("".join(f"_frame{i}.png\n" for i in range(5000)))
+    dialog = SuffixEditorDialog(str(suffix_file), max_suffixes=10_000)
+    qtbot.addWidget(dialog)
+    dialog.show()
+    dialog.list_view.setFocus()
+    assert dialog.model.rowCount() < 5000
+
+    QTest.keySequence(dialog.list_view, QKeySequence.SelectAll)
+    dialog._remove_suffix()
+
+    assert dialog.model.entry_count() == 0
+    assert dialog.count_label.text() == "0 entries"
+
+
+def test_write_suffix_file_is_atomic_and_keeps_permissions(tmp_path: Path):
+    """Tests that saving replaces the file and leaves no temporary file behind."""
+    suffix_file = tmp_path / "suffixes.txt"
+    suffix_file.write_text("old\n")
+    os.chmod(suffix_file, 0o640)
+
+    write_suffix_file(str(suffix_file), ["a.png", "b.png"])
+
+    assert suffix_file.read_text() == "a.png\nb.png\n"
+    assert stat.S_IMODE(os.stat(suffix_file).st_mode) == 0o640
+    assert os.listdir(tmp_path) == ["suffixes.txt"]
+
+
+def test_suffix_editor_handles_100k_lines(qtbot, tmp_path: Path):
+    """Tests that a 100,000-line suffix file loads, sorts and saves quickly."""
+    suffix_file = tmp_path / "suffixes.txt"
+    lines = [f"_frame{i}.png" for i in range(100_000)]
+    suffix_file.write_text("\n".join(reversed(lines)) + "\n")
+
+    start = time.perf_counter()
+    dialog = SuffixEditorDialog(str(suffix_file), max_suffixes=200_000)
+    qtbot.addWidget(dialog)
+    dialog.show()
+    dialog.model.sort_entries()
+    dialog._save_and_accept()
+    elapsed = time.perf_counter() - start
+
+    assert dialog.model.rowCount() < 100_000  # The view only fetched what it needs
+    assert suffix_file.read_text().splitlines() == lines
+    assert elapsed < 3.0
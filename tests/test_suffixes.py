@@ -0,0 +1,132 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the suffix patterns and the directory listing cache in src/igridvu/suffixes.py.
+"""
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from igridvu import suffixes
+from igridvu.suffixes import (expand_suffixes, deduce_prefix, is_pattern, list_directory,
+                              natural_key, read_suffix_file)
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    suffixes.clear_cache()
+    yield
+    suffixes.clear_cache()
+
+
+def touch(directory: Path, *names: str):
+    for name in names:
+        (directory / name).write_bytes(b"")
+
+
+def test_is_pattern():
+    assert not is_pattern("_render.png")
+    assert is_pattern("_v*.png")
+    assert is_pattern("_v?.png")
+    assert is_pattern("_[ab].png")
+    assert is_pattern(r"re:_v\d+\.png")
+
+
+def test_natural_key_orders_numbers_by_value():
+    assert sorted(["v10", "v2", "v1"], key=natural_key) == ["v1", "v2", "v10"]
+
+
+def test_expand_glob_in_natural_order(tmp_path: Path):
+    touch(tmp_path, "scene_v10.png", "scene_v2.png", "scene_v1.png", "scene_v1.jpg", "other_v3.png")
+
+    result, truncated = expand_suffixes(["_v*.png"], str(tmp_path / "scene"))
+
+    assert result == ["_v1.png", "_v2.png", "_v10.png"]
+    assert not truncated
+
+
+def test_expand_regex_and_keep_explicit_entries_in_place(tmp_path: Path):
+    touch(tmp_path, "scene_a1.png", "scene_a22.png", "scene_b.png")
+
+    result, _ = expand_suffixes(["_first.png", r"re:_a\d\.png", "_b.png"], str(tmp_path / "scene"))
+
+    assert result == ["_first.png", "_a1.png", "_b.png"]
+
+
+def test_expand_directory_prefix(tmp_path: Path):
+    touch(tmp_path, "1.png", "2.png", "notes.txt")
+    result, _ = expand_suffixes(["*.png"], str(tmp_path))
+    assert result == ["1.png", "2.png"]
+
+
+def test_expand_drops_duplicates_and_truncates(tmp_path: Path):
+    touch(tmp_path, *[f"s_{i}.png" for i in range(10)])
+
+    result, truncated = expand_suffixes(["_[0-4].png", "_*.png"], str(tmp_path / "s"), max_results=7)
+
+    assert result == [f"_{i}.png" for i in range(7)]
+    assert truncated
+
+
+def test_glob_matching_nothing_falls_back_to_the_literal_file(tmp_path: Path):
+    touch(tmp_path, "s_img[1].png", "s_a.png", "s_img1.png")
+
+    result, _ = expand_suffixes(["_img[1].png", "_a.png", "_x[2].png"], str(tmp_path / "s"))
+    # A pattern that matches files is still expanded
+    assert result == ["_img1.png", "_a.png"]
+
+    (tmp_path / "s_img1.png").unlink()
+    suffixes.clear_cache()
+    result, _ = expand_suffixes(["_img[1].png", "_a.png", "_x[2].png"], str(tmp_path / "s"))
+    assert result == ["_img[1].png", "_a.png"]
+    assert deduce_prefix("s_img[1].png", ["_img[1].png"]) == "s"
+
+
+def test_invalid_regex_matches_nothing(tmp_path: Path):
+    touch(tmp_path, "s_1.png")
+    assert expand_suffixes(["re:_(unclosed"], str(tmp_path / "s")) == ([], False)
+
+
+def test_listing_is_cached_until_directory_changes(tmp_path: Path):
+    touch(tmp_path, "a.png")
+    first = list_directory(str(tmp_path))
+    assert list_directory(str(tmp_path)) is first
+
+    touch(tmp_path, "b.png")
+    # Make sure the mtime differs even on coarse-grained filesystems
+    stat = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, first.mtime_ns + 1_000_000_000))
+    second = list_directory(str(tmp_path))
+
+    assert second is not first
+    assert "b.png" in second
+    assert second.with_prefix("b") == ["b.png"]
+
+
+def test_deduce_prefix():
+    assert deduce_prefix("scene1_render.png", ["render.png", "_render.png"]) == "scene1"
+    assert deduce_prefix("scene1_v12.png", ["_v*.png"]) == "scene1"
+    assert deduce_prefix("scene1_v12.png", [r"re:_v\d+\.png"]) == "scene1"
+    assert deduce_prefix("scene1.jpg", ["_v*.png"]) is None
+
+
+def test_read_suffix_file(tmp_path: Path):
+    suffix_file = tmp_path / "suffixes.txt"
+    suffix_file.write_text("a.png\n\n  b.png  \nc.png\n")
+
+    assert read_suffix_file(str(suffix_file), 10) == (["a.png", "b.png", "c.png"], False)
+    assert read_suffix_file(str(suffix_file), 2) == (["a.png"], True)
+
+
+def test_expansion_over_100k_files_is_fast(tmp_path: Path):
+    names = [f"scene_v{i}.png" for i in range(100_000)]
+    touch(tmp_path, *names)
+
+    start = time.perf_counter()
+    result, truncated = expand_suffixes(["_v*.png", r"re:_v\d+7\.png"], str(tmp_path / "scene"), max_results=30)
+    elapsed = time.perf_counter() - start
+
+    assert result == [f"_v{i}.png" for i in range(30)]
+    assert truncated
+    assert elapsed < 1.0
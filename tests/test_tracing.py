@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the tracing instrumentation in src/igridvu/tracing.py.
+"""
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from igridvu import tracing, ZoomableView
+
+
+@pytest.fixture
+def trace():
+    """Enables tracing for one test and restores the disabled state afterwards."""
+    tracing.clear()
+    tracing.enable()
+    yield tracing
+    tracing.disable()
+    tracing.clear()
+
+
+def complete_events(name=None):
+    return [e for e in tracing.events() if e["ph"] == "X" and (name is None or e["name"] == name)]
+
+
+def test_disabled_tracing_records_nothing():
+    tracing.clear()
+    assert not tracing.is_enabled()
+    with tracing.span("ignored"):
+        pass
+    assert tracing.events() == []
+
+
+def test_span_records_complete_event(trace):
+    with tracing.span("work", "test", size=3):
+        pass
+
+    (event,) = complete_events("work")
+    assert event["cat"] == "test"
+    assert event["args"] == {"size": 3}
+    assert event["dur"] >= 0
+
+
+def test_traced_decorator(trace):
+    @tracing.traced("decorated")
+    def add(a, b):
+        return a + b
+
+    assert add(1, 2) == 3
+    assert len(complete_events("decorated")) == 1
+
+
+def test_threads_get_their_own_tracks(trace):
+    def work():
+        with tracing.span("in_thread"):
+            pass
+
+    thread = threading.Thread(target=work, name="worker-1")
+    thread.start()
+    thread.join()
+    with tracing.span("in_main"):
+        pass
+
+    (thread_event,) = complete_events("in_thread")
+    (main_event,) = complete_events("in_main")
+    assert thread_event["tid"] != main_event["tid"]
+    names = [e["args"]["name"] for e in tracing.events() if e["name"] == "thread_name"]
+    assert "worker-1" in names
+
+
+def test_export_writes_chrome_trace_json(trace, tmp_path: Path):
+    with tracing.span("exported"):
+        pass
+    out = tmp_path / "trace.json"
+    tracing.export(str(out))
+
+    data = json.loads(out.read_text(encoding="utf-8"))
+    assert any(e["name"] == "exported" for e in data["traceEvents"])
+
+
+def test_view_decode_and_validation_are_traced(trace, tmp_path: Path, qtbot, create_dummy_image):
+    img_path = create_dummy_image(tmp_path, width=4, height=4)
+    view = ZoomableView(label_text="traced", img_path=str(img_path))
+    qtbot.addWidget(view)
+    view.get_channel_image("Red")
+
+    assert complete_events("validate")
+    assert complete_events("decode")[0]["args"]["path"] == str(img_path)
+    assert complete_events("get_channel_image")
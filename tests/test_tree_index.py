@@ -0,0 +1,106 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the persistent dataset index in src/igridvu/tree_index.py.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from igridvu.tree_index import TreeIndex, main
+
+
+def make_dataset(directory: Path, prefixes, suffixes=("_a.png", "_b.png"), mtime=None):
+    directory.mkdir(parents=True, exist_ok=True)
+    (directory / "igridvu_suffix.txt").write_text("\n".join(suffixes) + "\n")
+    for prefix in prefixes:
+        for suffix in suffixes:
+            path = directory / f"{prefix}{suffix}"
+            path.write_bytes(b"x" * 10)
+            if mtime is not None:
+                os.utime(path, (mtime, mtime))
+
+
+def bump_mtime(directory: Path):
+    """Moves a directory's mtime forward, even on coarse-grained filesystems."""
+    stat = directory.stat()
+    os.utime(directory, ns=(stat.st_atime_ns, stat.st_mtime_ns + 2_000_000_000))
+
+
+@pytest.fixture
+def tree(tmp_path: Path) -> Path:
+    root = tmp_path / "renders"
+    make_dataset(root / "2023" / "run1", ["scene1"], mtime=1_000_000)
+    make_dataset(root / "2024" / "run2", ["scene1", "scene2"], mtime=2_000_000)
+    (root / "2024" / "empty").mkdir()
+    return root
+
+
+def test_refresh_records_every_dataset(tree: Path, tmp_path: Path):
+    index = TreeIndex(str(tmp_path / "index.json"))
+    stats = index.refresh(str(tree), workers=4)
+
+    assert stats.datasets == 3
+    assert stats.scanned == 6 and stats.reused == 0
+    datasets = index.datasets(str(tree))
+    assert [Path(d.pre_path).name for d in datasets] == ["scene1", "scene2", "scene1"]
+    newest = datasets[0]
+    assert (newest.count, newest.total, newest.bytes) == (2, 2, 20)
+    assert newest.suffix_file == str(tree / "2024" / "run2" / "igridvu_suffix.txt")
+
+
+def test_refresh_is_incremental(tree: Path, tmp_path: Path):
+    index = TreeIndex(str(tmp_path / "index.json"))
+    index.refresh(str(tree))
+
+    assert index.refresh(str(tree)).scanned == 0
+
+    run1 = tree / "2023" / "run1"
+    (run1 / "scene9_a.png").write_bytes(b"")
+    bump_mtime(run1)
+    stats = index.refresh(str(tree))
+    assert (stats.scanned, stats.reused) == (1, 5)
+    assert stats.datasets == 4
+
+
+def test_removed_directories_are_dropped(tree: Path, tmp_path: Path):
+    index = TreeIndex(str(tmp_path / "index.json"))
+    index.refresh(str(tree))
+
+    for path in (tree / "2023" / "run1").iterdir():
+        path.unlink()
+    (tree / "2023" / "run1").rmdir()
+    index.refresh(str(tree))
+
+    assert not any("2023" in d.pre_path for d in index.datasets())
+
+
+def test_index_persists_and_finds_most_recent(tree: Path, tmp_path: Path):
+    path = str(tmp_path / "cache" / "index.json")
+    index = TreeIndex(path)
+    index.refresh(str(tree))
+    index.save()
+
+    loaded = TreeIndex(path).load()
+    assert loaded.contains(str(tree))
+    most_recent = loaded.most_recent(str(tree))
+    assert Path(most_recent.pre_path).parent.name == "run2"
+    assert loaded.most_recent(str(tree / "2023")).pre_path == str(tree / "2023" / "run1" / "scene1")
+
+
+def test_corrupt_index_is_ignored(tmp_path: Path):
+    path = tmp_path / "index.json"
+    path.write_text("{not json")
+    assert TreeIndex(str(path)).load().directories == {}
+
+
+def test_cli_most_recent(tree: Path, tmp_path: Path, capsys):
+    index_path = str(tmp_path / "index.json")
+
+    assert main([str(tree), "--index", index_path, "--most-recent"]) == 0
+    out = capsys.readouterr().out.strip()
+    assert out.endswith(os.path.join("2024", "run2", "scene1")) or out.endswith(os.path.join("2024", "run2", "scene2"))
+
+    # Queries can skip the walk entirely
+    assert main([str(tree), "--index", index_path, "--no-refresh", "--list"]) == 0
+    assert len(capsys.readouterr().out.strip().splitlines()) == 3
@@ -0,0 +1,98 @@
+# -*- coding: utf-8 -*-
+"""
+Unit tests for the batched path validation in src/igridvu/validation.py.
+"""
+import os
+from pathlib import Path
+
+import pytest
+
+from igridvu import suffixes
+from igridvu.suffixes import list_directory
+from igridvu.validation import validate_paths
+
+
+@pytest.fixture(autouse=True)
+def fresh_cache():
+    suffixes.clear_cache()
+    yield
+    suffixes.clear_cache()
+
+
+@pytest.fixture
+def dataset(tmp_path: Path) -> Path:
+    data = tmp_path / "data"
+    data.mkdir()
+    (data / "scene_a.png").write_bytes(b"a")
+    (data / "scene_big.png").write_bytes(b"x" * 2048)
+    (data / "sub").mkdir()
+    (data / "sub" / "b.png").write_bytes(b"b")
+    (tmp_path / "secret.png").write_bytes(b"s")
+    return data
+
+
+def test_valid_and_missing_files(dataset: Path):
+    checks = validate_paths(str(dataset / "scene"), ["_a.png", "_missing.png", "_big.png"], 1024)
+
+    assert checks[0].path == str(dataset / "scene_a.png")
+    assert checks[0].error is None
+    assert checks[0].size == 1
+    assert checks[1].error == "Not found"
+    assert checks[2].error.startswith("File too large")
+
+
+def test_directory_prefix_and_subdirectories(dataset: Path):
+    checks = validate_paths(str(dataset), ["scene_a.png", "sub/b.png", "sub"], 1024)
+    assert [check.error for check in checks] == [None, None, "Not found"]
+
+
+def test_path_traversal_is_rejected(dataset: Path):
+    checks = validate_paths(str(dataset / "scene"), ["/../../secret.png", "/../scene_a.png"], 1024)
+    assert checks[0].error == "Path traversal\nattempt"
+    # Resolves back into the base directory, but the kernel cannot walk through "scene"
+    assert checks[1].error == "Not found"
+
+
+def test_absolute_suffix_is_rejected(dataset: Path, tmp_path: Path):
+    checks = validate_paths(str(dataset), [str(tmp_path / "secret.png")], 1024)
+    assert checks[0].error == "Path traversal\nattempt"
+
+
+def test_symbolic_link_out_of_base_directory_is_rejected(dataset: Path, tmp_path: Path):
+    os.symlink(tmp_path / "secret.png", dataset / "scene_link.png")
+    os.symlink(dataset / "scene_a.png", dataset / "scene_inside.png")
+
+    checks = validate_paths(str(dataset / "scene"), ["_link.png", "_inside.png"], 1024)
+
+    assert checks[0].error == "Path traversal\nattempt"
+    assert checks[1].error is None
+
+
+def test_file_swapped_for_a_link_within_the_same_mtime_is_rejected(dataset: Path, tmp_path: Path):
+    """Tests that a cached directory listing does not let a file replaced by a link skip the check."""
+    mtime_ns = os.stat(dataset).st_mtime_ns
+    list_directory(str(dataset))  # Cached: scene_a.png is a regular file
+    os.remove(dataset / "scene_a.png")
+    os.symlink(tmp_path / "secret.png", dataset / "scene_a.png")
+    os.utime(dataset, ns=(mtime_ns, mtime_ns))  # As on a filesystem with coarse mtimes
+
+    checks = validate_paths(str(dataset / "scene"), ["_a.png"], 1024)
+
+    assert checks[0].error == "Path traversal\nattempt"
+
+
+@pytest.mark.skipif(hasattr(os, "geteuid") and os.geteuid() == 0, reason="root can read any file")
+def test_unreadable_file(dataset: Path):
+    os.chmod(dataset / "scene_a.png", 0)
+    try:
+        checks = validate_paths(str(dataset / "scene"), ["_a.png"], 1024)
+    finally:
+        os.chmod(dataset / "scene_a.png", 0o644)
+    assert checks[0].error == "Permission\ndenied"
+
+
+def test_sequential_and_parallel_results_agree(dataset: Path):
+    entries = ["_a.png", "_missing.png", "_big.png", "/../../secret.png"]
+    sequential = validate_paths(str(dataset / "scene"), entries, 1024, workers=1)
+    parallel = validate_paths(str(dataset / "scene"), entries, 1024, workers=4)
+    assert sequential == parallel
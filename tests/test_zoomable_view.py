@@ -296,3 +296,172 @@ def test_view_channel_and_restore(tmp_path: Path, qtbot, create_dummy_image):
     assert not view._image.isGrayscale()
     assert view._original_image is None
     assert view._image.constBits() == original_image.constBits()
+
+
+def _zoomed_view(qtbot, image: QImage, zoom: float) -> ZoomableView:
+    view = ZoomableView(label_text="zoom", image=image)
+    qtbot.addWidget(view)
+    view.resize(200, 200)
+    view.show()
+    qtbot.waitExposed(view)
+    view.resetTransform()
+    view.scale(zoom, zoom)
+    view.centerOn(0, 0)
+    return view
+
+
+def test_nearest_neighbor_above_zoom_threshold(qtbot):
+    """Tests that pixels are filtered when zoomed out and drawn sharp when zoomed in."""
+    image = QImage(64, 64, QImage.Format_RGB32)
+    image.fill(QColor(10, 20, 30))
+    view = _zoomed_view(qtbot, image, 0.5)
+    view.viewport().grab()
+    assert view._pixmap_item.transformationMode() == Qt.SmoothTransformation
+
+    view.scale(8, 8)
+    view.viewport().grab()
+    assert view.pixel_zoom() == pytest.approx(4.0)
+    assert view._pixmap_item.transformationMode() == Qt.FastTransformation
+
+
+def test_pixel_grid_and_values_at_high_zoom(qtbot):
+    """Tests that grid lines and pixel values are drawn at high zoom."""
+    image = QImage(4, 4, QImage.Format_RGB32)
+    image.fill(QColor(0, 0, 0))
+    view = _zoomed_view(qtbot, image, 60)
+    assert view.pixel_zoom() >= ZoomableView.PIXEL_VALUE_ZOOM
+
+    drawn = view.viewport().grab().toImage()
+
+    origin = view.mapFromScene(QPointF(1, 1))
+    center = view.mapFromScene(QPointF(1.5, 1.5))
+    # A grid line at the pixel boundary, the black pixel's value in white text at its center
+    assert drawn.pixelColor(origin.x(), origin.y() + 10) != QColor(0, 0, 0)
+    colors = {drawn.pixelColor(center.x() + dx, center.y() + dy).name()
+              for dx in range(-6, 7) for dy in range(-12, 13)}
+    assert len(colors) > 1
+
+
+def test_levels_of_detail_when_zoomed_out(qtbot):
+    """Tests that a zoomed-out view paints a downsampled level and maps colors to full-resolution pixels."""
+    image = QImage(1200, 800, QImage.Format_RGB32)
+    image.fill(QColor(0, 0, 0))
+    image.setPixelColor(1000, 700, QColor(255, 0, 0))
+    view = _zoomed_view(qtbot, image, 0.2)
+    qtbot.waitUntil(lambda: len(view._levels) == 3)
+    assert [level.width() for level in view._levels] == [600, 300, 150]
+
+    view.viewport().grab()
+    # 0.2 * 4 <= 1 < 0.2 * 8: the level downsampled by 4
+    assert view._level == 2
+    assert view._pixmap_item.pixmap().width() == 300
+    assert view._pixmap_item.scale() == pytest.approx(4.0)
+    assert view.get_color_at(QPointF(1000.5, 700.5)) == QColor(255, 0, 0)
+    assert view.memory_usage() > image.sizeInBytes() + 1200 * 800 * 4
+
+    view.scale(10, 10)
+    view.viewport().grab()
+    assert view._level == 0
+    assert view._pixmap_item.pixmap().width() == 1200
+    assert view._pixmap_item.scale() == 1.0
+
+    # A channel change drops the levels of the previous image and builds new ones
+    view.view_channel("Red")
+    assert view._levels == []
+    qtbot.waitUntil(lambda: len(view._levels) == 3)
+    assert view._levels[0].toImage().isGrayscale()
+
+
+def _wheel(view, pixel_delta: QPoint, angle_delta: QPoint, pos: QPointF = QPointF(50, 50)):
+    event = QWheelEvent(pos, pos, pixel_delta, angle_delta, Qt.NoButton, Qt.NoModifier,
+                        Qt.NoScrollPhase, False)
+    QApplication.sendEvent(view.viewport(), event)
+
+
+def test_wheel_events_are_coalesced_per_frame(qtbot):
+    """Tests that wheel events between two frames zoom once, about the cursor."""
+    image = QImage(400, 400, QImage.Format_RGB32)
+    image.fill(QColor(0, 0, 0))
+    view = _zoomed_view(qtbot, image, 1.0)
+    anchor = QPointF(50, 50)
+    scene_anchor = view.mapToScene(anchor.toPoint())
+    emitted = []
+    view.viewRectChanged.connect(emitted.append)
+
+    for _ in range(3):
+        _wheel(view, QPoint(0, 0), QPoint(0, 120), anchor)
+    assert view.pixel_zoom() == 1.0  # Nothing applied before the frame
+    qtbot.waitUntil(lambda: len(emitted) == 1)
+
+    assert view.pixel_zoom() == pytest.approx(ZoomableView.ZOOM_STEP ** 3)
+    moved = view.mapToScene(anchor.toPoint()) - scene_anchor
+    assert abs(moved.x()) < 1 and abs(moved.y()) < 1
+
+
+def test_trackpad_zoom_is_proportional(qtbot):
+    """Tests that high-resolution pixel deltas zoom in proportion to the distance scrolled."""
+    image = QImage(400, 400, QImage.Format_RGB32)
+    image.fill(QColor(0, 0, 0))
+    view = _zoomed_view(qtbot, image, 1.0)
+
+    _wheel(view, QPoint(0, ZoomableView.WHEEL_PIXELS_PER_STEP // 4), QPoint(0, 30))
+    qtbot.waitUntil(lambda: view.pixel_zoom() != 1.0)
+    assert view.pixel_zoom() == pytest.approx(ZoomableView.ZOOM_STEP ** 0.25)
+
+    _wheel(view, QPoint(0, -ZoomableView.WHEEL_PIXELS_PER_STEP // 4), QPoint(0, -30))
+    qtbot.waitUntil(lambda: view.pixel_zoom() == pytest.approx(1.0))
+
+
+def test_proxy_is_shown_while_image_decodes_in_background(tmp_path: Path, qtbot):
+    """Tests that a view created with a cached proxy shows it at full size until the image is decoded."""
+    from PySide6.QtCore import QSize
+    from igridvu.proxy_cache import CachedProxy
+    image = QImage(400, 200, QImage.Format_RGB32)
+    image.fill(QColor(0, 0, 255))
+    path = tmp_path / "big.png"
+    image.save(str(path))
+    proxy = CachedProxy(image.scaled(40, 20), QSize(400, 200))
+
+    view = ZoomableView("big", img_path=str(path), validated=True, proxy=proxy)
+    qtbot.addWidget(view)
+    view.view_channel("Red")
+
+    assert view.is_loading() and view.is_proxy()
+    assert view.image_size() == QSize(400, 200)
+    assert view.current_channel() == "Red"
+    assert not view.restore_full_resolution()
+
+    qtbot.waitUntil(lambda: not view.is_loading())
+    assert not view.is_proxy()
+    assert view.source_image().size() == QSize(400, 200)
+    # The channel chosen while loading is applied to the decoded image
+    assert view.current_channel() == "Red"
+    assert view.get_color_at(QPointF(10, 10)).blue() == 0
+
+
+def test_failed_background_decode_shows_error(tmp_path: Path, qtbot):
+    from PySide6.QtCore import QSize
+    from igridvu.proxy_cache import CachedProxy
+    path = tmp_path / "broken.png"
+    path.write_bytes(b"not an image")
+    proxy = CachedProxy(QImage(8, 8, QImage.Format_RGB32), QSize(80, 80))
+
+    view = ZoomableView("broken", img_path=str(path), validated=True, proxy=proxy)
+    qtbot.addWidget(view)
+    qtbot.waitUntil(lambda: not view.is_loading())
+
+    assert not view.has_image()
+    assert "Unrecognized" in get_scene_text(view)
+
+
+def test_proxy_image_is_downscaled_copy_of_screen(qtbot):
+    image = QImage(1000, 500, QImage.Format_RGB32)
+    image.fill(QColor(10, 200, 30))
+    view = ZoomableView("a", image=image)
+    qtbot.addWidget(view)
+    view.view_channel("Green")
+
+    proxy = view.proxy_image(100)
+    assert (proxy.width(), proxy.height()) == (100, 50)
+    # The channel on screen: green as gray
+    assert proxy.pixelColor(5, 5).red() == 200